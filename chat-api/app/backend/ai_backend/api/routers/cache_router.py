@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from ai_backend.core.dependencies import get_database, get_redis_client
 from ai_backend.config import settings
 from ai_backend.database.base import Database
+from ai_backend.cache.bulk_clear import get_bulk_cache_clearer
 from ai_backend.cache.redis_client import RedisClient
 import logging
 
@@ -32,7 +33,7 @@ def get_cache_status(
     
     # Redis 정보 조회
     info = redis_client.redis_client.info()
-    keys = redis_client.redis_client.keys("*")
+    total_keys = redis_client.redis_client.dbsize()
     
     return {
         "status": "success",
@@ -40,7 +41,10 @@ def get_cache_status(
             "enabled": True,
             "redis_version": info.get("redis_version"),
             "used_memory": info.get("used_memory_human"),
-            "total_keys": len(keys),
+            "total_keys": total_keys,
+            "codec": redis_client.codec.name,
+            "key_prefix": redis_client.codec.key_prefix,
+            "local_cache": redis_client.get_local_cache_stats(),
             "cache_config": {
                 "enabled": cache_config.cache_enabled,
                 "ttl_chat_messages": cache_config.cache_ttl_chat_messages,
@@ -54,31 +58,110 @@ def get_cache_status(
 
 
 @router.post("/cache/clear")
-def clear_cache(
+async def clear_cache(
+    pattern: str = "*",
+    batch_size: int = 500,
     redis_client: RedisClient = Depends(get_redis_client)
 ):
-    """모든 캐시 삭제"""
+    """캐시 삭제 (백그라운드 작업 - SCAN + UNLINK, 진행 상황은 /cache/clear/{job_id}로 조회)"""
     # Service Layer에서 전파된 HandledException을 그대로 전파
     # Global Exception Handler가 자동으로 처리
-    if not redis_client or not redis_client.ping():
+    if not redis_client or not await redis_client.ping_async():
         return {
             "status": "warning",
             "message": "Redis가 사용할 수 없습니다."
         }
     
-    # 모든 캐시 키 삭제
-    keys = redis_client.redis_client.keys("*")
-    if keys:
-        redis_client.redis_client.delete(*keys)
+    job = get_bulk_cache_clearer().start(redis_client, pattern, max(1, min(batch_size, 10000)))
+    return {
+        "status": "success",
+        "message": "캐시 삭제 작업이 시작되었습니다.",
+        "data": job.to_dict()
+    }
+
+
+@router.get("/cache/clear")
+def list_cache_clear_jobs():
+    """캐시 삭제 작업 목록 조회 (현재 파드에서 시작된 작업)"""
+    return {
+        "status": "success",
+        "data": [job.to_dict() for job in get_bulk_cache_clearer().list()]
+    }
+
+
+@router.get("/cache/clear/{job_id}")
+def get_cache_clear_job(job_id: str):
+    """캐시 삭제 작업 진행 상황 조회"""
+    job = get_bulk_cache_clearer().get(job_id)
+    if job is None:
+        return {
+            "status": "error",
+            "message": f"작업 '{job_id}'를 찾을 수 없습니다."
+        }
+    
+    return {
+        "status": "success",
+        "data": job.to_dict()
+    }
+
+
+@router.get("/cache/stats/prefixes")
+def get_cache_prefix_stats(
+    sample_size: int = 1000,
+    redis_client: RedisClient = Depends(get_redis_client)
+):
+    """접두사별 키 수/메모리 사용량 추정 (무작위 표본 기반)"""
+    if not redis_client or not redis_client.ping():
+        return {
+            "status": "error",
+            "message": "Redis가 사용할 수 없습니다."
+        }
+    
+    try:
         return {
             "status": "success",
-            "message": f"{len(keys)}개의 캐시가 삭제되었습니다."
+            "data": redis_client.sample_key_stats(max(1, min(sample_size, 10000)))
         }
-    else:
+    except Exception as e:
+        # Global Exception Handler가 처리하도록 예외를 다시 발생
+        from ai_backend.types.response.exceptions import HandledException
+        from ai_backend.types.response.response_code import ResponseCode
+        raise HandledException(ResponseCode.CACHE_QUERY_ERROR, e=e)
+
+
+@router.get("/cache/local/stats")
+def get_local_cache_stats(
+    redis_client: RedisClient = Depends(get_redis_client)
+):
+    """프로세스 내 L1 캐시 통계 조회 (히트/미스/제거 카운터)"""
+    if not redis_client:
         return {
-            "status": "info",
-            "message": "삭제할 캐시가 없습니다."
+            "status": "success",
+            "data": {"enabled": False, "message": "Redis not available"}
         }
+    
+    return {
+        "status": "success",
+        "data": redis_client.get_local_cache_stats()
+    }
+
+
+@router.post("/cache/local/clear")
+def clear_local_cache(
+    redis_client: RedisClient = Depends(get_redis_client)
+):
+    """모든 파드의 L1 캐시 비우기 (Redis 데이터는 유지)"""
+    if not redis_client:
+        return {
+            "status": "warning",
+            "message": "Redis가 사용할 수 없습니다."
+        }
+    
+    redis_client.invalidate_local_cache()
+    return {
+        "status": "success",
+        "message": "L1 캐시가 비워졌습니다."
+    }
 
 
 @router.get("/cache/test")
@@ -139,9 +222,12 @@ def get_cache_config(
 @router.get("/cache/keys")
 def get_cache_keys(
     pattern: str = "*",
+    cursor: int = 0,
+    count: int = 100,
+    limit: int = 100,
     redis_client: RedisClient = Depends(get_redis_client)
 ):
-    """캐시 키 목록 조회"""
+    """캐시 키 목록 조회 (SCAN 커서 페이지 - next_cursor가 0이면 마지막 페이지)"""
     if not redis_client or not redis_client.ping():
         return {
             "status": "error",
@@ -149,18 +235,22 @@ def get_cache_keys(
         }
 
     try:
-        # 패턴에 맞는 키들 조회
-        keys = redis_client.redis_client.keys(pattern)
+        # 패턴에 맞는 키들을 커서 단위로 조회
+        next_cursor, keys = redis_client.scan_keys(
+            pattern, cursor, max(1, min(count, 10000)), max(1, min(limit, 1000))
+        )
+
+        # 키별 TTL/타입 정보를 파이프라인으로 한 번에 수집
+        with redis_client.pipeline() as pipe:
+            for key in keys:
+                pipe.ttl(key)
+                pipe.type(key)
+            results = pipe.execute()
 
-        # 키별 정보 수집
         key_info = []
-        for key in keys:
-            # 키를 문자열로 변환 (bytes인 경우만 decode)
+        for key, ttl, key_type_raw in zip(keys, results[0::2], results[1::2]):
+            # 키/타입을 문자열로 변환 (bytes인 경우만 decode)
             key_str = key.decode('utf-8') if isinstance(key, bytes) else str(key)
-            ttl = redis_client.redis_client.ttl(key)
-
-            # 타입 정보를 문자열로 변환
-            key_type_raw = redis_client.redis_client.type(key)
             key_type = key_type_raw.decode('utf-8') if isinstance(key_type_raw, bytes) else str(key_type_raw)
 
             key_info.append({
@@ -173,6 +263,8 @@ def get_cache_keys(
             "status": "success",
             "data": {
                 "pattern": pattern,
+                "cursor": cursor,
+                "next_cursor": next_cursor,
                 "total_keys": len(keys),
                 "keys": key_info
             }
@@ -208,8 +300,10 @@ def get_cache_data(
         key_type_raw = redis_client.redis_client.type(key)
         key_type = key_type_raw.decode('utf-8') if isinstance(key_type_raw, bytes) else str(key_type_raw)
         
-        # 타입별 데이터 조회
-        if key_type == "string":
+        # 타입별 데이터 조회 (코덱으로 저장된 값 키는 디코딩하여 반환)
+        if redis_client.is_payload_key(key):
+            data = redis_client.read_payload(key)
+        elif key_type == "string":
             data = redis_client.redis_client.get(key)
             if isinstance(data, bytes):
                 data = data.decode('utf-8')
@@ -261,19 +355,25 @@ def get_chat_cache(
     try:
         # 채팅방 관련 키들 조회
         chat_keys = [
-            f"chat_messages:{chat_id}",
+            redis_client.payload_key(redis_client.chat_history_key(chat_id)),
             f"generation:{chat_id}",
             f"cancel:{chat_id}"
         ]
         
+        # 키별 타입/TTL을 파이프라인으로 한 번에 조회 (없는 키는 type이 "none")
+        with redis_client.pipeline() as pipe:
+            for key in chat_keys:
+                pipe.type(key)
+                pipe.ttl(key)
+            results = pipe.execute()
+        
         chat_data = {}
-        for key in chat_keys:
-            if redis_client.redis_client.exists(key):
-                key_type_raw = redis_client.redis_client.type(key)
-                key_type = key_type_raw.decode('utf-8') if isinstance(key_type_raw, bytes) else str(key_type_raw)
-                ttl = redis_client.redis_client.ttl(key)
-                
-                if key_type == "string":
+        for key, key_type_raw, ttl in zip(chat_keys, results[0::2], results[1::2]):
+            key_type = key_type_raw.decode('utf-8') if isinstance(key_type_raw, bytes) else str(key_type_raw)
+            if key_type != "none":
+                if redis_client.is_payload_key(key):
+                    data = redis_client.read_payload(key)
+                elif key_type == "string":
                     data = redis_client.redis_client.get(key)
                     if isinstance(data, bytes):
                         data = data.decode('utf-8')
@@ -323,6 +423,9 @@ def delete_cache_data(
         
         # 키 삭제
         deleted = redis_client.redis_client.delete(key)
+        # L1은 코덱/버전 접두사가 없는 키로 저장되므로 값 키는 접두사를 떼고 무효화
+        if redis_client.is_payload_key(key):
+            redis_client.invalidate_local_cache(key[len(redis_client.codec.key_prefix):])
         
         if deleted:
             return {
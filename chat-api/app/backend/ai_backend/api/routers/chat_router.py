@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from ai_backend.types.response.chat_response import AIResponse, ConversationHistoryResponse, ConversationClearedResponse, ErrorResponse, CreateChatResponse, ChatListResponse
 from ai_backend.types.response.exceptions import HandledException
 import logging
-import json
+from ai_backend.cache.codec import encode_sse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["llm-chat"])
@@ -18,7 +18,7 @@ class GenerateTitleRequest(BaseModel):
     message: str
 
 @router.post("/chat/{chat_id}/message", response_model=AIResponse)
-def send_message(
+async def send_message(
     chat_id: str,
     request: UserMessageRequest,
     llm_chat_service: LLMChatService = Depends(get_llm_chat_service)
@@ -28,7 +28,7 @@ def send_message(
     
     # Service Layer에서 전파된 HandledException을 그대로 전파
     # Global Exception Handler가 자동으로 처리
-    ai_response = llm_chat_service.send_message_simple(
+    ai_response = await llm_chat_service.send_message_simple(
         chat_id, 
         request.message, 
         request.user_id
@@ -52,16 +52,22 @@ async def send_message_stream(
     async def generate_stream():
         try:
             # 사용자 메시지 저장
-            user_message_id = llm_chat_service.save_user_message(
+            user_message_id = await llm_chat_service.save_user_message_async(
                 chat_id, request.message, request.user_id
             )
 
             # 사용자 메시지 스트림 전송
-            yield f"data: {json.dumps({'type': 'user_message', 'message_id': user_message_id, 'content': request.message, 'user_id': request.user_id, 'timestamp': llm_chat_service.get_current_timestamp()}, ensure_ascii=False)}\n\n"
+            yield encode_sse({
+                'type': 'user_message',
+                'message_id': user_message_id,
+                'content': request.message,
+                'user_id': request.user_id,
+                'timestamp': llm_chat_service.get_current_timestamp()
+            })
 
             # AI 응답 생성 (스트리밍)
             async for chunk in llm_chat_service.generate_ai_response_stream(chat_id, request.user_id):
-                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                yield encode_sse(chunk)
 
         except HandledException as e:
             # HandledException은 스트림으로 전달 (연결 유지)
@@ -74,7 +80,7 @@ async def send_message_stream(
                 timestamp=llm_chat_service.get_current_timestamp(),
                 chat_id=chat_id
             )
-            yield f"data: {json.dumps(error_response.dict(), ensure_ascii=False)}\n\n"
+            yield encode_sse(error_response.dict())
         except Exception as e:
             # 예상치 못한 예외도 스트림으로 전달 (연결 유지)
             logger.error(f"Unexpected error in streaming: {str(e)}")
@@ -86,7 +92,7 @@ async def send_message_stream(
                 timestamp=llm_chat_service.get_current_timestamp(),
                 chat_id=chat_id
             )
-            yield f"data: {json.dumps(error_response.dict(), ensure_ascii=False)}\n\n"
+            yield encode_sse(error_response.dict())
 
     return StreamingResponse(
         generate_stream(),
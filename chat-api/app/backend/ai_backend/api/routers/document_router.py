@@ -1,15 +1,16 @@
 # _*_ coding: utf-8 _*_
 """Document Management API endpoints."""
-import io
 import logging
+import mimetypes
 import os
+from functools import partial
 from pathlib import Path
 from typing import List, Optional
 
 from ai_backend.api.services.document_service import DocumentService
 from ai_backend.core.dependencies import get_document_service
-from fastapi import APIRouter, Depends, File, Form, Query, UploadFile
-from fastapi.responses import StreamingResponse
+from ai_backend.utils.file_response import file_download_response, stream_download_response
+from fastapi import APIRouter, Depends, File, Form, Header, Query, Request, Response, UploadFile
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["document-management"])
@@ -211,27 +212,19 @@ def get_document(
 @router.get("/documents/{document_id}/download")
 def download_document(
     document_id: str,
+    request: Request,
     user_id: str = Query(default="user"),
     document_service: DocumentService = Depends(get_document_service)
 ):
-    """문서 다운로드"""
+    """문서 다운로드 (Range 요청 시 206 부분 응답, If-None-Match가 ETag와 같으면 304)"""
     # Service Layer에서 전파된 HandledException을 그대로 전파
     # Global Exception Handler가 자동으로 처리
-    file_content, filename, media_type = document_service.download_document(
+    file_path, filename, media_type, content_hash = document_service.get_document_file(
         document_id, user_id
     )
     
-    # 한글 파일명 처리를 위한 URL 인코딩
-    import urllib.parse
-    encoded_filename = urllib.parse.quote(filename.encode('utf-8'))
-    
-    return StreamingResponse(
-        io.BytesIO(file_content),
-        media_type=media_type,
-        headers={
-            "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
-        }
-    )
+    # 파일 내용을 읽지 않고 파일 기반 응답으로 전송 (요청한 구간만 읽음)
+    return file_download_response(request, file_path, filename, media_type, content_hash)
 
 
 @router.get("/search")
@@ -395,6 +388,175 @@ def get_upload_status(
     }
 
 
+# ========================================
+# 해시로 기존 문서 확인 / 재개 가능 업로드 (tus 방식)
+# ========================================
+# 1. HEAD /documents/by-hash/{hash} 로 읽을 수 있는(본인/공개) 문서가 있는지 확인 (있으면 업로드 생략)
+# 2. POST /uploads 로 세션 생성 (content_hash를 주면 같은 내용의 문서가 있을 때 본인 소유 문서를 바로 반환)
+# 3. PATCH /uploads/{id} 로 청크 전송 (Upload-Offset 헤더 = 현재 오프셋, 응답의 Upload-Offset이 다음 오프셋)
+#    끊기면 HEAD /uploads/{id} 의 Upload-Offset부터 다시 전송
+# 4. POST /uploads/{id}/complete 로 문서 생성
+
+@router.head("/documents/by-hash/{file_hash}")
+def head_document_by_hash(
+    file_hash: str,
+    user_id: str = Query(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """해시(SHA-256 또는 MD5)로 읽을 수 있는 완료 문서 존재 확인 - 200 + X-Document-Id, 없으면 404"""
+    document = document_service.find_document_by_hash(file_hash, user_id)
+    if not document:
+        return Response(status_code=404)
+    return Response(
+        status_code=200,
+        headers={"X-Document-Id": document["document_id"], "Cache-Control": "no-store"}
+    )
+
+
+@router.get("/documents/by-hash/{file_hash}")
+def get_document_by_hash(
+    file_hash: str,
+    user_id: str = Query(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """해시(SHA-256 또는 MD5)로 읽을 수 있는(본인/공개) 완료 문서 조회"""
+    document = document_service.find_document_by_hash(file_hash, user_id)
+    return {
+        "status": "success",
+        "data": {
+            "exists": document is not None,
+            "document": document
+        }
+    }
+
+
+@router.post("/uploads")
+def create_upload_session(
+    response: Response,
+    filename: str = Form(...),
+    upload_length: int = Form(..., description="전체 파일 크기 (바이트)"),
+    user_id: str = Form(default="user"),
+    is_public: bool = Form(default=False),
+    permissions: Optional[str] = Form(default=None),  # JSON 문자열로 권한 리스트 전달
+    document_type: str = Form(default="common"),
+    metadata: Optional[str] = Form(default=None),  # JSON 문자열로 metadata 전달
+    content_hash: Optional[str] = Form(default=None, description="파일 SHA-256 (같은 내용의 문서가 있으면 업로드 생략)"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """재개 가능 업로드 세션 생성
+    
+    Returns:
+        upload_id (중복이면 None), is_duplicate, upload(세션 정보) 또는 document(기존 문서)
+    """
+    import json
+    try:
+        parsed_permissions = json.loads(permissions) if permissions else None
+        parsed_metadata = json.loads(metadata) if metadata else None
+    except (json.JSONDecodeError, TypeError):
+        return {
+            "status": "error",
+            "message": "permissions/metadata 파라미터가 올바른 JSON 형식이 아닙니다."
+        }
+    
+    result = document_service.create_upload_session(
+        filename=filename,
+        upload_length=upload_length,
+        user_id=user_id,
+        is_public=is_public,
+        permissions=parsed_permissions,
+        document_type=document_type,
+        metadata=parsed_metadata,
+        content_hash=content_hash
+    )
+    if result["upload_id"]:
+        response.headers["Upload-Offset"] = "0"
+        response.headers["Upload-Length"] = str(upload_length)
+    return {
+        "status": "success",
+        "message": "이미 업로드된 문서입니다." if result["is_duplicate"] else "업로드 세션이 생성되었습니다.",
+        "data": result
+    }
+
+
+@router.head("/uploads/{upload_id}")
+def head_upload_session(
+    upload_id: str,
+    user_id: str = Query(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """업로드 오프셋 조회 (Upload-Offset / Upload-Length 헤더)"""
+    upload = document_service.get_upload_session(upload_id, user_id)
+    return Response(
+        status_code=200,
+        headers={
+            "Upload-Offset": str(upload["upload_offset"]),
+            "Upload-Length": str(upload["upload_length"]),
+            "Cache-Control": "no-store"
+        }
+    )
+
+
+@router.get("/uploads/{upload_id}")
+def get_upload_session(
+    upload_id: str,
+    user_id: str = Query(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """업로드 세션 상태 조회"""
+    return {
+        "status": "success",
+        "data": document_service.get_upload_session(upload_id, user_id)
+    }
+
+
+@router.patch("/uploads/{upload_id}")
+def patch_upload_chunk(
+    upload_id: str,
+    response: Response,
+    chunk: UploadFile = File(..., description="현재 오프셋부터 이어지는 바이트"),
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    user_id: str = Form(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """청크 전송 - Upload-Offset이 서버 오프셋과 다르면 409"""
+    upload = document_service.append_upload_chunk(upload_id, user_id, upload_offset, chunk.file)
+    response.headers["Upload-Offset"] = str(upload["upload_offset"])
+    response.headers["Upload-Length"] = str(upload["upload_length"])
+    return {
+        "status": "success",
+        "data": upload
+    }
+
+
+@router.post("/uploads/{upload_id}/complete")
+def complete_upload(
+    upload_id: str,
+    user_id: str = Form(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """업로드 완료 - 문서 생성 (완료된 세션에 다시 요청하면 같은 문서 반환)"""
+    result = document_service.complete_upload(upload_id, user_id)
+    return {
+        "status": "success",
+        "message": "문서가 업로드되었습니다.",
+        "data": result
+    }
+
+
+@router.delete("/uploads/{upload_id}")
+def abort_upload(
+    upload_id: str,
+    user_id: str = Query(default="user"),
+    document_service: DocumentService = Depends(get_document_service)
+):
+    """업로드 취소 - 세션과 임시 파일 삭제"""
+    document_service.abort_upload(upload_id, user_id)
+    return {
+        "status": "success",
+        "message": "업로드가 취소되었습니다."
+    }
+
+
 @router.get("/documents/{document_id}/permissions")
 def get_document_permissions(
     document_id: str,
@@ -779,28 +941,43 @@ async def get_zip_contents(
 
 
 @router.get("/zip/{document_id}/extract/{file_path:path}")
-async def extract_file_from_zip(
+def extract_file_from_zip(
     document_id: str,
     file_path: str,
+    request: Request,
     user_id: str = Query("user"),
     document_service: DocumentService = Depends(get_document_service)
 ):
-    """zip 내부 특정 파일 추출 및 다운로드"""
-    try:
-        file_content, filename = document_service.get_zip_file_content(
-            document_id=document_id,
-            user_id=user_id,
-            file_path=file_path
-        )
-        
-        return StreamingResponse(
-            io.BytesIO(file_content),
-            media_type="application/octet-stream",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+    """zip 내부 특정 파일 추출 및 다운로드 (청크 단위 스트리밍, 무압축 멤버는 Range 지원)"""
+    # Service Layer에서 전파된 HandledException을 그대로 전파
+    # Global Exception Handler가 자동으로 처리
+    member_info = document_service.get_zip_member(
+        document_id=document_id,
+        user_id=user_id,
+        file_path=file_path
+    )
+    filename = member_info['filename']
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    
+    # 압축 해제 모드: 해제된 파일을 그대로 전송 (Range/ETag는 FileResponse 처리)
+    if member_info['extracted_file_path']:
+        return file_download_response(
+            request, member_info['extracted_file_path'], filename, media_type, member_info['member_hash']
         )
-    except Exception as e:
-        logger.error(f"zip 파일 추출 실패: {str(e)}")
-        return {
-            "status": "error",
-            "message": f"추출 실패: {str(e)}"
-        }
+    
+    # 압축 모드: 멤버를 메모리에 올리지 않고 청크 단위로 전송
+    archive, member = member_info['archive'], member_info['member']
+    iter_range = None
+    if archive.is_range_capable(member):
+        # 무압축 멤버는 아카이브 안의 연속 구간이므로 요청 구간만 읽음
+        iter_range = partial(archive.iter_stored_range, member)
+    
+    return stream_download_response(
+        request,
+        member.file_size,
+        partial(archive.iter_member, member),
+        filename,
+        media_type,
+        member_info['member_hash'],
+        iter_range=iter_range,
+    )
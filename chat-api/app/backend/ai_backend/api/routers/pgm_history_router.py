@@ -2,12 +2,14 @@
 """PGM Mapping History REST API endpoints."""
 
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 from ai_backend.api.services.pgm_history_service import PgmHistoryService
 from ai_backend.core.dependencies import get_pgm_history_service
 from ai_backend.database.models.pgm_mapping_models import PgmMappingAction
 from ai_backend.types.response.pgm_history_response import (
+    MappingActivityResponse,
     MappingHistoryItemResponse,
     MappingHistoryResponse,
     MappingHistoryStatsResponse,
@@ -83,9 +85,11 @@ def get_recent_mapping_history(
     skip: int = Query(0, ge=0, description="건너뛸 개수"),
     limit: int = Query(100, ge=1, le=200, description="조회할 개수"),
     action: Optional[str] = Query(None, description="액션 필터 (CREATE, UPDATE, DELETE, RESTORE)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
+    count_mode: str = Query("exact", pattern="^(exact|none)$", description="전체 개수 계산 방식 (exact/none)"),
     history_service: PgmHistoryService = Depends(get_pgm_history_service)
 ):
-    """최근 매핑 변경 이력을 조회"""
+    """최근 매핑 변경 이력을 조회 (next_cursor로 깊은 페이지도 일정한 비용)"""
     action_enum = None
     if action:
         try:
@@ -93,16 +97,52 @@ def get_recent_mapping_history(
         except ValueError:
             pass
     
-    histories, total = history_service.get_recent_histories(
+    histories, total, next_cursor = history_service.get_recent_histories(
         skip=skip,
         limit=limit,
-        action=action_enum
+        action=action_enum,
+        cursor=cursor,
+        count_mode=count_mode
     )
     
     return MappingHistoryResponse(
         total=total,
-        items=[MappingHistoryItemResponse.from_orm(h) for h in histories]
+        items=[MappingHistoryItemResponse.from_orm(h) for h in histories],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/pgm-history/analytics/activity", response_model=MappingActivityResponse)
+def get_mapping_activity(
+    bucket: str = Query("day", pattern="^(hour|day)$", description="구간 단위 (hour, day)"),
+    start: Optional[datetime] = Query(None, description="조회 시작 (기본: hour 2일 전, day 30일 전)"),
+    end: Optional[datetime] = Query(None, description="조회 끝, 미포함 (기본: 현재)"),
+    group_by: Optional[str] = Query(None, pattern="^(plant|process|line|program)$", description="그룹 기준"),
+    action: Optional[List[PgmMappingAction]] = Query(None, description="액션 필터 (여러 개 지정 가능)"),
+    plant: Optional[str] = Query(None, description="Plant 필터"),
+    process: Optional[str] = Query(None, description="공정 필터"),
+    line: Optional[str] = Query(None, description="Line 필터"),
+    pgm_id: Optional[str] = Query(None, description="프로그램 ID 필터"),
+    history_service: PgmHistoryService = Depends(get_pgm_history_service)
+):
+    """
+    매핑/해제 활동을 시간(hour) 또는 일(day) 구간별로 집계
+    
+    - 이력 원본 대신 시간별 집계 테이블(PGM_MAPPING_ROLLUP)을 읽어 수년치도 빠르게 응답
+    - group_by로 Plant/공정/Line/프로그램별 시계열 (해제 이력은 해제된 프로그램 기준)
+    """
+    result = history_service.get_mapping_activity(
+        bucket=bucket,
+        start=start,
+        end=end,
+        group_by=group_by,
+        actions=action,
+        plant=plant,
+        process=process,
+        line=line,
+        pgm_id=pgm_id
     )
+    return MappingActivityResponse(**result)
 
 
 @router.get("/pgm-history/plc/{plc_id}/stats", response_model=MappingHistoryStatsResponse)
@@ -1,6 +1,6 @@
 # _*_ coding: utf-8 _*_
 """PLC REST API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
 from ai_backend.core.dependencies import get_plc_service
 from ai_backend.api.services.plc_service import PlcService
 from ai_backend.types.request.plc_request import (
@@ -10,23 +10,31 @@ from ai_backend.types.request.plc_request import (
     PlcSearchRequest,
     PlcHierarchyRequest,
     MapProgramRequest,
-    UnmapProgramRequest
+    UnmapProgramRequest,
+    BatchMapProgramRequest,
+    BatchUnmapProgramRequest
 )
 from ai_backend.types.response.plc_response import (
     PlcResponse,
     PlcCreateResponse,
+    PlcImportResponse,
     PlcUpdateResponse,
     PlcDeleteResponse,
     PlcRestoreResponse,
     PlcListResponse,
     PlcSearchResponse,
+    PlcRankedSearchResponse,
     PlcCountResponse,
+    PlcCounterRefreshResponse,
     PlcExistsResponse,
     PlcHierarchyResponse,
     PlcWithMappingResponse,
     MapProgramResponse,
     UnmapProgramResponse,
-    UnmappedPlcsResponse
+    BatchMappingResponse,
+    UnmappedPlcsResponse,
+    PlcTreeChildrenResponse,
+    PlcTreeChangesResponse
 )
 from typing import Optional
 import logging
@@ -55,6 +63,35 @@ def create_plc(
     return PlcCreateResponse.from_orm(plc)
 
 
+@router.post("/plcs/import", response_model=PlcImportResponse)
+def import_plcs(
+    file: UploadFile = File(..., description="계층 JSON(plc01.json 형식), CSV/파이프 구분 텍스트(_PLC_MASTER__*.txt), Excel(.xlsx)"),
+    format: Optional[str] = Query(None, pattern="^(json|csv|xlsx)$", description="파일 형식 (생략 시 확장자/내용으로 판별)"),
+    user: Optional[str] = Query(None, description="등록/수정 사용자"),
+    batch_size: int = Query(2000, ge=100, le=10000, description="청크(트랜잭션) 크기"),
+    dry_run: bool = Query(False, description="검증만 수행 (DB 변경 없음)"),
+    encoding: str = Query("utf-8-sig", description="CSV 인코딩 (Excel에서 저장한 CSV는 cp949)"),
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """
+    PLC 일괄 등록/수정 (PLC ID 기준 upsert)
+
+    - 청크 단위로 커밋하며 잘못된 행은 건너뛰고 **errors**에 행 번호와 사유를 담는다
+    - 계층/명칭/활성 상태만 반영하고 프로그램 매핑은 변경하지 않는다
+    - 트리 캐시 버전은 마지막에 한 번만 올린다
+    """
+    result = plc_service.import_plcs(
+        file.file,
+        filename=file.filename,
+        file_format=format,
+        user=user,
+        batch_size=batch_size,
+        dry_run=dry_run,
+        encoding=encoding
+    )
+    return PlcImportResponse(**result)
+
+
 # ========== 조회 엔드포인트 (고정 경로를 Path Parameter보다 먼저 정의) ==========
 
 
@@ -64,33 +101,80 @@ def search_plcs(
     skip: int = Query(0, ge=0, description="건너뛸 개수"),
     limit: int = Query(100, ge=1, le=1000, description="조회할 개수"),
     is_active: Optional[bool] = Query(True, description="활성 상태 필터"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
     plc_service: PlcService = Depends(get_plc_service)
 ):
-    """PLC를 검색 (PLC_ID, PLC_NAME)"""
-    plcs = plc_service.search_plcs(
+    """PLC를 검색 (PLC_ID, PLC_NAME, PLC ID 순)"""
+    plcs, next_cursor = plc_service.search_plcs(
         keyword=keyword,
         skip=skip,
         limit=limit,
-        is_active=is_active
+        is_active=is_active,
+        cursor=cursor
     )
     
     return PlcSearchResponse(
         total=len(plcs),
-        items=[PlcResponse.from_orm(plc) for plc in plcs]
+        items=[PlcResponse.from_orm(plc) for plc in plcs],
+        next_cursor=next_cursor
     )
 
 
+@router.get("/plcs/search/ranked", response_model=PlcRankedSearchResponse)
+def search_plcs_ranked(
+    keyword: str = Query(..., min_length=1, max_length=100, description="검색 키워드 (PLC_ID, PLC_NAME)"),
+    limit: int = Query(20, ge=1, le=200, description="조회할 개수"),
+    is_active: Optional[bool] = Query(True, description="활성 상태 필터"),
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """
+    PLC 키워드 랭킹 검색 (입력 중 자동완성용)
+    
+    - 완전 일치 → 접두 일치 → 부분 일치 순, 같은 단계는 PLC ID 순
+    - **highlights**: 필드별 일치 위치 [시작, 끝) (대소문자 무시)
+    - pg_trgm 인덱스가 있으면 DB, 없거나 키워드가 3자 미만이면 메모리 검색 인덱스 사용
+    """
+    result = plc_service.search_plcs_ranked(keyword=keyword, limit=limit, is_active=is_active)
+    return PlcRankedSearchResponse(**result)
+
+
 @router.get("/plcs/count/summary", response_model=PlcCountResponse)
 def get_plc_count(
+    plant: Optional[str] = Query(None, description="Plant"),
+    process: Optional[str] = Query(None, description="공정 (plant 필요)"),
+    line: Optional[str] = Query(None, description="Line (process 필요)"),
+    equipment_group: Optional[str] = Query(None, description="장비그룹 (line 필요)"),
+    unit: Optional[str] = Query(None, description="호기 (equipment_group 필요)"),
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """
+    PLC 개수를 조회 (활성/비활성/전체/매핑/미매핑)
+    
+    - 계층 값을 상위부터 지정하면 해당 노드의 개수 (없으면 전체)
+    - COUNT(*) 대신 PLC_MASTER 트리거로 유지되는 카운터 1행을 읽는다
+    """
+    counts = plc_service.get_plc_count(
+        plant=plant,
+        process=process,
+        line=line,
+        equipment_group=equipment_group,
+        unit=unit
+    )
+    
+    return PlcCountResponse(**counts)
+
+
+@router.post("/plcs/count/refresh", response_model=PlcCounterRefreshResponse)
+def refresh_plc_counters(
     plc_service: PlcService = Depends(get_plc_service)
 ):
-    """PLC 개수를 조회 (활성/비활성/전체)"""
-    counts = plc_service.get_plc_count()
+    """PLC 카운터를 PLC_MASTER 기준으로 다시 집계합니다 (DB를 직접 수정한 경우 등 운영용)."""
+    node_count, program_count = plc_service.refresh_plc_counters()
     
-    return PlcCountResponse(
-        active_count=counts['active_count'],
-        inactive_count=counts['inactive_count'],
-        total_count=counts['total_count']
+    return PlcCounterRefreshResponse(
+        node_count=node_count,
+        program_count=program_count,
+        message="PLC 카운터가 재집계되었습니다."
     )
 
 
@@ -128,22 +212,28 @@ def get_hierarchy_values(
 def get_unmapped_plcs(
     skip: int = Query(0, ge=0, description="건너뜰 개수"),
     limit: int = Query(100, ge=1, le=1000, description="조회할 개수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
+    count_mode: str = Query("exact", pattern="^(exact|estimated|none)$", description="전체 개수 계산 방식 (exact/estimated/none)"),
     plc_service: PlcService = Depends(get_plc_service)
 ):
-    """프로그램이 매핑되지 않은 PLC 목록을 조회"""
-    plcs, total = plc_service.get_unmapped_plcs(
+    """프로그램이 매핑되지 않은 PLC 목록을 조회 (PLC ID 순)"""
+    plcs, total, next_cursor = plc_service.get_unmapped_plcs(
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count_mode=count_mode
     )
     
     return UnmappedPlcsResponse(
         total=total,
-        items=[PlcWithMappingResponse.from_orm(plc) for plc in plcs]
+        items=[PlcWithMappingResponse.from_orm(plc) for plc in plcs],
+        next_cursor=next_cursor
     )
 
 
 @router.get("/plcs/tree", response_model=dict)
 def get_plcs_tree(
+    request: Request,
     is_active: bool = Query(True, description="활성 PLC만 조회"),
     plc_service: PlcService = Depends(get_plc_service)
 ):
@@ -151,6 +241,8 @@ def get_plcs_tree(
     PLC 계층 구조를 트리 형태로 조회
     
     - **is_active**: 활성 PLC만 조회 (기본값: True)
+    - PLC 데이터가 바뀔 때만 트리를 다시 만들고, 그 외에는 미리 직렬화된 응답을 그대로 반환
+    - **ETag / If-None-Match**: 트리 버전이 같으면 본문 없이 304 반환
     
     **반환 구조:**
     ```json
@@ -192,8 +284,70 @@ def get_plcs_tree(
     ```
     """
     logger.info(f"PLC 계층 구조 조회 요청: is_active={is_active}")
-    result = plc_service.get_plc_hierarchy(is_active=is_active)
-    return result
+    snapshot = plc_service.get_plc_hierarchy_snapshot(is_active=is_active)
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+        "X-PLC-Tree-Version": str(snapshot.version)
+    }
+    if snapshot.change_version is not None:
+        headers["X-PLC-Tree-Change-Version"] = str(snapshot.change_version)
+    
+    # 프록시/압축 미들웨어가 붙인 약한 검증자(W/) 접두사는 무시하고 비교
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",") if tag.strip()}
+    if snapshot.etag in client_tags or "*" in client_tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.get("/plcs/tree/children", response_model=PlcTreeChildrenResponse)
+def get_plcs_tree_children(
+    plant: Optional[str] = Query(None, description="Plant"),
+    process: Optional[str] = Query(None, description="공정"),
+    line: Optional[str] = Query(None, description="Line"),
+    equipment_group: Optional[str] = Query(None, description="장비그룹"),
+    unit: Optional[str] = Query(None, description="호기"),
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """
+    PLC 계층을 한 단계씩 펼쳐 조회 (활성 PLC 기준)
+    
+    - 파라미터 없음 → Plant 목록, plant → 공정 목록, ... , equipment_group까지 → 호기 목록
+    - unit까지 지정하면 해당 호기의 PLC 목록(plcs)을 반환
+    - 각 노드에 활성 PLC 수, 매핑/미매핑 PLC 수, 하위 노드 수 포함
+    - 경로는 상위부터 연속으로 지정 (중간 계층 생략 불가)
+    """
+    result = plc_service.get_plc_tree_children(
+        plant=plant,
+        process=process,
+        line=line,
+        equipment_group=equipment_group,
+        unit=unit
+    )
+    return PlcTreeChildrenResponse(**result)
+
+
+@router.get("/plcs/tree/changes", response_model=PlcTreeChangesResponse)
+def get_plcs_tree_changes(
+    since: int = Query(..., ge=0, description="마지막으로 받은 변경 버전 (X-PLC-Tree-Change-Version 또는 이전 응답의 version)"),
+    is_active: bool = Query(True, description="클라이언트 트리의 활성 PLC 조회 조건"),
+    limit: int = Query(1000, ge=1, le=10000, description="최대 PLC 수"),
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """
+    since 버전 이후 추가/수정/삭제된 PLC만 조회 (트리 증분 동기화)
+    
+    - /plcs/tree 응답의 **X-PLC-Tree-Change-Version** 헤더 값을 since로 사용
+    - **upserts**: plcId 기준으로 기존 위치에서 제거한 뒤 계층 경로에 삽입 (계층 이동 포함)
+    - **removes**: 트리에서 제거할 PLC ID (삭제되었거나 is_active 조건에서 벗어남)
+    - **has_more**가 true이면 응답의 version으로 바로 다시 조회
+    - **full_reload**가 true이면 /plcs/tree 전체를 다시 조회
+    - 같은 변경이 두 번 올 수 있으므로 적용은 멱등이어야 함
+    """
+    result = plc_service.get_plc_tree_changes(since=since, is_active=is_active, limit=limit)
+    return PlcTreeChangesResponse(**result)
 
 
 @router.get("/plcs", response_model=PlcListResponse)
@@ -206,10 +360,17 @@ def get_plcs(
     line: Optional[str] = Query(None, description="Line 필터"),
     equipment_group: Optional[str] = Query(None, description="장비그룹 필터"),
     unit: Optional[str] = Query(None, description="호기 필터"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
+    count_mode: str = Query("exact", pattern="^(exact|estimated|none)$", description="전체 개수 계산 방식 (exact/estimated/none)"),
     plc_service: PlcService = Depends(get_plc_service)
 ):
-    """PLC 목록을 조회"""
-    plcs, total = plc_service.get_plcs(
+    """
+    PLC 목록을 조회 (Plant → 공정 → Line → 장비그룹 → 호기 → PLC ID 순)
+    
+    - 깊은 페이지는 skip 대신 **cursor**(이전 응답의 next_cursor)를 사용 (인덱스 범위 스캔, 페이지 깊이와 무관한 비용)
+    - **count_mode**: exact(COUNT), estimated(실행 계획 예상 행 수), none(개수 생략)
+    """
+    plcs, total, next_cursor = plc_service.get_plcs(
         skip=skip,
         limit=limit,
         is_active=is_active,
@@ -217,12 +378,15 @@ def get_plcs(
         process=process,
         line=line,
         equipment_group=equipment_group,
-        unit=unit
+        unit=unit,
+        cursor=cursor,
+        count_mode=count_mode
     )
     
     return PlcListResponse(
         total=total,
-        items=[PlcResponse.from_orm(plc) for plc in plcs]
+        items=[PlcResponse.from_orm(plc) for plc in plcs],
+        next_cursor=next_cursor
     )
 
 
@@ -306,6 +470,47 @@ def check_plc_exists(
 
 # ========== PLC-PGM 매핑 엔드포인트 ==========
 
+@router.post("/plcs/mapping/batch", response_model=BatchMappingResponse)
+def batch_map_program(
+    request: BatchMapProgramRequest,
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """
+    여러 PLC에 프로그램을 일괄 매핑합니다 (한 트랜잭션).
+
+    - plc_ids 또는 selector(계층 노드 하위의 활성 PLC 전체) 중 하나로 대상 지정
+    - overwrite=false이면 다른 프로그램에 매핑된 PLC는 건너뜀
+    - dry_run=true이면 변경 없이 PLC별 예상 결과만 반환
+    """
+    result = plc_service.batch_update_mapping(
+        pgm_id=request.pgm_id,
+        user=request.user,
+        notes=request.notes,
+        plc_ids=request.plc_ids,
+        selector=request.selector.model_dump() if request.selector else None,
+        overwrite=request.overwrite,
+        dry_run=request.dry_run
+    )
+    return BatchMappingResponse(**result)
+
+
+@router.post("/plcs/mapping/batch/unmap", response_model=BatchMappingResponse)
+def batch_unmap_program(
+    request: BatchUnmapProgramRequest,
+    plc_service: PlcService = Depends(get_plc_service)
+):
+    """여러 PLC의 프로그램 매핑을 일괄 해제합니다 (한 트랜잭션)."""
+    result = plc_service.batch_update_mapping(
+        pgm_id=None,
+        user=request.user,
+        notes=request.notes,
+        plc_ids=request.plc_ids,
+        selector=request.selector.model_dump() if request.selector else None,
+        dry_run=request.dry_run
+    )
+    return BatchMappingResponse(**result)
+
+
 @router.post("/plcs/{plc_id}/mapping", response_model=MapProgramResponse)
 def map_program_to_plc(
     plc_id: str,
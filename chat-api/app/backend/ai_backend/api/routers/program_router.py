@@ -120,21 +120,26 @@ def get_plcs_by_program(
     pgm_id: str,
     skip: int = Query(0, ge=0, description="건너뛸 개수"),
     limit: int = Query(100, ge=1, le=100, description="조회할 개수"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
+    count_mode: str = Query("exact", pattern="^(exact|estimated|none)$", description="전체 개수 계산 방식 (exact/estimated/none)"),
     plc_service: PlcService = Depends(get_plc_service)
 ):
     """
     특정 프로그램에 매핑된 PLC 목록을 조회
     
-    해당 프로그램을 사용하는 모든 PLC를 조회
+    해당 프로그램을 사용하는 모든 PLC를 조회 (PLC ID 순)
     """
-    plcs, total_count = plc_service.get_plcs_by_program(
+    plcs, total_count, next_cursor = plc_service.get_plcs_by_program(
         pgm_id=pgm_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count_mode=count_mode
     )
     
     return PlcsByProgramResponse(
         pgm_id=pgm_id,
-        total_count=total_count,
-        items=[PlcWithMappingResponse.from_orm(plc) for plc in plcs]
+        total=total_count,
+        items=[PlcWithMappingResponse.from_orm(plc) for plc in plcs],
+        next_cursor=next_cursor
     )
@@ -1,18 +1,29 @@
 # _*_ coding: utf-8 _*_
 """Document Service for handling file uploads and management."""
 import logging
-from typing import Dict, List
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
 
 from ai_backend.config.simple_settings import settings
+from ai_backend.database.crud.document_upload_crud import DocumentUploadCRUD
+from ai_backend.database.models.document_upload_models import DocumentUploadSession
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
+from ai_backend.utils.zip_stream import ZIP_COPY_CHUNK_SIZE, open_zip_archive
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 
 # 공통 모듈 사용
 from shared_core import Document
 from shared_core import DocumentService as BaseDocumentService
+from shared_core import FileTooLargeError
 from shared_core import ProcessingJobService
+from shared_core.services import UPLOAD_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +35,7 @@ class DocumentService(BaseDocumentService):
         # 환경변수에서 업로드 경로 가져오기 (k8s 환경 대응)
         upload_path = upload_base_path or settings.upload_base_path
         super().__init__(db, upload_path)
+        self.upload_crud = DocumentUploadCRUD(db)
 
     def upload_document(
         self,
@@ -45,17 +57,7 @@ class DocumentService(BaseDocumentService):
             original_filename = file.filename
             file_extension = self._get_file_extension(original_filename)
             
-            # 파일 크기 확인 (환경변수에서 설정값 가져오기)
-            file_content = file.file.read()
-            file_size = len(file_content)
-            max_size = settings.upload_max_size
-            
-            if file_size > max_size:
-                max_size_mb = settings.get_upload_max_size_mb()
-                raise HandledException(ResponseCode.DOCUMENT_FILE_TOO_LARGE, 
-                                     msg=f"파일 크기가 너무 큽니다. (최대 {max_size_mb:.1f}MB)")
-            
-            # 허용된 파일 타입 확인 (환경변수에서 설정값 가져오기)
+            # 허용된 파일 타입 확인 (환경변수에서 설정값 가져오기) - 내용을 읽기 전에 거절
             allowed_extensions = settings.get_upload_allowed_types()
             
             if file_extension not in allowed_extensions:
@@ -63,73 +65,34 @@ class DocumentService(BaseDocumentService):
                 raise HandledException(ResponseCode.DOCUMENT_INVALID_FILE_TYPE, 
                                      msg=f"지원하지 않는 파일 형식입니다. 허용된 형식: {allowed_types_str}")
             
-            # 공통 모듈의 create_document_from_file 사용
-            result = self.create_document_from_file(
-                file_content=file_content,
-                filename=original_filename,
-                user_id=user_id,
-                is_public=is_public,
-                permissions=permissions,
-                document_type=document_type,
-                metadata_json=metadata  # ⭐ metadata_json으로 전달 (**additional_metadata로 받음)
-            )
+            # 파일 크기 확인 (환경변수에서 설정값 가져오기)
+            # - 크기를 알 수 있으면 바로 거절, 모르면 스트리밍 중 초과 시 중단
+            max_size = settings.upload_max_size
+            too_large = HandledException(ResponseCode.DOCUMENT_FILE_TOO_LARGE, 
+                                         msg=f"파일 크기가 너무 큽니다. (최대 {settings.get_upload_max_size_mb():.1f}MB)")
+            if getattr(file, 'size', None) is not None and file.size > max_size:
+                raise too_large
+            
+            # 공통 모듈의 create_document_from_stream 사용
+            # - 업로드 스풀(file.file)을 청크 단위로 읽어 해시 계산 + 임시 파일 쓰기 후 원자적 이름 변경
+            # - 파일 전체를 메모리에 올리지 않으므로 요청당 메모리는 파일 크기와 무관
+            try:
+                result = self.create_document_from_stream(
+                    stream=file.file,
+                    filename=original_filename,
+                    user_id=user_id,
+                    is_public=is_public,
+                    permissions=permissions,
+                    document_type=document_type,
+                    max_size=max_size,
+                    metadata_json=metadata  # ⭐ metadata_json으로 전달 (**additional_metadata로 받음)
+                )
+            except FileTooLargeError:
+                raise too_large
             
             # ⭐ NEW: document_type이 "pgm_template"이면 Excel 파싱
             if document_type == "pgm_template":
-                try:
-                    from ai_backend.api.services.template_service import TemplateService
-                    template_service = TemplateService(self.db)
-                    
-                    # metadata에서 pgm_id 추출
-                    metadata = result.get('metadata_json') or {}
-                    pgm_id = metadata.get('pgm_id')
-                    
-                    if not pgm_id:
-                        logger.warning(f"pgm_template 업로드 시 metadata에 pgm_id 필요: {result['document_id']}")
-                    else:
-                        # Excel 파싱 및 PGM_TEMPLATE 테이블 저장
-                        # ⭐ file_path 대신 upload_path 사용
-                        file_path = result.get('upload_path') or result.get('file_path')
-                        if not file_path:
-                            logger.error(f"file_path를 찾을 수 없음: result keys = {list(result.keys())}")
-                            raise ValueError("file_path를 result에서 찾을 수 없습니다")
-                        
-                        parse_result = template_service.parse_and_save(
-                            document_id=result['document_id'],
-                            file_path=file_path,
-                            pgm_id=pgm_id,
-                            user_id=user_id
-                        )
-                        
-                        # 파싱 결과를 metadata_json에 추가 저장
-                        metadata['template_parse_result'] = parse_result
-                        
-                        # ⭐ update_document() 사용하여 metadata 업데이트
-                        from shared_core.crud import DocumentCRUD
-                        doc_crud = DocumentCRUD(self.db)
-                        success = doc_crud.update_document(
-                            result['document_id'],
-                            metadata_json=metadata  # ⭐ **kwargs로 전달됨
-                        )
-                        
-                        if success:
-                            logger.info(f"문서 metadata 업데이트 성공: {result['document_id']}")
-                        else:
-                            logger.warning(f"문서를 찾을 수 없음: {result['document_id']}")
-                        
-                        # 응답에 파싱 결과 포함
-                        result['metadata_json'] = metadata
-                        result['template_parse_result'] = parse_result
-                        
-                        logger.info(f"템플릿 파싱 완료: {parse_result}")
-                        
-                except HandledException:
-                    # 템플릿 파싱 실패 시 예외 전파
-                    raise
-                except Exception as e:
-                    logger.error(f"템플릿 파싱 실패: {e}")
-                    # 파싱 실패해도 문서는 저장되었으므로 경고만 로그
-                    # 원한다면 여기서 예외를 전파할 수도 있음
+                self._parse_pgm_template(result, user_id)
             
             return result
                 
@@ -138,6 +101,63 @@ class DocumentService(BaseDocumentService):
         except Exception as e:
             raise HandledException(ResponseCode.DOCUMENT_UPLOAD_ERROR, e=e)
     
+    def _parse_pgm_template(self, result: Dict, user_id: str) -> None:
+        """pgm_template 문서의 Excel 파싱 결과를 metadata_json과 result에 반영 (업로드/재개 가능 업로드 공통)"""
+        try:
+            from ai_backend.api.services.template_service import TemplateService
+            template_service = TemplateService(self.db)
+            
+            # metadata에서 pgm_id 추출
+            metadata = result.get('metadata_json') or {}
+            pgm_id = metadata.get('pgm_id')
+            
+            if not pgm_id:
+                logger.warning(f"pgm_template 업로드 시 metadata에 pgm_id 필요: {result['document_id']}")
+            else:
+                # Excel 파싱 및 PGM_TEMPLATE 테이블 저장
+                # ⭐ file_path 대신 upload_path 사용
+                file_path = result.get('upload_path') or result.get('file_path')
+                if not file_path:
+                    logger.error(f"file_path를 찾을 수 없음: result keys = {list(result.keys())}")
+                    raise ValueError("file_path를 result에서 찾을 수 없습니다")
+                
+                parse_result = template_service.parse_and_save(
+                    document_id=result['document_id'],
+                    file_path=file_path,
+                    pgm_id=pgm_id,
+                    user_id=user_id
+                )
+                
+                # 파싱 결과를 metadata_json에 추가 저장
+                metadata['template_parse_result'] = parse_result
+                
+                # ⭐ update_document() 사용하여 metadata 업데이트
+                from shared_core.crud import DocumentCRUD
+                doc_crud = DocumentCRUD(self.db)
+                success = doc_crud.update_document(
+                    result['document_id'],
+                    metadata_json=metadata  # ⭐ **kwargs로 전달됨
+                )
+                
+                if success:
+                    logger.info(f"문서 metadata 업데이트 성공: {result['document_id']}")
+                else:
+                    logger.warning(f"문서를 찾을 수 없음: {result['document_id']}")
+                
+                # 응답에 파싱 결과 포함
+                result['metadata_json'] = metadata
+                result['template_parse_result'] = parse_result
+                
+                logger.info(f"템플릿 파싱 완료: {parse_result}")
+                
+        except HandledException:
+            # 템플릿 파싱 실패 시 예외 전파
+            raise
+        except Exception as e:
+            logger.error(f"템플릿 파싱 실패: {e}")
+            # 파싱 실패해도 문서는 저장되었으므로 경고만 로그
+            # 원한다면 여기서 예외를 전파할 수도 있음
+    
     def get_document(self, document_id: str, user_id: str) -> Dict:
         """문서 정보 조회 (권한 체크 포함)"""
         try:
@@ -185,6 +205,20 @@ class DocumentService(BaseDocumentService):
         except Exception as e:
             raise HandledException(ResponseCode.DOCUMENT_DOWNLOAD_ERROR, e=e)
     
+    def get_document_file(self, document_id: str, user_id: str) -> tuple[Path, str, str, Optional[str]]:
+        """다운로드할 문서 파일 정보 (경로, 파일명, MIME 타입, ETag용 해시)"""
+        try:
+            return super().get_document_file(document_id, user_id)
+                
+        except FileNotFoundError:
+            raise HandledException(ResponseCode.DOCUMENT_NOT_FOUND, msg="파일이 존재하지 않습니다.")
+        except PermissionError:
+            raise HandledException(ResponseCode.DOCUMENT_NOT_FOUND, msg="문서를 찾을 수 없습니다.")
+        except HandledException:
+            raise
+        except Exception as e:
+            raise HandledException(ResponseCode.DOCUMENT_DOWNLOAD_ERROR, e=e)
+    
     def delete_document(self, document_id: str, user_id: str) -> bool:
         """문서 삭제"""
         try:
@@ -376,6 +410,347 @@ class DocumentService(BaseDocumentService):
             logger.error(f"처리 작업 진행률 조회 실패: {str(e)}")
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
+    # ========================================
+    # 재개 가능 업로드 (tus 방식) / 해시로 기존 문서 확인
+    # ========================================
+    
+    _SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+    _MD5_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+    
+    def find_document_by_hash(self, file_hash: str, user_id: str) -> Optional[Dict]:
+        """
+        해시로 완료된 기존 문서 조회 (업로드 전 중복 확인 - 있으면 파일을 보낼 필요 없음)
+        
+        해시를 안다고 파일을 가진 것은 아니므로 user_id가 읽을 수 있는 문서(본인 소유 또는 공개)만
+        조회한다 (본인 문서 우선).
+        
+        Args:
+            file_hash: SHA-256 (64자, CONTENT_HASH) 또는 MD5 (32자, FILE_HASH) 16진수
+            user_id: 조회하는 사용자
+        """
+        file_hash = file_hash.strip().lower()
+        try:
+            if self._SHA256_PATTERN.match(file_hash):
+                document = self.document_crud.find_completed_document_by_content_hash(file_hash, readable_by=user_id)
+            elif self._MD5_PATTERN.match(file_hash):
+                document = self.document_crud.find_completed_document_by_hash(file_hash, readable_by=user_id)
+            else:
+                raise HandledException(ResponseCode.VALIDATION_ERROR,
+                                       msg="해시는 SHA-256(64자) 또는 MD5(32자) 16진수여야 합니다.")
+            return self._document_to_dict(document, is_duplicate=True) if document else None
+        
+        except HandledException:
+            raise
+        except Exception as e:
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+    
+    def create_upload_session(
+        self,
+        filename: str,
+        upload_length: int,
+        user_id: str,
+        is_public: bool = False,
+        permissions: List[str] = None,
+        document_type: str = 'common',
+        metadata: Dict = None,
+        content_hash: str = None
+    ) -> Dict:
+        """
+        재개 가능 업로드 세션 생성
+        
+        - content_hash(SHA-256)를 주면 읽을 수 있는 같은 내용의 완료 문서가 있는지 먼저 확인하고,
+          있으면 세션 없이 문서를 반환 (is_duplicate=True, 파일 전송 불필요)
+          - 본인 문서면 그 문서를, 다른 사용자의 공개 문서면 공유 파일을 링크한 본인 소유 문서를 새로 만들어 반환
+        - 검증(문서 타입/확장자/크기)은 POST /upload와 같고, 크기 제한은 UPLOAD_RESUMABLE_MAX_SIZE
+        """
+        if document_type not in Document.VALID_DOCUMENT_TYPES:
+            raise HandledException(ResponseCode.DOCUMENT_INVALID_FILE_TYPE, 
+                                 msg=f"유효하지 않은 문서 타입: {document_type}. 허용된 타입: {', '.join(Document.VALID_DOCUMENT_TYPES)}")
+        
+        allowed_extensions = settings.get_upload_allowed_types()
+        if self._get_file_extension(filename) not in allowed_extensions:
+            raise HandledException(ResponseCode.DOCUMENT_INVALID_FILE_TYPE, 
+                                 msg=f"지원하지 않는 파일 형식입니다. 허용된 형식: {', '.join(allowed_extensions)}")
+        
+        if upload_length < 0:
+            raise HandledException(ResponseCode.VALIDATION_ERROR, msg="upload_length는 0 이상이어야 합니다.")
+        if upload_length > settings.upload_resumable_max_size:
+            raise HandledException(ResponseCode.DOCUMENT_FILE_TOO_LARGE, 
+                                 msg=f"파일 크기가 너무 큽니다. (최대 {settings.upload_resumable_max_size / (1024 * 1024):.1f}MB)",
+                                 http_status_code=413)
+        
+        if content_hash:
+            content_hash = content_hash.strip().lower()
+            if not self._SHA256_PATTERN.match(content_hash):
+                raise HandledException(ResponseCode.VALIDATION_ERROR, msg="content_hash는 SHA-256(64자) 16진수여야 합니다.")
+            try:
+                existing = self.document_crud.find_completed_document_by_content_hash(content_hash, readable_by=user_id)
+            except Exception as e:
+                raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+            if existing and existing.user_id == user_id:
+                logger.info(f"📋 업로드 전 해시 확인으로 기존 문서 반환: {existing.document_id}")
+                return {"upload_id": None, "is_duplicate": True, "document": self._document_to_dict(existing, is_duplicate=True)}
+            if existing:
+                document = self._create_document_from_existing(
+                    existing.document_id, filename, user_id, is_public, permissions, document_type, metadata
+                )
+                if document:
+                    return {"upload_id": None, "is_duplicate": True, "document": document}
+        
+        try:
+            self._expire_upload_sessions()
+            
+            upload_id = f"upl_{uuid.uuid4().hex}"
+            part_path = self._get_upload_part_path(upload_id)
+            part_path.parent.mkdir(parents=True, exist_ok=True)
+            part_path.touch(exist_ok=False)
+            
+            try:
+                upload = self.upload_crud.create_session({
+                    "upload_id": upload_id,
+                    "user_id": user_id,
+                    "filename": filename,
+                    "upload_length": upload_length,
+                    "upload_offset": 0,
+                    "content_hash": content_hash,
+                    "is_public": is_public,
+                    "permissions": permissions,
+                    "document_type": document_type,
+                    "metadata_json": metadata,
+                    "status": "uploading",
+                    "expires_dt": self._upload_expires_dt(),
+                })
+            except BaseException:
+                part_path.unlink(missing_ok=True)
+                raise
+            
+            logger.info(f"📤 업로드 세션 생성: {upload_id} ({filename}, {upload_length} bytes)")
+            return {"upload_id": upload_id, "is_duplicate": False, "upload": self._upload_session_to_dict(upload)}
+        
+        except HandledException:
+            raise
+        except Exception as e:
+            raise HandledException(ResponseCode.DOCUMENT_UPLOAD_ERROR, e=e)
+    
+    def get_upload_session(self, upload_id: str, user_id: str) -> Dict:
+        """업로드 세션 상태 조회 (현재 오프셋 - 끊긴 뒤 이어 보낼 위치)"""
+        upload = self.upload_crud.get_session(upload_id)
+        self._check_upload_session(upload, user_id)
+        return self._upload_session_to_dict(upload)
+    
+    def append_upload_chunk(self, upload_id: str, user_id: str, offset: int, stream: BinaryIO) -> Dict:
+        """
+        업로드 세션의 현재 오프셋에 청크 이어 붙이기 (PATCH)
+        
+        - offset은 서버의 UPLOAD_OFFSET과 같아야 함 (다르면 409 - HEAD로 오프셋을 다시 확인)
+        - 세션 행을 잠근 상태에서 쓰고 fsync 후 오프셋을 커밋 (같은 업로드의 동시 요청은 409)
+        - 오프셋 뒤에 남은 바이트(이전 요청이 쓰다 끊긴 부분)는 잘라낸 뒤 이어 쓴다
+        """
+        upload = self.upload_crud.lock_session(upload_id)
+        try:
+            self._check_upload_session(upload, user_id)
+            if upload.status != "uploading":
+                raise HandledException(ResponseCode.DOCUMENT_UPLOAD_OFFSET_MISMATCH, 
+                                     msg="이미 완료된 업로드입니다.", http_status_code=409)
+            if offset != upload.upload_offset:
+                raise HandledException(ResponseCode.DOCUMENT_UPLOAD_OFFSET_MISMATCH, 
+                                     msg=f"현재 오프셋: {upload.upload_offset}", http_status_code=409)
+            
+            part_path = self._get_upload_part_path(upload_id)
+            if not part_path.exists():
+                raise HandledException(ResponseCode.DOCUMENT_UPLOAD_NOT_FOUND, 
+                                     msg="업로드 임시 파일이 없습니다.", http_status_code=404)
+            
+            limit = min(upload.upload_length - offset, settings.upload_chunk_max_size)
+            written = 0
+            with open(part_path, "r+b") as f:
+                f.seek(offset)
+                f.truncate()
+                try:
+                    while True:
+                        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        written += len(chunk)
+                        if written > limit:
+                            raise HandledException(ResponseCode.DOCUMENT_FILE_TOO_LARGE, 
+                                                 msg=f"청크가 남은 크기 또는 청크 최대 크기({limit} bytes)를 넘었습니다.",
+                                                 http_status_code=413)
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                except BaseException:
+                    # 커밋하지 않은 바이트는 버린다 (오프셋은 그대로)
+                    f.truncate(offset)
+                    raise
+            
+            upload = self.upload_crud.update_session(
+                upload, upload_offset=offset + written, expires_dt=self._upload_expires_dt()
+            )
+            return self._upload_session_to_dict(upload)
+        
+        except HandledException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HandledException(ResponseCode.DOCUMENT_UPLOAD_ERROR, e=e)
+    
+    def complete_upload(self, upload_id: str, user_id: str) -> Dict:
+        """
+        업로드 완료 - 받은 파일로 문서 생성 (POST /upload와 같은 중복 확인/공유 파일 저장)
+        
+        - 임시 파일을 청크 단위로 읽어 해시를 계산하고, 세션에 content_hash가 있으면 검증
+          (불일치 시 세션을 오프셋 0으로 되돌리고 409)
+        - 임시 파일은 복사 없이 공유 파일 저장소로 옮겨진다
+        - 이미 완료된 세션이면 같은 문서를 다시 반환 (완료 응답을 못 받은 클라이언트의 재시도)
+        """
+        upload = self.upload_crud.lock_session(upload_id)
+        try:
+            self._check_upload_session(upload, user_id)
+            if upload.status == "completed":
+                document = self.document_crud.get_document(upload.document_id)
+                if not document or document.is_deleted:
+                    raise HandledException(ResponseCode.DOCUMENT_NOT_FOUND, http_status_code=404)
+                self.db.rollback()
+                return self._document_to_dict(document)
+            
+            if upload.upload_offset != upload.upload_length:
+                raise HandledException(ResponseCode.DOCUMENT_UPLOAD_INCOMPLETE, 
+                                     msg=f"{upload.upload_offset}/{upload.upload_length} bytes", http_status_code=409)
+            
+            part_path = self._get_upload_part_path(upload_id)
+            file_size, file_hash, content_hash = self._hash_file(part_path)
+            if file_size != upload.upload_length:
+                raise HandledException(ResponseCode.DOCUMENT_UPLOAD_FAILED, 
+                                     msg=f"임시 파일 크기가 다릅니다. ({file_size}/{upload.upload_length} bytes)")
+            if upload.content_hash and upload.content_hash != content_hash:
+                with open(part_path, "r+b") as f:
+                    f.truncate(0)
+                self.upload_crud.update_session(upload, upload_offset=0, expires_dt=self._upload_expires_dt())
+                raise HandledException(ResponseCode.DOCUMENT_UPLOAD_HASH_MISMATCH, 
+                                     msg="처음부터 다시 업로드해 주세요.", http_status_code=409)
+            
+            result = self.create_document_from_temp_file(
+                temp_path=part_path,
+                filename=upload.filename,
+                user_id=upload.user_id,
+                is_public=upload.is_public,
+                permissions=upload.permissions,
+                document_type=upload.document_type,
+                file_size=file_size,
+                file_hash=file_hash,
+                content_hash=content_hash,
+                # 세션 완료 표시를 문서 저장과 같은 커밋에 포함 (커밋 사이에 재시도가 세션을 잠그면
+                # 이미 옮겨진 임시 파일을 다시 해시하게 됨)
+                before_commit=lambda document_id: self.upload_crud.mark_completed(
+                    upload, document_id, self._upload_expires_dt()
+                ),
+                metadata_json=upload.metadata_json
+            )
+            if upload.status != "completed":
+                # 완료된 본인 문서와 같은 내용이어서 새로 저장하지 않은 경우
+                self.upload_crud.update_session(
+                    upload, status="completed", document_id=result['document_id'], expires_dt=self._upload_expires_dt()
+                )
+            logger.info(f"✅ 업로드 완료: {upload_id} → {result['document_id']}")
+        
+        except HandledException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HandledException(ResponseCode.DOCUMENT_UPLOAD_ERROR, e=e)
+        
+        # 문서 타입별 후처리 (POST /upload, /upload-zip과 동일)
+        if result['document_type'] == "pgm_template":
+            self._parse_pgm_template(result, user_id)
+        elif result['document_type'] == "zip":
+            self._attach_zip_info(result, user_id)
+        return result
+    
+    def _create_document_from_existing(
+        self,
+        source_document_id: str,
+        filename: str,
+        user_id: str,
+        is_public: bool,
+        permissions: Optional[List[str]],
+        document_type: str,
+        metadata: Optional[Dict]
+    ) -> Optional[Dict]:
+        """다른 사용자의 공개 문서와 같은 내용으로 본인 소유 문서 생성 (공유 파일 링크, 없으면 None)"""
+        try:
+            result = self.create_document_from_blob(
+                source_document_id,
+                filename=filename,
+                user_id=user_id,
+                is_public=is_public,
+                permissions=permissions,
+                document_type=document_type,
+                metadata_json=metadata
+            )
+        except HandledException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HandledException(ResponseCode.DOCUMENT_UPLOAD_ERROR, e=e)
+        if not result:
+            return None
+        
+        # 문서 타입별 후처리 (complete_upload와 동일)
+        if result['document_type'] == "pgm_template":
+            self._parse_pgm_template(result, user_id)
+        elif result['document_type'] == "zip":
+            self._attach_zip_info(result, user_id)
+        return dict(result, is_duplicate=True)
+    
+    def abort_upload(self, upload_id: str, user_id: str) -> bool:
+        """업로드 취소 - 세션과 임시 파일 삭제"""
+        upload = self.upload_crud.lock_session(upload_id)
+        try:
+            self._check_upload_session(upload, user_id)
+            self._get_upload_part_path(upload_id).unlink(missing_ok=True)
+            self.upload_crud.delete_session(upload)
+            return True
+        except HandledException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HandledException(ResponseCode.DOCUMENT_DELETE_ERROR, e=e)
+    
+    def _get_upload_part_path(self, upload_id: str) -> Path:
+        """업로드 세션 임시 파일 (완료 시 os.replace로 옮길 수 있게 공유 파일 저장소 아래)"""
+        return self.blob_base_path / "tmp" / f"{upload_id}.part"
+    
+    def _upload_expires_dt(self) -> datetime:
+        return datetime.now() + timedelta(hours=settings.upload_session_ttl_hours)
+    
+    def _check_upload_session(self, upload: Optional[DocumentUploadSession], user_id: str) -> None:
+        """세션 존재/소유자/만료 확인 (다른 사용자의 세션은 없는 것으로 취급)"""
+        if not upload or upload.user_id != user_id or upload.expires_dt < datetime.now():
+            raise HandledException(ResponseCode.DOCUMENT_UPLOAD_NOT_FOUND, http_status_code=404)
+    
+    def _expire_upload_sessions(self) -> None:
+        """만료된 업로드 세션과 임시 파일 정리 (세션 생성 시 한 번에 최대 100건)"""
+        for upload in self.upload_crud.get_expired_sessions(datetime.now()):
+            self._get_upload_part_path(upload.upload_id).unlink(missing_ok=True)
+            self.upload_crud.delete_session(upload)
+            logger.info(f"🗑️ 만료된 업로드 세션 정리: {upload.upload_id}")
+    
+    def _upload_session_to_dict(self, upload: DocumentUploadSession) -> Dict:
+        return {
+            "upload_id": upload.upload_id,
+            "filename": upload.filename,
+            "upload_length": upload.upload_length,
+            "upload_offset": upload.upload_offset,
+            "status": upload.status,
+            "document_id": upload.document_id,
+            "expires_dt": upload.expires_dt.isoformat(),
+        }
+    
     # ========================================
     # ZIP 파일 관련 메서드
     # ========================================
@@ -414,43 +789,8 @@ class DocumentService(BaseDocumentService):
                 document_type='zip'
             )
             
-            document_id = result['document_id']
-            upload_path = result['upload_path']
-            
-            # 2. 압축 해제 여부에 따라 분기
-            if extract_files:
-                # 압축 해제 모드
-                extraction_result = self._extract_and_store_zip(upload_path, document_id, user_id)
-                zip_contents = extraction_result['zip_contents']
-            else:
-                # 압축 파일 그대로 모드 (기존)
-                zip_contents = self._analyze_zip_file(upload_path)
-            
-            # 3. metadata_json 업데이트
-            from shared_core.crud import DocumentCRUD
-            doc_crud = DocumentCRUD(self.db)
-            
-            metadata = {
-                'storage_type': 'extracted' if extract_files else 'compressed',
-                'extracted_path': extraction_result.get('extracted_path') if extract_files else None,
-                'zip_summary': {
-                    'total_files': len(zip_contents['files']),
-                    'total_directories': sum(1 for f in zip_contents['files'] if f['is_directory']),
-                    'total_size': sum(f['size'] for f in zip_contents['files']),
-                    'total_uncompressed_size': sum(f['uncompressed_size'] for f in zip_contents['files']),
-                    'file_type_stats': zip_contents['file_type_stats']
-                },
-                'files': zip_contents['files']
-            }
-            
-            doc_crud.update_document(document_id, metadata_json=metadata)
-            
-            # 4. 결과 반환
-            result['zip_info'] = {
-                'total_files': metadata['zip_summary']['total_files'],
-                'total_directories': metadata['zip_summary']['total_directories'],
-                'file_types': metadata['zip_summary']['file_type_stats']
-            }
+            # 2~4. 압축 파일 분석/해제 후 metadata_json 업데이트
+            self._attach_zip_info(result, user_id, extract_files)
             
             return result
             
@@ -460,6 +800,46 @@ class DocumentService(BaseDocumentService):
             logger.error(f"zip 파일 업로드 실패: {str(e)}")
             raise HandledException(ResponseCode.DOCUMENT_UPLOAD_ERROR, e=e)
     
+    def _attach_zip_info(self, result: Dict, user_id: str, extract_files: bool = False) -> None:
+        """zip 문서 분석(또는 압축 해제) 결과를 metadata_json에 저장하고 result['zip_info'] 추가 (업로드/재개 가능 업로드 공통)"""
+        document_id = result['document_id']
+        upload_path = result['upload_path']
+        
+        # 2. 압축 해제 여부에 따라 분기
+        if extract_files:
+            # 압축 해제 모드
+            extraction_result = self._extract_and_store_zip(upload_path, document_id, user_id)
+            zip_contents = extraction_result['zip_contents']
+        else:
+            # 압축 파일 그대로 모드 (기존)
+            zip_contents = self._analyze_zip_file(upload_path)
+        
+        # 3. metadata_json 업데이트
+        from shared_core.crud import DocumentCRUD
+        doc_crud = DocumentCRUD(self.db)
+        
+        metadata = {
+            'storage_type': 'extracted' if extract_files else 'compressed',
+            'extracted_path': extraction_result.get('extracted_path') if extract_files else None,
+            'zip_summary': {
+                'total_files': len(zip_contents['files']),
+                'total_directories': sum(1 for f in zip_contents['files'] if f['is_directory']),
+                'total_size': sum(f['size'] for f in zip_contents['files']),
+                'total_uncompressed_size': sum(f['uncompressed_size'] for f in zip_contents['files']),
+                'file_type_stats': zip_contents['file_type_stats']
+            },
+            'files': zip_contents['files']
+        }
+        
+        doc_crud.update_document(document_id, metadata_json=metadata)
+        
+        # 4. 결과 반환
+        result['zip_info'] = {
+            'total_files': metadata['zip_summary']['total_files'],
+            'total_directories': metadata['zip_summary']['total_directories'],
+            'file_types': metadata['zip_summary']['file_type_stats']
+        }
+    
     def _extract_and_store_zip(self, zip_path: str, document_id: str, user_id: str) -> Dict:
         """압축 해제 및 저장 (Phase 1 - 기본 기능)
         
@@ -487,11 +867,13 @@ class DocumentService(BaseDocumentService):
             zip_path_obj = Path(zip_path)
             extracted_base = zip_path_obj.parent / f"{zip_path_obj.stem}_extracted"
             extracted_base.mkdir(parents=True, exist_ok=True)
+            resolved_base = extracted_base.resolve()
             
             # 2. ZIP 파일 분석 및 해제
             files = []
             file_type_stats = defaultdict(int)
             extracted_count = 0
+            skipped_count = 0
             
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 for info in zip_ref.infolist():
@@ -502,6 +884,14 @@ class DocumentService(BaseDocumentService):
                         # 파일 정보 저장
                         extracted_file_path = extracted_base / info.filename
                         
+                        # 해제 디렉토리 밖을 가리키는 멤버(../, 절대 경로 - zip slip)는 쓰지 않음
+                        # (다운로드 시 extracted 경로 검사와 동일)
+                        resolved_path = extracted_file_path.resolve()
+                        if resolved_base not in resolved_path.parents and not (info.is_dir() and resolved_path == resolved_base):
+                            skipped_count += 1
+                            logger.warning(f"해제 경로 밖의 멤버 건너뜀: {info.filename}")
+                            continue
+                        
                         file_info = {
                             'path': info.filename,
                             'name': path_obj.name,
@@ -527,10 +917,10 @@ class DocumentService(BaseDocumentService):
                             # 디렉토리 생성
                             extracted_file_path.parent.mkdir(parents=True, exist_ok=True)
                             
-                            # 파일 해제
-                            with zip_ref.open(info.filename) as source:
+                            # 파일 해제 (청크 단위 복사 - 멤버 크기와 무관하게 메모리 일정)
+                            with zip_ref.open(info) as source:
                                 with open(extracted_file_path, 'wb') as target:
-                                    target.write(source.read())
+                                    shutil.copyfileobj(source, target, ZIP_COPY_CHUNK_SIZE)
                             
                             extracted_count += 1
                         else:
@@ -555,7 +945,7 @@ class DocumentService(BaseDocumentService):
                 },
                 'extracted_path': str(extracted_base),
                 'extracted_count': extracted_count,
-                'failed_count': len(files) - extracted_count
+                'failed_count': len(files) - extracted_count + skipped_count
             }
             
         except zipfile.BadZipFile:
@@ -692,15 +1082,25 @@ class DocumentService(BaseDocumentService):
             logger.error(f"zip 내부 파일 검색 실패: {str(e)}")
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
-    def get_zip_file_content(
+    def get_zip_member(
         self,
         document_id: str,
         user_id: str,
         file_path: str
-    ) -> tuple[bytes, str]:
-        """zip 내부 특정 파일 추출"""
+    ) -> Dict:
+        """zip 내부 특정 파일 조회 (내용은 읽지 않음 - 호출자가 파일/청크 스트림으로 전송)
+
+        Returns:
+            {
+                'filename': 'a.pdf',
+                'member_hash': '...',           # ETag용 (zip 내용 해시 + 내부 경로)
+                'extracted_file_path': Path,    # storage_type=extracted (아니면 None)
+                'archive': ZipArchive,          # storage_type=compressed (central directory 캐시)
+                'member': ZipInfo,
+            }
+        """
+        import hashlib
         import zipfile
-        from pathlib import Path
         
         try:
             # 1. 문서 조회 및 권한 체크
@@ -721,9 +1121,19 @@ class DocumentService(BaseDocumentService):
             if document.metadata_json:
                 storage_type = document.metadata_json.get('storage_type', 'compressed')
             
+            result = {
+                'filename': Path(file_path).name,
+                'member_hash': hashlib.sha256(
+                    f"{document.content_hash or document.file_hash}/{file_path}".encode('utf-8')
+                ).hexdigest(),
+                'extracted_file_path': None,
+                'archive': None,
+                'member': None,
+            }
+            
             # 3. storage_type에 따라 분기
             if storage_type == 'extracted':
-                # 압축 해제된 파일에서 직접 읽기
+                # 압축 해제된 파일을 그대로 전송
                 extracted_path = document.metadata_json.get('extracted_path')
                 if not extracted_path:
                     raise HandledException(
@@ -731,34 +1141,42 @@ class DocumentService(BaseDocumentService):
                         msg="압축 해제 경로를 찾을 수 없습니다"
                     )
                 
-                extracted_file_path = Path(extracted_path) / file_path
-                if not extracted_file_path.exists():
+                extracted_base = Path(extracted_path).resolve()
+                extracted_file_path = (extracted_base / file_path).resolve()
+                if extracted_base not in extracted_file_path.parents or not extracted_file_path.is_file():
                     raise HandledException(
                         ResponseCode.DOCUMENT_NOT_FOUND,
                         msg=f"파일이 존재하지 않습니다: {file_path}"
                     )
                 
-                with open(extracted_file_path, 'rb') as f:
-                    file_content = f.read()
-                filename = Path(file_path).name
-                return file_content, filename
+                result['extracted_file_path'] = extracted_file_path
             else:
-                # 압축 파일에서 추출 (기존 로직)
-                zip_file_path = doc_info['file_path']
+                # 압축 파일에서 직접 스트리밍 (central directory는 아카이브별로 캐시)
+                archive = open_zip_archive(document.upload_path)
+                try:
+                    member = archive.get_member(file_path)
+                except KeyError:
+                    member = None
+                if member is None or member.is_dir():
+                    raise HandledException(
+                        ResponseCode.DOCUMENT_NOT_FOUND,
+                        msg=f"zip 내부에 '{file_path}' 파일이 존재하지 않습니다"
+                    )
                 
-                with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-                    try:
-                        file_content = zip_ref.read(file_path)
-                        filename = Path(file_path).name
-                        return file_content, filename
-                    except KeyError:
-                        raise HandledException(
-                            ResponseCode.DOCUMENT_NOT_FOUND,
-                            msg=f"zip 내부에 '{file_path}' 파일이 존재하지 않습니다"
-                        )
+                result['archive'] = archive
+                result['member'] = member
+            
+            return result
             
         except HandledException:
             raise
+        except FileNotFoundError:
+            raise HandledException(ResponseCode.DOCUMENT_NOT_FOUND, msg="파일이 존재하지 않습니다.")
+        except zipfile.BadZipFile:
+            raise HandledException(
+                ResponseCode.DOCUMENT_INVALID_FILE_TYPE,
+                msg="손상된 zip 파일입니다"
+            )
         except Exception as e:
             logger.error(f"zip 파일 추출 실패: {str(e)}")
             raise HandledException(ResponseCode.DOCUMENT_DOWNLOAD_ERROR, e=e)
\ No newline at end of file
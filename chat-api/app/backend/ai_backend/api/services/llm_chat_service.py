@@ -1,22 +1,25 @@
 # _*_ coding: utf-8 _*_
 """LLM Chat Service for handling AI conversations."""
-import asyncio
 import logging
+import os
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import tiktoken
 from ai_backend.api.services.llm_provider_factory import (
     BaseLLMProvider,
-    LLMProviderFactory,
+    get_llm_provider_registry,
 )
+from ai_backend.cache.cancel_bus import get_cancel_bus
 from ai_backend.database.base import Database
-from ai_backend.database.crud.chat_crud import ChatCRUD
+from ai_backend.database.crud.chat_crud import AsyncChatCRUD, ChatCRUD, to_history_entry
 from ai_backend.database.models.chat_models import ChatMessage
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
+from ai_backend.utils.token_utils import count_fitting_suffix, count_tokens, get_tokenizer
 from ai_backend.utils.uuid_gen import gen
 from openai import AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -25,14 +28,14 @@ logger = logging.getLogger(__name__)
 class LLMChatService:
     """LLM 채팅 서비스를 관리하는 클래스"""
     
-    def __init__(self, db: Session = None, redis_client=None):
+    def __init__(self, db: Session = None, redis_client=None, async_db: AsyncSession = None):
         # DB 필수 검사
         if db is None:
             raise HandledException(ResponseCode.DATABASE_CONNECTION_ERROR, msg="Database session is required")
         
-        # LLM 제공자 팩토리를 사용하여 제공자 생성
+        # 프로세스 전역 레지스트리에서 제공자 조회 (요청마다 클라이언트를 새로 만들지 않음)
         try:
-            self.llm_provider = LLMProviderFactory.create_provider()
+            self.llm_provider = get_llm_provider_registry().get_provider()
             logger.info(f"LLM provider initialized: {type(self.llm_provider).__name__}")
         except Exception as e:
             logger.error(f"Failed to initialize LLM provider: {e}")
@@ -42,23 +45,23 @@ class LLMChatService:
         self.redis_client = redis_client
         self.chat_crud = ChatCRUD(db)  # Repository 인스턴스 생성
         
-        # 취소 상태 관리
-        self.is_cancelled = {}
+        # 스트리밍 경로용 비동기 Repository (이벤트 루프 블로킹 방지)
+        self.async_db = async_db
+        self.async_chat_crud = AsyncChatCRUD(async_db) if async_db is not None else None
+        
+        # 취소 상태 관리 (프로세스 공유 이벤트 버스, 레디스 사용 시 파드 간 pub/sub 전파)
+        self.cancel_bus = get_cancel_bus()
+        # 레디스 미사용 시 다른 프로세스에서의 취소를 확인하는 DB 조회 간격 (초)
+        self.cancel_db_poll_interval = float(os.getenv("CANCEL_DB_POLL_INTERVAL", "2.0"))
         
         # 레디스 사용 여부 결정 (로컬: DB만, 운영: 레디스+DB)
         self.use_redis = self._should_use_redis()
         logger.info(f"Cache mode: {'Redis + DB' if self.use_redis else 'DB only'}")
         
-        # 토큰 관리 설정
-        try:
-            self.tokenizer = tiktoken.encoding_for_model(self.llm_provider.model)
-            self.max_tokens = 4000  # 안전한 토큰 제한
-            self.max_history_tokens = 3000  # 히스토리에 사용할 최대 토큰
-        except Exception as e:
-            logger.warning(f"Failed to initialize tokenizer: {e}")
-            self.tokenizer = None
-            self.max_tokens = 4000
-            self.max_history_tokens = 3000
+        # 토큰 관리 설정 (인코더는 모델별로 프로세스 단위 캐시)
+        self.tokenizer = get_tokenizer(self.llm_provider.model)
+        self.max_tokens = 4000  # 안전한 토큰 제한
+        self.max_history_tokens = 3000  # 히스토리에 사용할 최대 토큰
     
     def _should_use_redis(self) -> bool:
         """레디스 사용 여부 결정 (로컬: false, 운영: true)"""
@@ -86,70 +89,74 @@ class LLMChatService:
     
     def _count_tokens(self, text: str) -> int:
         """텍스트의 토큰 수 계산"""
-        if self.tokenizer is None:
-            # 간단한 추정 (영어 기준 약 4글자 = 1토큰)
-            return len(text) // 4
-        try:
-            return len(self.tokenizer.encode(text))
-        except Exception as e:
-            logger.warning(f"Token counting failed: {e}")
-            return len(text) // 4
+        return count_tokens(text, self.tokenizer)
     
-    def _truncate_messages_by_tokens(self, messages: List[Dict]) -> List[Dict]:
-        """토큰 수를 기준으로 메시지 개수를 제한"""
+    def _truncate_messages_by_tokens(self, messages: List[Dict], token_counts: List[Optional[int]] = None) -> List[Dict]:
+        """토큰 수를 기준으로 메시지 개수를 제한
+        
+        token_counts: 메시지별 저장된 토큰 수 (없는 항목만 새로 토큰화)
+        """
         if not self.tokenizer:
             # 토큰 계산이 불가능한 경우 메시지 개수로 제한
             return messages[-20:]
         
-        total_tokens = 0
-        truncated_messages = []
+        if token_counts is None:
+            token_counts = [None] * len(messages)
+        counts = [
+            count if count is not None else self._count_tokens(message["content"])
+            for message, count in zip(messages, token_counts)
+        ]
         
         # 시스템 프롬프트는 항상 포함
-        system_prompt = messages[0] if messages and messages[0].get("role") == "system" else None
-        if system_prompt:
-            total_tokens += self._count_tokens(system_prompt["content"])
-            truncated_messages.append(system_prompt)
-        
-        # 나머지 메시지를 역순으로 확인 (최신 메시지부터)
-        remaining_messages = messages[1:] if system_prompt else messages
-        for message in reversed(remaining_messages):
-            message_tokens = self._count_tokens(message["content"])
-            if total_tokens + message_tokens > self.max_history_tokens:
-                break
-            total_tokens += message_tokens
-            truncated_messages.insert(1 if system_prompt else 0, message)
+        has_system_prompt = bool(messages) and messages[0].get("role") == "system"
+        offset = 1 if has_system_prompt else 0
+        budget = self.max_history_tokens - (counts[0] if has_system_prompt else 0)
         
+        # 나머지 메시지는 최신 메시지부터 누적 토큰 수(suffix sum)로 포함 개수 결정
+        keep = count_fitting_suffix(counts[offset:], budget) if budget >= 0 else 0
+        truncated_messages = messages[:offset] + messages[len(messages) - keep:]
+        
+        total_tokens = sum(counts[:offset]) + sum(counts[len(counts) - keep:])
         logger.debug(f"Truncated messages: {len(truncated_messages)} messages, ~{total_tokens} tokens")
         return truncated_messages
     
-    def _get_messages_for_openai(self, chat_id: str) -> List[Dict]:
-        """메시지를 가져와서 OpenAI 형식으로 변환 (레디스 우선)"""
-        messages = []
+    def _cached_history_to_openai(self, cached_history: List[Dict]):
+        """캐시된 대화 기록을 OpenAI 형식으로 변환
         
-        # 레디스 우선으로 대화 기록 조회
-        if self.use_redis:
-            try:
-                cached_history = self.redis_client.get_chat_messages(chat_id)
-                if cached_history:
-                    # 캐시된 데이터를 OpenAI 형식으로 변환
-                    for msg in cached_history[-20:]:  # 최근 20개로 증가
-                        # 취소된 메시지는 제외
-                        if msg.get("cancelled", False):
-                            continue
-                        messages.append({
-                            "role": msg.get("role", "user"),
-                            "content": msg.get("content", "")
-                        })
-                    logger.debug(f"Using cached history for chat {chat_id}: {len(messages)} messages")
-                    
-                    # 토큰 기반으로 메시지 제한 적용
-                    return self._truncate_messages_by_tokens(messages)
-            except Exception as e:
-                logger.warning(f"Redis cache read failed: {e}")
-        
-        # 레디스에 없거나 실패한 경우 DB에서 조회
-        db_messages = self.chat_crud.get_messages(chat_id)
+        Returns:
+            (OpenAI 형식 메시지 목록, 메시지별 저장된 토큰 수 목록)
+        """
+        messages = []
+        token_counts = []
+        for msg in cached_history[-20:]:  # 최근 20개로 증가
+            # 취소된 메시지는 제외
+            if msg.get("cancelled", False):
+                continue
+            messages.append({
+                "role": msg.get("role", "user"),
+                "content": msg.get("content", "")
+            })
+            token_counts.append(msg.get("token_count"))
+        return messages, token_counts
+    
+    def _history_entry(self, role: str, content: str, token_count: Optional[int]) -> Dict:
+        """새로 저장한 메시지의 캐시 엔트리 생성 (to_history_entry와 동일한 형식)"""
+        return {
+            "role": role,
+            "content": content,
+            "timestamp": self.get_current_timestamp(),
+            "cancelled": False,
+            "token_count": token_count
+        }
+    
+    def _db_messages_to_openai(self, db_messages: List[ChatMessage]):
+        """DB 메시지를 OpenAI 형식으로 변환
         
+        Returns:
+            (OpenAI 형식 메시지 목록, 메시지별 저장된 토큰 수 목록)
+        """
+        messages = []
+        token_counts = []
         # 최근 20개 메시지만 사용 (토큰 제한 고려)
         for msg in db_messages[-20:]:
             # 취소된 메시지는 제외
@@ -169,11 +176,35 @@ class LLMChatService:
                 "role": role,
                 "content": msg.message
             })
+            token_counts.append(msg.token_count)
+        return messages, token_counts
+    
+    async def _get_messages_for_openai_async(self, chat_id: str) -> List[Dict]:
+        """메시지를 가져와서 OpenAI 형식으로 변환 (레디스 우선, 비동기)"""
+        # 레디스 우선으로 대화 기록 조회
+        if self.use_redis:
+            cached_history = await self.redis_client.get_chat_messages_async(chat_id)
+            if cached_history:
+                messages, token_counts = self._cached_history_to_openai(cached_history)
+                logger.debug(f"Using cached history for chat {chat_id}: {len(messages)} messages")
+                return self._truncate_messages_by_tokens(messages, token_counts)
+        
+        # 레디스에 없거나 실패한 경우 DB에서 최신 메시지만 조회
+        db_messages = await self.async_chat_crud.get_recent_messages(
+            chat_id, self.redis_client.chat_history_max_length if self.use_redis else 50
+        )
+        messages, token_counts = self._db_messages_to_openai(db_messages)
         
         logger.debug(f"Using DB history for chat {chat_id}: {len(messages)} messages")
         
+        # 캐시 미스 시에만 히스토리 리스트를 재구성 (이후에는 메시지 단위로 추가)
+        if self.use_redis and db_messages:
+            await self.redis_client.set_chat_messages_async(
+                chat_id, [to_history_entry(m) for m in db_messages], 1800
+            )
+        
         # 토큰 기반으로 메시지 제한 적용
-        return self._truncate_messages_by_tokens(messages)
+        return self._truncate_messages_by_tokens(messages, token_counts)
     
     def _ensure_chat_exists(self, chat_id: str):
         """채팅이 존재하지 않으면 생성"""
@@ -185,8 +216,20 @@ class LLMChatService:
         except Exception as e:
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
-    def send_message_simple(self, chat_id: str, message: str, user_id: str = "user") -> dict:
-        """사용자 메시지를 처리하고 LLM 응답을 생성 (REST API용)"""
+    async def _ensure_chat_exists_async(self, chat_id: str):
+        """채팅이 존재하지 않으면 생성 (비동기)"""
+        try:
+            await self.async_chat_crud.get_chat_or_create(chat_id, "user")
+        except HandledException:
+            raise  # Repository에서 발생한 HandledException 전파
+        except Exception as e:
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+    
+    async def send_message_simple(self, chat_id: str, message: str, user_id: str = "user") -> dict:
+        """사용자 메시지를 처리하고 LLM 응답을 생성 (REST API용)
+        
+        앱 이벤트 루프에서 직접 실행되어 LLM 제공자의 HTTP 커넥션 풀을 공유한다.
+        """
         try:
             # 비즈니스 로직 검증
             if not message or not message.strip():
@@ -196,26 +239,38 @@ class LLMChatService:
                 raise HandledException(ResponseCode.CHAT_SESSION_NOT_FOUND, msg="채팅 ID가 유효하지 않습니다.")
             
             # 채팅 존재 확인 및 초기화
-            self._ensure_chat_exists(chat_id)
+            await self._ensure_chat_exists_async(chat_id)
             
             # 사용자 메시지를 DB에 저장
             user_message_id = gen()
-            self.chat_crud.save_user_message(user_message_id, chat_id, user_id, message)
+            user_tokens = self._count_tokens(message)
+            await self.async_chat_crud.save_user_message_simple(
+                user_message_id, chat_id, user_id, message, token_count=user_tokens
+            )
             
-            # LLM 응답 생성 (캐시 무효화 없이)
-            ai_response = asyncio.run(self._generate_ai_response(chat_id))
+            # 캐시된 히스토리에 사용자 메시지 추가 (캐시가 없으면 다음 조회 시 DB에서 재구성)
+            if self.use_redis:
+                await self.redis_client.append_chat_message_async(
+                    chat_id, self._history_entry("user", message, user_tokens)
+                )
+            
+            # LLM 응답 생성
+            ai_response = await self._generate_ai_response(chat_id)
             
             # AI 응답을 DB에 저장
             ai_message_id = gen()
-            self.chat_crud.save_ai_message(ai_message_id, chat_id, user_id, ai_response, "completed")
+            ai_tokens = self._count_tokens(ai_response)
+            await self.async_chat_crud.save_ai_message(
+                ai_message_id, chat_id, user_id, ai_response, "completed",
+                token_count=ai_tokens
+            )
             
-            # 메시지 저장 완료 후 캐시 무효화 (한 번만)
+            # 캐시된 히스토리에 AI 응답 추가 (전체 재구성 없음)
             if self.use_redis:
-                try:
-                    self.redis_client.delete_chat_messages(chat_id)
-                    logger.debug(f"Invalidated cache for chat {chat_id} after message completion")
-                except Exception as e:
-                    logger.warning(f"Redis cache invalidation failed: {e}")
+                if await self.redis_client.append_chat_message_async(
+                    chat_id, self._history_entry("assistant", ai_response, ai_tokens)
+                ):
+                    logger.debug(f"Appended AI response to cached history for chat {chat_id}")
             
             # AI 응답 반환
             return {
@@ -231,10 +286,11 @@ class LLMChatService:
             # 에러 발생 시 메시지 상태를 error로 업데이트
             if 'ai_message_id' in locals():
                 try:
-                    chat_crud = ChatCRUD(self.db)
                     # AIMessage 객체를 안전하게 문자열로 변환
                     error_msg = self._safe_error_message(e)
-                    chat_crud.update_message_to_error(ai_message_id, error_msg)
+                    await self.async_chat_crud.update_message_to_error(ai_message_id, error_msg)
+                    if self.use_redis:
+                        await self.redis_client.delete_chat_messages_async(chat_id)
                 except HandledException:
                     raise  # Repository에서 발생한 HandledException 전파
                 except Exception as db_error:
@@ -261,29 +317,8 @@ class LLMChatService:
     async def _generate_ai_response(self, chat_id: str) -> str:
         """OpenAI API를 사용하여 AI 응답 생성"""
         try:
-            # 대화 기록을 가져와서 OpenAI 형식으로 변환
-            messages = []
-            
-            # 레디스 우선으로 대화 기록 조회
-            if self.use_redis:
-                try:
-                    cached_history = self.redis_client.get_chat_messages(chat_id)
-                    if cached_history:
-                        # 캐시된 데이터 사용
-                        for msg in cached_history[-10:]:  # 최근 10개만
-                            messages.append({
-                                "role": msg.get("role", "user"),
-                                "content": msg.get("content", "")
-                            })
-                    else:
-                        # 캐시에 없으면 DB에서 조회
-                        messages = self._get_messages_for_openai(chat_id)
-                except Exception as e:
-                    logger.warning(f"Redis cache read failed: {e}")
-                    messages = self._get_messages_for_openai(chat_id)
-            else:
-                # DB만 사용
-                messages = self._get_messages_for_openai(chat_id)
+            # 대화 기록을 가져와서 OpenAI 형식으로 변환 (레디스 우선)
+            messages = await self._get_messages_for_openai_async(chat_id)
             
             # 시스템 프롬프트 추가
             system_prompt = {
@@ -324,8 +359,12 @@ class LLMChatService:
                 except Exception as e:
                     logger.warning(f"Redis cache read failed: {e}")
             
-            # 레디스에 없거나 실패한 경우 DB에서 조회
-            history = self.chat_crud.get_messages_from_db(chat_id)
+            # 레디스에 없거나 실패한 경우 DB에서 최신 메시지만 조회
+            # (히스토리 리스트는 이후 뒤에 추가되므로 가장 오래된 메시지로 채우면 중간이 빠진다)
+            db_messages = self.chat_crud.get_recent_messages(
+                chat_id, self.redis_client.chat_history_max_length if self.use_redis else 50
+            )
+            history = [to_history_entry(m) for m in db_messages]
             
             # 레디스 사용 시 캐시에 저장
             if self.use_redis and history:
@@ -342,6 +381,12 @@ class LLMChatService:
             raise HandledException(ResponseCode.CHAT_HISTORY_LOAD_ERROR, e=e)
     
     
+    def _clear_chat_cache(self, chat_id: str):
+        """채팅방 관련 캐시(대화 기록, 생성 상태, 취소 상태)를 한 번의 왕복으로 삭제"""
+        with self.redis_client.pipeline() as pipe:
+            self.redis_client.queue_delete_many(pipe, [self.redis_client.chat_history_key(chat_id)])
+            pipe.delete(f"generation:{chat_id}", f"cancel:{chat_id}")
+    
     def clear_conversation(self, chat_id: str):
         """대화 기록 초기화 (DB에서 메시지 삭제)"""
         try:
@@ -350,17 +395,7 @@ class LLMChatService:
             # 레디스 캐시도 삭제
             if self.use_redis:
                 try:
-                    # 채팅방 메시지 캐시 삭제
-                    self.redis_client.delete_chat_messages(chat_id)
-                    
-                    # 생성 상태 캐시 삭제
-                    generation_key = f"generation:{chat_id}"
-                    self.redis_client.redis_client.delete(generation_key)
-                    
-                    # 취소 상태 캐시 삭제
-                    cancel_key = f"cancel:{chat_id}"
-                    self.redis_client.redis_client.delete(cancel_key)
-                    
+                    self._clear_chat_cache(chat_id)
                     logger.debug(f"Cleared all cache for chat {chat_id}")
                 except Exception as e:
                     logger.warning(f"Redis cache clear failed: {e}")
@@ -390,29 +425,66 @@ class LLMChatService:
         
         # 사용자 메시지를 DB에 저장
         user_message_id = gen()
-        self.chat_crud.save_user_message_simple(user_message_id, chat_id, user_id, message)
+        user_tokens = self._count_tokens(message)
+        self.chat_crud.save_user_message_simple(
+            user_message_id, chat_id, user_id, message, token_count=user_tokens
+        )
+        
+        # 캐시된 히스토리에 사용자 메시지 추가 (캐시가 없으면 다음 조회 시 DB에서 재구성)
+        if self.use_redis:
+            self.redis_client.append_chat_message(chat_id, self._history_entry("user", message, user_tokens))
+        
+        logger.debug(f"Saved user message for chat {chat_id}")
+        
+        return user_message_id
+    
+    async def save_user_message_async(self, chat_id: str, message: str, user_id: str = "user") -> str:
+        """사용자 메시지를 저장하고 메시지 ID 반환 (스트리밍용, 비동기)"""
+        await self._ensure_chat_exists_async(chat_id)
+        
+        user_message_id = gen()
+        user_tokens = self._count_tokens(message)
+        await self.async_chat_crud.save_user_message_simple(
+            user_message_id, chat_id, user_id, message, token_count=user_tokens
+        )
+        
+        # 캐시된 히스토리에 사용자 메시지 추가
+        if self.use_redis:
+            await self.redis_client.append_chat_message_async(
+                chat_id, self._history_entry("user", message, user_tokens)
+            )
         
-        # 스트리밍에서는 캐시 무효화를 하지 않음 (성능 향상)
-        # 대화 완료 후에만 캐시를 업데이트
         logger.debug(f"Saved user message for chat {chat_id}")
         
         return user_message_id
     
     async def generate_ai_response_stream(self, chat_id: str, user_id: str = "user"):
-        """AI 응답을 스트리밍으로 생성"""
+        """AI 응답을 스트리밍으로 생성
+        
+        이벤트 루프에서 실행되므로 DB는 AsyncChatCRUD, 레디스는 redis.asyncio 클라이언트만 사용한다.
+        """
         ai_message_id = None
         ai_response_content = ""
         is_cancelled = False
         
+        # 취소 신호 구독 (청크마다 레디스/DB를 조회하지 않고 이벤트 플래그만 확인)
+        cancel_event = self.cancel_bus.register(chat_id)
+        
         try:
+            if self.use_redis:
+                try:
+                    await self.cancel_bus.ensure_listener(self.redis_client)
+                except Exception as e:
+                    logger.warning(f"Redis cancel subscription failed: {e}")
+            
             # 세션 존재 확인 및 초기화
-            self._ensure_chat_exists(chat_id)
+            await self._ensure_chat_exists_async(chat_id)
             
             # 생성 시작 표시 (레디스에 저장)
             if self.use_redis:
                 try:
                     generation_key = f"generation:{chat_id}"
-                    self.redis_client.redis_client.setex(generation_key, 300, "1")  # 5분 TTL
+                    await self.redis_client.async_redis_client.setex(generation_key, 300, "1")  # 5분 TTL
                 except Exception as e:
                     logger.warning(f"Redis generation start failed: {e}")
             
@@ -425,7 +497,7 @@ class LLMChatService:
             }
             
             # 취소 확인
-            if self.is_cancelled.get(chat_id, False):
+            if cancel_event.is_set():
                 is_cancelled = True
                 yield {
                     'type': 'cancelled',
@@ -435,7 +507,7 @@ class LLMChatService:
                 return
             
             # 대화 기록을 가져와서 OpenAI 형식으로 변환 (레디스 우선)
-            messages = self._get_messages_for_openai(chat_id)
+            messages = await self._get_messages_for_openai_async(chat_id)
             
             # 시스템 프롬프트 추가
             system_prompt = {
@@ -457,7 +529,7 @@ class LLMChatService:
             }
             
             # 취소 확인
-            if self.is_cancelled.get(chat_id, False):
+            if cancel_event.is_set():
                 is_cancelled = True
                 yield {
                     'type': 'cancelled',
@@ -473,40 +545,32 @@ class LLMChatService:
             ai_message_id = gen()
             
             # AI 응답을 진행중 상태로 DB에 저장
-            self.chat_crud.save_ai_message_generating(ai_message_id, chat_id, user_id)
+            await self.async_chat_crud.save_ai_message_generating(ai_message_id, chat_id, user_id)
             
+            last_db_cancel_check = time.monotonic()
             async for chunk in stream:
-                # 취소 확인 (레디스 우선)
-                if self.use_redis:
-                    try:
-                        cancel_key = f"cancel:{chat_id}"
-                        if self.redis_client.redis_client.exists(cancel_key):
-                            is_cancelled = True
-                            logger.info(f"Cancellation detected in stream for session: {chat_id}")
-                            yield {
-                                'type': 'cancelled',
-                                'message': '사용자에 의해 취소되었습니다.',
-                                'timestamp': self.get_current_timestamp()
-                            }
-                            break
-                    except Exception as e:
-                        logger.warning(f"Redis cancel check failed: {e}")
+                # 레디스 미사용(또는 취소 채널 재구독 중) 시 다른 프로세스의 취소를 주기적으로 DB에서 확인
+                # (청크마다 조회하지 않음)
+                if (not self.use_redis or not self.cancel_bus.is_listening) and not cancel_event.is_set():
+                    now = time.monotonic()
+                    if now - last_db_cancel_check >= self.cancel_db_poll_interval:
+                        last_db_cancel_check = now
+                        try:
+                            if await self.async_chat_crud.is_message_cancelled(ai_message_id):
+                                cancel_event.set()
+                        except Exception as e:
+                            logger.warning(f"DB cancel check failed: {e}")
                 
-                # 레디스에 없거나 실패한 경우 DB에서 확인
-                if not is_cancelled:
-                    try:
-                        messages = self.chat_crud.get_messages(chat_id)
-                        if messages and messages[-1].is_cancelled:
-                            is_cancelled = True
-                            logger.info(f"Cancellation detected in stream for session: {chat_id}")
-                            yield {
-                                'type': 'cancelled',
-                                'message': '사용자에 의해 취소되었습니다.',
-                                'timestamp': self.get_current_timestamp()
-                            }
-                            break
-                    except Exception as e:
-                        logger.warning(f"DB cancel check failed: {e}")
+                # 취소 확인
+                if cancel_event.is_set():
+                    is_cancelled = True
+                    logger.info(f"Cancellation detected in stream for session: {chat_id}")
+                    yield {
+                        'type': 'cancelled',
+                        'message': '사용자에 의해 취소되었습니다.',
+                        'timestamp': self.get_current_timestamp()
+                    }
+                    break
                 
                 # Provider별 스트림 청크 처리
                 content = self.llm_provider.process_stream_chunk(chunk)
@@ -524,27 +588,27 @@ class LLMChatService:
             
             # 취소되지 않은 경우에만 완전한 응답 처리
             if not is_cancelled and ai_response_content:
-                # External API provider인 경우 노드 데이터 저장
-                if hasattr(self.llm_provider, 'get_collected_node_data'):
-                    node_data = self.llm_provider.get_collected_node_data()
-                    if node_data:
-                        # 노드 데이터와 함께 메시지 완료 업데이트
-                        self.chat_crud.update_ai_message_completed(ai_message_id, ai_response_content, node_data)
-                        # 노드 데이터 초기화
-                        self.llm_provider.clear_node_data()
-                    else:
-                        self.chat_crud.update_ai_message_completed(ai_message_id, ai_response_content)
+                # 완료된 응답의 토큰 수를 함께 저장 (다음 턴에서 재토큰화 방지)
+                response_tokens = self._count_tokens(ai_response_content)
+                
+                # External API provider인 경우 노드 데이터 저장 (스트림 객체별로 수집됨)
+                node_data = stream.get_collected_node_data() if hasattr(stream, 'get_collected_node_data') else None
+                if node_data:
+                    # 노드 데이터와 함께 메시지 완료 업데이트
+                    await self.async_chat_crud.update_ai_message_completed(
+                        ai_message_id, ai_response_content, node_data, token_count=response_tokens
+                    )
                 else:
-                    # 일반 provider인 경우
-                    self.chat_crud.update_ai_message_completed(ai_message_id, ai_response_content)
+                    await self.async_chat_crud.update_ai_message_completed(
+                        ai_message_id, ai_response_content, token_count=response_tokens
+                    )
                 
-                # 스트리밍 완료 후 캐시 무효화
+                # 스트리밍 완료 후 캐시된 히스토리에 AI 응답 추가 (전체 재구성 없음)
                 if self.use_redis:
-                    try:
-                        self.redis_client.delete_chat_messages(chat_id)
-                        logger.debug(f"Invalidated cache for chat {chat_id} after streaming completion")
-                    except Exception as e:
-                        logger.warning(f"Redis cache invalidation failed: {e}")
+                    if await self.redis_client.append_chat_message_async(
+                        chat_id, self._history_entry("assistant", ai_response_content, response_tokens)
+                    ):
+                        logger.debug(f"Appended AI response to cached history for chat {chat_id}")
                 
                 # 완료 표시
                 yield {
@@ -558,22 +622,16 @@ class LLMChatService:
                 # 취소된 경우 - 메시지 처리
                 try:
                     if ai_message_id:
-                        self.chat_crud.update_message_to_error(ai_message_id, "⚠️ 응답이 취소되었습니다.")
+                        await self.async_chat_crud.update_message_to_error(ai_message_id, "⚠️ 응답이 취소되었습니다.")
                     else:
                         # ai_message_id가 없으면 새로 생성
                         ai_message_id = gen()
                         
                         # 채팅방이 존재하는지 확인하고, 없으면 생성
-                        chat = self.chat_crud.get_chat(chat_id)
-                        if not chat:
-                            self.chat_crud.create_chat(
-                                chat_id=chat_id,
-                                chat_title=f"Chat {chat_id}",
-                                user_id=user_id
-                            )
+                        await self.async_chat_crud.get_chat_or_create(chat_id, user_id)
                             
                         # 취소 메시지 저장
-                        self.chat_crud.create_message(
+                        await self.async_chat_crud.create_message(
                             message_id=ai_message_id,
                             chat_id=chat_id,
                             user_id=user_id,
@@ -588,7 +646,9 @@ class LLMChatService:
                     if not ai_message_id:
                         ai_message_id = gen()
                 
-                # DB에 이미 저장되었으므로 메모리 저장 불필요
+                # 취소 메시지는 캐시에 추가하지 않고 무효화 (다음 조회 시 DB에서 재구성)
+                if self.use_redis:
+                    await self.redis_client.delete_chat_messages_async(chat_id)
                 
                 # 취소 완료 메시지 스트림 전송
                 yield {
@@ -603,12 +663,10 @@ class LLMChatService:
             # HandledException은 스트림으로 전달 (연결 유지)
             if ai_message_id:
                 try:
-                    self.chat_crud.update_message_status(ai_message_id, "error")
-                    # 에러 메시지로 업데이트
-                    message = self.db.query(ChatMessage).filter(ChatMessage.message_id == ai_message_id).first()
-                    if message:
-                        message.message = f"❌ 오류가 발생했습니다: {e.message}"
-                        self.db.commit()
+                    # 에러 상태 및 에러 메시지로 업데이트
+                    await self.async_chat_crud.update_message_to_error(ai_message_id, e.message)
+                    if self.use_redis:
+                        await self.redis_client.delete_chat_messages_async(chat_id)
                 except Exception as db_error:
                     logger.error(f"Failed to update message status to error: {db_error}")
             
@@ -626,12 +684,10 @@ class LLMChatService:
             # 에러 발생 시 메시지 상태를 error로 업데이트
             if ai_message_id:
                 try:
-                    self.chat_crud.update_message_status(ai_message_id, "error")
-                    # 에러 메시지로 업데이트
-                    message = self.db.query(ChatMessage).filter(ChatMessage.message_id == ai_message_id).first()
-                    if message:
-                        message.message = f"❌ 오류가 발생했습니다: {str(e)}"
-                        self.db.commit()
+                    # 에러 상태 및 에러 메시지로 업데이트
+                    await self.async_chat_crud.update_message_to_error(ai_message_id, str(e))
+                    if self.use_redis:
+                        await self.redis_client.delete_chat_messages_async(chat_id)
                 except Exception as db_error:
                     logger.error(f"Failed to update message status to error: {db_error}")
             
@@ -647,11 +703,13 @@ class LLMChatService:
             )
             yield error_response.dict()
         finally:
+            self.cancel_bus.unregister(chat_id, cancel_event)
+            
             # 생성 완료 - 레디스에서 생성 상태 제거
             if self.use_redis:
                 try:
                     generation_key = f"generation:{chat_id}"
-                    self.redis_client.redis_client.delete(generation_key)
+                    await self.redis_client.async_redis_client.delete(generation_key)
                 except Exception as e:
                     logger.warning(f"Redis generation cleanup failed: {e}")
     
@@ -663,35 +721,34 @@ class LLMChatService:
                 raise HandledException(ResponseCode.CHAT_SESSION_NOT_FOUND, msg="채팅 ID가 유효하지 않습니다.")
             
             # 세션 존재 확인 및 초기화
-            self._ensure_chat_exists(chat_id)
+            await self._ensure_chat_exists_async(chat_id)
+            
+            # 취소 신호 발행 (로컬 스트림 이벤트 + 레디스 pub/sub로 다른 파드에 전파)
+            delivered = await self.cancel_bus.cancel(
+                chat_id, self.redis_client if self.use_redis else None
+            )
             
-            # 레디스에서 생성 상태 확인
+            # 레디스 생성 상태 제거
             if self.use_redis:
                 try:
                     generation_key = f"generation:{chat_id}"
-                    if self.redis_client.redis_client.exists(generation_key):
-                        # 레디스에서 생성 상태 제거
-                        self.redis_client.redis_client.delete(generation_key)
-                        
-                        # 취소 상태를 레디스에 저장
-                        cancel_key = f"cancel:{chat_id}"
-                        self.redis_client.redis_client.setex(cancel_key, 60, "1")  # 1분 TTL
-                        
-                        logger.info(f"Generation cancelled for session: {chat_id}")
-                        return True
+                    await self.redis_client.async_redis_client.delete(generation_key)
                 except Exception as e:
                     logger.warning(f"Redis cancel check failed: {e}")
             
+            # 스트림이 신호를 받았으면 완료 (받은 리스너가 없으면 DB 취소 상태로 전달 - 스트림이 DB를 확인)
+            if delivered:
+                logger.info(f"Generation cancelled for session: {chat_id}")
+                return True
+            
             # DB에서 현재 생성 중인 메시지가 있는지 확인
-            messages = self.chat_crud.get_messages(chat_id)
-            
-            # 최근 메시지가 generating 상태인지 확인
-            if messages and messages[-1].status == "generating":
-                # 생성 중인 메시지를 취소 상태로 변경
-                messages[-1].status = "cancelled"
-                messages[-1].is_cancelled = True
-                messages[-1].message = "⚠️ 응답이 취소되었습니다."
-                self.db.commit()
+            generating_message_id = await self.async_chat_crud.get_generating_message_id(chat_id)
+            
+            if generating_message_id:
+                # 생성 중인 메시지를 취소 상태로 변경 (레디스 미사용 파드는 이 상태를 주기적으로 확인)
+                await self.async_chat_crud.update_message_cancelled(
+                    generating_message_id, "⚠️ 응답이 취소되었습니다."
+                )
                 logger.info(f"Generation cancelled for session: {chat_id}")
                 return True
             else:
@@ -712,16 +769,10 @@ class LLMChatService:
             ai_message_id = gen()
             
             # 채팅방이 존재하는지 확인하고, 없으면 생성
-            chat = self.chat_crud.get_chat(chat_id)
-            if not chat:
-                self.chat_crud.create_chat(
-                    chat_id=chat_id,
-                    chat_title=f"Chat {chat_id}",
-                    user_id=user_id
-                )
+            await self.async_chat_crud.get_chat_or_create(chat_id, user_id)
             
             # 취소 메시지 저장
-            self.chat_crud.create_message(
+            await self.async_chat_crud.create_message(
                 message_id=ai_message_id,
                 chat_id=chat_id,
                 user_id=user_id,
@@ -750,9 +801,9 @@ class LLMChatService:
                 logger.warning(f"Redis generation check failed: {e}")
         
         # 레디스에 없거나 실패한 경우 DB에서 확인
-        messages = self.chat_crud.get_messages(chat_id)
+        messages = self.chat_crud.get_recent_messages(chat_id, 1)
         # 최근 메시지가 generating 상태인지 확인
-        return messages and messages[-1].status == "generating"
+        return bool(messages) and messages[-1].status == "generating"
     
     def create_chat(self, chat_title: str, user_id: str) -> str:
         """새로운 채팅 생성"""
@@ -789,17 +840,7 @@ class LLMChatService:
             # DB 삭제 성공 시 Redis 캐시도 삭제
             if success and self.use_redis:
                 try:
-                    # 채팅방 관련 모든 캐시 삭제
-                    self.redis_client.delete_chat_messages(chat_id)
-                    
-                    # 생성 상태 캐시 삭제
-                    generation_key = f"generation:{chat_id}"
-                    self.redis_client.redis_client.delete(generation_key)
-                    
-                    # 취소 상태 캐시 삭제
-                    cancel_key = f"cancel:{chat_id}"
-                    self.redis_client.redis_client.delete(cancel_key)
-                    
+                    self._clear_chat_cache(chat_id)
                     logger.debug(f"Cleared all cache for deleted chat {chat_id}")
                 except Exception as e:
                     logger.warning(f"Redis cache cleanup failed for chat {chat_id}: {e}")
@@ -3,9 +3,12 @@
 import json
 import logging
 import os
+import threading
+import time
+from datetime import datetime
 from typing import Any, AsyncGenerator, Dict, Optional
 
-import aiohttp
+import httpx
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
 from langserve import RemoteRunnable
@@ -14,6 +17,59 @@ from openai import AsyncOpenAI
 logger = logging.getLogger(__name__)
 
 
+class ProviderStats:
+    """LLM 제공자 호출 통계 (헬스 체크용)"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.total_latency_ms = 0.0
+        self.last_latency_ms = None
+        self.last_success_at = None
+        self.last_error = None
+        self.last_error_at = None
+        self._lock = threading.Lock()
+    
+    def record_success(self, started: float):
+        """성공 호출 기록 (started: time.monotonic() 시작 시각)"""
+        latency_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self.requests += 1
+            self.total_latency_ms += latency_ms
+            self.last_latency_ms = latency_ms
+            self.last_success_at = datetime.now()
+    
+    def record_failure(self, started: float, error: Exception):
+        """실패 호출 기록"""
+        latency_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.total_latency_ms += latency_ms
+            self.last_latency_ms = latency_ms
+            self.last_error = str(error)
+            self.last_error_at = datetime.now()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """통계를 딕셔너리로 반환"""
+        with self._lock:
+            # 마지막 호출이 실패면 degraded
+            healthy = self.last_error_at is None or (
+                self.last_success_at is not None and self.last_success_at > self.last_error_at
+            )
+            return {
+                "status": "healthy" if healthy else "degraded",
+                "requests": self.requests,
+                "failures": self.failures,
+                "error_rate": round(self.failures / self.requests, 4) if self.requests else 0.0,
+                "avg_latency_ms": round(self.total_latency_ms / self.requests, 2) if self.requests else None,
+                "last_latency_ms": round(self.last_latency_ms, 2) if self.last_latency_ms is not None else None,
+                "last_success_at": self.last_success_at.isoformat() if self.last_success_at else None,
+                "last_error": self.last_error,
+                "last_error_at": self.last_error_at.isoformat() if self.last_error_at else None,
+            }
+
+
 class BaseLLMProvider:
     """Base class for LLM providers"""
     
@@ -21,6 +77,7 @@ class BaseLLMProvider:
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.stats = ProviderStats()
     
     async def create_completion(self, messages, stream=False):
         """Create completion from LLM provider"""
@@ -33,22 +90,29 @@ class BaseLLMProvider:
     def process_stream_chunk(self, chunk):
         """Process streaming chunk and extract content"""
         raise NotImplementedError("Subclasses must implement process_stream_chunk")
+    
+    async def aclose(self):
+        """제공자가 보유한 HTTP 클라이언트 종료 (종료 시 레지스트리에서 호출)"""
+        pass
 
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI provider implementation"""
     
-    def __init__(self, api_key: str, base_url: str, model: str = "gpt-3.5-turbo", max_tokens: int = 1000, temperature: float = 0.7):
+    def __init__(self, api_key: str, base_url: str = None, model: str = "gpt-3.5-turbo", max_tokens: int = 1000, temperature: float = 0.7,
+                 http_client: httpx.AsyncClient = None):
         super().__init__(model, max_tokens, temperature)
         
         if not api_key:
             raise HandledException(ResponseCode.LLM_CONFIG_ERROR, msg="OpenAI API key is required")
         
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        # http_client: 레지스트리의 공유 keep-alive 커넥션 풀 (None이면 SDK 기본 클라이언트)
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
         logger.info("OpenAI provider initialized with model: " + str(model))
     
     async def create_completion(self, messages: list, stream: bool = False):
         """Create completion using OpenAI API"""
+        started = time.monotonic()
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
@@ -57,8 +121,10 @@ class OpenAIProvider(BaseLLMProvider):
                 temperature=self.temperature,
                 stream=stream
             )
+            self.stats.record_success(started)
             return response
         except Exception as e:
+            self.stats.record_failure(started, e)
             logger.error("OpenAI API error: " + str(e))
             raise HandledException(ResponseCode.CHAT_AI_RESPONSE_ERROR, e=e)
     
@@ -90,13 +156,18 @@ class OpenAIProvider(BaseLLMProvider):
         if chunk.choices and len(chunk.choices) > 0 and chunk.choices[0].delta.content is not None:
             return chunk.choices[0].delta.content
         return None
+    
+    async def aclose(self):
+        """AsyncOpenAI 클라이언트 종료 (공유 커넥션 풀이면 레지스트리 종료와 중복되어도 무해)"""
+        await self.client.close()
 
 
 class AzureOpenAIProvider(BaseLLMProvider):
     """Azure OpenAI provider implementation"""
     
     def __init__(self, api_key: str, endpoint: str, deployment_name: str, 
-                 api_version: str, max_tokens: int = 1000, temperature: float = 0.7):
+                 api_version: str, max_tokens: int = 1000, temperature: float = 0.7,
+                 http_client: httpx.AsyncClient = None):
         super().__init__(deployment_name, max_tokens, temperature)
         
         if not api_key:
@@ -109,12 +180,14 @@ class AzureOpenAIProvider(BaseLLMProvider):
         self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=endpoint.rstrip('/') + "/openai/deployments/" + deployment_name,
-            default_query={"api-version": api_version}
+            default_query={"api-version": api_version},
+            http_client=http_client
         )
         logger.info("Azure OpenAI provider initialized with deployment: " + str(deployment_name))
     
     async def create_completion(self, messages: list, stream: bool = False):
         """Create completion using Azure OpenAI API"""
+        started = time.monotonic()
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,  # deployment name
@@ -123,8 +196,10 @@ class AzureOpenAIProvider(BaseLLMProvider):
                 temperature=self.temperature,
                 stream=stream
             )
+            self.stats.record_success(started)
             return response
         except Exception as e:
+            self.stats.record_failure(started, e)
             logger.error("Azure OpenAI API error: " + str(e))
             raise HandledException(ResponseCode.CHAT_AI_RESPONSE_ERROR, e=e)
     
@@ -157,13 +232,38 @@ class AzureOpenAIProvider(BaseLLMProvider):
         if chunk.choices and len(chunk.choices) > 0 and chunk.choices[0].delta.content is not None:
             return chunk.choices[0].delta.content
         return None
+    
+    async def aclose(self):
+        """AsyncOpenAI 클라이언트 종료 (공유 커넥션 풀이면 레지스트리 종료와 중복되어도 무해)"""
+        await self.client.close()
+
+
+class ExternalAPIStream:
+    """External API 스트림 래퍼 - 스트림별 노드 데이터 수집
+    
+    provider 인스턴스는 프로세스 전체에서 공유되므로 노드 데이터는
+    provider가 아닌 각 스트림 객체에 모아 동시 스트림 간 섞이지 않도록 한다.
+    """
+    
+    def __init__(self, provider, request_body: dict):
+        self.provider = provider
+        self.request_body = request_body
+        self.node_data = {}
+    
+    def __aiter__(self):
+        return self.provider._create_streaming_completion(self.request_body, self.node_data)
+    
+    def get_collected_node_data(self):
+        """수집된 노드 데이터 반환"""
+        return self.node_data.copy()
 
 
 class ExternalAPIProvider(BaseLLMProvider):
     """External API Agent provider implementation using LangServe RemoteRunnable"""
     
     def __init__(self, api_url: str, authorization_header: str, 
-                 max_tokens: int = 1000, temperature: float = 0.7):
+                 max_tokens: int = 1000, temperature: float = 0.7,
+                 http_limits: httpx.Limits = None):
         super().__init__("external_api", max_tokens, temperature)
         
         if not api_url:
@@ -173,16 +273,19 @@ class ExternalAPIProvider(BaseLLMProvider):
         
         self.api_url = api_url.rstrip('/')
         self.authorization_header = authorization_header
-        self.node_data = {}  # 노드 데이터를 메모리에 수집
+        self._title_provider = None
         
         # LangServe RemoteRunnable 초기화
         headers = {
             "Authorization": self.authorization_header,
         }
         
+        # RemoteRunnable은 내부 httpx 클라이언트를 보유하므로 인스턴스를 재사용하면 커넥션도 재사용됨
+        client_kwargs = {"limits": http_limits} if http_limits is not None else None
         self.agent = RemoteRunnable(
             self.api_url,
-            headers=headers
+            headers=headers,
+            client_kwargs=client_kwargs
         )
         
         logger.info("External API provider initialized with URL: " + str(self.api_url))
@@ -218,8 +321,8 @@ class ExternalAPIProvider(BaseLLMProvider):
             }
             
             if stream:
-                # 스트리밍의 경우 async generator를 직접 반환
-                return self._create_streaming_completion(request_body)
+                # 스트리밍의 경우 스트림별 노드 데이터를 수집하는 async iterator 반환
+                return ExternalAPIStream(self, request_body)
             else:
                 return await self._create_non_streaming_completion(request_body)
                 
@@ -227,24 +330,27 @@ class ExternalAPIProvider(BaseLLMProvider):
             logger.error("External API error: " + str(e))
             raise HandledException(ResponseCode.CHAT_AI_RESPONSE_ERROR, e=e)
     
-    async def _create_streaming_completion(self, request_body: dict):
+    async def _create_streaming_completion(self, request_body: dict, node_data: dict):
         """Create streaming completion using LangServe RemoteRunnable"""
+        started = time.monotonic()
         try:
             # LangServe RemoteRunnable의 stream 메서드 사용
             async for chunk in self.agent.astream(request_body):
                 logger.debug(f"Received chunk: {chunk}")
                 
                 # LangServe 스타일의 청크 처리
-                content = self._extract_content_from_chunk(chunk)
+                content = self._extract_content_from_chunk(chunk, node_data)
                 if content is not None:
                     yield self._create_chunk_object({'content': content})
+            self.stats.record_success(started)
                     
         except Exception as e:
+            self.stats.record_failure(started, e)
             logger.error(f"LangServe streaming error: {e}")
             raise HandledException(ResponseCode.CHAT_AI_RESPONSE_ERROR, e=e)
     
     
-    def _extract_content_from_chunk(self, chunk_data: dict):
+    def _extract_content_from_chunk(self, chunk_data: dict, node_data: dict):
         """청크 데이터에서 스트리밍할 컨텐츠 추출"""
         # LangServe 스타일의 청크 처리
         if chunk_data.get("final_result"):
@@ -256,7 +362,7 @@ class ExternalAPIProvider(BaseLLMProvider):
         elif chunk_data.get("updates"):
             # 노드 업데이트는 스트리밍하지 않지만 데이터 저장
             logger.debug(f"Node updates: {chunk_data}")
-            self._store_node_data(chunk_data)
+            self._store_node_data(chunk_data, node_data)
             return None
         elif chunk_data.get("progress"):
             # 진행상황은 스트리밍하지 않음
@@ -271,8 +377,8 @@ class ExternalAPIProvider(BaseLLMProvider):
         return None
     
     
-    def _store_node_data(self, chunk_data: dict):
-        """노드 결과 데이터를 메모리에 수집 (LangServe 스타일)"""
+    def _store_node_data(self, chunk_data: dict, collected: dict):
+        """노드 결과 데이터를 스트림별 딕셔너리에 수집 (LangServe 스타일)"""
         # 노드 기본 정보 추출
         node_name = chunk_data.get('node_name', 'unknown')
         node_type = chunk_data.get('node_type', 'unknown')
@@ -290,26 +396,21 @@ class ExternalAPIProvider(BaseLLMProvider):
             if key not in ['node_name', 'node_type', 'updates']:
                 node_data[key] = value
         
-        # 노드 데이터를 메모리에 저장
-        self.node_data[node_name] = node_data
+        # 노드 데이터를 스트림별 딕셔너리에 저장
+        collected[node_name] = node_data
         logger.debug(f"Node '{node_name}' ({node_type}) data collected: {node_data}")
     
-    def get_collected_node_data(self):
-        """수집된 노드 데이터 반환"""
-        return self.node_data.copy()
-    
-    def clear_node_data(self):
-        """노드 데이터 초기화"""
-        self.node_data.clear()
-    
     
     async def _create_non_streaming_completion(self, request_body: dict):
         """Create non-streaming completion using LangServe RemoteRunnable"""
+        started = time.monotonic()
         try:
             # LangServe RemoteRunnable의 invoke 메서드 사용
             response_data = await self.agent.ainvoke(request_body)
+            self.stats.record_success(started)
             return self._create_completion_object(response_data)
         except Exception as e:
+            self.stats.record_failure(started, e)
             logger.error(f"LangServe non-streaming error: {e}")
             raise HandledException(ResponseCode.CHAT_AI_RESPONSE_ERROR, e=e)
     
@@ -340,17 +441,12 @@ class ExternalAPIProvider(BaseLLMProvider):
     async def create_title_completion(self, message: str):
         """Create title completion using OpenAIProvider (External API는 타이틀만 OpenAI 사용)"""
         try:
-            # OpenAIProvider를 직접 생성해서 타이틀 생성 (설정에서 값 가져오기)
-            from ai_backend.config.simple_settings import settings
-            
-            openai_provider = OpenAIProvider(
-                api_key=settings.openai_api_key,
-                base_url=settings.openai_base_url,
-                model=settings.openai_model,
-            )
+            # 타이틀용 OpenAIProvider는 최초 1회만 생성 (레지스트리의 공유 커넥션 풀 사용)
+            if self._title_provider is None:
+                self._title_provider = get_llm_provider_registry().get_provider("openai")
             
             # OpenAIProvider의 create_title_completion 사용
-            return await openai_provider.create_title_completion(message)
+            return await self._title_provider.create_title_completion(message)
             
         except Exception as e:
             logger.error("External API title generation error: " + str(e))
@@ -363,14 +459,23 @@ class ExternalAPIProvider(BaseLLMProvider):
             if hasattr(delta, 'content') and delta.content is not None:
                 return delta.content
         return None
+    
+    async def aclose(self):
+        """RemoteRunnable 내부 httpx 클라이언트(동기/비동기) 종료"""
+        await self.agent.async_client.aclose()
+        self.agent.sync_client.close()
 
 
 class LLMProviderFactory:
     """Factory class for creating LLM providers"""
     
     @staticmethod
-    def create_provider(provider_type: str = None) -> BaseLLMProvider:
-        """Create LLM provider based on configuration"""
+    def create_provider(provider_type: str = None, http_client: httpx.AsyncClient = None,
+                        http_limits: httpx.Limits = None) -> BaseLLMProvider:
+        """Create LLM provider based on configuration
+        
+        요청마다 호출하지 말고 LLMProviderRegistry.get_provider()를 통해 재사용할 것
+        """
         
         # 환경 변수에서 제공자 타입 가져오기
         if not provider_type:
@@ -379,11 +484,11 @@ class LLMProviderFactory:
         logger.info("Creating LLM provider: " + str(provider_type))
         
         if provider_type == "openai":
-            return LLMProviderFactory._create_openai_provider()
+            return LLMProviderFactory._create_openai_provider(http_client)
         elif provider_type == "azure_openai":
-            return LLMProviderFactory._create_azure_openai_provider()
+            return LLMProviderFactory._create_azure_openai_provider(http_client)
         elif provider_type == "external_api":
-            return LLMProviderFactory._create_external_api_provider()
+            return LLMProviderFactory._create_external_api_provider(http_limits)
         else:
             raise HandledException(
                 ResponseCode.LLM_CONFIG_ERROR, 
@@ -391,22 +496,25 @@ class LLMProviderFactory:
             )
     
     @staticmethod
-    def _create_openai_provider() -> OpenAIProvider:
+    def _create_openai_provider(http_client: httpx.AsyncClient = None) -> OpenAIProvider:
         """Create OpenAI provider"""
         api_key = os.getenv("OPENAI_API_KEY")
+        base_url = os.getenv("OPENAI_BASE_URL") or None
         model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
         max_tokens = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
         temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
         
         return OpenAIProvider(
             api_key=api_key,
+            base_url=base_url,
             model=model,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            http_client=http_client
         )
     
     @staticmethod
-    def _create_azure_openai_provider() -> AzureOpenAIProvider:
+    def _create_azure_openai_provider(http_client: httpx.AsyncClient = None) -> AzureOpenAIProvider:
         """Create Azure OpenAI provider"""
         api_key = os.getenv("AZURE_OPENAI_API_KEY")
         endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -421,11 +529,12 @@ class LLMProviderFactory:
             deployment_name=deployment_name,
             api_version=api_version,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            http_client=http_client
         )
     
     @staticmethod
-    def _create_external_api_provider() -> ExternalAPIProvider:
+    def _create_external_api_provider(http_limits: httpx.Limits = None) -> ExternalAPIProvider:
         """Create External API provider"""
         api_url = os.getenv("EXTERNAL_API_URL")
         authorization_header = os.getenv("EXTERNAL_API_AUTHORIZATION")
@@ -436,5 +545,109 @@ class LLMProviderFactory:
             api_url=api_url,
             authorization_header=authorization_header,
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            http_limits=http_limits
         )
+
+
+class LLMProviderRegistry:
+    """프로세스 전역 LLM 제공자 레지스트리
+    
+    - 제공자 타입별로 provider 인스턴스를 1회만 생성하여 재사용
+    - OpenAI/Azure OpenAI는 하나의 httpx.AsyncClient(keep-alive 커넥션 풀)를 공유
+    - External API(RemoteRunnable)는 인스턴스 재사용으로 내부 커넥션 풀을 유지
+    """
+    
+    def __init__(self):
+        # 커넥션 풀 설정 (환경 변수)
+        self.max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.keepalive_expiry = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.timeout = float(os.getenv("LLM_HTTP_TIMEOUT", "600"))
+        
+        self._providers: Dict[str, BaseLLMProvider] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+    
+    def get_http_limits(self) -> httpx.Limits:
+        """커넥션 풀 제한 설정 반환"""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+    
+    def get_http_client(self) -> httpx.AsyncClient:
+        """공유 HTTP 클라이언트 반환 (최초 호출 시 생성)"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=self.get_http_limits(),
+                timeout=httpx.Timeout(self.timeout, connect=10.0)
+            )
+        return self._http_client
+    
+    def get_provider(self, provider_type: str = None) -> BaseLLMProvider:
+        """제공자 인스턴스 반환 (타입별 최초 1회 생성)"""
+        if not provider_type:
+            provider_type = os.getenv("LLM_PROVIDER", "openai")
+        provider_type = provider_type.lower()
+        
+        provider = self._providers.get(provider_type)
+        if provider is not None:
+            return provider
+        
+        with self._lock:
+            provider = self._providers.get(provider_type)
+            if provider is None:
+                provider = LLMProviderFactory.create_provider(
+                    provider_type,
+                    http_client=self.get_http_client(),
+                    http_limits=self.get_http_limits()
+                )
+                self._providers[provider_type] = provider
+                logger.info("LLM provider registered: " + str(provider_type))
+        return provider
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """제공자별 헬스 통계 반환"""
+        return {
+            "pool": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry,
+                "timeout": self.timeout
+            },
+            "providers": {
+                provider_type: {
+                    "provider": type(provider).__name__,
+                    "model": provider.model,
+                    **provider.stats.to_dict()
+                }
+                for provider_type, provider in self._providers.items()
+            }
+        }
+    
+    async def aclose(self):
+        """제공자별 클라이언트와 공유 HTTP 클라이언트 종료"""
+        providers = list(self._providers.items())
+        self._providers.clear()
+        for provider_type, provider in providers:
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.warning("LLM provider close failed (" + str(provider_type) + "): " + str(e))
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+# 전역 LLM 제공자 레지스트리 인스턴스
+llm_provider_registry = None
+
+
+def get_llm_provider_registry() -> LLMProviderRegistry:
+    """LLM 제공자 레지스트리 싱글톤 반환"""
+    global llm_provider_registry
+    if llm_provider_registry is None:
+        llm_provider_registry = LLMProviderRegistry()
+    return llm_provider_registry
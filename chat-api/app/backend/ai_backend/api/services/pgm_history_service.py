@@ -2,6 +2,7 @@
 """PGM Mapping History service."""
 
 import logging
+from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 from ai_backend.database.crud.pgm_mapping_crud import PgmMappingHistoryCrud
 from ai_backend.database.models.pgm_mapping_models import (
@@ -14,6 +15,14 @@ from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# 매핑 활동 집계 구간 (bucket → 구간 길이, 기본 조회 기간)
+ACTIVITY_BUCKETS = {
+    "hour": (timedelta(hours=1), timedelta(days=2)),
+    "day": (timedelta(days=1), timedelta(days=30)),
+}
+# 한 번에 조회할 수 있는 최대 구간 수 (hour 기준 약 1년)
+ACTIVITY_MAX_BUCKETS = 9000
+
 
 class PgmHistoryService:
     """매핑 이력 조회 서비스"""
@@ -103,17 +112,25 @@ class PgmHistoryService:
         self,
         skip: int = 0,
         limit: int = 100,
-        action: Optional[PgmMappingAction] = None
-    ) -> Tuple[List[PgmMappingHistory], int]:
-        """최근 매핑 변경 이력 조회 (전체)"""
+        action: Optional[PgmMappingAction] = None,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[PgmMappingHistory], Optional[int], Optional[str]]:
+        """최근 매핑 변경 이력 조회 (전체)
+        
+        Returns:
+            (이력 목록, 전체 개수, 다음 페이지 커서)
+        """
         try:
             histories, total = self.pgm_mapping_crud.get_recent_histories(
                 skip=skip,
                 limit=limit,
-                action=action
+                action=action,
+                cursor=cursor,
+                count_mode=count_mode
             )
             logger.info(f"전체 이력 조회: {len(histories)}개")
-            return histories, total
+            return histories, total, self.pgm_mapping_crud.next_cursor(histories, limit)
         except HandledException:
             raise
         except Exception as e:
@@ -122,18 +139,13 @@ class PgmHistoryService:
     def get_history_stats_by_plc(self, plc_id: str) -> dict:
         """특정 PLC의 매핑 이력 통계"""
         try:
-            # 전체 이력 조회
-            all_histories, total = self.pgm_mapping_crud.get_histories_by_plc(
-                plc_id=plc_id,
-                skip=0,
-                limit=1000  # 충분히 큰 값
-            )
-            
-            # 액션별 카운트
-            create_count = sum(1 for h in all_histories if h.action == PgmMappingAction.CREATE.value)
-            update_count = sum(1 for h in all_histories if h.action == PgmMappingAction.UPDATE.value)
-            delete_count = sum(1 for h in all_histories if h.action == PgmMappingAction.DELETE.value)
-            restore_count = sum(1 for h in all_histories if h.action == PgmMappingAction.RESTORE.value)
+            # 액션별 카운트 (GROUP BY 1회)
+            counts = self.pgm_mapping_crud.count_actions_by_plc(plc_id)
+            create_count = counts.get(PgmMappingAction.CREATE.value, 0)
+            update_count = counts.get(PgmMappingAction.UPDATE.value, 0)
+            delete_count = counts.get(PgmMappingAction.DELETE.value, 0)
+            restore_count = counts.get(PgmMappingAction.RESTORE.value, 0)
+            total = sum(counts.values())
             
             # 최근 액션
             latest_action = self.pgm_mapping_crud.get_latest_action_by_plc(plc_id)
@@ -154,3 +166,92 @@ class PgmHistoryService:
             raise
         except Exception as e:
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+
+    def get_mapping_activity(
+        self,
+        bucket: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        group_by: Optional[str] = None,
+        actions: Optional[List[PgmMappingAction]] = None,
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        pgm_id: Optional[str] = None
+    ) -> dict:
+        """
+        매핑/해제 활동 시계열 (구간별 액션 건수, Plant/공정/Line/프로그램별 그룹 선택)
+        
+        - 기간은 [start, end), start는 구간 경계로 내림 (기본: end=현재, start=hour 2일 전 / day 30일 전)
+        - 건수가 0인 구간/그룹은 items에 없다
+        
+        Returns:
+            dict: bucket, group_by, start, end, totals, items
+        """
+        try:
+            if bucket not in ACTIVITY_BUCKETS:
+                raise HandledException(ResponseCode.VALIDATION_ERROR, msg=f"지원하지 않는 구간입니다: {bucket}")
+            if group_by is not None and group_by not in self.pgm_mapping_crud.ACTIVITY_GROUPS:
+                raise HandledException(ResponseCode.VALIDATION_ERROR, msg=f"지원하지 않는 그룹입니다: {group_by}")
+            
+            # ACTION_DT는 서버 로컬 시각(naive)으로 저장되므로 타임존이 있는 입력은 로컬 시각으로 변환
+            start, end = (
+                value.astimezone().replace(tzinfo=None) if value and value.tzinfo else value
+                for value in (start, end)
+            )
+            step, default_range = ACTIVITY_BUCKETS[bucket]
+            end = end or datetime.now()
+            start = start or end - default_range
+            start = start.replace(minute=0, second=0, microsecond=0)
+            if bucket == "day":
+                start = start.replace(hour=0)
+            if start >= end:
+                raise HandledException(ResponseCode.VALIDATION_ERROR, msg="start는 end보다 이전이어야 합니다.")
+            if (end - start) / step > ACTIVITY_MAX_BUCKETS:
+                raise HandledException(
+                    ResponseCode.VALIDATION_ERROR,
+                    msg=f"조회 구간이 너무 깁니다 (최대 {ACTIVITY_MAX_BUCKETS}개 구간, day 구간을 사용하세요)."
+                )
+            
+            rows = self.pgm_mapping_crud.get_activity(
+                start=start,
+                end=end,
+                bucket=bucket,
+                group_by=group_by,
+                actions=[action.value for action in actions] if actions else None,
+                plant=plant,
+                process=process,
+                line=line,
+                pgm_id=pgm_id
+            )
+            
+            group_attrs = self.pgm_mapping_crud.ACTIVITY_GROUPS.get(group_by, ())
+            totals = {"create_count": 0, "update_count": 0, "delete_count": 0, "restore_count": 0, "total_count": 0}
+            items = []
+            for row in rows:
+                create_count, update_count, delete_count, restore_count = (int(value) for value in row[-4:])
+                item = {
+                    "bucket": row[0],
+                    **dict(zip(group_attrs, row[1:1 + len(group_attrs)])),
+                    "create_count": create_count,
+                    "update_count": update_count,
+                    "delete_count": delete_count,
+                    "restore_count": restore_count,
+                    "total_count": create_count + update_count + delete_count + restore_count
+                }
+                for key in totals:
+                    totals[key] += item[key]
+                items.append(item)
+            
+            return {
+                "bucket": bucket,
+                "group_by": group_by,
+                "start": start,
+                "end": end,
+                "totals": totals,
+                "items": items
+            }
+        except HandledException:
+            raise
+        except Exception as e:
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
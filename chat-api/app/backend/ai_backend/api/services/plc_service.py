@@ -1,25 +1,59 @@
 # _*_ coding: utf-8 _*_
 """PLC Service for handling PLC operations."""
 import logging
-from typing import List, Optional
+import os
+import time
+from typing import IO, List, Optional
 
+from ai_backend.cache.plc_tree_cache import PlcTreeSnapshot, get_plc_tree_cache
 from ai_backend.database.crud.plc_crud import PlcCRUD
+from ai_backend.database.crud.program_crud import ProgramCRUD
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
+from ai_backend.utils.plc_import import (
+    PLC_IMPORT_FORMATS,
+    detect_import_format,
+    iter_batches,
+    iter_plc_records,
+    normalize_plc_record,
+)
+from ai_backend.utils.plc_search_index import PlcSearchIndex, highlight_spans, match_type
+from ai_backend.utils.plc_tree import (
+    PLC_HIERARCHY_FIELDS,
+    build_plc_infos,
+    build_plc_tree,
+    build_plc_tree_changes,
+    build_plc_tree_counts,
+)
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# pg_trgm 키워드 검색 최소 길이 (trigram은 3자부터 인덱스로 좁혀짐)
+TRIGRAM_MIN_KEYWORD_LENGTH = 3
+
+# PLC 일괄 등록 응답에 담을 최대 오류 행 수 (나머지는 failed 건수에만 반영)
+PLC_IMPORT_MAX_ERRORS = 1000
+
+# pg_trgm 인덱스 존재 여부 (프로세스당 1회 확인, 인덱스는 시작 시 생성됨)
+_trigram_available: Optional[bool] = None
+
 
 class PlcService:
     """PLC 서비스를 관리하는 클래스"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, redis_client=None):
         if db is None:
             raise ValueError("Database session is required")
         
         self.db = db
         self.plc_crud = PlcCRUD(db)
+        self.redis_client = redis_client
+        self.tree_cache = get_plc_tree_cache()
+    
+    def _invalidate_tree(self):
+        """PLC 데이터 변경 후 계층 트리 버전 증가 (다음 /plcs/tree 조회 시 재생성)"""
+        self.tree_cache.bump(self.redis_client)
     
     def create_plc(
         self,
@@ -60,6 +94,7 @@ class PlcService:
                 plc_name=plc_name,
                 create_user=create_user
             )
+            self._invalidate_tree()
             return plc
         
         except HandledException:
@@ -67,7 +102,105 @@ class PlcService:
         except Exception as e:
             # Service Layer에서는 구체적인 예외 타입을 모르므로 일반적인 오류로 처리
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
-    
+
+    def import_plcs(
+        self,
+        fp: IO[bytes],
+        filename: Optional[str] = None,
+        file_format: Optional[str] = None,
+        user: Optional[str] = None,
+        batch_size: int = 2000,
+        dry_run: bool = False,
+        encoding: str = "utf-8-sig"
+    ) -> dict:
+        """
+        PLC 일괄 등록 (계층 JSON / CSV·파이프 구분 텍스트 / Excel)
+
+        - 파일을 스트리밍으로 읽어 batch_size건씩 검증 후 청크 단위로 upsert/커밋
+        - 잘못된 행은 건너뛰고 행 번호와 사유를 errors에 담는다 (최대 PLC_IMPORT_MAX_ERRORS건)
+        - 같은 PLC ID가 다시 나오면 처음 행을 사용하고 이후 행은 오류로 보고
+        - 트리 버전은 끝에 한 번만 올린다
+        - dry_run이면 DB를 바꾸지 않고 추가/수정 예정 건수만 계산한다 (값이 같은 행도 수정으로 집계)
+        """
+        started = time.perf_counter()
+        if file_format is None:
+            file_format = detect_import_format(filename, fp.read(8))
+            fp.seek(0)
+        elif file_format not in PLC_IMPORT_FORMATS:
+            raise HandledException(ResponseCode.INVALID_DATA_FORMAT, msg=f"지원하지 않는 형식입니다: {file_format}")
+
+        summary = {
+            "format": file_format,
+            "dry_run": dry_run,
+            "total": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "errors": [],
+            "errors_truncated": False,
+            "version": None,
+            "elapsed_ms": 0.0,
+        }
+
+        def add_error(row: Optional[int], plc_id: Optional[str], message: str):
+            summary["failed"] += 1
+            if len(summary["errors"]) < PLC_IMPORT_MAX_ERRORS:
+                summary["errors"].append({"row": row, "plc_id": plc_id, "error": message})
+            else:
+                summary["errors_truncated"] = True
+
+        first_rows = {}  # PLC ID -> 처음 나온 행 번호
+        try:
+            records = iter_plc_records(fp, file_format, encoding=encoding)
+            for batch in iter_batches(records, batch_size):
+                chunk = []
+                for row, raw in batch:
+                    summary["total"] += 1
+                    record, error = normalize_plc_record(raw)
+                    if error:
+                        plc_id = raw.get("plc_id")
+                        add_error(row, str(plc_id) if plc_id is not None else None, error)
+                    elif record["plc_id"] in first_rows:
+                        add_error(row, record["plc_id"], f"중복된 PLC ID ({first_rows[record['plc_id']]}행에서 이미 등록)")
+                    else:
+                        first_rows[record["plc_id"]] = row
+                        chunk.append((row, record))
+                if chunk:
+                    self._import_chunk(chunk, user, dry_run, summary, add_error)
+        except (ValueError, UnicodeDecodeError) as e:
+            # 파일 구조 오류: 이미 반영된 청크는 유지하고 중단
+            add_error(None, None, f"파일을 더 읽을 수 없습니다: {e}")
+        finally:
+            if not dry_run and summary["inserted"] + summary["updated"] > 0:
+                summary["version"] = self.tree_cache.bump(self.redis_client)
+
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(
+            f"PLC import: format={file_format}, dry_run={dry_run}, total={summary['total']}, "
+            f"inserted={summary['inserted']}, updated={summary['updated']}, "
+            f"unchanged={summary['unchanged']}, failed={summary['failed']} in {summary['elapsed_ms']} ms"
+        )
+        return summary
+
+    def _import_chunk(self, chunk: List[tuple], user: Optional[str], dry_run: bool, summary: dict, add_error):
+        """검증된 청크 1개 반영 (DB 오류 시 청크 전체를 실패로 보고하고 계속 진행)"""
+        records = [record for _, record in chunk]
+        if dry_run:
+            existing = self.plc_crud.get_existing_plc_ids([record["plc_id"] for record in records])
+            summary["updated"] += len(existing)
+            summary["inserted"] += len(records) - len(existing)
+            return
+        try:
+            inserted, updated = self.plc_crud.bulk_upsert_plcs(records, user)
+        except HandledException as e:
+            for row, record in chunk:
+                add_error(row, record["plc_id"], f"DB 반영 실패: {e.message}")
+            return
+        summary["inserted"] += inserted
+        summary["updated"] += updated
+        summary["unchanged"] += len(records) - inserted - updated
+
     def get_plc(self, plc_id: str, include_deleted: bool = False):
         """PLC 조회"""
         try:
@@ -94,13 +227,17 @@ class PlcService:
         process: Optional[str] = None,
         line: Optional[str] = None,
         equipment_group: Optional[str] = None,
-        unit: Optional[str] = None
+        unit: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ):
-        """PLC 목록 조회"""
+        """PLC 목록 조회
+        
+        Returns:
+            (PLC 목록, 전체 개수, 다음 페이지 커서)
+        """
         try:
-            plcs = self.plc_crud.get_plcs(
-                skip=skip,
-                limit=limit,
+            filters = dict(
                 is_active=is_active,
                 plant=plant,
                 process=process,
@@ -108,8 +245,10 @@ class PlcService:
                 equipment_group=equipment_group,
                 unit=unit
             )
-            total_count = self.plc_crud.count_plcs(is_active=is_active)
-            return plcs, total_count
+            plcs = self.plc_crud.get_plcs(skip=skip, limit=limit, cursor=cursor, **filters)
+            total_count = self.plc_crud.count_plcs(count_mode=count_mode, **filters)
+            next_cursor = self.plc_crud.next_cursor(plcs, limit, PlcCRUD.HIERARCHY_ORDER)
+            return plcs, total_count, next_cursor
         except HandledException:
             raise
         except Exception as e:
@@ -141,6 +280,7 @@ class PlcService:
             if not plc:
                 raise HandledException(ResponseCode.PLC_NOT_FOUND, msg="PLC를 찾을 수 없습니다.")
             
+            self._invalidate_tree()
             return plc
         except HandledException:
             raise  # HandledException은 그대로 전파
@@ -155,6 +295,7 @@ class PlcService:
             if not success:
                 raise HandledException(ResponseCode.PLC_NOT_FOUND, msg="PLC를 찾을 수 없습니다.")
             
+            self._invalidate_tree()
             return True
         except HandledException:
             raise  # HandledException은 그대로 전파
@@ -169,6 +310,7 @@ class PlcService:
             if not success:
                 raise HandledException(ResponseCode.PLC_NOT_FOUND, msg="PLC를 찾을 수 없습니다.")
             
+            self._invalidate_tree()
             return True
         except HandledException:
             raise  # HandledException은 그대로 전파
@@ -184,38 +326,143 @@ class PlcService:
         except Exception as e:
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
-    def search_plcs(self, keyword: str, skip: int = 0, limit: int = 100, is_active: Optional[bool] = True):
-        """PLC 검색"""
+    def search_plcs(
+        self,
+        keyword: str,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: Optional[bool] = True,
+        cursor: Optional[str] = None
+    ):
+        """PLC 검색
+        
+        Returns:
+            (PLC 목록, 다음 페이지 커서)
+        """
         try:
             plcs = self.plc_crud.search_plcs(
                 keyword=keyword,
                 skip=skip,
                 limit=limit,
-                is_active=is_active
+                is_active=is_active,
+                cursor=cursor
             )
-            return plcs
+            return plcs, self.plc_crud.next_cursor(plcs, limit, PlcCRUD.PLC_ID_ORDER)
         except HandledException:
             raise
         except Exception as e:
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
-    def get_plc_count(self):
-        """PLC 개수 조회 (활성/비활성/전체)"""
+    def search_plcs_ranked(
+        self,
+        keyword: str,
+        limit: int = 20,
+        is_active: Optional[bool] = True
+    ):
+        """PLC 키워드 랭킹 검색 (완전 일치 → 접두 일치 → 부분 일치, 하이라이트 포함)
+        
+        검색 엔진은 PLC_SEARCH_ENGINE(auto/trigram/memory)로 정한다.
+        auto는 pg_trgm 인덱스가 있고 키워드가 3자 이상이면 DB, 그 외에는 메모리 검색 인덱스를 사용한다.
+        메모리 인덱스는 트리 캐시와 같은 버전으로 보관되어 PLC 변경 후 첫 검색에서 다시 만든다.
+        
+        Returns:
+            dict: keyword, engine, took_ms, items
+        """
+        try:
+            started = time.perf_counter()
+            engine = self._select_search_engine(keyword)
+            
+            if engine == "trigram":
+                rows = self.plc_crud.search_plcs_ranked(keyword=keyword, limit=limit, is_active=is_active)
+                matches = [(row[:-1], row[-1]) for row in rows]
+            else:
+                snapshot = self.tree_cache.get_or_build(
+                    key="search",
+                    builder=lambda: PlcSearchIndex(self.plc_crud.get_plc_search_rows()),
+                    redis_client=self.redis_client,
+                    serialize=False
+                )
+                matches = snapshot.data.search(keyword, limit=limit, is_active=is_active)
+            
+            items = [
+                {
+                    "plc_id": row[0],
+                    "plc_name": row[1],
+                    "plant": row[2],
+                    "process": row[3],
+                    "line": row[4],
+                    "equipment_group": row[5],
+                    "unit": row[6],
+                    "pgm_id": row[7],
+                    "is_active": row[8],
+                    "match_type": match_type(rank),
+                    "highlights": {
+                        "plc_id": highlight_spans(row[0], keyword),
+                        "plc_name": highlight_spans(row[1], keyword)
+                    }
+                }
+                for row, rank in matches
+            ]
+            return {
+                "keyword": keyword,
+                "engine": engine,
+                "took_ms": round((time.perf_counter() - started) * 1000, 2),
+                "items": items
+            }
+        except HandledException:
+            raise
+        except Exception as e:
+            logger.error(f"PLC 랭킹 검색 중 오류 발생: {str(e)}", exc_info=True)
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+    
+    def _select_search_engine(self, keyword: str) -> str:
+        """키워드 검색 엔진 선택 (trigram / memory)"""
+        global _trigram_available
+        engine = os.getenv("PLC_SEARCH_ENGINE", "auto").lower()
+        if engine in ("trigram", "memory"):
+            return engine
+        
+        if len(keyword) < TRIGRAM_MIN_KEYWORD_LENGTH:
+            return "memory"
+        if _trigram_available is None:
+            _trigram_available = self.plc_crud.has_trigram_index()
+            logger.info(f"PLC 검색 pg_trgm 인덱스 사용 가능: {_trigram_available}")
+        return "trigram" if _trigram_available else "memory"
+    
+    def get_plc_count(
+        self,
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        equipment_group: Optional[str] = None,
+        unit: Optional[str] = None
+    ):
+        """PLC 개수 조회 (활성/비활성/전체/매핑/미매핑, 계층 노드 지정 가능 - 카운터 1행 조회)"""
         try:
-            active_count = self.plc_crud.count_plcs(is_active=True)
-            inactive_count = self.plc_crud.count_plcs(is_active=False)
-            total_count = self.plc_crud.count_plcs(is_active=None)
+            path = self._hierarchy_path(dict(zip(PLC_HIERARCHY_FIELDS, (plant, process, line, equipment_group, unit))))
+            active_count, inactive_count, mapped_count = self.plc_crud.get_hierarchy_counts(path)
             
             return {
                 'active_count': active_count,
                 'inactive_count': inactive_count,
-                'total_count': total_count
+                'total_count': active_count + inactive_count,
+                'mapped_count': mapped_count,
+                'unmapped_count': active_count - mapped_count
             }
         except HandledException:
             raise
         except Exception as e:
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
+    def refresh_plc_counters(self):
+        """PLC 카운터 재집계 (운영용)"""
+        try:
+            return self.plc_crud.refresh_counters()
+        except HandledException:
+            raise
+        except Exception as e:
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+    
     def get_hierarchy_values(
         self,
         level: str,
@@ -256,6 +503,7 @@ class PlcService:
                 user=user,
                 notes=notes
             )
+            self._invalidate_tree()
             return plc
         except HandledException:
             raise
@@ -275,12 +523,109 @@ class PlcService:
                 user=user,
                 notes=notes
             )
+            self._invalidate_tree()
             return plc
         except HandledException:
             raise
         except Exception as e:
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
+    def batch_update_mapping(
+        self,
+        pgm_id: Optional[str],
+        user: str,
+        notes: Optional[str] = None,
+        plc_ids: Optional[List[str]] = None,
+        selector: Optional[dict] = None,
+        overwrite: bool = True,
+        dry_run: bool = False
+    ) -> dict:
+        """
+        여러 PLC 프로그램 일괄 매핑/해제 (pgm_id가 None이면 해제)
+
+        대상은 PLC ID 목록 또는 계층 선택자(하위 활성 PLC 전체)로 지정하고, 전체를 한 트랜잭션으로 반영한다.
+
+        Returns:
+            dict: pgm_id, dry_run, total, changed, unchanged, skipped, not_found, version, items
+            items의 status - mapped / unmapped (변경됨), already_mapped / not_mapped (이미 같은 상태),
+            mapped_to_other (overwrite=false로 건너뜀), not_found (없거나 삭제된 PLC)
+        """
+        try:
+            filters = None
+            if selector is not None:
+                path = self._hierarchy_path(selector)
+                if not path:
+                    raise HandledException(ResponseCode.VALIDATION_ERROR, msg="selector에는 plant가 필요합니다.")
+                filters = dict(zip(PLC_HIERARCHY_FIELDS, path))
+            if plc_ids is not None:
+                plc_ids = list(dict.fromkeys(plc_id.strip() for plc_id in plc_ids if plc_id and plc_id.strip()))
+                if not plc_ids:
+                    raise HandledException(ResponseCode.VALIDATION_ERROR, msg="plc_ids가 비어 있습니다.")
+
+            if pgm_id is not None and not ProgramCRUD(self.db).get_program_by_id(pgm_id):
+                raise HandledException(ResponseCode.PROGRAM_NOT_FOUND, msg=f"프로그램 '{pgm_id}'를 찾을 수 없습니다.")
+
+            rows = self.plc_crud.bulk_update_mapping(
+                pgm_id=pgm_id,
+                user=user,
+                notes=notes,
+                plc_ids=plc_ids,
+                filters=filters,
+                overwrite=overwrite,
+                dry_run=dry_run
+            )
+
+            items = []
+            counts = {"changed": 0, "unchanged": 0, "skipped": 0, "not_found": 0}
+            for plc_id, prev_pgm_id, changed in rows:
+                if changed:
+                    status, count_key = ("mapped" if pgm_id else "unmapped"), "changed"
+                elif pgm_id is None or prev_pgm_id == pgm_id:
+                    status, count_key = ("already_mapped" if pgm_id else "not_mapped"), "unchanged"
+                else:
+                    status, count_key = "mapped_to_other", "skipped"
+                counts[count_key] += 1
+                items.append({"plc_id": plc_id, "status": status, "prev_pgm_id": prev_pgm_id})
+
+            if plc_ids is not None:
+                found = {item["plc_id"] for item in items}
+                for plc_id in plc_ids:
+                    if plc_id not in found:
+                        counts["not_found"] += 1
+                        items.append({"plc_id": plc_id, "status": "not_found", "prev_pgm_id": None})
+
+            version = None
+            if not dry_run and counts["changed"]:
+                version = self.tree_cache.bump(self.redis_client)
+
+            return {
+                "pgm_id": pgm_id,
+                "dry_run": dry_run,
+                "total": len(items),
+                **counts,
+                "version": version,
+                "items": items
+            }
+        except HandledException:
+            raise
+        except Exception as e:
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+
+    @staticmethod
+    def _hierarchy_path(values: dict) -> List[str]:
+        """계층 값에서 상위부터 연속으로 지정된 경로 (중간이 비어 있으면 VALIDATION_ERROR)"""
+        path = []
+        for field in PLC_HIERARCHY_FIELDS:
+            if not values.get(field):
+                break
+            path.append(values[field])
+        if any(values.get(field) for field in PLC_HIERARCHY_FIELDS[len(path):]):
+            raise HandledException(
+                ResponseCode.VALIDATION_ERROR,
+                msg=f"계층 경로는 {' → '.join(PLC_HIERARCHY_FIELDS)} 순서로 빠짐없이 지정해야 합니다."
+            )
+        return path
+
     def get_plc_mapping_history(
         self,
         plc_id: str,
@@ -304,16 +649,24 @@ class PlcService:
         self,
         pgm_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ):
-        """특정 프로그램에 매핑된 PLC 목록 조회"""
+        """특정 프로그램에 매핑된 PLC 목록 조회
+        
+        Returns:
+            (PLC 목록, 전체 개수, 다음 페이지 커서)
+        """
         try:
             plcs, total = self.plc_crud.get_plcs_by_program(
                 pgm_id=pgm_id,
                 skip=skip,
-                limit=limit
+                limit=limit,
+                cursor=cursor,
+                count_mode=count_mode
             )
-            return plcs, total
+            return plcs, total, self.plc_crud.next_cursor(plcs, limit, PlcCRUD.PLC_ID_ORDER)
         except HandledException:
             raise
         except Exception as e:
@@ -322,15 +675,23 @@ class PlcService:
     def get_unmapped_plcs(
         self,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ):
-        """프로그램이 매핑되지 않은 PLC 목록 조회"""
+        """프로그램이 매핑되지 않은 PLC 목록 조회
+        
+        Returns:
+            (PLC 목록, 전체 개수, 다음 페이지 커서)
+        """
         try:
             plcs, total = self.plc_crud.get_unmapped_plcs(
                 skip=skip,
-                limit=limit
+                limit=limit,
+                cursor=cursor,
+                count_mode=count_mode
             )
-            return plcs, total
+            return plcs, total, self.plc_crud.next_cursor(plcs, limit, PlcCRUD.PLC_ID_ORDER)
         except HandledException:
             raise
         except Exception as e:
@@ -347,132 +708,163 @@ class PlcService:
     
     # ========== PLC 계층 구조 조회 메서드 ==========
     
-    def get_plc_hierarchy(
+    def get_plc_hierarchy_snapshot(self, is_active: bool = True) -> PlcTreeSnapshot:
+        """PLC 계층 구조 조회 (현재 버전의 미리 직렬화된 트리)
+        
+        PLC 데이터가 바뀌지 않았으면 DB 조회와 트리 생성 없이 메모리의 바이트를 그대로 반환한다.
+        """
+        try:
+            return self.tree_cache.get_or_build(
+                key="active" if is_active else "inactive",
+                builder=lambda: self.get_plc_hierarchy(is_active=is_active),
+                redis_client=self.redis_client,
+                change_version_reader=self.plc_crud.get_latest_change_version
+            )
+        except HandledException:
+            raise
+        except Exception as e:
+            logger.error(f"PLC 계층 구조 캐시 조회 중 오류 발생: {str(e)}", exc_info=True)
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
+    
+    def get_plc_tree_children(
         self,
-        is_active: Optional[bool] = True
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        equipment_group: Optional[str] = None,
+        unit: Optional[str] = None
     ):
-        """PLC 계층 구조 조회
+        """PLC 계층 한 단계 펼치기 (활성 PLC 기준 하위 노드 + 집계)
         
-        Args:
-            is_active: 활성 PLC만 조회 (기본값: True)
+        경로는 상위부터 연속으로 지정해야 한다 (예: plant, process만 지정 → 해당 공정의 Line 목록).
+        호기별 집계 트리는 트리 캐시와 같은 버전으로 메모리에 보관하므로 노드 조회는 DB를 거치지 않는다.
+        호기(unit)까지 지정하면 해당 호기의 PLC 목록을 DB에서 조회해 함께 반환한다.
         
         Returns:
-            dict: 계층 구조로 변환된 PLC 데이터
+            dict: level, path, version, plc_count, mapped_count, unmapped_count, items, plcs
         """
         try:
-            # 1. get_plcs() 사용해서 데이터 조회
-            plcs, total = self.get_plcs(
-                skip=0,
-                limit=10000,  # 전체 조회 (계층 구조는 페이징 불가)
-                is_active=is_active
+            path = self._hierarchy_path(dict(zip(PLC_HIERARCHY_FIELDS, (plant, process, line, equipment_group, unit))))
+            
+            snapshot = self.tree_cache.get_or_build(
+                key="counts",
+                builder=lambda: build_plc_tree_counts(self.plc_crud.get_unit_counts(is_active=True)),
+                redis_client=self.redis_client,
+                serialize=False
             )
             
-            logger.info(f"PLC 계층 구조 조회: {len(plcs)}개 PLC 조회 완료 (total: {total})")
+            node = snapshot.data
+            for name in path:
+                node = node["children"].get(name)
+                if node is None:
+                    raise HandledException(
+                        ResponseCode.PLC_HIERARCHY_NODE_NOT_FOUND,
+                        msg=f"계층 노드를 찾을 수 없습니다: {' / '.join(path)}"
+                    )
             
-            # 데이터가 없는 경우도 정상 처리
-            if not plcs or len(plcs) == 0:
-                logger.info("PLC 데이터가 없어 빈 계층 구조 반환")
-                return {"data": []}
+            plcs = None
+            if len(path) == len(PLC_HIERARCHY_FIELDS):
+                plcs = build_plc_infos(
+                    self.plc_crud.get_plc_tree_rows(is_active=True, **dict(zip(PLC_HIERARCHY_FIELDS, path)))
+                )
             
-            # 2. 계층 구조로 변환
-            return self._build_hierarchy(plcs)
-        
+            return {
+                "level": PLC_HIERARCHY_FIELDS[len(path)] if len(path) < len(PLC_HIERARCHY_FIELDS) else "plc",
+                "path": dict(zip(PLC_HIERARCHY_FIELDS, path)),
+                "version": snapshot.version,
+                "plc_count": node["plc_count"],
+                "mapped_count": node["mapped_count"],
+                "unmapped_count": node["plc_count"] - node["mapped_count"],
+                "items": [
+                    {
+                        "name": name,
+                        "plc_count": child["plc_count"],
+                        "mapped_count": child["mapped_count"],
+                        "unmapped_count": child["plc_count"] - child["mapped_count"],
+                        "child_count": len(child["children"])
+                    }
+                    for name, child in node["children"].items()
+                ],
+                "plcs": plcs
+            }
         except HandledException:
             raise
         except Exception as e:
-            logger.error(f"PLC 계층 구조 조회 중 오류 발생: {str(e)}", exc_info=True)
+            logger.error(f"PLC 계층 펼치기 중 오류 발생: {str(e)}", exc_info=True)
             raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
-    def _build_hierarchy(self, plcs):
-        """PLC 리스트를 계층 구조로 변환
+    def get_plc_tree_changes(
+        self,
+        since: int,
+        is_active: Optional[bool] = True,
+        limit: int = 1000
+    ):
+        """PLC 트리 증분 조회 (since 버전 이후 추가/수정/삭제된 PLC)
         
         Args:
-            plcs: PLC 리스트
+            since: 클라이언트가 마지막으로 받은 변경 버전 (/plcs/tree의 X-PLC-Tree-Change-Version)
+            is_active: 클라이언트 트리의 조회 조건 (조건에서 벗어난 PLC는 removes로 전달)
+            limit: 한 번에 반환할 최대 PLC 수 (has_more가 true이면 version으로 다시 조회)
         
         Returns:
-            dict: 계층 구조 데이터
+            dict: since, version, has_more, full_reload, upserts, removes
         """
-        hierarchy = {}
-        
-        for plc in plcs:
-            # Plant 레벨
-            if plc.plant not in hierarchy:
-                hierarchy[plc.plant] = {}
-            
-            # Process 레벨
-            if plc.process not in hierarchy[plc.plant]:
-                hierarchy[plc.plant][plc.process] = {}
-            
-            # Line 레벨
-            if plc.line not in hierarchy[plc.plant][plc.process]:
-                hierarchy[plc.plant][plc.process][plc.line] = {}
+        try:
+            latest = self.plc_crud.get_latest_change_version()
             
-            # Equipment Group 레벨
-            if plc.equipment_group not in hierarchy[plc.plant][plc.process][plc.line]:
-                hierarchy[plc.plant][plc.process][plc.line][plc.equipment_group] = {}
+            # 클라이언트 버전이 서버보다 앞서면(DB 교체 등) 증분으로 맞출 수 없으므로 전체 재조회 요청
+            if since > latest:
+                return {
+                    "since": since,
+                    "version": latest,
+                    "has_more": False,
+                    "full_reload": True,
+                    "upserts": [],
+                    "removes": []
+                }
             
-            # Unit 레벨 (딕셔너리로 변경)
-            if plc.unit not in hierarchy[plc.plant][plc.process][plc.line][plc.equipment_group]:
-                hierarchy[plc.plant][plc.process][plc.line][plc.equipment_group][plc.unit] = []
+            rows = self.plc_crud.get_plc_changes(since=since, limit=limit + 1)
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            upserts, removes = build_plc_tree_changes(rows, is_active=is_active)
             
-            # info 추가
-            hierarchy[plc.plant][plc.process][plc.line][plc.equipment_group][plc.unit].append({
-                "plcId": plc.plc_id,
-                "plcNm": plc.plc_name,
-                "regDt": plc.create_dt.isoformat() if plc.create_dt else None,
-                "regUsr": plc.create_user or "unknown",
-                "pgmId": plc.pgm_id or None
-            })
-        
-        # 딕셔너리를 Response 모델로 변환
-        return self._convert_to_response(hierarchy)
+            return {
+                "since": since,
+                "version": rows[-1][0] if rows else latest,
+                "has_more": has_more,
+                "full_reload": False,
+                "upserts": upserts,
+                "removes": removes
+            }
+        except HandledException:
+            raise
+        except Exception as e:
+            logger.error(f"PLC 트리 증분 조회 중 오류 발생: {str(e)}", exc_info=True)
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
     
-    def _convert_to_response(self, hierarchy):
-        """딕셔너리를 PlcHierarchyResponse 형식으로 변환 (TO-BE 구조)
+    def get_plc_hierarchy(
+        self,
+        is_active: Optional[bool] = True
+    ):
+        """PLC 계층 구조 조회
         
         Args:
-            hierarchy: 계층 구조 딕셔너리
+            is_active: 활성 PLC만 조회 (기본값: True)
         
         Returns:
-            dict: Response 형식의 데이터
+            dict: 계층 구조로 변환된 PLC 데이터
         """
-        plants = []
-        
-        for plant_name, processes_dict in hierarchy.items():
-            processes = []
+        try:
+            # 1. 트리에 필요한 컬럼만 계층 순으로 조회 (전체 조회, 계층 구조는 페이징 불가)
+            rows = self.plc_crud.get_plc_tree_rows(is_active=is_active)
             
-            for process_name, lines_dict in processes_dict.items():
-                lines = []
-                
-                for line_name, eq_groups_dict in lines_dict.items():
-                    equipment_groups = []
-                    
-                    for eq_group_name, units_dict in eq_groups_dict.items():
-                        units = []
-                        for unit_name, info_list in units_dict.items():
-                            units.append({
-                                "unit": unit_name,
-                                "info": info_list  # 리스트 형태로 전달
-                            })
-                        
-                        equipment_groups.append({
-                            "eqpGrp": eq_group_name,
-                            "unitList": units
-                        })
-                    
-                    lines.append({
-                        "line": line_name,
-                        "eqpGrpList": equipment_groups
-                    })
-                
-                processes.append({
-                    "proc": process_name,
-                    "lineList": lines
-                })
+            logger.info(f"PLC 계층 구조 조회: {len(rows)}개 PLC 조회 완료")
             
-            plants.append({
-                "plt": plant_name,
-                "procList": processes
-            })
+            # 2. 정렬된 행을 한 번 순회하며 계층 구조로 변환 (데이터가 없으면 빈 목록)
+            return build_plc_tree(rows)
         
-        return {"data": plants}
+        except HandledException:
+            raise
+        except Exception as e:
+            logger.error(f"PLC 계층 구조 조회 중 오류 발생: {str(e)}", exc_info=True)
+            raise HandledException(ResponseCode.UNDEFINED_ERROR, e=e)
@@ -0,0 +1,127 @@
+# _*_ coding: utf-8 _*_
+"""Background bulk cache clear using SCAN + UNLINK with progress reporting."""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ai_backend.utils.uuid_gen import gen
+
+logger = logging.getLogger(__name__)
+
+
+class CacheClearJob:
+    """대량 캐시 삭제 작업 상태"""
+
+    def __init__(self, pattern: str, batch_size: int):
+        self.job_id = gen()
+        self.pattern = pattern
+        self.batch_size = batch_size
+        self.status = "pending"
+        self.scanned = 0
+        self.deleted = 0
+        self.estimated_total: Optional[int] = None
+        self.error: Optional[str] = None
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = None
+        if self.status == "completed":
+            progress = 1.0
+        elif self.estimated_total:
+            progress = round(min(self.scanned / self.estimated_total, 0.99), 4)
+
+        return {
+            "job_id": self.job_id,
+            "pattern": self.pattern,
+            "status": self.status,
+            "scanned": self.scanned,
+            "deleted": self.deleted,
+            "estimated_total": self.estimated_total,
+            "progress": progress,
+            "error": self.error,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class BulkCacheClearer:
+    """SCAN 커서로 키를 나눠 조회하고 UNLINK로 삭제하는 백그라운드 작업 관리 (프로세스 단위 싱글톤)
+
+    - KEYS/DEL처럼 한 번에 전체 키 공간을 훑지 않아 Redis를 블로킹하지 않는다
+    - UNLINK는 메모리 해제를 Redis 백그라운드 스레드에서 수행한다
+    - 작업 상태는 작업을 시작한 프로세스에만 보관된다
+    """
+
+    MAX_FINISHED_JOBS = 20
+
+    def __init__(self):
+        self._jobs: Dict[str, CacheClearJob] = {}
+
+    def start(self, redis_client, pattern: str = "*", batch_size: int = 500) -> CacheClearJob:
+        """삭제 작업 시작 (이벤트 루프에서 호출)"""
+        job = CacheClearJob(pattern, batch_size)
+        self._jobs[job.job_id] = job
+        self._prune()
+        job.task = asyncio.create_task(self._run(job, redis_client))
+        return job
+
+    def get(self, job_id: str) -> Optional[CacheClearJob]:
+        return self._jobs.get(job_id)
+
+    def list(self):
+        return list(self._jobs.values())
+
+    def _prune(self):
+        """완료된 오래된 작업 기록 정리"""
+        finished = [job for job in self._jobs.values() if job.finished_at is not None]
+        for job in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job.job_id]
+
+    async def _run(self, job: CacheClearJob, redis_client):
+        client = redis_client.async_redis_client
+        job.status = "running"
+        try:
+            # 전체 삭제인 경우 DBSIZE로 진행률 추정 (패턴 삭제는 추정 불가)
+            if job.pattern == "*":
+                job.estimated_total = await client.dbsize()
+
+            cursor = 0
+            while True:
+                cursor, keys = await client.scan(cursor=cursor, match=job.pattern, count=job.batch_size)
+                job.scanned += len(keys)
+                if keys:
+                    job.deleted += await client.unlink(*keys)
+                if cursor == 0:
+                    break
+                # 다른 요청이 이벤트 루프를 사용할 수 있도록 양보
+                await asyncio.sleep(0)
+
+            job.status = "completed"
+            logger.info(f"Cache clear job {job.job_id} completed: {job.deleted} keys deleted")
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.warning(f"Cache clear job {job.job_id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now()
+            job.task = None
+            # 삭제된 값이 L1에 남지 않도록 모든 파드의 L1 비움
+            await asyncio.to_thread(redis_client.invalidate_local_cache)
+
+
+# 전역 대량 삭제 관리자 인스턴스
+bulk_cache_clearer = None
+
+
+def get_bulk_cache_clearer() -> BulkCacheClearer:
+    """대량 삭제 관리자 싱글톤 반환"""
+    global bulk_cache_clearer
+    if bulk_cache_clearer is None:
+        bulk_cache_clearer = BulkCacheClearer()
+    return bulk_cache_clearer
@@ -0,0 +1,167 @@
+# _*_ coding: utf-8 _*_
+"""Event-driven cancellation bus for streaming chat generation."""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationBus:
+    """스트리밍 생성 취소 신호 관리 (프로세스 단위 싱글톤)
+
+    - 스트림 시작 시 chat_id별 asyncio.Event를 등록하고, 청크마다 이벤트 플래그만 확인한다.
+    - 로컬 모드(레디스 없음): cancel() 호출 시 같은 프로세스의 이벤트를 직접 설정한다.
+    - 레디스 모드: cancel() 이 "cancel:{chat_id}" 채널에 publish 하고,
+      각 파드의 리스너가 패턴 구독(cancel:*)으로 수신하여 로컬 이벤트를 설정한다.
+      따라서 스트림이 다른 파드에서 실행 중이어도 취소가 전달된다.
+    - 리스너는 유휴 타임아웃이 없는 연결로 구독하고, 끊기면 스스로 재구독한다.
+    """
+
+    CHANNEL_PREFIX = "cancel:"
+    # 구독 연결이 끊겼을 때 재구독 대기 시간 (지수 증가, 초)
+    RECONNECT_MIN_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+    # 메시지 대기 단위 (초) - 유휴 구독 연결의 health check 주기를 보장
+    POLL_TIMEOUT = 10.0
+
+    def __init__(self):
+        self._events: Dict[str, asyncio.Event] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listener_lock: Optional[asyncio.Lock] = None
+        self._subscribed = False
+
+    def register(self, chat_id: str) -> asyncio.Event:
+        """스트림 시작 시 취소 이벤트 등록 (이전 취소 상태는 초기화)"""
+        event = asyncio.Event()
+        self._events[chat_id] = event
+        return event
+
+    def unregister(self, chat_id: str, event: asyncio.Event):
+        """스트림 종료 시 취소 이벤트 해제 (다른 스트림이 재등록한 경우 유지)"""
+        if self._events.get(chat_id) is event:
+            del self._events[chat_id]
+
+    def is_active(self, chat_id: str) -> bool:
+        """현재 프로세스에서 해당 채팅의 스트림이 진행 중인지 확인"""
+        return chat_id in self._events
+
+    @property
+    def is_listening(self) -> bool:
+        """레디스 취소 채널을 구독 중인지 (재구독 중이면 스트림은 DB 취소 상태를 확인해야 함)"""
+        return self._subscribed
+
+    def _set_local(self, chat_id: str) -> bool:
+        """로컬 이벤트 설정"""
+        event = self._events.get(chat_id)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    async def cancel(self, chat_id: str, redis_client=None) -> bool:
+        """취소 신호 발행
+
+        Returns:
+            로컬 스트림 또는 구독 중인 파드 중 하나라도 신호를 받았으면 True
+        """
+        delivered = self._set_local(chat_id)
+
+        if redis_client is not None:
+            try:
+                receivers = await redis_client.async_redis_client.publish(
+                    f"{self.CHANNEL_PREFIX}{chat_id}", "1"
+                )
+                delivered = delivered or receivers > 0
+            except Exception as e:
+                logger.warning(f"Redis cancel publish failed: {e}")
+
+        return delivered
+
+    async def ensure_listener(self, redis_client):
+        """레디스 취소 채널 리스너 시작 (프로세스당 1회, 구독 완료 후 반환)"""
+        if self._listener_task is not None and not self._listener_task.done():
+            return
+
+        if self._listener_lock is None:
+            self._listener_lock = asyncio.Lock()
+
+        async with self._listener_lock:
+            if self._listener_task is not None and not self._listener_task.done():
+                return
+
+            pubsub = await self._subscribe(redis_client)
+            self._subscribed = True
+            self._listener_task = asyncio.create_task(self._listen(redis_client, pubsub))
+            logger.info("Cancellation listener subscribed to Redis channel pattern")
+
+    async def _subscribe(self, redis_client):
+        """취소 채널 패턴 구독 (읽기 타임아웃이 없는 pub/sub 전용 연결)"""
+        pubsub = redis_client.async_pubsub_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+        except Exception:
+            await pubsub.aclose()
+            raise
+        return pubsub
+
+    async def _listen(self, redis_client, pubsub):
+        """취소 채널 메시지를 수신하여 로컬 이벤트 설정 (연결이 끊기면 재구독)"""
+        delay = self.RECONNECT_MIN_DELAY
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = await self._subscribe(redis_client)
+                    self._subscribed = True
+                    logger.info("Cancellation listener resubscribed to Redis channel pattern")
+                delay = self.RECONNECT_MIN_DELAY
+                while True:
+                    # 타임아웃마다 반환되어 health check(PING)가 실행됨 - 끊긴 연결은 예외로 감지
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.POLL_TIMEOUT
+                    )
+                    if message is None or message.get("type") != "pmessage":
+                        continue
+                    channel = message.get("channel", "")
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+                    chat_id = channel[len(self.CHANNEL_PREFIX):]
+                    if self._set_local(chat_id):
+                        logger.info(f"Cancellation signal received for session: {chat_id}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cancellation listener disconnected, retrying in {delay}s: {e}")
+            finally:
+                self._subscribed = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+                    pubsub = None
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+    async def close(self):
+        """리스너 종료"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+
+
+# 전역 취소 버스 인스턴스
+cancel_bus = None
+
+
+def get_cancel_bus() -> CancellationBus:
+    """취소 버스 싱글톤 반환"""
+    global cancel_bus
+    if cancel_bus is None:
+        cancel_bus = CancellationBus()
+    return cancel_bus
@@ -0,0 +1,147 @@
+# _*_ coding: utf-8 _*_
+"""Pluggable payload codecs for cached values and SSE framing."""
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+
+# 캐시 키 포맷 버전 (값 구조가 바뀌면 올려서 이전 키와 분리)
+CACHE_KEY_VERSION = 1
+
+
+class Codec(ABC):
+    """캐시 값 인코더/디코더 (encode/decode를 구현하지 않은 하위 클래스는 생성 시 TypeError)
+
+    - name: 키 접두사에 포함되어 코덱별로 키 공간을 분리한다
+    - binary: True이면 결과가 UTF-8 텍스트가 아니므로 decode_responses=False 클라이언트가 필요하다
+    """
+
+    name = "base"
+    binary = False
+
+    @abstractmethod
+    def encode(self, value: Any) -> Union[str, bytes]:
+        """값 → 저장 형식"""
+
+    @abstractmethod
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """저장 형식 → 값"""
+
+    @property
+    def key_prefix(self) -> str:
+        """버전/코덱별 키 접두사 (코덱 전환 시 이전 형식의 값을 읽지 않도록 분리)"""
+        return f"v{CACHE_KEY_VERSION}:{self.name}:"
+
+
+class JsonCodec(Codec):
+    """표준 라이브러리 json (기본값, 추가 의존성 없음)"""
+
+    name = "json"
+
+    def encode(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """orjson - JSON 호환 텍스트, 인코딩/디코딩이 stdlib json보다 빠름"""
+
+    name = "orjson"
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """msgpack - 바이너리, 페이로드 크기가 가장 작음"""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+_CODECS = {
+    "json": (JsonCodec, lambda: True),
+    "orjson": (OrjsonCodec, lambda: orjson is not None),
+    "msgpack": (MsgpackCodec, lambda: msgpack is not None),
+}
+
+_instances: Dict[str, Codec] = {}
+
+
+def available_codecs() -> list:
+    """현재 환경에서 사용 가능한 코덱 이름 목록"""
+    return [name for name, (_, is_available) in _CODECS.items() if is_available()]
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """코덱 인스턴스 반환
+
+    name이 없으면 CACHE_CODEC 환경변수를 사용한다 (기본값: json).
+    알 수 없거나 패키지가 설치되지 않은 코덱이면 json으로 대체한다.
+    """
+    name = (name or os.getenv("CACHE_CODEC", "json")).lower()
+    if name not in _CODECS or not _CODECS[name][1]():
+        logger.warning(f"Cache codec '{name}' is not available, falling back to json")
+        name = "json"
+
+    if name not in _instances:
+        _instances[name] = _CODECS[name][0]()
+    return _instances[name]
+
+
+# ==========================================
+# SSE 프레이밍 (텍스트 프로토콜이므로 JSON 계열 코덱만 사용)
+# ==========================================
+
+_sse_codec: Optional[Codec] = None
+
+
+def get_sse_codec() -> Codec:
+    """SSE 이벤트 인코딩용 코덱 (SSE_CODEC, 기본값: 설치되어 있으면 orjson)"""
+    global _sse_codec
+    if _sse_codec is None:
+        name = os.getenv("SSE_CODEC", "orjson" if orjson is not None else "json")
+        codec = get_codec(name)
+        if codec.binary:
+            logger.warning(f"SSE codec '{codec.name}' is binary, falling back to json")
+            codec = get_codec("json")
+        _sse_codec = codec
+    return _sse_codec
+
+
+def encode_json(payload: Any) -> bytes:
+    """JSON UTF-8 바이트 생성 (SSE와 같은 텍스트 코덱 사용, 미리 직렬화한 응답 본문용)"""
+    data = get_sse_codec().encode(payload)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return data
+
+
+def encode_sse(payload: Any) -> bytes:
+    """SSE data 프레임 생성 (data: <json>\\n\\n)"""
+    return b"data: " + encode_json(payload) + b"\n\n"
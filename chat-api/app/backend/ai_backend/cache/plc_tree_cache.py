@@ -0,0 +1,161 @@
+# _*_ coding: utf-8 _*_
+"""Versioned, materialized PLC hierarchy tree cache."""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ai_backend.cache.codec import encode_json
+
+logger = logging.getLogger(__name__)
+
+
+class PlcTreeSnapshot:
+    """특정 버전의 PLC 트리 (미리 직렬화된 응답 본문 또는 집계 객체)"""
+
+    def __init__(
+        self,
+        version: int,
+        key: Hashable,
+        body: Optional[bytes] = None,
+        change_version: Optional[int] = None,
+        data: Any = None
+    ):
+        self.version = version
+        self.key = key
+        self.body = body
+        # serialize=False로 만든 경우 builder 결과 객체 (읽기 전용으로 공유)
+        self.data = data
+        # 트리 생성 직전의 PLC 변경 로그 버전 (/plcs/tree/changes?since= 시작점)
+        self.change_version = change_version
+        self.etag = f'"plc-tree-{key}-{version}"'
+        self.built_at = time.monotonic()
+
+
+class PlcTreeCache:
+    """PLC 계층 트리 캐시 (프로세스 단위 싱글톤)
+
+    - 트리는 버전별로 한 번만 만들고 직렬화된 바이트로 메모리에 보관한다
+    - PLC 생성/수정/삭제/복원/매핑/매핑 해제 시 버전을 올리면 다음 조회에서 재생성된다
+    - 버전은 레디스 카운터(plc_tree:version)로 파드 간에 공유하고, 레디스가 없으면 프로세스 내 카운터를 사용한다
+    - 카운터 키가 사라져도(캐시 삭제 등) 이전 버전과 겹치지 않도록 현재 시각(ms)으로 초기화한다
+    - DB를 직접 수정한 경우를 대비해 PLC_TREE_CACHE_MAX_AGE 초가 지나면 같은 버전이어도 재생성한다
+    """
+
+    VERSION_KEY = "plc_tree:version"
+
+    def __init__(self, max_age_seconds: float = 300.0):
+        self.max_age_seconds = max_age_seconds
+        self._local_version = self._seed()
+        self._snapshots: Dict[Hashable, PlcTreeSnapshot] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _seed() -> int:
+        return int(time.time() * 1000)
+
+    def current_version(self, redis_client=None) -> int:
+        """현재 트리 버전 조회"""
+        if redis_client is not None:
+            try:
+                version = redis_client.redis_client.get(self.VERSION_KEY)
+                if version is None:
+                    redis_client.redis_client.set(self.VERSION_KEY, self._seed(), nx=True)
+                    version = redis_client.redis_client.get(self.VERSION_KEY)
+                return int(version)
+            except Exception as e:
+                logger.warning(f"PLC tree version read failed, using local version: {e}")
+        return self._local_version
+
+    def bump(self, redis_client=None) -> int:
+        """트리 버전 증가 (PLC 데이터 변경 후 호출)"""
+        self._local_version += 1
+        if redis_client is not None:
+            try:
+                pipe = redis_client.redis_client.pipeline(transaction=True)
+                pipe.set(self.VERSION_KEY, self._seed(), nx=True)
+                pipe.incr(self.VERSION_KEY)
+                return int(pipe.execute()[1])
+            except Exception as e:
+                logger.warning(f"PLC tree version bump failed: {e}")
+        return self._local_version
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        builder: Callable[[], Any],
+        redis_client=None,
+        change_version_reader: Optional[Callable[[], int]] = None,
+        serialize: bool = True
+    ) -> PlcTreeSnapshot:
+        """현재 버전의 트리 반환 (없거나 오래되었으면 builder로 생성 후 직렬화)
+
+        버전은 DB 조회 전에 읽는다. 조회 중 변경이 생기면 다음 요청에서 버전이 달라져 다시 생성된다.
+        change_version_reader도 builder 전에 호출하므로, 그 이후 변경은 증분 조회에서 빠짐없이(중복 가능) 받는다.
+        serialize=False이면 직렬화하지 않고 builder 결과를 snapshot.data로 보관한다 (계층별 집계 등).
+        """
+        version = self.current_version(redis_client)
+        snapshot = self._snapshots.get(key)
+        if self._is_fresh(snapshot, version):
+            return snapshot
+
+        # 동시에 여러 요청이 재생성하지 않도록 잠금
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if self._is_fresh(snapshot, version):
+                return snapshot
+
+            started = time.perf_counter()
+            change_version = change_version_reader() if change_version_reader else None
+            if serialize:
+                snapshot = PlcTreeSnapshot(version, key, body=encode_json(builder()), change_version=change_version)
+            else:
+                snapshot = PlcTreeSnapshot(version, key, change_version=change_version, data=builder())
+            self._snapshots[key] = snapshot
+            logger.info(
+                f"PLC tree rebuilt: key={key}, version={version}, "
+                f"{len(snapshot.body) if snapshot.body is not None else '-'} bytes "
+                f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+            return snapshot
+
+    def _is_fresh(self, snapshot: Optional[PlcTreeSnapshot], version: int) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() - snapshot.built_at < self.max_age_seconds
+        )
+
+    def clear(self):
+        """메모리의 트리 스냅샷 삭제"""
+        with self._lock:
+            self._snapshots.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": [
+                {
+                    "key": str(snapshot.key),
+                    "version": snapshot.version,
+                    "change_version": snapshot.change_version,
+                    "bytes": len(snapshot.body) if snapshot.body is not None else None,
+                    "age_seconds": round(time.monotonic() - snapshot.built_at, 1)
+                }
+                for snapshot in self._snapshots.values()
+            ]
+        }
+
+
+# 전역 PLC 트리 캐시 인스턴스
+plc_tree_cache = None
+
+
+def get_plc_tree_cache() -> PlcTreeCache:
+    """PLC 트리 캐시 싱글톤 반환"""
+    global plc_tree_cache
+    if plc_tree_cache is None:
+        plc_tree_cache = PlcTreeCache(
+            max_age_seconds=float(os.getenv("PLC_TREE_CACHE_MAX_AGE", "300"))
+        )
+    return plc_tree_cache
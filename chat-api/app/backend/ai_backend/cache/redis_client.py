@@ -1,15 +1,30 @@
 # _*_ coding: utf-8 _*_
 """Redis client for caching and session management."""
 import redis
-import json
+import redis.asyncio as aioredis
+import asyncio
+import logging
 import os
-from typing import Optional, Dict, Any, List
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional, Dict, Any, Iterable, List, Union
 from datetime import datetime, timedelta
 
+from ai_backend.cache.codec import available_codecs, get_codec
+from ai_backend.cache.local_cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
 
 class RedisClient:
     """Redis 클라이언트 - 캐싱 및 세션 관리"""
     
+    # L1 캐시 무효화 채널 (메시지 본문 = 무효화할 키, "*" 이면 전체)
+    L1_INVALIDATION_CHANNEL = "cache:l1:invalidate"
+    # 구독 연결이 끊겼을 때 재구독 대기 시간 (지수 증가, 초) / 메시지 대기 단위 (health check 주기 보장)
+    PUBSUB_RECONNECT_MIN_DELAY = 0.5
+    PUBSUB_RECONNECT_MAX_DELAY = 30.0
+    PUBSUB_POLL_TIMEOUT = 10.0
+    
     def __init__(self):
         self.host = os.getenv("REDIS_HOST", "localhost")
         self.port = int(os.getenv("REDIS_PORT", "6379"))
@@ -21,6 +36,20 @@ class RedisClient:
         socket_timeout = int(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
         socket_connect_timeout = int(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "5"))
         
+        # 채팅 히스토리 리스트 최대 길이 (초과분은 오래된 메시지부터 LTRIM)
+        self.chat_history_max_length = int(os.getenv("CACHE_CHAT_HISTORY_MAX_LENGTH", "50"))
+        
+        # 프로세스 내 L1 캐시 (선택) - 조회 시 네트워크 왕복과 json.loads 생략
+        # 파드 간 일관성은 무효화 채널 pub/sub으로 유지하고, 짧은 TTL로 지연 수신을 보완
+        self.local_cache = None
+        if os.getenv("CACHE_L1_ENABLED", "false").lower() == "true":
+            self.local_cache = LocalCache(
+                max_entries=int(os.getenv("CACHE_L1_MAX_ENTRIES", "1000")),
+                ttl_seconds=float(os.getenv("CACHE_L1_TTL_SECONDS", "5"))
+            )
+        self._invalidation_task: Optional[asyncio.Task] = None
+        self._invalidation_subscribed = False
+        
         self.redis_client = redis.Redis(
             host=self.host,
             port=self.port,
@@ -32,6 +61,91 @@ class RedisClient:
             retry_on_timeout=True,
             max_connections=max_connections  # 100 → 500 (1000명 대응)
         )
+        
+        # 비동기 클라이언트 (스트리밍 등 이벤트 루프 경로 전용)
+        # - 동기 클라이언트는 이벤트 루프를 블로킹하므로 async 경로에서는 이 클라이언트 사용
+        self.async_redis_client = aioredis.Redis(
+            host=self.host,
+            port=self.port,
+            db=self.db,
+            password=self.password,
+            decode_responses=True,
+            socket_connect_timeout=socket_connect_timeout,
+            socket_timeout=socket_timeout,
+            retry_on_timeout=True,
+            max_connections=max_connections
+        )
+        
+        # pub/sub 전용 비동기 클라이언트 (취소 버스, L1 무효화 구독)
+        # - 구독 연결은 메시지가 없으면 계속 유휴 상태이므로 읽기 타임아웃을 두지 않고,
+        #   health_check_interval 마다 PING으로 끊긴 연결을 감지한다
+        self.async_pubsub_client = aioredis.Redis(
+            host=self.host,
+            port=self.port,
+            db=self.db,
+            password=self.password,
+            decode_responses=True,
+            socket_connect_timeout=socket_connect_timeout,
+            socket_timeout=None,
+            socket_keepalive=True,
+            health_check_interval=int(os.getenv("REDIS_PUBSUB_HEALTH_CHECK_INTERVAL", "30"))
+        )
+        
+        # 캐시 값 코덱 (CACHE_CODEC: json, orjson, msgpack)
+        # - 값 키는 "v{버전}:{코덱}:" 접두사로 분리되어 코덱을 바꿔도 이전 형식의 값을 읽지 않음
+        # - 바이너리 코덱은 응답 디코딩을 끈 별도 클라이언트로 읽고 쓴다
+        self.codec = get_codec()
+        self.payload_client = self.redis_client
+        self.async_payload_client = self.async_redis_client
+        if self.codec.binary:
+            self.payload_client = redis.Redis(
+                host=self.host,
+                port=self.port,
+                db=self.db,
+                password=self.password,
+                decode_responses=False,
+                socket_connect_timeout=socket_connect_timeout,
+                socket_timeout=socket_timeout,
+                retry_on_timeout=True,
+                max_connections=max_connections
+            )
+            self.async_payload_client = aioredis.Redis(
+                host=self.host,
+                port=self.port,
+                db=self.db,
+                password=self.password,
+                decode_responses=False,
+                socket_connect_timeout=socket_connect_timeout,
+                socket_timeout=socket_timeout,
+                retry_on_timeout=True,
+                max_connections=max_connections
+            )
+    
+    def payload_key(self, key: str) -> str:
+        """코덱/버전 접두사가 붙은 실제 Redis 키"""
+        return f"{self.codec.key_prefix}{key}"
+    
+    def is_payload_key(self, redis_key: str) -> bool:
+        """현재 코덱으로 저장된 값 키인지 확인"""
+        return redis_key.startswith(self.codec.key_prefix)
+    
+    def read_payload(self, redis_key: str) -> Any:
+        """현재 코덱으로 저장된 값 키를 디코딩하여 조회 (캐시 관리 API용, string/list)"""
+        key_type = self.payload_client.type(redis_key)
+        if isinstance(key_type, bytes):
+            key_type = key_type.decode("utf-8")
+        if key_type == "list":
+            return [self.codec.decode(entry) for entry in self.payload_client.lrange(redis_key, 0, -1)]
+        data = self.payload_client.get(redis_key)
+        return self.codec.decode(data) if data else None
+    
+    def _other_codec_keys(self, key: str) -> List[str]:
+        """다른 코덱으로 저장된 동일 키 목록 (코덱 전환 중 혼재 파드의 값 무효화용)"""
+        current = self.payload_key(key)
+        return [
+            other for other in (get_codec(name).key_prefix + key for name in available_codecs())
+            if other != current
+        ]
     
     def ping(self) -> bool:
         """Redis 연결 상태 확인"""
@@ -40,11 +154,134 @@ class RedisClient:
         except Exception:
             return False
     
+    # ==========================================
+    # L1 캐시 (프로세스 내, 선택)
+    # - 조회: L1 → Redis 순서, Redis 히트 시 L1에 저장
+    # - 변경: 로컬 항목 제거 + 무효화 채널에 publish (쓰기 파이프라인에 함께 전송)
+    # ==========================================
+    
+    def _l1_get(self, key: str) -> Optional[Any]:
+        """L1 캐시 조회 (무효화 채널을 구독 중일 때만 - 끊긴 동안은 Redis에서 조회)"""
+        if self.local_cache is None or not self._invalidation_subscribed:
+            return None
+        return self.local_cache.get(key)
+    
+    def _l1_set(self, key: str, value: Any, expire_seconds: Optional[int] = None):
+        """L1 캐시 저장 (Redis TTL보다 오래 유지하지 않음)"""
+        if self.local_cache is not None and self._invalidation_subscribed and value is not None:
+            self.local_cache.set(key, value, expire_seconds)
+    
+    def _queue_invalidation(self, pipe, key: str):
+        """쓰기 파이프라인에 무효화 추가 (추가 왕복 없음)
+        
+        - 다른 코덱 형식으로 저장된 동일 키 삭제 (다음 조회 시 DB에서 재구성)
+        - L1 항목 제거 및 무효화 채널 publish
+        """
+        other_keys = self._other_codec_keys(key)
+        if other_keys:
+            pipe.delete(*other_keys)
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
+            pipe.publish(self.L1_INVALIDATION_CHANNEL, key)
+    
+    def invalidate_local_cache(self, key: Optional[str] = None):
+        """L1 캐시 무효화 (key가 없으면 전체) - 모든 파드에 전파"""
+        if self.local_cache is None:
+            return
+        if key is None:
+            self.local_cache.clear()
+        else:
+            self.local_cache.delete(key)
+        try:
+            self.redis_client.publish(self.L1_INVALIDATION_CHANNEL, key or "*")
+        except Exception as e:
+            logger.warning(f"L1 invalidation publish failed: {e}")
+    
+    def get_local_cache_stats(self) -> Dict[str, Any]:
+        """L1 캐시 통계 조회"""
+        if self.local_cache is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "listener_running": self._invalidation_task is not None and not self._invalidation_task.done(),
+            "listener_subscribed": self._invalidation_subscribed,
+            **self.local_cache.stats()
+        }
+    
+    async def start_invalidation_listener(self):
+        """L1 무효화 채널 구독 시작 (프로세스당 1회, 구독 완료 후 반환)"""
+        if self.local_cache is None:
+            return
+        if self._invalidation_task is not None and not self._invalidation_task.done():
+            return
+        
+        pubsub = await self._subscribe_invalidations()
+        self._invalidation_subscribed = True
+        self._invalidation_task = asyncio.create_task(self._listen_invalidations(pubsub))
+        logger.info("L1 cache invalidation listener subscribed")
+    
+    async def _subscribe_invalidations(self):
+        """무효화 채널 구독 (읽기 타임아웃이 없는 pub/sub 전용 연결)"""
+        pubsub = self.async_pubsub_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.L1_INVALIDATION_CHANNEL)
+        except Exception:
+            await pubsub.aclose()
+            raise
+        return pubsub
+    
+    async def _listen_invalidations(self, pubsub):
+        """무효화 메시지를 수신하여 로컬 항목 제거 (연결이 끊기면 L1을 비우고 재구독)"""
+        delay = self.PUBSUB_RECONNECT_MIN_DELAY
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = await self._subscribe_invalidations()
+                    # 끊긴 동안의 무효화는 놓쳤을 수 있으므로 재구독 후 L1 전체 비움
+                    self.local_cache.clear()
+                    self._invalidation_subscribed = True
+                    logger.info("L1 cache invalidation listener resubscribed")
+                delay = self.PUBSUB_RECONNECT_MIN_DELAY
+                while True:
+                    # 타임아웃마다 반환되어 health check(PING)가 실행됨 - 끊긴 연결은 예외로 감지
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.PUBSUB_POLL_TIMEOUT
+                    )
+                    if message is None or message.get("type") != "message":
+                        continue
+                    key = message.get("data")
+                    if isinstance(key, bytes):
+                        key = key.decode("utf-8")
+                    if key == "*":
+                        self.local_cache.clear()
+                    else:
+                        self.local_cache.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 구독이 끊긴 동안의 변경은 놓칠 수 있으므로 L1 전체 비움
+                self.local_cache.clear()
+                logger.warning(f"L1 cache invalidation listener disconnected, retrying in {delay}s: {e}")
+            finally:
+                self._invalidation_subscribed = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+                    pubsub = None
+            
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.PUBSUB_RECONNECT_MAX_DELAY)
+    
     def set_session(self, chat_id: str, data: Dict[str, Any], expire_seconds: int = 3600) -> bool:
         """세션 데이터 저장"""
         try:
             key = f"session:{chat_id}"
-            self.redis_client.setex(key, expire_seconds, json.dumps(data))
+            pipe = self.payload_client.pipeline(transaction=False)
+            pipe.setex(self.payload_key(key), expire_seconds, self.codec.encode(data))
+            self._queue_invalidation(pipe, key)
+            pipe.execute()
             return True
         except Exception:
             return False
@@ -53,8 +290,13 @@ class RedisClient:
         """세션 데이터 조회"""
         try:
             key = f"session:{chat_id}"
-            data = self.redis_client.get(key)
-            return json.loads(data) if data else None
+            cached = self._l1_get(key)
+            if cached is not None:
+                return cached
+            data = self.payload_client.get(self.payload_key(key))
+            session = self.codec.decode(data) if data else None
+            self._l1_set(key, session)
+            return session
         except Exception:
             return None
     
@@ -62,15 +304,36 @@ class RedisClient:
         """세션 데이터 삭제"""
         try:
             key = f"session:{chat_id}"
-            return bool(self.redis_client.delete(key))
+            pipe = self.payload_client.pipeline(transaction=False)
+            pipe.delete(self.payload_key(key))
+            self._queue_invalidation(pipe, key)
+            return bool(pipe.execute()[0])
         except Exception:
             return False
     
+    # ==========================================
+    # 채팅 히스토리 (Redis LIST, 메시지 1건 = 엔트리 1개)
+    # - 저장 시 RPUSHX로 추가만 하고 LTRIM으로 최대 길이 유지
+    # - 전체 재구성은 캐시 미스 후 DB 로드 시에만 수행
+    # ==========================================
+    
+    @staticmethod
+    def chat_history_key(chat_id: str) -> str:
+        """채팅 히스토리 리스트 키"""
+        return f"chat_history:{chat_id}"
+    
     def set_chat_cache(self, chat_id: str, messages: List[Dict[str, Any]], expire_seconds: int = 1800) -> bool:
-        """채팅 메시지 캐시 저장"""
+        """채팅 메시지 캐시 저장 (전체 재구성 - DB 로드 직후에만 사용)"""
         try:
-            key = f"chat:{chat_id}"
-            self.redis_client.setex(key, expire_seconds, json.dumps(messages))
+            key = self.chat_history_key(chat_id)
+            redis_key = self.payload_key(key)
+            pipe = self.payload_client.pipeline(transaction=True)
+            pipe.delete(redis_key)
+            if messages:
+                pipe.rpush(redis_key, *[self.codec.encode(message) for message in messages[-self.chat_history_max_length:]])
+                pipe.expire(redis_key, expire_seconds)
+            self._queue_invalidation(pipe, key)
+            pipe.execute()
             return True
         except Exception:
             return False
@@ -78,17 +341,39 @@ class RedisClient:
     def get_chat_cache(self, chat_id: str) -> Optional[List[Dict[str, Any]]]:
         """채팅 메시지 캐시 조회"""
         try:
-            key = f"chat:{chat_id}"
-            data = self.redis_client.get(key)
-            return json.loads(data) if data else None
+            key = self.chat_history_key(chat_id)
+            cached = self._l1_get(key)
+            if cached is not None:
+                return cached
+            entries = self.payload_client.lrange(self.payload_key(key), 0, -1)
+            history = [self.codec.decode(entry) for entry in entries] if entries else None
+            self._l1_set(key, history)
+            return history
         except Exception:
             return None
     
+    def append_chat_cache(self, chat_id: str, message: Dict[str, Any], expire_seconds: int = 1800) -> bool:
+        """채팅 메시지 1건 추가 (캐시가 있을 때만 추가하여 부분 히스토리 생성 방지)"""
+        try:
+            key = self.chat_history_key(chat_id)
+            redis_key = self.payload_key(key)
+            pipe = self.payload_client.pipeline(transaction=True)
+            pipe.rpushx(redis_key, self.codec.encode(message))
+            pipe.ltrim(redis_key, -self.chat_history_max_length, -1)
+            pipe.expire(redis_key, expire_seconds)
+            self._queue_invalidation(pipe, key)
+            return bool(pipe.execute()[0])
+        except Exception:
+            return False
+    
     def delete_chat_cache(self, chat_id: str) -> bool:
         """채팅 메시지 캐시 삭제"""
         try:
-            key = f"chat:{chat_id}"
-            return bool(self.redis_client.delete(key))
+            key = self.chat_history_key(chat_id)
+            pipe = self.payload_client.pipeline(transaction=False)
+            pipe.delete(self.payload_key(key))
+            self._queue_invalidation(pipe, key)
+            return bool(pipe.execute()[0])
         except Exception:
             return False
     
@@ -96,7 +381,10 @@ class RedisClient:
         """사용자 채팅 목록 캐시 저장"""
         try:
             key = f"user_chats:{user_id}"
-            self.redis_client.setex(key, expire_seconds, json.dumps(chats))
+            pipe = self.payload_client.pipeline(transaction=False)
+            pipe.setex(self.payload_key(key), expire_seconds, self.codec.encode(chats))
+            self._queue_invalidation(pipe, key)
+            pipe.execute()
             return True
         except Exception:
             return False
@@ -105,8 +393,13 @@ class RedisClient:
         """사용자 채팅 목록 캐시 조회"""
         try:
             key = f"user_chats:{user_id}"
-            data = self.redis_client.get(key)
-            return json.loads(data) if data else None
+            cached = self._l1_get(key)
+            if cached is not None:
+                return cached
+            data = self.payload_client.get(self.payload_key(key))
+            chats = self.codec.decode(data) if data else None
+            self._l1_set(key, chats)
+            return chats
         except Exception:
             return None
     
@@ -114,7 +407,10 @@ class RedisClient:
         """사용자 채팅 목록 캐시 삭제"""
         try:
             key = f"user_chats:{user_id}"
-            return bool(self.redis_client.delete(key))
+            pipe = self.payload_client.pipeline(transaction=False)
+            pipe.delete(self.payload_key(key))
+            self._queue_invalidation(pipe, key)
+            return bool(pipe.execute()[0])
         except Exception:
             return False
     
@@ -126,10 +422,178 @@ class RedisClient:
         """채팅 메시지 저장 (set_chat_cache와 동일)"""
         return self.set_chat_cache(chat_id, messages, expire_seconds)
     
+    def append_chat_message(self, chat_id: str, message: Dict[str, Any], expire_seconds: int = 1800) -> bool:
+        """채팅 메시지 1건 추가 (append_chat_cache와 동일)"""
+        return self.append_chat_cache(chat_id, message, expire_seconds)
+    
     def delete_chat_messages(self, chat_id: str) -> bool:
         """채팅 메시지 삭제 (delete_chat_cache와 동일)"""
         return self.delete_chat_cache(chat_id)
     
+    # ==========================================
+    # 배치 API (여러 키를 한 번의 왕복으로 처리)
+    # - get_many / set_many / delete_many 의 키는 세션, 사용자 채팅 목록과 같은 코덱 값 키
+    # - 코덱 값이 아닌 키(generation:, cancel: 등)는 pipeline() 안에서 직접 명령을 추가
+    # ==========================================
+    
+    @contextmanager
+    def pipeline(self, transaction: bool = False):
+        """파이프라인 컨텍스트 매니저 (블록 종료 시 한 번에 전송)
+        
+        결과가 필요하면 블록 안에서 pipe.execute()를 직접 호출한다.
+        바이너리 코덱 사용 시 코덱 값이 아닌 키의 조회 결과는 bytes로 반환된다.
+        """
+        pipe = self.payload_client.pipeline(transaction=transaction)
+        try:
+            yield pipe
+            pipe.execute()
+        finally:
+            pipe.reset()
+    
+    def queue_delete_many(self, pipe, keys: Iterable[str]):
+        """파이프라인에 코덱 값 키 삭제 및 무효화 추가"""
+        keys = list(keys)
+        if not keys:
+            return
+        pipe.delete(*[self.payload_key(key) for key in keys])
+        for key in keys:
+            self._queue_invalidation(pipe, key)
+    
+    def _queue_set_many(self, pipe, mapping: Dict[str, Any], expire_seconds: Union[int, Dict[str, int]]):
+        """파이프라인에 코덱 값 저장 및 무효화 추가"""
+        for key, value in mapping.items():
+            ttl = expire_seconds[key] if isinstance(expire_seconds, dict) else expire_seconds
+            pipe.setex(self.payload_key(key), ttl, self.codec.encode(value))
+            self._queue_invalidation(pipe, key)
+    
+    def _decode_many(self, keys: List[str], values: List[Any], result: Dict[str, Any]):
+        """MGET 결과 디코딩 및 L1 저장"""
+        for key, data in zip(keys, values):
+            if data:
+                value = self.codec.decode(data)
+                result[key] = value
+                self._l1_set(key, value)
+    
+    def _split_l1(self, keys: Iterable[str]):
+        """L1 히트 항목과 Redis 조회가 필요한 키 분리"""
+        result = {}
+        missing = []
+        for key in keys:
+            cached = self._l1_get(key)
+            if cached is not None:
+                result[key] = cached
+            else:
+                missing.append(key)
+        return result, missing
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """여러 코덱 값 조회 (L1 미스 키만 MGET 1회, 존재하는 키만 반환)"""
+        result, missing = self._split_l1(keys)
+        if not missing:
+            return result
+        try:
+            values = self.payload_client.mget([self.payload_key(key) for key in missing])
+            self._decode_many(missing, values, result)
+        except Exception:
+            pass
+        return result
+    
+    def set_many(self, mapping: Dict[str, Any], expire_seconds: Union[int, Dict[str, int]] = 1800) -> bool:
+        """여러 코덱 값 저장 (키별 TTL은 dict로 지정)"""
+        if not mapping:
+            return True
+        try:
+            with self.pipeline() as pipe:
+                self._queue_set_many(pipe, mapping, expire_seconds)
+            return True
+        except Exception:
+            return False
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """여러 코덱 값 삭제 (삭제된 키 수 반환)"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            with self.pipeline() as pipe:
+                self.queue_delete_many(pipe, keys)
+                return pipe.execute()[0]
+        except Exception:
+            return 0
+    
+    # ==========================================
+    # 키 공간 조회 (SCAN 커서 기반 - KEYS처럼 서버를 블로킹하지 않음)
+    # ==========================================
+    
+    def scan_keys(self, pattern: str = "*", cursor: int = 0, count: int = 100, limit: int = 100):
+        """패턴에 맞는 키를 커서 단위로 조회
+        
+        SCAN은 한 번에 count(힌트)개 안팎의 슬롯만 훑으므로 limit개가 모이거나
+        커서가 끝(0)에 도달할 때까지 반복한다.
+        
+        Returns:
+            (다음 커서 - 0이면 끝, 키 목록)
+        """
+        keys = []
+        while True:
+            cursor, batch = self.redis_client.scan(cursor=cursor, match=pattern, count=count)
+            keys.extend(batch)
+            if cursor == 0 or len(keys) >= limit:
+                return cursor, keys
+    
+    @staticmethod
+    def key_prefix_of(key: str) -> str:
+        """키 접두사 (마지막 ':' 앞부분, 예: v1:json:chat_history:abc → v1:json:chat_history)"""
+        return key.rsplit(":", 1)[0] if ":" in key else key
+    
+    def sample_key_stats(self, sample_size: int = 1000) -> Dict[str, Any]:
+        """접두사별 키 수/메모리 사용량 추정 (RANDOMKEY 표본 + MEMORY USAGE)
+        
+        표본에서 접두사별 비율과 평균 크기를 구하고 DBSIZE를 곱해 전체 값을 추정한다.
+        """
+        total_keys = self.redis_client.dbsize()
+        if total_keys == 0:
+            return {"total_keys": 0, "sampled": 0, "prefixes": []}
+        
+        with self.pipeline() as pipe:
+            for _ in range(min(sample_size, total_keys)):
+                pipe.randomkey()
+            sampled_keys = [key for key in pipe.execute() if key is not None]
+        sampled_keys = [key.decode("utf-8") if isinstance(key, bytes) else key for key in sampled_keys]
+        
+        # 표본 추출과 조회 사이에 만료된 키는 None으로 반환됨
+        with self.pipeline() as pipe:
+            for key in sampled_keys:
+                pipe.memory_usage(key)
+            usages = pipe.execute()
+        
+        stats: Dict[str, Dict[str, int]] = {}
+        sampled = 0
+        for key, usage in zip(sampled_keys, usages):
+            if usage is None:
+                continue
+            sampled += 1
+            entry = stats.setdefault(self.key_prefix_of(key), {"count": 0, "bytes": 0})
+            entry["count"] += 1
+            entry["bytes"] += usage
+        
+        prefixes = []
+        for prefix, entry in stats.items():
+            share = entry["count"] / sampled
+            avg_bytes = entry["bytes"] / entry["count"]
+            estimated_keys = round(share * total_keys)
+            prefixes.append({
+                "prefix": prefix,
+                "sampled_keys": entry["count"],
+                "share": round(share, 4),
+                "estimated_keys": estimated_keys,
+                "avg_bytes": round(avg_bytes),
+                "estimated_bytes": round(avg_bytes * estimated_keys)
+            })
+        prefixes.sort(key=lambda item: item["estimated_bytes"], reverse=True)
+        
+        return {"total_keys": total_keys, "sampled": sampled, "prefixes": prefixes}
+    
     def increment_counter(self, key: str, expire_seconds: int = 3600) -> int:
         """카운터 증가"""
         try:
@@ -149,10 +613,140 @@ class RedisClient:
         except Exception:
             return 0
     
+    # ==========================================
+    # 비동기 API (redis.asyncio)
+    # ==========================================
+    
+    async def ping_async(self) -> bool:
+        """Redis 연결 상태 확인 (비동기)"""
+        try:
+            return await self.async_redis_client.ping()
+        except Exception:
+            return False
+    
+    async def get_chat_messages_async(self, chat_id: str) -> Optional[List[Dict[str, Any]]]:
+        """채팅 메시지 조회 (비동기)"""
+        try:
+            key = self.chat_history_key(chat_id)
+            cached = self._l1_get(key)
+            if cached is not None:
+                return cached
+            entries = await self.async_payload_client.lrange(self.payload_key(key), 0, -1)
+            history = [self.codec.decode(entry) for entry in entries] if entries else None
+            self._l1_set(key, history)
+            return history
+        except Exception:
+            return None
+    
+    async def set_chat_messages_async(self, chat_id: str, messages: List[Dict[str, Any]], expire_seconds: int = 1800) -> bool:
+        """채팅 메시지 저장 (전체 재구성, 비동기)"""
+        try:
+            key = self.chat_history_key(chat_id)
+            redis_key = self.payload_key(key)
+            pipe = self.async_payload_client.pipeline(transaction=True)
+            pipe.delete(redis_key)
+            if messages:
+                pipe.rpush(redis_key, *[self.codec.encode(message) for message in messages[-self.chat_history_max_length:]])
+                pipe.expire(redis_key, expire_seconds)
+            self._queue_invalidation(pipe, key)
+            await pipe.execute()
+            return True
+        except Exception:
+            return False
+    
+    async def append_chat_message_async(self, chat_id: str, message: Dict[str, Any], expire_seconds: int = 1800) -> bool:
+        """채팅 메시지 1건 추가 (캐시가 있을 때만, 비동기)"""
+        try:
+            key = self.chat_history_key(chat_id)
+            redis_key = self.payload_key(key)
+            pipe = self.async_payload_client.pipeline(transaction=True)
+            pipe.rpushx(redis_key, self.codec.encode(message))
+            pipe.ltrim(redis_key, -self.chat_history_max_length, -1)
+            pipe.expire(redis_key, expire_seconds)
+            self._queue_invalidation(pipe, key)
+            return bool((await pipe.execute())[0])
+        except Exception:
+            return False
+    
+    async def delete_chat_messages_async(self, chat_id: str) -> bool:
+        """채팅 메시지 삭제 (비동기)"""
+        try:
+            key = self.chat_history_key(chat_id)
+            pipe = self.async_payload_client.pipeline(transaction=False)
+            pipe.delete(self.payload_key(key))
+            self._queue_invalidation(pipe, key)
+            return bool((await pipe.execute())[0])
+        except Exception:
+            return False
+    
+    @asynccontextmanager
+    async def pipeline_async(self, transaction: bool = False):
+        """파이프라인 컨텍스트 매니저 (비동기, 블록 종료 시 한 번에 전송)"""
+        pipe = self.async_payload_client.pipeline(transaction=transaction)
+        try:
+            yield pipe
+            await pipe.execute()
+        finally:
+            await pipe.reset()
+    
+    async def get_many_async(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """여러 코덱 값 조회 (비동기)"""
+        result, missing = self._split_l1(keys)
+        if not missing:
+            return result
+        try:
+            values = await self.async_payload_client.mget([self.payload_key(key) for key in missing])
+            self._decode_many(missing, values, result)
+        except Exception:
+            pass
+        return result
+    
+    async def set_many_async(self, mapping: Dict[str, Any], expire_seconds: Union[int, Dict[str, int]] = 1800) -> bool:
+        """여러 코덱 값 저장 (비동기)"""
+        if not mapping:
+            return True
+        try:
+            async with self.pipeline_async() as pipe:
+                self._queue_set_many(pipe, mapping, expire_seconds)
+            return True
+        except Exception:
+            return False
+    
+    async def delete_many_async(self, keys: Iterable[str]) -> int:
+        """여러 코덱 값 삭제 (비동기)"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            async with self.pipeline_async() as pipe:
+                self.queue_delete_many(pipe, keys)
+                return (await pipe.execute())[0]
+        except Exception:
+            return 0
+    
     def close(self):
         """Redis 연결 종료"""
         try:
             self.redis_client.close()
+            if self.payload_client is not self.redis_client:
+                self.payload_client.close()
+        except Exception:
+            pass
+    
+    async def close_async(self):
+        """비동기 Redis 연결 종료"""
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            try:
+                await self._invalidation_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._invalidation_task = None
+        try:
+            await self.async_redis_client.aclose()
+            await self.async_pubsub_client.aclose()
+            if self.async_payload_client is not self.async_redis_client:
+                await self.async_payload_client.aclose()
         except Exception:
             pass
 
@@ -156,6 +156,14 @@ class Settings(BaseSettings):
         env="UPLOAD_ALLOWED_TYPES"
     )
     
+    # 재개 가능 업로드 (/uploads) 설정
+    # - 최대 크기: 대용량 래더 ZIP 등 (기본 10GB, 일반 업로드 제한과 별도)
+    # - 청크 최대 크기: PATCH 한 번에 받는 크기 (끊기면 이 청크만 다시 보냄)
+    # - 세션 유효 시간: 마지막 청크 이후 이 시간이 지나면 세션과 임시 파일 정리
+    upload_resumable_max_size: int = Field(default=10737418240, env="UPLOAD_RESUMABLE_MAX_SIZE")  # 10GB
+    upload_chunk_max_size: int = Field(default=67108864, env="UPLOAD_CHUNK_MAX_SIZE")  # 64MB
+    upload_session_ttl_hours: int = Field(default=24, env="UPLOAD_SESSION_TTL_HOURS")
+    
     # 로깅 상세 설정
     # ==========================================
     # 에러 로그에 스택 트레이스 포함 여부
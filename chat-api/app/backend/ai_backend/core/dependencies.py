@@ -1,8 +1,9 @@
 # _*_ coding: utf-8 _*_
 """Dependency injection for FastAPI."""
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ai_backend.api.services.llm_chat_service import LLMChatService
 from ai_backend.api.services.document_service import DocumentService
@@ -59,6 +60,20 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         session.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """비동기 데이터베이스 세션 의존성 주입 (요청별 AsyncSession)"""
+    db = get_database()
+    session = db._async_session_factory()
+    try:
+        yield session
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 def get_redis_client():
     """Redis 클라이언트 의존성 주입 (싱글톤 패턴)"""
     global _redis_instance
@@ -89,13 +104,15 @@ def get_redis_client():
 
 def get_llm_chat_service(
     db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
     redis_client = Depends(get_redis_client)
 ) -> LLMChatService:
     """LLM 채팅 서비스 의존성 주입 (Redis fallback 지원)"""
     # LLMChatService는 환경 변수에서 LLM 제공자를 자동으로 선택
     return LLMChatService(
         db=db,
-        redis_client=redis_client
+        redis_client=redis_client,
+        async_db=async_db
     )
 
 
@@ -121,10 +138,11 @@ def get_group_service(
 
 
 def get_plc_service(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client = Depends(get_redis_client)
 ) -> PlcService:
-    """PLC 관리 서비스 의존성 주입"""
-    return PlcService(db=db)
+    """PLC 관리 서비스 의존성 주입 (트리 버전 공유용 Redis, 없으면 프로세스 내 버전 사용)"""
+    return PlcService(db=db, redis_client=redis_client)
 
 
 def get_program_service(
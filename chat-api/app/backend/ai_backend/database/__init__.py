@@ -5,8 +5,12 @@
 from .base import Base, Database
 from .models.chat_models import *
 from .models.document_models import *
+from .models.document_upload_models import *
 from .models.group_models import *
 from .models.pgm_mapping_models import *
+from .models.pgm_mapping_rollup_models import *
+from .models.plc_change_models import *
+from .models.plc_counter_models import *
 from .models.plc_models import *
 from .models.program_models import *
 
@@ -20,10 +24,17 @@ __all__ = [
     "Chat",
     "ChatMessage",
     "Document",
+    "DocumentBlob",
+    "DocumentUploadSession",
     "Group",
     "GroupMember",
     "PLCMaster",
     "Program",
     "PgmMappingHistory",
-    "PgmMappingAction"
+    "PgmMappingAction",
+    "PgmMappingRollup",
+    "PlcChangeLog",
+    "PlcChangeType",
+    "PlcHierarchyCounter",
+    "PgmPlcCounter"
 ]
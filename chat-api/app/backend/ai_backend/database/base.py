@@ -5,14 +5,15 @@
 import os
 import logging
 # from pathlib import Path
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 # import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-from sqlalchemy import create_engine, orm
+from sqlalchemy import create_engine, orm, text
 from sqlalchemy.engine import engine_from_config
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 
@@ -26,25 +27,84 @@ __all__ = [
 
 Base = declarative_base()
 
+# 기존 테이블에 대한 스키마 보정 DDL (create_all은 기존 테이블에 컬럼을 추가하지 않음)
+# - 모두 멱등(IF NOT EXISTS)이어야 하며, 애플리케이션 시작 시 순서대로 실행됨
+SCHEMA_PATCHES = [
+    # CHAT_MESSAGES.TOKEN_COUNT: 메시지 저장 시 토큰 수를 기록하여 히스토리 잘라내기 시 재토큰화 방지
+    'ALTER TABLE "CHAT_MESSAGES" ADD COLUMN IF NOT EXISTS "TOKEN_COUNT" INTEGER',
+    # PLC_MASTER 복합 인덱스 (plc_models.PLCMaster.__table_args__와 동일하게 유지)
+    'CREATE INDEX IF NOT EXISTS "IX_PLC_MASTER_HIERARCHY" ON "PLC_MASTER" '
+    '("IS_ACTIVE", "PLANT", "PROCESS", "LINE", "EQUIPMENT_GROUP", "UNIT", "PLC_ID")',
+    'CREATE INDEX IF NOT EXISTS "IX_PLC_MASTER_PGM" ON "PLC_MASTER" ("PGM_ID", "IS_ACTIVE", "PLC_ID")',
+    'CREATE INDEX IF NOT EXISTS "IX_PLC_MASTER_UNMAPPED" ON "PLC_MASTER" ("PLC_ID") '
+    'WHERE "PGM_ID" IS NULL AND "IS_ACTIVE"',
+    # PGM_MAPPING_HISTORY 최근 이력 keyset 페이지네이션 (pgm_mapping_models.PgmMappingHistory.__table_args__와 동일)
+    'CREATE INDEX IF NOT EXISTS "IX_PGM_MAPPING_HISTORY_DT_ID" ON "PGM_MAPPING_HISTORY" ("ACTION_DT", "HISTORY_ID")',
+    # DOCUMENTS.CONTENT_HASH: 내용 주소 기반 공유 파일(DOCUMENT_BLOBS) 참조 (shared_core.models.Document와 동일)
+    'ALTER TABLE "DOCUMENTS" ADD COLUMN IF NOT EXISTS "CONTENT_HASH" VARCHAR(64)',
+    'CREATE INDEX IF NOT EXISTS "IX_DOCUMENTS_CONTENT_HASH" ON "DOCUMENTS" ("CONTENT_HASH")',
+]
+
+# 권한/확장 설치 여부에 따라 실패할 수 있는 DDL (각각 별도 트랜잭션, 실패 시 경고만 남기고 계속)
+OPTIONAL_SCHEMA_PATCHES = [
+    # PLC 키워드 검색: ILIKE '%키워드%'를 pg_trgm GIN 인덱스로 처리 (없으면 메모리 검색 인덱스 사용)
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS "IX_PLC_MASTER_ID_TRGM" ON "PLC_MASTER" USING gin ("PLC_ID" gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS "IX_PLC_MASTER_NAME_TRGM" ON "PLC_MASTER" USING gin ("PLC_NAME" gin_trgm_ops)',
+]
+
+
+def create_trigger_if_missing(name: str, table: str, event: str, referencing: str, function: str) -> str:
+    """
+    문장 단위 트리거를 없을 때만 생성하는 멱등 DDL (SCHEMA_PATCHES와 같은 트랜잭션에서 실행)
+
+    DROP/CREATE TRIGGER는 테이블 잠금을 트랜잭션 끝까지 유지하므로 매 시작마다 재생성하지 않는다.
+    트리거 본문 변경은 CREATE OR REPLACE FUNCTION으로 반영되며, 이벤트/전이 테이블을 바꾸려면 이름을 바꾼다.
+    """
+    return f'''
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgrelid = '"{table}"'::regclass AND tgname = '{name}' AND NOT tgisinternal
+    ) THEN
+        CREATE TRIGGER "{name}" AFTER {event} ON "{table}"
+        REFERENCING {referencing} FOR EACH STATEMENT EXECUTE PROCEDURE {function}();
+    END IF;
+END
+$$'''
+
 
 class Database:
     def __init__(self, db_config):
         """
         """
         db_info = db_config['database']
-        database_url = 'postgresql://{username}:{password}@{host}:{port}/{dbname}'.format(
+        url_params = dict(
             username=os.getenv("DATABASE__USERNAME", os.getenv("SYSTEMDB_USERNAME", db_info.get("username"))),
             password=os.getenv("DATABASE__PASSWORD", os.getenv("SYSTEMDB_PASSWORD", db_info.get("password"))),
             host=os.getenv("DATABASE__HOST", db_info.get("host")),
             port=os.getenv("DATABASE__PORT", db_info.get("port")),
             dbname=os.getenv("DATABASE__DBNAME", db_info.get("dbname")),
         )
+        database_url = 'postgresql://{username}:{password}@{host}:{port}/{dbname}'.format(**url_params)
         self._engine = create_engine(database_url)
         self._session_factory = orm.sessionmaker(
             autocommit=False,
             autoflush=False,
             bind=self._engine,
         )
+        
+        # 비동기 엔진 (스트리밍 등 이벤트 루프에서 실행되는 경로 전용)
+        # - 동기 Session은 이벤트 루프를 블로킹하므로 async 경로에서는 AsyncSession 사용
+        async_database_url = 'postgresql+asyncpg://{username}:{password}@{host}:{port}/{dbname}'.format(**url_params)
+        self._async_engine = create_async_engine(async_database_url)
+        self._async_session_factory = async_sessionmaker(
+            bind=self._async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
 
     def create_database(self, checkfirst=True):
         """
@@ -59,11 +119,36 @@ class Database:
             from shared_core.models import Base as SharedBase
             SharedBase.metadata.create_all(bind=self._engine, checkfirst=checkfirst)
             
+            # 기존 테이블 스키마 보정
+            self.apply_schema_patches()
+            
             logger.info("✅ 모든 테이블 생성 완료 (Backend + shared_core)")
         except Exception as e:
             logger.error("❌ 테이블 생성 실패: " + str(e))
             raise e
 
+    def apply_schema_patches(self):
+        """기존 테이블에 누락된 컬럼 등을 멱등 DDL로 보정"""
+        # PLC 카운터/매핑 이력 집계 트리거와 최초 집계 (모델 모듈이 Base를 import하므로 여기서 import)
+        from ai_backend.database.models.pgm_mapping_rollup_models import PGM_MAPPING_ROLLUP_DDL
+        from ai_backend.database.models.plc_counter_models import PLC_COUNTER_DDL
+
+        statements = SCHEMA_PATCHES + PLC_COUNTER_DDL + PGM_MAPPING_ROLLUP_DDL
+        with self._engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        logger.info(f"스키마 보정 DDL {len(statements)}건 적용 완료")
+
+        applied = 0
+        for statement in OPTIONAL_SCHEMA_PATCHES:
+            try:
+                with self._engine.begin() as conn:
+                    conn.execute(text(statement))
+                applied += 1
+            except Exception as e:
+                logger.warning(f"선택 스키마 DDL 적용 실패 (건너뜀): {statement} - {e}")
+        logger.info(f"선택 스키마 DDL {applied}/{len(OPTIONAL_SCHEMA_PATCHES)}건 적용 완료")
+
     @contextmanager
     def session(self):
         """
@@ -76,9 +161,29 @@ class Database:
             raise
         finally:
             session.close()    
+
+    @asynccontextmanager
+    async def async_session(self):
+        """
+        비동기 세션 컨텍스트 (AsyncSession)
+        """
+        session = self._async_session_factory()
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
     def close(self):
         """데이터베이스 연결 종료"""
         if hasattr(self, '_session_factory'):
             self._session_factory.close_all()
         if hasattr(self, '_engine'):
-            self._engine.dispose()
\ No newline at end of file
+            self._engine.dispose()
+
+    async def close_async(self):
+        """비동기 엔진 연결 종료"""
+        if hasattr(self, '_async_engine'):
+            await self._async_engine.dispose()
\ No newline at end of file
@@ -7,12 +7,28 @@ from typing import List, Optional
 from ai_backend.database.models.chat_models import Chat, ChatMessage
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
-from sqlalchemy import desc
+from sqlalchemy import desc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
+def to_history_entry(msg: ChatMessage) -> dict:
+    """ChatMessage를 대화 기록(캐시) 엔트리 딕셔너리로 변환"""
+    role = "user" if msg.message_type == "user" else "assistant"
+    if msg.is_cancelled:
+        role = "system"
+    
+    return {
+        "role": role,
+        "content": msg.message,
+        "timestamp": msg.create_dt.isoformat(),
+        "cancelled": msg.is_cancelled,
+        "token_count": msg.token_count
+    }
+
+
 class ChatCRUD:
     """Chat 관련 CRUD 작업을 처리하는 클래스 - DB 기반"""
     
@@ -46,7 +62,8 @@ class ChatCRUD:
         message: str, 
         message_type: str = "text",
         status: str = None,
-        is_cancelled: bool = False
+        is_cancelled: bool = False,
+        token_count: int = None
     ) -> ChatMessage:
         """메시지 생성"""
         try:
@@ -58,6 +75,7 @@ class ChatCRUD:
                 message_type=message_type,
                 status=status,
                 is_cancelled=is_cancelled,
+                token_count=token_count,
                 create_dt=datetime.now()
             )
             self.session.add(chat_message)
@@ -86,6 +104,21 @@ class ChatCRUD:
             logger.error("Database error getting messages: " + str(e))
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
+    def get_recent_messages(self, chat_id: str, limit: int = 50) -> List[ChatMessage]:
+        """특정 채팅의 최신 메시지 limit건 조회 (오래된 것부터 정렬하여 반환)"""
+        try:
+            messages = self.session.query(ChatMessage)\
+                .filter(ChatMessage.chat_id == chat_id)\
+                .filter(ChatMessage.is_deleted == False)\
+                .order_by(desc(ChatMessage.create_dt))\
+                .limit(limit)\
+                .all()
+            messages.reverse()
+            return messages
+        except Exception as e:
+            logger.error("Database error getting recent messages: " + str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
     def get_chat(self, chat_id: str) -> Optional[Chat]:
         """채팅 조회"""
         try:
@@ -129,7 +162,7 @@ class ChatCRUD:
             logger.error(f"Database error in get_chat_or_create: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def save_user_message(self, message_id: str, chat_id: str, user_id: str, message: str) -> ChatMessage:
+    def save_user_message(self, message_id: str, chat_id: str, user_id: str, message: str, token_count: int = None) -> ChatMessage:
         """사용자 메시지 저장"""
         try:
             return self.create_message(
@@ -138,13 +171,14 @@ class ChatCRUD:
                 user_id=user_id,
                 message=message,
                 message_type="user",
-                status="completed"
+                status="completed",
+                token_count=token_count
             )
         except Exception as e:
             logger.error(f"Database error saving user message: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def save_ai_message(self, message_id: str, chat_id: str, user_id: str, message: str, status: str = "completed") -> ChatMessage:
+    def save_ai_message(self, message_id: str, chat_id: str, user_id: str, message: str, status: str = "completed", token_count: int = None) -> ChatMessage:
         """AI 메시지 저장"""
         try:
             return self.create_message(
@@ -153,7 +187,8 @@ class ChatCRUD:
                 user_id=user_id,
                 message=message,
                 message_type="assistant",
-                status=status
+                status=status,
+                token_count=token_count
             )
         except Exception as e:
             logger.error(f"Database error saving AI message: {str(e)}")
@@ -165,18 +200,7 @@ class ChatCRUD:
             messages = self.get_messages(chat_id)
             
             # ChatMessage 객체를 딕셔너리로 변환
-            history = []
-            for msg in messages:
-                role = "user" if msg.message_type == "user" else "assistant"
-                if msg.is_cancelled:
-                    role = "system"
-                
-                history.append({
-                    "role": role,
-                    "content": msg.message,
-                    "timestamp": msg.create_dt.isoformat(),
-                    "cancelled": msg.is_cancelled
-                })
+            history = [to_history_entry(msg) for msg in messages]
             
             # 시간순으로 정렬 (오래된 것부터)
             history.sort(key=lambda x: x["timestamp"])
@@ -290,7 +314,7 @@ class ChatCRUD:
             logger.error(f"Database error getting active generating chats: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def save_user_message_simple(self, message_id: str, chat_id: str, user_id: str, message: str):
+    def save_user_message_simple(self, message_id: str, chat_id: str, user_id: str, message: str, token_count: int = None):
         """사용자 메시지 저장"""
         try:
             self.create_message(
@@ -299,7 +323,8 @@ class ChatCRUD:
                 user_id=user_id,
                 message=message,
                 message_type="user",
-                status="completed"
+                status="completed",
+                token_count=token_count
             )
         except Exception as e:
             logger.error(f"Database error saving user message: {str(e)}")
@@ -320,7 +345,7 @@ class ChatCRUD:
             logger.error(f"Database error saving AI message generating: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def update_ai_message_completed(self, message_id: str, content: str, external_api_nodes: dict = None):
+    def update_ai_message_completed(self, message_id: str, content: str, external_api_nodes: dict = None, token_count: int = None):
         """AI 메시지를 완료 상태로 업데이트"""
         try:
             self.update_message_status(message_id, "completed")
@@ -328,6 +353,7 @@ class ChatCRUD:
             message = self.session.query(ChatMessage).filter(ChatMessage.message_id == message_id).first()
             if message:
                 message.message = content
+                message.token_count = token_count
                 # External API 노드 데이터가 있으면 안전하게 저장
                 if external_api_nodes:
                     safe_nodes = self._safe_json_serialize(external_api_nodes)
@@ -396,3 +422,272 @@ class ChatCRUD:
         except Exception as e:
             self.session.rollback()
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+
+class AsyncChatCRUD:
+    """Chat 관련 CRUD 작업 - AsyncSession 기반 (스트리밍 등 이벤트 루프 경로 전용)
+    
+    ChatCRUD와 동일한 인터페이스를 코루틴으로 제공하여
+    SSE 스트림 처리 중 DB 작업이 이벤트 루프를 블로킹하지 않도록 한다.
+    """
+    
+    # 순수 변환 헬퍼는 동기 CRUD와 공유
+    _safe_error_message = ChatCRUD._safe_error_message
+    _safe_json_serialize = ChatCRUD._safe_json_serialize
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def create_chat(self, chat_id: str, chat_title: str, user_id: str) -> Chat:
+        """채팅 생성"""
+        try:
+            chat = Chat(
+                chat_id=chat_id,
+                chat_title=chat_title,
+                user_id=user_id,
+                create_dt=datetime.now(),
+                is_active=True  # 활성 상태로 생성
+            )
+            self.session.add(chat)
+            await self.session.commit()
+            await self.session.refresh(chat)
+            return chat
+        except Exception as e:
+            logger.error(f"Database error creating chat: {str(e)}")
+            await self.session.rollback()
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def create_message(
+        self, 
+        message_id: str, 
+        chat_id: str, 
+        user_id: str, 
+        message: str, 
+        message_type: str = "text",
+        status: str = None,
+        is_cancelled: bool = False,
+        token_count: int = None
+    ) -> ChatMessage:
+        """메시지 생성 (마지막 메시지 시간 갱신까지 한 번의 커밋으로 처리)"""
+        try:
+            now = datetime.now()
+            chat_message = ChatMessage(
+                message_id=message_id,
+                chat_id=chat_id,
+                user_id=user_id,
+                message=message,
+                message_type=message_type,
+                status=status,
+                is_cancelled=is_cancelled,
+                token_count=token_count,
+                create_dt=now
+            )
+            self.session.add(chat_message)
+            
+            # 채팅의 마지막 메시지 시간 업데이트
+            await self.session.execute(
+                update(Chat).where(Chat.chat_id == chat_id).values(last_message_at=now)
+            )
+            await self.session.commit()
+            return chat_message
+        except Exception as e:
+            logger.error(f"Database error creating message: {str(e)}")
+            await self.session.rollback()
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def get_messages(self, chat_id: str, limit: int = 50) -> List[ChatMessage]:
+        """특정 채팅의 메시지 조회"""
+        try:
+            result = await self.session.execute(
+                select(ChatMessage)
+                .where(ChatMessage.chat_id == chat_id)
+                .where(ChatMessage.is_deleted == False)
+                .order_by(ChatMessage.create_dt)
+                .limit(limit)
+                # 다른 요청(취소 등)에서 변경된 상태를 반영하도록 identity map 갱신
+                .execution_options(populate_existing=True)
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error("Database error getting messages: " + str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def get_recent_messages(self, chat_id: str, limit: int = 50) -> List[ChatMessage]:
+        """특정 채팅의 최신 메시지 limit건 조회 (오래된 것부터 정렬하여 반환)"""
+        try:
+            result = await self.session.execute(
+                select(ChatMessage)
+                .where(ChatMessage.chat_id == chat_id)
+                .where(ChatMessage.is_deleted == False)
+                .order_by(desc(ChatMessage.create_dt))
+                .limit(limit)
+            )
+            messages = list(result.scalars().all())
+            messages.reverse()
+            return messages
+        except Exception as e:
+            logger.error("Database error getting recent messages: " + str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def get_generating_message_id(self, chat_id: str) -> Optional[str]:
+        """특정 채팅에서 가장 최근의 generating 상태 메시지 ID (없으면 None)"""
+        try:
+            result = await self.session.execute(
+                select(ChatMessage.message_id)
+                .where(ChatMessage.chat_id == chat_id)
+                .where(ChatMessage.status == "generating")
+                .where(ChatMessage.is_deleted == False)
+                .order_by(desc(ChatMessage.create_dt))
+                .limit(1)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("Database error getting generating message: " + str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def is_message_cancelled(self, message_id: str) -> bool:
+        """메시지 취소 여부 (단일 컬럼 조회 - 스트림의 주기적 취소 확인용)"""
+        try:
+            result = await self.session.execute(
+                select(ChatMessage.is_cancelled).where(ChatMessage.message_id == message_id)
+            )
+            return bool(result.scalar_one_or_none())
+        except Exception as e:
+            logger.error("Database error checking message cancelled: " + str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def get_messages_from_db(self, chat_id: str) -> List[dict]:
+        """데이터베이스에서 메시지 조회하여 딕셔너리로 변환"""
+        try:
+            messages = await self.get_messages(chat_id)
+            
+            # 쿼리가 create_dt 순으로 정렬되어 있으므로 추가 정렬 불필요
+            return [to_history_entry(msg) for msg in messages]
+        except HandledException:
+            raise
+        except Exception as e:
+            logger.error(f"Database error getting messages: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def get_chat(self, chat_id: str) -> Optional[Chat]:
+        """채팅 조회"""
+        try:
+            result = await self.session.execute(select(Chat).where(Chat.chat_id == chat_id))
+            return result.scalars().first()
+        except Exception as e:
+            logger.error(f"Database error getting chat: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def get_chat_or_create(self, chat_id: str, user_id: str = "user") -> Chat:
+        """채팅이 없으면 생성하고 반환"""
+        try:
+            chat = await self.get_chat(chat_id)
+            if not chat:
+                chat = await self.create_chat(
+                    chat_id=chat_id,
+                    chat_title=f"Chat {chat_id}",
+                    user_id=user_id
+                )
+            return chat
+        except HandledException:
+            raise
+        except Exception as e:
+            logger.error(f"Database error in get_chat_or_create: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def save_user_message_simple(self, message_id: str, chat_id: str, user_id: str, message: str, token_count: int = None):
+        """사용자 메시지 저장"""
+        await self.create_message(
+            message_id=message_id,
+            chat_id=chat_id,
+            user_id=user_id,
+            message=message,
+            message_type="user",
+            status="completed",
+            token_count=token_count
+        )
+    
+    async def save_ai_message(self, message_id: str, chat_id: str, user_id: str, message: str, status: str = "completed", token_count: int = None) -> ChatMessage:
+        """AI 메시지 저장"""
+        return await self.create_message(
+            message_id=message_id,
+            chat_id=chat_id,
+            user_id=user_id,
+            message=message,
+            message_type="assistant",
+            status=status,
+            token_count=token_count
+        )
+    
+    async def save_ai_message_generating(self, message_id: str, chat_id: str, user_id: str):
+        """AI 메시지를 generating 상태로 저장"""
+        await self.create_message(
+            message_id=message_id,
+            chat_id=chat_id,
+            user_id=user_id,
+            message="",  # 빈 메시지로 시작
+            message_type="assistant",
+            status="generating"
+        )
+    
+    async def update_message_status(self, message_id: str, status: str, is_cancelled: bool = False):
+        """메시지 상태 업데이트"""
+        try:
+            await self.session.execute(
+                update(ChatMessage)
+                .where(ChatMessage.message_id == message_id)
+                .values(status=status, is_cancelled=is_cancelled)
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def update_ai_message_completed(self, message_id: str, content: str, external_api_nodes: dict = None, token_count: int = None):
+        """AI 메시지를 완료 상태로 업데이트 (단일 UPDATE 문)"""
+        try:
+            values = {"status": "completed", "is_cancelled": False, "message": content, "token_count": token_count}
+            # External API 노드 데이터가 있으면 안전하게 저장
+            if external_api_nodes:
+                values["external_api_nodes"] = self._safe_json_serialize(external_api_nodes)
+            await self.session.execute(
+                update(ChatMessage).where(ChatMessage.message_id == message_id).values(**values)
+            )
+            await self.session.commit()
+        except Exception as e:
+            logger.error(f"Database error updating AI message completed: {str(e)}")
+            await self.session.rollback()
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def update_message_to_error(self, message_id: str, error_message):
+        """메시지를 에러 상태로 업데이트 (단일 UPDATE 문)"""
+        try:
+            safe_error_msg = self._safe_error_message(error_message)
+            await self.session.execute(
+                update(ChatMessage)
+                .where(ChatMessage.message_id == message_id)
+                .values(
+                    status="error",
+                    is_cancelled=False,
+                    message=f"❌ 오류가 발생했습니다: {safe_error_msg}"
+                )
+            )
+            await self.session.commit()
+        except Exception as e:
+            logger.error(f"Database error updating message to error: {str(e)}")
+            await self.session.rollback()
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    async def update_message_cancelled(self, message_id: str, message: str):
+        """메시지를 취소 상태로 업데이트 (단일 UPDATE 문)"""
+        try:
+            await self.session.execute(
+                update(ChatMessage)
+                .where(ChatMessage.message_id == message_id)
+                .values(status="cancelled", is_cancelled=True, message=message)
+            )
+            await self.session.commit()
+        except Exception as e:
+            logger.error(f"Database error updating message to cancelled: {str(e)}")
+            await self.session.rollback()
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
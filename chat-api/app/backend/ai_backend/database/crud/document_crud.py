@@ -76,18 +76,18 @@ class DocumentCRUD(BaseDocumentCRUD):
             logger.error(f"문서 처리 정보 업데이트 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def find_document_by_hash(self, file_hash: str, status_filter: str = None):
+    def find_document_by_hash(self, file_hash: str, status_filter: str = None, user_id: str = None):
         """파일 해시를 기반으로 기존 문서 검색 (FastAPI 예외 처리)"""
         try:
-            return super().find_document_by_hash(file_hash, status_filter)
+            return super().find_document_by_hash(file_hash, status_filter, user_id)
         except Exception as e:
             logger.error(f"해시 기반 문서 검색 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def find_completed_document_by_hash(self, file_hash: str):
+    def find_completed_document_by_hash(self, file_hash: str, readable_by: str = None):
         """완료된 상태의 기존 문서 검색 (FastAPI 예외 처리)"""
         try:
-            return super().find_completed_document_by_hash(file_hash)
+            return super().find_completed_document_by_hash(file_hash, readable_by)
         except Exception as e:
             logger.error(f"완료된 문서 검색 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
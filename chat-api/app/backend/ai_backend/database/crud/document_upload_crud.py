@@ -0,0 +1,107 @@
+# _*_ coding: utf-8 _*_
+"""Resumable document upload session CRUD operations with database."""
+
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from ai_backend.database.models.document_upload_models import DocumentUploadSession
+from ai_backend.types.response.exceptions import HandledException
+from ai_backend.types.response.response_code import ResponseCode
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentUploadCRUD:
+    """재개 가능 업로드 세션 CRUD 작업을 처리하는 클래스"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_session(self, session_data: dict) -> DocumentUploadSession:
+        """업로드 세션 생성"""
+        try:
+            upload = DocumentUploadSession(**session_data)
+            self.db.add(upload)
+            self.db.commit()
+            self.db.refresh(upload)
+            return upload
+        except Exception as e:
+            self.db.rollback()
+            logger.error(str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    def get_session(self, upload_id: str) -> Optional[DocumentUploadSession]:
+        """업로드 세션 조회"""
+        try:
+            return self.db.query(DocumentUploadSession)\
+                .filter(DocumentUploadSession.upload_id == upload_id)\
+                .first()
+        except Exception as e:
+            logger.error(str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    def lock_session(self, upload_id: str) -> Optional[DocumentUploadSession]:
+        """
+        업로드 세션 행 잠금 (NOWAIT - 커밋/롤백할 때까지 유지)
+
+        같은 업로드에 청크/완료 요청이 동시에 들어오면 기다리지 않고 DOCUMENT_UPLOAD_LOCKED (409)
+        """
+        try:
+            return self.db.query(DocumentUploadSession)\
+                .filter(DocumentUploadSession.upload_id == upload_id)\
+                .populate_existing()\
+                .with_for_update(nowait=True)\
+                .first()
+        except OperationalError as e:
+            self.db.rollback()
+            raise HandledException(ResponseCode.DOCUMENT_UPLOAD_LOCKED, e=e, http_status_code=409)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    def update_session(self, upload: DocumentUploadSession, **kwargs) -> DocumentUploadSession:
+        """업로드 세션 수정 (커밋 - 잠금 해제)"""
+        try:
+            for key, value in kwargs.items():
+                setattr(upload, key, value)
+            upload.update_dt = datetime.now()
+            self.db.commit()
+            self.db.refresh(upload)
+            return upload
+        except Exception as e:
+            self.db.rollback()
+            logger.error(str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    def mark_completed(self, upload: DocumentUploadSession, document_id: str, expires_dt: datetime) -> None:
+        """업로드 세션 완료 표시 (커밋하지 않음 - 같은 트랜잭션의 문서 저장 커밋에 함께 반영)"""
+        upload.status = "completed"
+        upload.document_id = document_id
+        upload.expires_dt = expires_dt
+        upload.update_dt = datetime.now()
+
+    def delete_session(self, upload: DocumentUploadSession) -> None:
+        """업로드 세션 삭제"""
+        try:
+            self.db.delete(upload)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    def get_expired_sessions(self, now: datetime, limit: int = 100) -> List[DocumentUploadSession]:
+        """만료된 업로드 세션 조회 (EXPIRES_DT 인덱스, 오래된 순)"""
+        try:
+            return self.db.query(DocumentUploadSession)\
+                .filter(DocumentUploadSession.expires_dt < now)\
+                .order_by(DocumentUploadSession.expires_dt)\
+                .limit(limit)\
+                .all()
+        except Exception as e:
+            logger.error(str(e))
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
@@ -1,12 +1,15 @@
 # _*_ coding: utf-8 _*_
 """PLC-Program Mapping CRUD operations."""
 
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from ai_backend.database.models.pgm_mapping_models import PgmMappingHistory, PgmMappingAction
+from ai_backend.database.models.pgm_mapping_rollup_models import PgmMappingRollup
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
+from ai_backend.utils.keyset import decode_cursor, encode_cursor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -139,10 +142,14 @@ class PgmMappingHistoryCrud:
         self,
         skip: int = 0,
         limit: int = 100,
-        action: Optional[PgmMappingAction] = None
-    ) -> Tuple[List[PgmMappingHistory], int]:
+        action: Optional[PgmMappingAction] = None,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[PgmMappingHistory], Optional[int]]:
         """
-        최근 매핑 변경 이력 조회 (전체)
+        최근 매핑 변경 이력 조회 (전체, ACTION_DT → HISTORY_ID 내림차순)
+        - cursor가 있으면 (ACTION_DT, HISTORY_ID) keyset으로 이어서 조회 (skip 무시)
+        - 전체 개수는 PGM_MAPPING_ROLLUP 합계 (count_mode=none이면 None - 다음 페이지 조회 시 권장)
         Returns: (이력 목록, 전체 개수)
         """
         try:
@@ -151,15 +158,41 @@ class PgmMappingHistoryCrud:
             if action:
                 query = query.filter(PgmMappingHistory.action == action.value)
             
-            total = query.count()
-            histories = query.order_by(
-                PgmMappingHistory.action_dt.desc()
-            ).offset(skip).limit(limit).all()
+            query = query.order_by(
+                PgmMappingHistory.action_dt.desc(),
+                PgmMappingHistory.history_id.desc()
+            )
+            if cursor:
+                try:
+                    action_dt, history_id = decode_cursor(cursor, 2)
+                    action_dt = datetime.fromisoformat(action_dt)
+                except (TypeError, ValueError) as e:
+                    raise HandledException(ResponseCode.INVALID_DATA_FORMAT, msg="잘못된 커서입니다.", e=e)
+                query = query.filter(
+                    tuple_(PgmMappingHistory.action_dt, PgmMappingHistory.history_id) < tuple_(action_dt, history_id)
+                )
+            elif skip:
+                query = query.offset(skip)
+            
+            histories = query.limit(limit).all()
+            total = None
+            if count_mode != "none":
+                total = self._rollup_count(action=action.value if action else None)
             
             return histories, total
+        except HandledException:
+            raise
         except Exception as e:
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
 
+    @staticmethod
+    def next_cursor(histories: List[PgmMappingHistory], limit: int) -> Optional[str]:
+        """다음 페이지 커서 (페이지가 가득 차지 않았으면 None)"""
+        if not histories or len(histories) < limit:
+            return None
+        last = histories[-1]
+        return encode_cursor([last.action_dt.isoformat(), last.history_id])
+
     def count_histories_by_plc(self, plc_id: str) -> int:
         """특정 PLC의 이력 개수"""
         try:
@@ -170,20 +203,114 @@ class PgmMappingHistoryCrud:
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
 
     def count_histories_by_program(self, pgm_id: str) -> int:
-        """특정 프로그램의 이력 개수"""
+        """
+        특정 프로그램의 이력 개수 (PGM_ID 기준, PGM_MAPPING_ROLLUP 합계)
+        - 집계의 PGM_ID는 해제 이력에 PREV_PGM_ID를 쓰므로 DELETE는 제외한다
+        """
+        return self._rollup_count(pgm_id=pgm_id, exclude_action=PgmMappingAction.DELETE.value)
+
+    def count_histories_by_action(self, action: PgmMappingAction) -> int:
+        """특정 액션 타입의 이력 개수 (PGM_MAPPING_ROLLUP 합계)"""
+        return self._rollup_count(action=action.value)
+
+    def count_actions_by_plc(self, plc_id: str) -> Dict[str, int]:
+        """특정 PLC의 액션별 이력 개수 (PLC_ID 인덱스로 GROUP BY 1회)"""
         try:
-            return self.db.query(PgmMappingHistory).filter(
-                PgmMappingHistory.pgm_id == pgm_id
-            ).count()
+            rows = self.db.query(
+                PgmMappingHistory.action,
+                func.count()
+            ).filter(
+                PgmMappingHistory.plc_id == plc_id
+            ).group_by(PgmMappingHistory.action).all()
+            return {action: count for action, count in rows}
         except Exception as e:
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
 
-    def count_histories_by_action(self, action: PgmMappingAction) -> int:
-        """특정 액션 타입의 이력 개수"""
+    def _rollup_count(
+        self,
+        action: Optional[str] = None,
+        pgm_id: Optional[str] = None,
+        exclude_action: Optional[str] = None
+    ) -> int:
+        """PGM_MAPPING_ROLLUP 합계로 이력 개수 계산"""
         try:
-            return self.db.query(PgmMappingHistory).filter(
-                PgmMappingHistory.action == action.value
-            ).count()
+            query = self.db.query(func.coalesce(func.sum(PgmMappingRollup.action_count), 0))
+            if action:
+                query = query.filter(PgmMappingRollup.action == action)
+            if exclude_action:
+                query = query.filter(PgmMappingRollup.action != exclude_action)
+            if pgm_id:
+                query = query.filter(PgmMappingRollup.pgm_id == pgm_id)
+            return int(query.scalar())
+        except Exception as e:
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    # ========== 매핑 활동 집계 (PGM_MAPPING_ROLLUP) ==========
+
+    # group_by → 집계 컬럼 (line은 공정/Plant가 달라도 이름이 같을 수 있어 상위 계층을 함께 묶는다)
+    ACTIVITY_GROUPS = {
+        "plant": ("plant",),
+        "process": ("plant", "process"),
+        "line": ("plant", "process", "line"),
+        "program": ("pgm_id",),
+    }
+
+    def get_activity(
+        self,
+        start: datetime,
+        end: datetime,
+        bucket: str = "day",
+        group_by: Optional[str] = None,
+        actions: Optional[Sequence[str]] = None,
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        pgm_id: Optional[str] = None
+    ) -> List[tuple]:
+        """
+        구간(bucket: hour/day)별 액션 건수 집계 [start, end)
+        Returns: (구간 시작, *group_by 컬럼, CREATE, UPDATE, DELETE, RESTORE) 튜플 목록 (구간 → 그룹 순)
+        
+        시간 집계 행만 읽으므로 이력 원본 크기와 무관하게 기간 × 그룹 수에 비례한다.
+        """
+        try:
+            bucket_dt = PgmMappingRollup.bucket_dt
+            if bucket == "day":
+                bucket_dt = func.date_trunc("day", PgmMappingRollup.bucket_dt)
+            group_columns = [getattr(PgmMappingRollup, attr) for attr in self.ACTIVITY_GROUPS.get(group_by, ())]
+            action_counts = [
+                func.coalesce(
+                    func.sum(PgmMappingRollup.action_count).filter(PgmMappingRollup.action == action.value), 0
+                )
+                for action in (
+                    PgmMappingAction.CREATE,
+                    PgmMappingAction.UPDATE,
+                    PgmMappingAction.DELETE,
+                    PgmMappingAction.RESTORE
+                )
+            ]
+            
+            query = self.db.query(
+                bucket_dt.label("bucket"),
+                *group_columns,
+                *action_counts
+            ).filter(
+                PgmMappingRollup.bucket_dt >= start,
+                PgmMappingRollup.bucket_dt < end
+            )
+            if actions:
+                query = query.filter(PgmMappingRollup.action.in_(actions))
+            if plant:
+                query = query.filter(PgmMappingRollup.plant == plant)
+            if process:
+                query = query.filter(PgmMappingRollup.process == process)
+            if line:
+                query = query.filter(PgmMappingRollup.line == line)
+            if pgm_id:
+                query = query.filter(PgmMappingRollup.pgm_id == pgm_id)
+            
+            keys = [bucket_dt, *group_columns]
+            return query.group_by(*keys).order_by(*keys).all()
         except Exception as e:
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
 
@@ -1,28 +1,116 @@
 # _*_ coding: utf-8 _*_
 """PLC CRUD operations with database - 프로그램 매핑 메서드 추가"""
+import csv
+import io
+import json
 import logging
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from ai_backend.database.models.pgm_mapping_models import (
     PgmMappingAction,
     PgmMappingHistory,
 )
+from ai_backend.database.models.plc_change_models import PlcChangeLog, PlcChangeType
+from ai_backend.database.models.plc_counter_models import (
+    PgmPlcCounter,
+    PlcHierarchyCounter,
+    plc_counter_fill_statements,
+)
 from ai_backend.database.models.plc_models import PLCMaster
 from ai_backend.types.response.exceptions import HandledException
 from ai_backend.types.response.response_code import ResponseCode
-from sqlalchemy import and_, or_
+from ai_backend.utils.keyset import decode_cursor, encode_cursor
+from sqlalchemy import DateTime, String, and_, case, func, insert, literal, or_, select, text, tuple_, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# PLC_CHANGE_LOG 기록을 직렬화하는 advisory lock 키 (임의의 고정값)
+PLC_CHANGE_LOCK_KEY = 74210013
+
+# PLC 일괄 등록 스테이징 테이블 (세션별 임시 테이블, 커밋 시 비워짐)
+PLC_IMPORT_STAGE_TABLE = "plc_import_stage"
+PLC_IMPORT_STAGE_COLUMNS = (
+    "plc_id", "plant", "process", "line", "equipment_group", "unit", "plc_name", "is_active", "create_user"
+)
+
 
 class PlcCRUD:
     """PLC 관련 CRUD 작업을 처리하는 클래스"""
     
+    # 목록 정렬 키 (keyset 페이지네이션 커서 = 마지막 행의 정렬 키 값)
+    # - 계층 순: IX_PLC_MASTER_HIERARCHY로 계층 필터 + 정렬을 인덱스 순서대로 처리
+    # - PLC ID 순: 검색/미매핑/프로그램별 목록
+    HIERARCHY_ORDER = ("plant", "process", "line", "equipment_group", "unit", "plc_id")
+    PLC_ID_ORDER = ("plc_id",)
+    
     def __init__(self, db: Session):
         self.db = db
+    
+    def _paginate(
+        self,
+        query,
+        order: Sequence[str],
+        skip: int,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> List[PLCMaster]:
+        """정렬 키 순으로 한 페이지 조회 (cursor가 있으면 keyset, 없으면 offset)"""
+        columns = [getattr(PLCMaster, attr) for attr in order]
+        if cursor:
+            try:
+                values = decode_cursor(cursor, len(columns))
+            except ValueError as e:
+                raise HandledException(ResponseCode.INVALID_DATA_FORMAT, msg="잘못된 커서입니다.", e=e)
+            # (정렬 키) > (마지막 행 값) 행 비교는 복합 인덱스 범위 스캔으로 처리되어 깊은 페이지도 일정한 비용
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(*columns).limit(limit).all()
+    
+    @staticmethod
+    def next_cursor(items: List[PLCMaster], limit: int, order: Sequence[str]) -> Optional[str]:
+        """다음 페이지 커서 (페이지가 가득 차지 않았으면 None)"""
+        if not items or len(items) < limit:
+            return None
+        return encode_cursor([getattr(items[-1], attr) for attr in order])
+    
+    def _count(self, query, count_mode: str = "exact") -> Optional[int]:
+        """
+        목록 전체 개수
+        - exact: COUNT(*)
+        - estimated: 실행 계획의 예상 행 수 (ANALYZE 통계 기반, 대용량에서도 즉시 반환)
+        - none: 조회하지 않음
+        """
+        if count_mode == "none":
+            return None
+        query = query.order_by(None)
+        if count_mode == "estimated":
+            compiled = query.statement.compile(dialect=self.db.get_bind().dialect)
+            plan = self.db.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        return query.count()
+    
+    def _log_change(self, plc_id: str, change_type: PlcChangeType, user: Optional[str] = None):
+        """
+        PLC 변경 로그 추가 (호출한 트랜잭션과 함께 커밋)
+        
+        트랜잭션 단위 advisory lock으로 변경 기록을 직렬화해 CHANGE_ID 순서와 커밋 순서를 맞춘다.
+        그래야 클라이언트가 받은 최대 CHANGE_ID보다 작은 변경이 나중에 커밋되어 누락되는 일이 없다.
+        """
+        self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PLC_CHANGE_LOCK_KEY})
+        self.db.add(PlcChangeLog(
+            plc_id=plc_id,
+            change_type=change_type.value,
+            change_dt=datetime.now(),
+            change_user=user
+        ))
             
     def create_plc(
         self,
@@ -50,6 +138,7 @@ class PlcCRUD:
                 is_active=True
             )
             self.db.add(plc)
+            self._log_change(plc_id, PlcChangeType.CREATE, create_user)
             self.db.commit()
             self.db.refresh(plc)
             return plc
@@ -61,7 +150,120 @@ class PlcCRUD:
             self.db.rollback()
             logger.error(f"PLC 생성 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
-    
+
+    # ========== 일괄 등록 ==========
+
+    def bulk_upsert_plcs(self, records: List[dict], user: Optional[str] = None) -> Tuple[int, int]:
+        """
+        PLC 일괄 등록/수정 (청크 1개 = 트랜잭션 1개)
+
+        임시 스테이징 테이블에 COPY로 적재한 뒤 INSERT ... SELECT ... ON CONFLICT (PLC_ID) DO UPDATE
+        한 문장으로 반영한다 (행마다 파라미터를 바인딩하는 VALUES 방식보다 DB 처리 시간이 1/10 수준).
+        - 계층/명칭/IS_ACTIVE만 갱신하고 프로그램 매핑과 생성 정보는 유지
+        - 값이 같은 행은 갱신하지 않는다 (UPDATE_DT, 변경 로그도 남기지 않음)
+        - 추가/수정된 PLC는 같은 문장에서 PLC_CHANGE_LOG에 기록
+
+        records: normalize_plc_record 결과 목록 (PLC ID 중복 없음)
+        Returns: (추가 건수, 수정 건수)
+        """
+        if not records:
+            return 0, 0
+        now = datetime.now()
+        try:
+            # 변경 로그 순서 보장 (_log_change와 같은 잠금)
+            self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PLC_CHANGE_LOCK_KEY})
+            self.db.execute(text(
+                f'CREATE TEMP TABLE IF NOT EXISTS {PLC_IMPORT_STAGE_TABLE} '
+                f'({", ".join(f"{column} TEXT" for column in PLC_IMPORT_STAGE_COLUMNS)}) ON COMMIT DELETE ROWS'
+            ))
+            self._copy_to_stage([
+                (
+                    record["plc_id"],
+                    record["plant"],
+                    record["process"],
+                    record["line"],
+                    record["equipment_group"],
+                    record["unit"],
+                    record["plc_name"],
+                    "t" if record["is_active"] else "f",
+                    record.get("create_user") or user,
+                )
+                for record in records
+            ])
+            inserted, updated = self.db.execute(text(f'''
+                WITH upserted AS (
+                    INSERT INTO "PLC_MASTER" (
+                        "PLC_ID", "PLANT", "PROCESS", "LINE", "EQUIPMENT_GROUP", "UNIT",
+                        "PLC_NAME", "IS_ACTIVE", "CREATE_DT", "CREATE_USER"
+                    )
+                    SELECT plc_id, plant, process, line, equipment_group, unit,
+                           plc_name, is_active::boolean, :now, create_user
+                    FROM {PLC_IMPORT_STAGE_TABLE}
+                    ON CONFLICT ("PLC_ID") DO UPDATE SET
+                        "PLANT" = excluded."PLANT",
+                        "PROCESS" = excluded."PROCESS",
+                        "LINE" = excluded."LINE",
+                        "EQUIPMENT_GROUP" = excluded."EQUIPMENT_GROUP",
+                        "UNIT" = excluded."UNIT",
+                        "PLC_NAME" = excluded."PLC_NAME",
+                        "IS_ACTIVE" = excluded."IS_ACTIVE",
+                        "UPDATE_DT" = :now,
+                        "UPDATE_USER" = :user
+                    WHERE ("PLC_MASTER"."PLANT", "PLC_MASTER"."PROCESS", "PLC_MASTER"."LINE",
+                           "PLC_MASTER"."EQUIPMENT_GROUP", "PLC_MASTER"."UNIT", "PLC_MASTER"."PLC_NAME",
+                           "PLC_MASTER"."IS_ACTIVE")
+                        IS DISTINCT FROM
+                          (excluded."PLANT", excluded."PROCESS", excluded."LINE",
+                           excluded."EQUIPMENT_GROUP", excluded."UNIT", excluded."PLC_NAME",
+                           excluded."IS_ACTIVE")
+                    RETURNING "PLC_ID", (xmax = 0) AS inserted
+                ), logged AS (
+                    INSERT INTO "PLC_CHANGE_LOG" ("PLC_ID", "CHANGE_TYPE", "CHANGE_DT", "CHANGE_USER")
+                    SELECT "PLC_ID",
+                           CASE WHEN inserted THEN '{PlcChangeType.CREATE.value}' ELSE '{PlcChangeType.UPDATE.value}' END,
+                           :now, :user
+                    FROM upserted
+                )
+                SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+            '''), {"now": now, "user": user}).one()
+            self.db.commit()
+            return inserted, updated
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"PLC 일괄 등록 실패 ({len(records)}건): {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    def _copy_to_stage(self, rows: List[tuple]):
+        """스테이징 테이블에 행 적재 (psycopg2이면 COPY FROM STDIN, 그 외 드라이버는 executemany)"""
+        columns = ", ".join(PLC_IMPORT_STAGE_COLUMNS)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):
+                buffer = io.StringIO()
+                # CSV에서 따옴표 없는 빈 값은 NULL (정리된 레코드에는 빈 문자열이 없음)
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {PLC_IMPORT_STAGE_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+                return
+        finally:
+            cursor.close()
+        self.db.execute(
+            text(f"INSERT INTO {PLC_IMPORT_STAGE_TABLE} ({columns}) VALUES "
+                 f"({', '.join(f':{column}' for column in PLC_IMPORT_STAGE_COLUMNS)})"),
+            [dict(zip(PLC_IMPORT_STAGE_COLUMNS, row)) for row in rows]
+        )
+
+    def get_existing_plc_ids(self, plc_ids: List[str]) -> set:
+        """이미 등록된 PLC ID 집합 (삭제된 PLC 포함, 일괄 등록 dry run용)"""
+        if not plc_ids:
+            return set()
+        try:
+            rows = self.db.query(PLCMaster.plc_id).filter(PLCMaster.plc_id.in_(plc_ids)).all()
+            return {plc_id for plc_id, in rows}
+        except Exception as e:
+            logger.error(f"PLC ID 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
     def get_plc(self, plc_id: str) -> Optional[PLCMaster]:
         """PLC 조회 (활성 상태만)"""
         try:
@@ -94,44 +296,150 @@ class PlcCRUD:
         process: Optional[str] = None,
         line: Optional[str] = None,
         equipment_group: Optional[str] = None,
-        unit: Optional[str] = None
+        unit: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[PLCMaster]:
-        """PLC 목록 조회 (필터링 지원)"""
+        """PLC 목록 조회 (필터링 지원, 계층 순 정렬, cursor 지정 시 keyset 페이지네이션)"""
         try:
-            query = self.db.query(PLCMaster)
-            
-            # 활성 상태 필터
-            if is_active is not None:
-                query = query.filter(PLCMaster.is_active == is_active)
-            
-            # 계층 구조 필터
-            if plant:
-                query = query.filter(PLCMaster.plant == plant)
-            if process:
-                query = query.filter(PLCMaster.process == process)
-            if line:
-                query = query.filter(PLCMaster.line == line)
-            if equipment_group:
-                query = query.filter(PLCMaster.equipment_group == equipment_group)
-            if unit:
-                query = query.filter(PLCMaster.unit == unit)
-            
-            return query.offset(skip).limit(limit).all()
+            query = self._filter_plcs(is_active, plant, process, line, equipment_group, unit)
+            return self._paginate(query, self.HIERARCHY_ORDER, skip, limit, cursor)
+        except HandledException:
+            raise
         except Exception as e:
             logger.error(f"PLC 목록 조회 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
-    def count_plcs(self, is_active: Optional[bool] = True) -> int:
-        """PLC 개수 조회"""
+    def count_plcs(
+        self,
+        is_active: Optional[bool] = True,
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        equipment_group: Optional[str] = None,
+        unit: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Optional[int]:
+        """
+        PLC 개수 조회 (count_mode: exact / estimated / none)
+        
+        계층 필터가 상위부터 연속으로 지정된 경우(필터 없음 포함)는 count_mode와 관계없이
+        PLC_HIERARCHY_COUNTER에서 정확한 값을 바로 읽는다.
+        """
         try:
-            query = self.db.query(PLCMaster)
-            if is_active is not None:
-                query = query.filter(PLCMaster.is_active == is_active)
-            return query.count()
+            if count_mode == "none":
+                return None
+            path = self._counter_path(plant, process, line, equipment_group, unit)
+            if path is not None:
+                active_count, inactive_count, _ = self.get_hierarchy_counts(path)
+                if is_active is None:
+                    return active_count + inactive_count
+                return active_count if is_active else inactive_count
+            query = self._filter_plcs(is_active, plant, process, line, equipment_group, unit)
+            return self._count(query, count_mode)
         except Exception as e:
             logger.error(f"PLC 개수 조회 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
+    # ========== PLC 수 카운터 (PLC_MASTER 트리거로 유지) ==========
+    
+    @staticmethod
+    def _counter_path(*values: Optional[str]) -> Optional[List[str]]:
+        """계층 필터 값 → 카운터 경로 (상위부터 연속 지정이 아니면 None - 카운터로 셀 수 없음)"""
+        path = []
+        for value in values:
+            if not value:
+                break
+            path.append(value)
+        if any(values[len(path):]):
+            return None
+        return path
+    
+    def get_hierarchy_counts(self, path: Sequence[str] = ()) -> Tuple[int, int, int]:
+        """
+        계층 노드의 PLC 수 (PK 조회 1회)
+        Args:
+            path: 상위부터의 계층 값 (빈 경로 = 전체)
+        Returns: (활성 수, 비활성 수, 매핑된 활성 수) - 노드가 없으면 (0, 0, 0)
+        """
+        try:
+            key = list(path) + [''] * (5 - len(path))
+            row = self.db.query(
+                PlcHierarchyCounter.active_count,
+                PlcHierarchyCounter.inactive_count,
+                PlcHierarchyCounter.mapped_count
+            ).filter(
+                PlcHierarchyCounter.plant == key[0],
+                PlcHierarchyCounter.process == key[1],
+                PlcHierarchyCounter.line == key[2],
+                PlcHierarchyCounter.equipment_group == key[3],
+                PlcHierarchyCounter.unit == key[4]
+            ).first()
+            return tuple(row) if row else (0, 0, 0)
+        except Exception as e:
+            logger.error(f"계층 PLC 수 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def get_program_plc_count(self, pgm_id: str) -> int:
+        """프로그램에 매핑된 활성 PLC 수 (PK 조회 1회)"""
+        try:
+            count = self.db.query(PgmPlcCounter.plc_count).filter(PgmPlcCounter.pgm_id == pgm_id).scalar()
+            return count or 0
+        except Exception as e:
+            logger.error(f"프로그램별 PLC 수 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def refresh_counters(self) -> Tuple[int, int]:
+        """
+        카운터를 PLC_MASTER 기준으로 다시 집계 (트리거 밖에서 데이터를 직접 고친 경우 등 운영용)
+        
+        PLC_MASTER를 SHARE 모드로 잠가 집계하는 동안의 쓰기를 막는다 (조회는 계속 가능).
+        Returns: (계층 노드 행 수, 프로그램 행 수)
+        """
+        try:
+            self.db.execute(text('LOCK TABLE "PLC_MASTER" IN SHARE MODE'))
+            self.db.query(PlcHierarchyCounter).delete(synchronize_session=False)
+            self.db.query(PgmPlcCounter).delete(synchronize_session=False)
+            for statement in plc_counter_fill_statements():
+                self.db.execute(text(statement))
+            node_rows = self.db.query(func.count()).select_from(PlcHierarchyCounter).scalar()
+            program_rows = self.db.query(func.count()).select_from(PgmPlcCounter).scalar()
+            self.db.commit()
+            logger.info(f"PLC 카운터 재집계: 노드 {node_rows}건, 프로그램 {program_rows}건")
+            return node_rows, program_rows
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"PLC 카운터 재집계 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def _filter_plcs(
+        self,
+        is_active: Optional[bool] = True,
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        equipment_group: Optional[str] = None,
+        unit: Optional[str] = None
+    ):
+        """활성 상태/계층 구조 필터를 적용한 PLC 쿼리"""
+        query = self.db.query(PLCMaster)
+        
+        # 활성 상태 필터
+        if is_active is not None:
+            query = query.filter(PLCMaster.is_active == is_active)
+        
+        # 계층 구조 필터
+        if plant:
+            query = query.filter(PLCMaster.plant == plant)
+        if process:
+            query = query.filter(PLCMaster.process == process)
+        if line:
+            query = query.filter(PLCMaster.line == line)
+        if equipment_group:
+            query = query.filter(PLCMaster.equipment_group == equipment_group)
+        if unit:
+            query = query.filter(PLCMaster.unit == unit)
+        return query
+    
     def update_plc(
         self,
         plc_id: str,
@@ -165,6 +473,7 @@ class PlcCRUD:
             
             plc.update_dt = datetime.now()
             plc.update_user = update_user
+            self._log_change(plc_id, PlcChangeType.UPDATE, update_user)
             
             self.db.commit()
             self.db.refresh(plc)
@@ -183,6 +492,7 @@ class PlcCRUD:
             
             plc.is_active = False
             plc.update_dt = datetime.now()
+            self._log_change(plc_id, PlcChangeType.DELETE)
             
             self.db.commit()
             return True
@@ -200,6 +510,7 @@ class PlcCRUD:
             
             plc.is_active = True
             plc.update_dt = datetime.now()
+            self._log_change(plc_id, PlcChangeType.RESTORE)
             
             self.db.commit()
             return True
@@ -226,9 +537,10 @@ class PlcCRUD:
         keyword: str,
         skip: int = 0,
         limit: int = 100,
-        is_active: Optional[bool] = True
+        is_active: Optional[bool] = True,
+        cursor: Optional[str] = None
     ) -> List[PLCMaster]:
-        """PLC 검색 (PLC_ID 또는 PLC_NAME)"""
+        """PLC 검색 (PLC_ID 또는 PLC_NAME, PLC ID 순 정렬)"""
         try:
             query = self.db.query(PLCMaster)
             
@@ -243,7 +555,9 @@ class PlcCRUD:
                 )
             )
             
-            return query.offset(skip).limit(limit).all()
+            return self._paginate(query, self.PLC_ID_ORDER, skip, limit, cursor)
+        except HandledException:
+            raise
         except Exception as e:
             logger.error(f"PLC 검색 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
@@ -335,6 +649,7 @@ class PlcCRUD:
                 notes=notes
             )
             self.db.add(history)
+            self._log_change(plc_id, PlcChangeType.MAP, user)
             
             self.db.commit()
             self.db.refresh(plc)
@@ -393,6 +708,7 @@ class PlcCRUD:
                 notes=notes
             )
             self.db.add(history)
+            self._log_change(plc_id, PlcChangeType.UNMAP, user)
             
             self.db.commit()
             self.db.refresh(plc)
@@ -406,7 +722,140 @@ class PlcCRUD:
             self.db.rollback()
             logger.error(f"프로그램 매핑 해제 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
-    
+
+    def bulk_update_mapping(
+        self,
+        pgm_id: Optional[str],
+        user: str,
+        notes: Optional[str] = None,
+        plc_ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None,
+        overwrite: bool = True,
+        dry_run: bool = False
+    ) -> List[tuple]:
+        """
+        여러 PLC의 프로그램 일괄 매핑/해제 (pgm_id가 None이면 해제)
+
+        대상 선택(FOR UPDATE) → PLC_MASTER UPDATE → PGM_MAPPING_HISTORY INSERT → PLC_CHANGE_LOG INSERT를
+        CTE로 묶은 한 문장으로 실행하고 한 번 커밋한다 (테이블당 문장 1개, PLC 수와 무관).
+        - 대상: 활성 PLC 중 plc_ids에 있거나 filters(계층 경로)에 해당하는 PLC
+        - 이미 같은 상태인 PLC(같은 프로그램 매핑 / 매핑 없음)는 변경하지 않는다
+        - overwrite=False이면 다른 프로그램이 매핑된 PLC도 변경하지 않는다
+        - dry_run이면 대상만 조회한다
+
+        Returns: 대상 PLC별 (plc_id, prev_pgm_id, changed) 목록 (PLC ID 순)
+        """
+        selected = select(
+            PLCMaster.plc_id.label("plc_id"),
+            PLCMaster.pgm_id.label("prev_pgm_id")
+        ).where(PLCMaster.is_active == True)
+        if plc_ids is not None:
+            selected = selected.where(PLCMaster.plc_id.in_(plc_ids))
+        for attr, value in (filters or {}).items():
+            selected = selected.where(getattr(PLCMaster, attr) == value)
+
+        try:
+            if dry_run:
+                rows = self.db.execute(selected.order_by(PLCMaster.plc_id)).all()
+                return [
+                    (plc_id, prev_pgm_id, self._mapping_changes(prev_pgm_id, pgm_id, overwrite))
+                    for plc_id, prev_pgm_id in rows
+                ]
+
+            # 변경 로그 순서 보장 (_log_change와 같은 잠금)
+            self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PLC_CHANGE_LOCK_KEY})
+
+            now = datetime.now()
+            selected = selected.with_for_update().cte("selected")
+            if pgm_id is None:
+                condition = selected.c.prev_pgm_id.isnot(None)
+                values = {"pgm_id": None, "pgm_mapping_dt": now, "pgm_mapping_user": user, "update_dt": now}
+                action = literal(PgmMappingAction.DELETE.value)
+                change_type = PlcChangeType.UNMAP
+            else:
+                condition = selected.c.prev_pgm_id.is_distinct_from(pgm_id)
+                if not overwrite:
+                    condition = selected.c.prev_pgm_id.is_(None)
+                values = {"pgm_id": pgm_id, "pgm_mapping_dt": now, "pgm_mapping_user": user}
+                action = None  # 이전 매핑 유무로 결정 (아래 CASE)
+                change_type = PlcChangeType.MAP
+
+            updated = update(PLCMaster).where(
+                PLCMaster.plc_id == selected.c.plc_id,
+                condition
+            ).values(**values).returning(
+                PLCMaster.plc_id.label("plc_id"),
+                selected.c.prev_pgm_id
+            ).cte("updated")
+
+            if action is None:
+                action = case(
+                    (updated.c.prev_pgm_id.is_(None), PgmMappingAction.CREATE.value),
+                    else_=PgmMappingAction.UPDATE.value
+                )
+            history = insert(PgmMappingHistory).from_select(
+                [
+                    PgmMappingHistory.plc_id,
+                    PgmMappingHistory.pgm_id,
+                    PgmMappingHistory.action,
+                    PgmMappingHistory.action_dt,
+                    PgmMappingHistory.action_user,
+                    PgmMappingHistory.prev_pgm_id,
+                    PgmMappingHistory.notes,
+                ],
+                select(
+                    updated.c.plc_id,
+                    literal(pgm_id, String),
+                    action,
+                    literal(now, DateTime),
+                    literal(user, String),
+                    updated.c.prev_pgm_id,
+                    literal(notes, String)
+                )
+            ).cte("history")
+            changes = insert(PlcChangeLog).from_select(
+                [
+                    PlcChangeLog.plc_id,
+                    PlcChangeLog.change_type,
+                    PlcChangeLog.change_dt,
+                    PlcChangeLog.change_user,
+                ],
+                select(
+                    updated.c.plc_id,
+                    literal(change_type.value),
+                    literal(now, DateTime),
+                    literal(user, String)
+                )
+            ).cte("changes")
+
+            rows = self.db.execute(
+                select(
+                    selected.c.plc_id,
+                    selected.c.prev_pgm_id,
+                    updated.c.plc_id.isnot(None)
+                ).select_from(
+                    selected.outerjoin(updated, updated.c.plc_id == selected.c.plc_id)
+                ).add_cte(history, changes).order_by(selected.c.plc_id)
+            ).all()
+            self.db.commit()
+
+            changed = sum(1 for row in rows if row[2])
+            logger.info(f"프로그램 일괄 {'매핑' if pgm_id else '매핑 해제'}: PGM={pgm_id}, 대상={len(rows)}, 변경={changed}")
+            return [tuple(row) for row in rows]
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"프로그램 일괄 매핑 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+
+    @staticmethod
+    def _mapping_changes(prev_pgm_id: Optional[str], pgm_id: Optional[str], overwrite: bool) -> bool:
+        """bulk_update_mapping에서 해당 PLC가 변경 대상인지 (dry run 판정용, CTE 조건과 동일)"""
+        if pgm_id is None:
+            return prev_pgm_id is not None
+        if not overwrite:
+            return prev_pgm_id is None
+        return prev_pgm_id != pgm_id
+
     def get_mapping_history(
         self,
         plc_id: str,
@@ -438,11 +887,13 @@ class PlcCRUD:
         self,
         pgm_id: str,
         skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[PLCMaster], int]:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[PLCMaster], Optional[int]]:
         """
-        특정 프로그램에 매핑된 PLC 목록 조회
-        Returns: (PLC 목록, 전체 개수)
+        특정 프로그램에 매핑된 PLC 목록 조회 (PLC ID 순 정렬)
+        Returns: (PLC 목록, 전체 개수 - count_mode=none이면 None)
         """
         try:
             query = self.db.query(PLCMaster).filter(
@@ -452,36 +903,31 @@ class PlcCRUD:
                 )
             )
             
-            total = query.count()
-            plcs = query.offset(skip).limit(limit).all()
+            total = self.get_program_plc_count(pgm_id) if count_mode != "none" else None
+            plcs = self._paginate(query, self.PLC_ID_ORDER, skip, limit, cursor)
             
             return plcs, total
             
+        except HandledException:
+            raise
         except Exception as e:
             logger.error(f"프로그램별 PLC 조회 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
     
     def count_plcs_by_program(self, pgm_id: str) -> int:
-        """특정 프로그램에 매핑된 PLC 개수"""
-        try:
-            return self.db.query(PLCMaster).filter(
-                and_(
-                    PLCMaster.pgm_id == pgm_id,
-                    PLCMaster.is_active == True
-                )
-            ).count()
-        except Exception as e:
-            logger.error(f"프로그램별 PLC 개수 조회 실패: {str(e)}")
-            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+        """특정 프로그램에 매핑된 PLC 개수 (PGM_PLC_COUNTER)"""
+        return self.get_program_plc_count(pgm_id)
     
     def get_unmapped_plcs(
         self,
         skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[PLCMaster], int]:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Tuple[List[PLCMaster], Optional[int]]:
         """
-        프로그램이 매핑되지 않은 PLC 목록 조회
-        Returns: (PLC 목록, 전체 개수)
+        프로그램이 매핑되지 않은 PLC 목록 조회 (PLC ID 순 정렬)
+        Returns: (PLC 목록, 전체 개수 - count_mode=none이면 None)
         """
         try:
             query = self.db.query(PLCMaster).filter(
@@ -491,11 +937,253 @@ class PlcCRUD:
                 )
             )
             
-            total = query.count()
-            plcs = query.offset(skip).limit(limit).all()
+            total = None
+            if count_mode != "none":
+                active_count, _, mapped_count = self.get_hierarchy_counts()
+                total = active_count - mapped_count
+            plcs = self._paginate(query, self.PLC_ID_ORDER, skip, limit, cursor)
             
             return plcs, total
             
+        except HandledException:
+            raise
         except Exception as e:
             logger.error(f"미매핑 PLC 조회 실패: {str(e)}")
             raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def get_plc_tree_rows(
+        self,
+        is_active: Optional[bool] = True,
+        plant: Optional[str] = None,
+        process: Optional[str] = None,
+        line: Optional[str] = None,
+        equipment_group: Optional[str] = None,
+        unit: Optional[str] = None
+    ) -> List[tuple]:
+        """
+        계층 트리 생성용 PLC 행 조회 (필요한 컬럼만, 계층 순 정렬, 계층 필터 지원)
+        Returns: (plant, process, line, equipment_group, unit,
+                  plc_id, plc_name, reg_dt, reg_user, pgm_id) 튜플 목록
+        
+        ORM 객체 대신 튜플로 받고 등록일은 DB에서 ISO 문자열로 변환해
+        행마다 객체/datetime을 만들지 않는다.
+        """
+        try:
+            query = self.db.query(
+                PLCMaster.plant,
+                PLCMaster.process,
+                PLCMaster.line,
+                PLCMaster.equipment_group,
+                PLCMaster.unit,
+                PLCMaster.plc_id,
+                PLCMaster.plc_name,
+                func.to_char(PLCMaster.create_dt, 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+                func.coalesce(PLCMaster.create_user, "unknown"),
+                PLCMaster.pgm_id
+            )
+            if is_active is not None:
+                query = query.filter(PLCMaster.is_active == is_active)
+            
+            # 계층 구조 필터
+            if plant:
+                query = query.filter(PLCMaster.plant == plant)
+            if process:
+                query = query.filter(PLCMaster.process == process)
+            if line:
+                query = query.filter(PLCMaster.line == line)
+            if equipment_group:
+                query = query.filter(PLCMaster.equipment_group == equipment_group)
+            if unit:
+                query = query.filter(PLCMaster.unit == unit)
+            
+            return query.order_by(
+                PLCMaster.plant,
+                PLCMaster.process,
+                PLCMaster.line,
+                PLCMaster.equipment_group,
+                PLCMaster.unit,
+                PLCMaster.plc_id
+            ).all()
+        except Exception as e:
+            logger.error(f"PLC 트리 행 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def get_unit_counts(self, is_active: Optional[bool] = True) -> List[tuple]:
+        """
+        호기(Unit)별 PLC 수/매핑된 PLC 수 집계 (계층 순 정렬)
+        Returns: (plant, process, line, equipment_group, unit, plc_count, mapped_count) 튜플 목록
+        
+        PLC 단위가 아닌 호기 단위 행만 받으므로 상위 계층 집계를 메모리에서 빠르게 만들 수 있다.
+        활성 PLC 기준(is_active=True)은 PLC_MASTER 대신 PLC_HIERARCHY_COUNTER의 호기 행을 읽는다.
+        """
+        try:
+            if is_active is True:
+                keys = (
+                    PlcHierarchyCounter.plant,
+                    PlcHierarchyCounter.process,
+                    PlcHierarchyCounter.line,
+                    PlcHierarchyCounter.equipment_group,
+                    PlcHierarchyCounter.unit
+                )
+                return self.db.query(
+                    *keys,
+                    PlcHierarchyCounter.active_count,
+                    PlcHierarchyCounter.mapped_count
+                ).filter(
+                    PlcHierarchyCounter.unit != '',
+                    PlcHierarchyCounter.active_count > 0
+                ).order_by(*keys).all()
+            
+            hierarchy = (
+                PLCMaster.plant,
+                PLCMaster.process,
+                PLCMaster.line,
+                PLCMaster.equipment_group,
+                PLCMaster.unit
+            )
+            query = self.db.query(
+                *hierarchy,
+                func.count(PLCMaster.plc_id),
+                func.count(PLCMaster.pgm_id)
+            )
+            if is_active is not None:
+                query = query.filter(PLCMaster.is_active == is_active)
+            
+            return query.group_by(*hierarchy).order_by(*hierarchy).all()
+        except Exception as e:
+            logger.error(f"호기별 PLC 집계 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    # ========== PLC 키워드 검색 (랭킹) ==========
+    
+    # pg_trgm GIN 인덱스 (base.OPTIONAL_SCHEMA_PATCHES)
+    TRIGRAM_INDEXES = ("IX_PLC_MASTER_ID_TRGM", "IX_PLC_MASTER_NAME_TRGM")
+    
+    def has_trigram_index(self) -> bool:
+        """PLC_ID/PLC_NAME pg_trgm 인덱스가 모두 있는지 확인"""
+        try:
+            count = self.db.execute(
+                text("SELECT count(*) FROM pg_indexes WHERE tablename = 'PLC_MASTER' AND indexname = ANY(:names)"),
+                {"names": list(self.TRIGRAM_INDEXES)}
+            ).scalar()
+            return count == len(self.TRIGRAM_INDEXES)
+        except Exception as e:
+            logger.warning(f"pg_trgm 인덱스 확인 실패: {str(e)}")
+            self.db.rollback()
+            return False
+    
+    def search_plcs_ranked(
+        self,
+        keyword: str,
+        limit: int = 20,
+        is_active: Optional[bool] = True
+    ) -> List[tuple]:
+        """
+        PLC_ID/PLC_NAME 부분 일치 검색 (완전 일치 → 접두 일치 → 부분 일치, 같은 단계는 PLC ID 순)
+        Returns: (plc_id, plc_name, plant, process, line, equipment_group, unit, pgm_id, is_active, rank) 튜플 목록
+        
+        ILIKE '%키워드%'는 pg_trgm GIN 인덱스가 있으면 인덱스 스캔으로 처리된다 (키워드 3자 이상).
+        """
+        try:
+            lowered = keyword.lower()
+            escaped = lowered.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            rank = case(
+                (or_(func.lower(PLCMaster.plc_id) == lowered, func.lower(PLCMaster.plc_name) == lowered), 0),
+                (or_(
+                    PLCMaster.plc_id.ilike(f"{escaped}%", escape="\\"),
+                    PLCMaster.plc_name.ilike(f"{escaped}%", escape="\\")
+                ), 1),
+                else_=2
+            )
+            query = self.db.query(
+                PLCMaster.plc_id,
+                PLCMaster.plc_name,
+                PLCMaster.plant,
+                PLCMaster.process,
+                PLCMaster.line,
+                PLCMaster.equipment_group,
+                PLCMaster.unit,
+                PLCMaster.pgm_id,
+                PLCMaster.is_active,
+                rank
+            ).filter(
+                or_(
+                    PLCMaster.plc_id.ilike(f"%{escaped}%", escape="\\"),
+                    PLCMaster.plc_name.ilike(f"%{escaped}%", escape="\\")
+                )
+            )
+            if is_active is not None:
+                query = query.filter(PLCMaster.is_active == is_active)
+            
+            return query.order_by(rank, PLCMaster.plc_id).limit(limit).all()
+        except Exception as e:
+            logger.error(f"PLC 랭킹 검색 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def get_plc_search_rows(self) -> List[tuple]:
+        """
+        메모리 검색 인덱스용 전체 PLC 행 조회 (필요한 컬럼만)
+        Returns: (plc_id, plc_name, plant, process, line, equipment_group, unit, pgm_id, is_active) 튜플 목록
+        """
+        try:
+            return self.db.query(
+                PLCMaster.plc_id,
+                PLCMaster.plc_name,
+                PLCMaster.plant,
+                PLCMaster.process,
+                PLCMaster.line,
+                PLCMaster.equipment_group,
+                PLCMaster.unit,
+                PLCMaster.pgm_id,
+                PLCMaster.is_active
+            ).all()
+        except Exception as e:
+            logger.error(f"PLC 검색 행 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    # ========== PLC 트리 증분 동기화 ==========
+    
+    def get_latest_change_version(self) -> int:
+        """마지막 PLC 변경 로그 ID (변경이 없으면 0)"""
+        try:
+            return self.db.query(func.max(PlcChangeLog.change_id)).scalar() or 0
+        except Exception as e:
+            logger.error(f"PLC 변경 버전 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
+    
+    def get_plc_changes(self, since: int, limit: int = 1000) -> List[tuple]:
+        """
+        since 이후 변경된 PLC의 현재 상태 조회 (PLC당 1행, 마지막 변경 순)
+        Returns: (change_id, plc_id, plant, process, line, equipment_group, unit,
+                  plc_name, reg_dt, reg_user, pgm_id, is_active) 튜플 목록
+        
+        같은 PLC가 여러 번 바뀌었으면 마지막 CHANGE_ID 하나로 묶는다.
+        PLC_MASTER에 행이 없으면(직접 삭제 등) 계층 컬럼과 is_active가 None이다.
+        """
+        try:
+            latest = self.db.query(
+                PlcChangeLog.plc_id.label("plc_id"),
+                func.max(PlcChangeLog.change_id).label("change_id")
+            ).filter(
+                PlcChangeLog.change_id > since
+            ).group_by(PlcChangeLog.plc_id).subquery()
+            
+            return self.db.query(
+                latest.c.change_id,
+                latest.c.plc_id,
+                PLCMaster.plant,
+                PLCMaster.process,
+                PLCMaster.line,
+                PLCMaster.equipment_group,
+                PLCMaster.unit,
+                PLCMaster.plc_name,
+                func.to_char(PLCMaster.create_dt, 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+                func.coalesce(PLCMaster.create_user, "unknown"),
+                PLCMaster.pgm_id,
+                PLCMaster.is_active
+            ).outerjoin(
+                PLCMaster, PLCMaster.plc_id == latest.c.plc_id
+            ).order_by(latest.c.change_id).limit(limit).all()
+        except Exception as e:
+            logger.error(f"PLC 변경 내역 조회 실패: {str(e)}")
+            raise HandledException(ResponseCode.DATABASE_QUERY_ERROR, e=e)
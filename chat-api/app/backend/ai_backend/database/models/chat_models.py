@@ -41,6 +41,7 @@ class ChatMessage(Base):
     create_dt = Column('CREATE_DT', DateTime, nullable=False, server_default=func.now())
     is_deleted = Column('IS_DELETED', Boolean, nullable=False, server_default=false())
     is_cancelled = Column('IS_CANCELLED', Boolean, nullable=False, server_default=false())  # 취소된 메시지 표시
+    token_count = Column('TOKEN_COUNT', Integer, nullable=True)  # 메시지 토큰 수 (저장 시 계산, 히스토리 잘라내기용)
     
     # External API 노드 처리 결과 저장용 (JSON)
     external_api_nodes = Column('EXTERNAL_API_NODES', JSON, nullable=True) 
\ No newline at end of file
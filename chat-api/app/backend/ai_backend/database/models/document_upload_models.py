@@ -0,0 +1,45 @@
+# _*_ coding: utf-8 _*_
+"""Resumable document upload session models (재개 가능 업로드)."""
+
+from ai_backend.database.base import Base
+from sqlalchemy import JSON, BigInteger, Boolean, Column, DateTime, String
+from sqlalchemy.sql.expression import false, func
+
+__all__ = [
+    "DocumentUploadSession",
+]
+
+
+class DocumentUploadSession(Base):
+    """
+    재개 가능 업로드 세션 (tus 방식)
+    - 세션 생성 → 청크를 오프셋에 이어 붙임(PATCH) → 완료 시 문서 생성
+    - 받은 바이트는 공유 파일 저장소의 임시 파일(.blobs/tmp/{UPLOAD_ID}.part)에 쌓이고,
+      UPLOAD_OFFSET은 fsync가 끝난 바이트 수 (끊긴 청크는 이 오프셋부터 다시 보냄)
+    - 완료 후에도 EXPIRES_DT까지 남겨 두어 완료 요청 재시도에 같은 문서를 돌려준다
+    """
+    __tablename__ = "DOCUMENT_UPLOAD_SESSIONS"
+
+    upload_id = Column('UPLOAD_ID', String(50), primary_key=True)
+    user_id = Column('USER_ID', String(50), nullable=False)
+    filename = Column('FILENAME', String(255), nullable=False)
+    upload_length = Column('UPLOAD_LENGTH', BigInteger, nullable=False)  # 전체 크기 (바이트)
+    upload_offset = Column('UPLOAD_OFFSET', BigInteger, nullable=False, default=0)  # 저장 완료된 바이트 수
+    content_hash = Column('CONTENT_HASH', String(64), nullable=True)  # 클라이언트가 알려준 SHA-256 (완료 시 검증)
+
+    # 완료 시 문서 생성에 쓰는 값 (POST /upload와 동일)
+    is_public = Column('IS_PUBLIC', Boolean, nullable=False, server_default=false())
+    permissions = Column('PERMISSIONS', JSON, nullable=True)
+    document_type = Column('DOCUMENT_TYPE', String(20), nullable=False, default='common')
+    metadata_json = Column('METADATA_JSON', JSON, nullable=True)
+
+    status = Column('STATUS', String(20), nullable=False, default='uploading')  # uploading, completed
+    document_id = Column('DOCUMENT_ID', String(50), nullable=True)  # 완료 시 생성된 문서
+
+    create_dt = Column('CREATE_DT', DateTime, nullable=False, server_default=func.now())
+    update_dt = Column('UPDATE_DT', DateTime, nullable=True)
+    expires_dt = Column('EXPIRES_DT', DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        {'comment': '재개 가능 문서 업로드 세션'}
+    )
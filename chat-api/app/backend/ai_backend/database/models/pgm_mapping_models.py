@@ -3,7 +3,7 @@
 
 import enum
 from ai_backend.database.base import Base
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 from sqlalchemy.sql.expression import func
 
 __all__ = [
@@ -43,6 +43,9 @@ class PgmMappingHistory(Base):
     # 비고
     notes = Column('NOTES', String(500), nullable=True)
     
+    # 기존 DB에는 create_all이 인덱스를 추가하지 않으므로 base.SCHEMA_PATCHES에 같은 정의를 둔다
     __table_args__ = (
+        # 최근 이력 keyset 페이지네이션 (ACTION_DT, HISTORY_ID 내림차순)
+        Index('IX_PGM_MAPPING_HISTORY_DT_ID', 'ACTION_DT', 'HISTORY_ID'),
         {'comment': 'PLC-프로그램 매핑 변경 이력 (감사 추적용)'}
     )
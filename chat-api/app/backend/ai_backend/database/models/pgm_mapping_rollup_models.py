@@ -0,0 +1,99 @@
+# _*_ coding: utf-8 _*_
+"""PLC-Program mapping history rollup models (시간대별 매핑 활동 집계)."""
+
+from ai_backend.database.base import Base, create_trigger_if_missing
+from sqlalchemy import BigInteger, Column, DateTime, Index, String
+
+__all__ = [
+    "PgmMappingRollup",
+    "PGM_MAPPING_ROLLUP_DDL",
+]
+
+
+class PgmMappingRollup(Base):
+    """
+    매핑 이력 시간별 집계 테이블
+    - (1시간 구간, Plant/공정/Line, 프로그램, 액션)마다 한 행
+    - PGM_MAPPING_HISTORY의 문장 단위 트리거가 같은 트랜잭션에서 증감 (원본 이력은 그대로 유지)
+    - 계층은 이력이 기록될 때의 PLC_MASTER 위치, 프로그램은 PGM_ID(해제는 PREV_PGM_ID), 없으면 ''
+    - 일 단위 조회는 시간 행을 합산한다 (수년치도 이력 원본 대신 집계 행만 읽음)
+    """
+    __tablename__ = "PGM_MAPPING_ROLLUP"
+
+    bucket_dt = Column('BUCKET_DT', DateTime, primary_key=True)  # 1시간 구간 시작 (ACTION_DT 절사)
+    plant = Column('PLANT', String(100), primary_key=True, default='')
+    process = Column('PROCESS', String(100), primary_key=True, default='')
+    line = Column('LINE', String(100), primary_key=True, default='')
+    pgm_id = Column('PGM_ID', String(50), primary_key=True, default='')
+    action = Column('ACTION', String(20), primary_key=True)
+    action_count = Column('ACTION_COUNT', BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # 프로그램별 기간 조회 (PK는 구간 → 계층 순이라 계층 필터는 PK 범위 스캔)
+        Index('IX_PGM_MAPPING_ROLLUP_PGM', 'PGM_ID', 'BUCKET_DT'),
+        {'comment': 'PLC-프로그램 매핑 이력 시간별 집계 (PGM_MAPPING_HISTORY 트리거로 유지)'}
+    )
+
+
+# ========== 집계 갱신 SQL ==========
+
+def _source(table: str, sign: int) -> str:
+    """이력 행 → (구간, 계층, 프로그램, 액션, +1/-1) (PLC가 없으면 계층은 '')"""
+    return f'''
+            SELECT date_trunc('hour', h."ACTION_DT") AS "BUCKET_DT",
+                   COALESCE(p."PLANT", '') AS "PLANT",
+                   COALESCE(p."PROCESS", '') AS "PROCESS",
+                   COALESCE(p."LINE", '') AS "LINE",
+                   COALESCE(h."PGM_ID", h."PREV_PGM_ID", '') AS "PGM_ID",
+                   h."ACTION" AS "ACTION",
+                   {sign} AS "N"
+            FROM {table} AS h
+            LEFT JOIN "PLC_MASTER" AS p ON p."PLC_ID" = h."PLC_ID"'''
+
+
+def _rollup_upsert(source: str, condition: str = "") -> str:
+    return f'''
+        INSERT INTO "PGM_MAPPING_ROLLUP" AS r
+            ("BUCKET_DT", "PLANT", "PROCESS", "LINE", "PGM_ID", "ACTION", "ACTION_COUNT")
+        SELECT "BUCKET_DT", "PLANT", "PROCESS", "LINE", "PGM_ID", "ACTION", SUM("N")
+        FROM ({source}) AS delta
+        WHERE TRUE{condition}
+        GROUP BY 1, 2, 3, 4, 5, 6
+        HAVING SUM("N") <> 0
+        ORDER BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT ("BUCKET_DT", "PLANT", "PROCESS", "LINE", "PGM_ID", "ACTION") DO UPDATE SET
+            "ACTION_COUNT" = r."ACTION_COUNT" + EXCLUDED."ACTION_COUNT"'''
+
+
+_TRIGGER_FUNCTION = f'''
+CREATE OR REPLACE FUNCTION pgm_mapping_rollup_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_rollup_upsert(_source("new_rows", 1))};
+    ELSIF TG_OP = 'DELETE' THEN
+        {_rollup_upsert(_source("old_rows", -1))};
+    ELSE
+        {_rollup_upsert(_source("new_rows", 1) + " UNION ALL " + _source("old_rows", -1))};
+    END IF;
+    RETURN NULL;
+END
+$$'''
+
+_TRIGGERS = (
+    ("TR_PGM_MAPPING_ROLLUP_INS", "INSERT", "NEW TABLE AS new_rows"),
+    ("TR_PGM_MAPPING_ROLLUP_UPD", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("TR_PGM_MAPPING_ROLLUP_DEL", "DELETE", "OLD TABLE AS old_rows"),
+)
+
+# 시작 시 base.Database.apply_schema_patches에서 실행 (멱등, 집계가 비어 있으면 전체 이력으로 최초 1회 채움)
+# - 트리거는 없을 때만 생성 (이미 있으면 PGM_MAPPING_HISTORY를 잠그지 않음)
+PGM_MAPPING_ROLLUP_DDL = [_TRIGGER_FUNCTION]
+for _name, _event, _referencing in _TRIGGERS:
+    PGM_MAPPING_ROLLUP_DDL.append(
+        create_trigger_if_missing(_name, "PGM_MAPPING_HISTORY", _event, _referencing, "pgm_mapping_rollup_trigger")
+    )
+PGM_MAPPING_ROLLUP_DDL.append(_rollup_upsert(
+    _source('"PGM_MAPPING_HISTORY"', 1),
+    '\n          AND NOT EXISTS (SELECT 1 FROM "PGM_MAPPING_ROLLUP")'
+))
@@ -0,0 +1,42 @@
+# _*_ coding: utf-8 _*_
+"""PLC change log models (트리 증분 동기화용)."""
+
+import enum
+from ai_backend.database.base import Base
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql.expression import func
+
+__all__ = [
+    "PlcChangeLog",
+    "PlcChangeType",
+]
+
+
+class PlcChangeType(str, enum.Enum):
+    """PLC 변경 타입"""
+    CREATE = "CREATE"    # PLC 생성
+    UPDATE = "UPDATE"    # 계층/명칭 수정
+    DELETE = "DELETE"    # 소프트 삭제 (IS_ACTIVE=FALSE)
+    RESTORE = "RESTORE"  # 복원
+    MAP = "MAP"          # 프로그램 매핑
+    UNMAP = "UNMAP"      # 프로그램 매핑 해제
+
+
+class PlcChangeLog(Base):
+    """
+    PLC 변경 로그 테이블
+    - PLC_MASTER를 바꾸는 트랜잭션 안에서 함께 기록 (같이 커밋/롤백)
+    - CHANGE_ID가 /plcs/tree/changes의 버전(커서) 역할을 하며 커밋 순서대로 증가
+    - 변경 내용은 저장하지 않고, 조회 시 PLC_MASTER의 현재 상태를 내려준다
+    """
+    __tablename__ = "PLC_CHANGE_LOG"
+    
+    change_id = Column('CHANGE_ID', BigInteger, primary_key=True, autoincrement=True)
+    plc_id = Column('PLC_ID', String(50), nullable=False, index=True)
+    change_type = Column('CHANGE_TYPE', String(20), nullable=False)
+    change_dt = Column('CHANGE_DT', DateTime, nullable=False, server_default=func.now())
+    change_user = Column('CHANGE_USER', String(50), nullable=True)
+    
+    __table_args__ = (
+        {'comment': 'PLC 변경 로그 (트리 증분 동기화용)'}
+    )
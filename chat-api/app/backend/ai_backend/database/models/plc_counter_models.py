@@ -0,0 +1,151 @@
+# _*_ coding: utf-8 _*_
+"""PLC counter models (계층 노드별/프로그램별 PLC 수)."""
+
+from ai_backend.database.base import Base, create_trigger_if_missing
+from sqlalchemy import BigInteger, Column, String
+
+__all__ = [
+    "PlcHierarchyCounter",
+    "PgmPlcCounter",
+    "PLC_COUNTER_DDL",
+    "plc_counter_fill_statements",
+]
+
+# 계층 컬럼 (PLC_MASTER와 동일한 DB 컬럼명, 상위 → 하위)
+_HIERARCHY_COLUMNS = ('"PLANT"', '"PROCESS"', '"LINE"', '"EQUIPMENT_GROUP"', '"UNIT"')
+
+
+class PlcHierarchyCounter(Base):
+    """
+    계층 노드별 PLC 수
+    - 노드마다 한 행: 지정하지 않은 하위 계층은 '' (루트 = 모두 '', Plant = PLANT만 값, ..., 호기 = 모두 값)
+    - PLC_MASTER의 문장 단위 트리거가 같은 트랜잭션에서 증감하므로 COUNT(*) 없이 PK 조회로 읽는다
+    - MAPPED_COUNT는 활성 PLC 중 프로그램이 매핑된 수 (미매핑 = ACTIVE_COUNT - MAPPED_COUNT)
+    - PLC가 모두 빠진 노드도 0으로 남는다 (읽을 때 0인 행은 없는 노드로 취급)
+    """
+    __tablename__ = "PLC_HIERARCHY_COUNTER"
+
+    plant = Column('PLANT', String(100), primary_key=True, default='')
+    process = Column('PROCESS', String(100), primary_key=True, default='')
+    line = Column('LINE', String(100), primary_key=True, default='')
+    equipment_group = Column('EQUIPMENT_GROUP', String(100), primary_key=True, default='')
+    unit = Column('UNIT', String(100), primary_key=True, default='')
+    active_count = Column('ACTIVE_COUNT', BigInteger, nullable=False, default=0)
+    inactive_count = Column('INACTIVE_COUNT', BigInteger, nullable=False, default=0)
+    mapped_count = Column('MAPPED_COUNT', BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        {'comment': '계층 노드별 PLC 수 (PLC_MASTER 트리거로 유지)'}
+    )
+
+
+class PgmPlcCounter(Base):
+    """
+    프로그램별 매핑된 활성 PLC 수
+    - PLC_HIERARCHY_COUNTER와 같은 트리거로 유지
+    """
+    __tablename__ = "PGM_PLC_COUNTER"
+
+    pgm_id = Column('PGM_ID', String(50), primary_key=True)
+    plc_count = Column('PLC_COUNT', BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        {'comment': '프로그램별 매핑 PLC 수 (PLC_MASTER 트리거로 유지)'}
+    )
+
+
+# ========== 카운터 갱신 SQL ==========
+# source: PLANT, PROCESS, LINE, EQUIPMENT_GROUP, UNIT, IS_ACTIVE, PGM_ID, N(+1/-1) 컬럼을 가진 SELECT
+
+def _source(table: str, sign: int) -> str:
+    return (
+        f'SELECT {", ".join(_HIERARCHY_COLUMNS)}, "IS_ACTIVE", "PGM_ID", {sign} AS "N" FROM {table}'
+    )
+
+
+def _hierarchy_upsert(source: str, condition: str = "") -> str:
+    """계층 노드별 증감분을 GROUPING SETS로 한 번에 집계해 upsert (노드 키 순으로 잠금)"""
+    grouping_sets = ", ".join(
+        "(" + ", ".join(_HIERARCHY_COLUMNS[:depth]) + ")" for depth in range(len(_HIERARCHY_COLUMNS) + 1)
+    )
+    keys = ", ".join(f"COALESCE({column}, '')" for column in _HIERARCHY_COLUMNS)
+    return f'''
+        INSERT INTO "PLC_HIERARCHY_COUNTER" AS c
+            ({", ".join(_HIERARCHY_COLUMNS)}, "ACTIVE_COUNT", "INACTIVE_COUNT", "MAPPED_COUNT")
+        SELECT * FROM (
+            SELECT {keys},
+                   COALESCE(SUM("N") FILTER (WHERE "IS_ACTIVE"), 0) AS active_count,
+                   COALESCE(SUM("N") FILTER (WHERE NOT "IS_ACTIVE"), 0) AS inactive_count,
+                   COALESCE(SUM("N") FILTER (WHERE "IS_ACTIVE" AND "PGM_ID" IS NOT NULL), 0) AS mapped_count
+            FROM ({source}) AS delta
+            GROUP BY GROUPING SETS ({grouping_sets})
+        ) AS node
+        WHERE (active_count <> 0 OR inactive_count <> 0 OR mapped_count <> 0){condition}
+        ORDER BY 1, 2, 3, 4, 5
+        ON CONFLICT ({", ".join(_HIERARCHY_COLUMNS)}) DO UPDATE SET
+            "ACTIVE_COUNT" = c."ACTIVE_COUNT" + EXCLUDED."ACTIVE_COUNT",
+            "INACTIVE_COUNT" = c."INACTIVE_COUNT" + EXCLUDED."INACTIVE_COUNT",
+            "MAPPED_COUNT" = c."MAPPED_COUNT" + EXCLUDED."MAPPED_COUNT"'''
+
+
+def _program_upsert(source: str, condition: str = "") -> str:
+    """프로그램별 증감분 upsert"""
+    return f'''
+        INSERT INTO "PGM_PLC_COUNTER" AS c ("PGM_ID", "PLC_COUNT")
+        SELECT "PGM_ID", SUM("N") FROM ({source}) AS delta
+        WHERE "IS_ACTIVE" AND "PGM_ID" IS NOT NULL{condition}
+        GROUP BY "PGM_ID"
+        HAVING SUM("N") <> 0
+        ORDER BY 1
+        ON CONFLICT ("PGM_ID") DO UPDATE SET "PLC_COUNT" = c."PLC_COUNT" + EXCLUDED."PLC_COUNT"'''
+
+
+def _apply(source: str) -> str:
+    return f"{_hierarchy_upsert(source)};\n{_program_upsert(source)};"
+
+
+def plc_counter_fill_statements(only_if_empty: bool = False) -> list:
+    """
+    PLC_MASTER 전체를 집계해 카운터를 채우는 SQL (비어 있는 카운터 테이블 기준)
+
+    only_if_empty: PLC_HIERARCHY_COUNTER가 비어 있을 때만 채움 (최초 배포 시 1회)
+    """
+    source = _source('"PLC_MASTER"', 1)
+    condition = '\n          AND NOT EXISTS (SELECT 1 FROM "PLC_HIERARCHY_COUNTER")' if only_if_empty else ""
+    # 프로그램 카운터를 먼저 채운다 (계층 카운터가 채워지면 조건이 거짓이 됨)
+    return [_program_upsert(source, condition), _hierarchy_upsert(source, condition)]
+
+
+# PLC_MASTER 문장 단위 트리거 (전이 테이블로 문장당 한 번만 집계)
+# - 단건 CRUD, COPY 일괄 등록, CTE 일괄 매핑 등 모든 쓰기 경로를 같은 트랜잭션에서 반영
+# - UPDATE는 변경 전(-1)/후(+1)를 합산하므로 계층/활성/매핑과 무관한 수정은 카운터를 건드리지 않는다
+_TRIGGER_FUNCTION = f'''
+CREATE OR REPLACE FUNCTION plc_master_counter_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_apply(_source("new_rows", 1))}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_apply(_source("old_rows", -1))}
+    ELSE
+        {_apply(_source("new_rows", 1) + " UNION ALL " + _source("old_rows", -1))}
+    END IF;
+    RETURN NULL;
+END
+$$'''
+
+_TRIGGERS = (
+    ("TR_PLC_MASTER_COUNTER_INS", "INSERT", "NEW TABLE AS new_rows"),
+    ("TR_PLC_MASTER_COUNTER_UPD", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("TR_PLC_MASTER_COUNTER_DEL", "DELETE", "OLD TABLE AS old_rows"),
+)
+
+# 시작 시 base.Database.apply_schema_patches에서 한 트랜잭션으로 실행 (멱등)
+# - 트리거는 없을 때만 생성 (이미 있으면 PLC_MASTER를 잠그지 않음)
+# - 최초 배포 시에는 트리거 생성이 PLC_MASTER 쓰기를 막는 동안 1회 채우므로 누락/중복 없이 시작된다
+PLC_COUNTER_DDL = [_TRIGGER_FUNCTION]
+for _name, _event, _referencing in _TRIGGERS:
+    PLC_COUNTER_DDL.append(
+        create_trigger_if_missing(_name, "PLC_MASTER", _event, _referencing, "plc_master_counter_trigger")
+    )
+PLC_COUNTER_DDL.extend(plc_counter_fill_statements(only_if_empty=True))
@@ -1,6 +1,6 @@
 # _*_ coding: utf-8 _*_
-from sqlalchemy import Column, String, DateTime, Boolean
-from sqlalchemy.sql.expression import func, true
+from sqlalchemy import Column, String, DateTime, Boolean, Index
+from sqlalchemy.sql.expression import func, text, true
 from ai_backend.database.base import Base
 
 __all__ = [
@@ -28,3 +28,14 @@ class PLCMaster(Base):
     create_user = Column('CREATE_USER', String(50), nullable=True)  # 생성자
     update_dt = Column('UPDATE_DT', DateTime, nullable=True)  # 수정일시
     update_user = Column('UPDATE_USER', String(50), nullable=True)  # 수정자
+    
+    # 목록/트리/keyset 페이지네이션용 복합 인덱스
+    # - 기존 DB에는 create_all이 인덱스를 추가하지 않으므로 base.SCHEMA_PATCHES에 같은 정의를 둔다 (이름 일치 필수)
+    __table_args__ = (
+        # 활성 + 계층 접두 필터, 계층 순 정렬/커서, 트리/집계 GROUP BY
+        Index('IX_PLC_MASTER_HIERARCHY', 'IS_ACTIVE', 'PLANT', 'PROCESS', 'LINE', 'EQUIPMENT_GROUP', 'UNIT', 'PLC_ID'),
+        # 프로그램별 PLC 목록/개수
+        Index('IX_PLC_MASTER_PGM', 'PGM_ID', 'IS_ACTIVE', 'PLC_ID'),
+        # 미매핑 활성 PLC 목록 (부분 인덱스)
+        Index('IX_PLC_MASTER_UNMAPPED', 'PLC_ID', postgresql_where=text('"PGM_ID" IS NULL AND "IS_ACTIVE"')),
+    )
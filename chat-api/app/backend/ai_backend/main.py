@@ -356,11 +356,60 @@ def create_app():
     async def read_plc_tree():
         return FileResponse("plc-tree.html")
     
+    # LLM 제공자 레지스트리 (프로세스당 1회 생성, 공유 커넥션 풀)
+    @app.on_event("startup")
+    async def init_llm_provider_registry():
+        from ai_backend.api.services.llm_provider_factory import get_llm_provider_registry
+        try:
+            get_llm_provider_registry().get_provider()
+            logger.info("LLM provider registry initialized")
+        except Exception as e:
+            # 설정 오류는 요청 시점에 HandledException으로 다시 보고됨
+            logger.warning("LLM provider registry warm-up failed: {}".format(e))
+    
+    @app.on_event("shutdown")
+    async def close_llm_provider_registry():
+        from ai_backend.api.services.llm_provider_factory import get_llm_provider_registry
+        await get_llm_provider_registry().aclose()
+    
+    # L1 캐시 무효화 구독 (CACHE_L1_ENABLED=true 인 경우에만 동작)
+    @app.on_event("startup")
+    async def init_local_cache_listener():
+        from ai_backend.core.dependencies import get_redis_client
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.start_invalidation_listener()
+        except Exception as e:
+            logger.warning("L1 cache invalidation listener failed to start: {}".format(e))
+    
+    # 종료 순서: 취소 버스 리스너 → 레디스(L1 무효화 리스너/pub-sub 연결) → 비동기 DB 엔진
+    # (pub/sub 연결을 먼저 닫으면 실행 중인 리스너가 끊김으로 보고 재연결을 시도함)
+    @app.on_event("shutdown")
+    async def close_async_resources():
+        from ai_backend.cache.cancel_bus import get_cancel_bus
+        from ai_backend.core.dependencies import get_database, get_redis_client
+        await get_cancel_bus().close()
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            await redis_client.close_async()
+        try:
+            await get_database().close_async()
+        except Exception as e:
+            logger.warning("Async database engine dispose failed: {}".format(e))
+    
     # Health check endpoint
     @app.get("/health")
     async def health_check():
         return {"status": "healthy", "service": "ai-backend"}
     
+    @app.get("/health/llm")
+    async def llm_health_check():
+        """LLM 제공자별 호출 통계 및 커넥션 풀 설정"""
+        from ai_backend.api.services.llm_provider_factory import get_llm_provider_registry
+        return get_llm_provider_registry().get_stats()
+    
     # 디버그 모드에서만 추가 엔드포인트 제공
     if debug_mode:
         @app.get("/debug/info")
@@ -1,7 +1,7 @@
 # _*_ coding: utf-8 _*_
 """PLC request models."""
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 
 
 class CreatePlcRequest(BaseModel):
@@ -112,3 +112,49 @@ class UnmapProgramRequest(BaseModel):
         if not v.strip():
             raise ValueError('필드는 공백일 수 없습니다.')
         return v.strip()
+
+
+# ========== 일괄 매핑 Request ==========
+
+class PlcHierarchySelector(BaseModel):
+    """계층 선택자 (상위부터 연속으로 지정, 예: plant + process + line → 해당 Line의 모든 활성 PLC)"""
+    plant: str = Field(..., min_length=1, max_length=100, description="Plant")
+    process: Optional[str] = Field(None, min_length=1, max_length=100, description="공정")
+    line: Optional[str] = Field(None, min_length=1, max_length=100, description="Line")
+    equipment_group: Optional[str] = Field(None, min_length=1, max_length=100, description="장비그룹")
+    unit: Optional[str] = Field(None, min_length=1, max_length=100, description="호기")
+
+
+class BatchUnmapProgramRequest(BaseModel):
+    """일괄 매핑 해제 요청 (plc_ids 또는 selector 중 하나)"""
+    plc_ids: Optional[List[str]] = Field(None, min_length=1, max_length=10000, description="대상 PLC ID 목록")
+    selector: Optional[PlcHierarchySelector] = Field(None, description="대상 계층 (하위 활성 PLC 전체)")
+    user: str = Field(..., min_length=1, max_length=50, description="작업자")
+    notes: Optional[str] = Field(None, max_length=500, description="비고")
+    dry_run: bool = Field(False, description="변경 없이 결과만 미리 보기")
+    
+    @field_validator('user')
+    @classmethod
+    def validate_not_empty(cls, v):
+        if not v.strip():
+            raise ValueError('필드는 공백일 수 없습니다.')
+        return v.strip()
+    
+    @model_validator(mode='after')
+    def validate_target(self):
+        if (self.plc_ids is None) == (self.selector is None):
+            raise ValueError('plc_ids 또는 selector 중 하나만 지정해야 합니다.')
+        return self
+
+
+class BatchMapProgramRequest(BatchUnmapProgramRequest):
+    """일괄 매핑 요청 (plc_ids 또는 selector 중 하나)"""
+    pgm_id: str = Field(..., min_length=1, max_length=50, description="프로그램 ID")
+    overwrite: bool = Field(True, description="다른 프로그램이 매핑된 PLC도 변경 (false이면 건너뜀)")
+    
+    @field_validator('pgm_id', 'user')
+    @classmethod
+    def validate_not_empty(cls, v):
+        if not v.strip():
+            raise ValueError('필드는 공백일 수 없습니다.')
+        return v.strip()
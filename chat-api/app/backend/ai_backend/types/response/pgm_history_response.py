@@ -24,7 +24,8 @@ class MappingHistoryItemResponse(BaseModel):
 class MappingHistoryResponse(BaseModel):
     """매핑 이력 목록 응답"""
     items: List[MappingHistoryItemResponse]
-    total: int = Field(..., description="전체 이력 개수")
+    total: Optional[int] = Field(None, description="전체 이력 개수 (count_mode=none이면 null)")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (최근 이력 조회만, 마지막 페이지면 null)")
 
 
 class MappingHistoryStatsResponse(BaseModel):
@@ -36,3 +37,31 @@ class MappingHistoryStatsResponse(BaseModel):
     delete_count: int = Field(..., description="삭제 횟수")
     restore_count: int = Field(..., description="복원 횟수")
     latest_action: Optional[MappingHistoryItemResponse] = Field(None, description="최근 변경")
+
+
+class MappingActivityCounts(BaseModel):
+    """매핑 활동 액션별 건수"""
+    create_count: int = Field(..., description="최초 매핑 건수")
+    update_count: int = Field(..., description="프로그램 변경 건수")
+    delete_count: int = Field(..., description="매핑 해제 건수")
+    restore_count: int = Field(..., description="매핑 복원 건수")
+    total_count: int = Field(..., description="전체 건수")
+
+
+class MappingActivityItem(MappingActivityCounts):
+    """매핑 활동 구간 항목 (group_by에 해당하는 필드만 채워짐)"""
+    bucket: datetime = Field(..., description="구간 시작")
+    plant: Optional[str] = Field(None, description="Plant (group_by=plant/process/line)")
+    process: Optional[str] = Field(None, description="공정 (group_by=process/line)")
+    line: Optional[str] = Field(None, description="Line (group_by=line)")
+    pgm_id: Optional[str] = Field(None, description="프로그램 ID (group_by=program, 해제는 해제된 프로그램)")
+
+
+class MappingActivityResponse(BaseModel):
+    """매핑 활동 시계열 응답"""
+    bucket: str = Field(..., description="구간 단위 (hour, day)")
+    group_by: Optional[str] = Field(None, description="그룹 기준 (plant, process, line, program)")
+    start: datetime = Field(..., description="조회 시작 (구간 경계로 내림)")
+    end: datetime = Field(..., description="조회 끝 (미포함)")
+    totals: MappingActivityCounts = Field(..., description="기간 전체 합계")
+    items: List[MappingActivityItem] = Field(..., description="구간 → 그룹 순 (건수가 0인 구간은 생략)")
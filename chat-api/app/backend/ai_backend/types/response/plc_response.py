@@ -1,7 +1,7 @@
 # _*_ coding: utf-8 _*_
 """PLC response models."""
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -34,6 +34,28 @@ class PlcCreateResponse(BaseModel):
     plc_name: str = Field(..., description="PLC 명칭")
 
 
+class PlcImportRowError(BaseModel):
+    """PLC 일괄 등록 - 행 오류"""
+    row: Optional[int] = Field(None, description="행 번호 (CSV/Excel은 파일의 줄 번호, JSON은 PLC 순번, 파일 오류는 null)")
+    plc_id: Optional[str] = Field(None, description="PLC ID")
+    error: str = Field(..., description="오류 사유")
+
+
+class PlcImportResponse(BaseModel):
+    """PLC 일괄 등록 응답"""
+    format: str = Field(..., description="파일 형식 (json/csv/xlsx)")
+    dry_run: bool = Field(..., description="검증만 수행했는지 여부")
+    total: int = Field(..., description="읽은 PLC 행 수")
+    inserted: int = Field(..., description="추가된 PLC 수 (dry_run이면 추가 예정)")
+    updated: int = Field(..., description="수정된 PLC 수 (dry_run이면 이미 존재하는 PLC 수)")
+    unchanged: int = Field(..., description="값이 같아 변경되지 않은 PLC 수")
+    failed: int = Field(..., description="실패한 행 수")
+    errors: List[PlcImportRowError] = Field(..., description="행 오류 목록 (최대 1000건)")
+    errors_truncated: bool = Field(..., description="오류가 더 있어 목록이 잘렸는지 여부")
+    version: Optional[int] = Field(None, description="변경 후 트리 버전 (변경이 없으면 null)")
+    elapsed_ms: float = Field(..., description="처리 시간 (ms)")
+
+
 class PlcUpdateResponse(BaseModel):
     """PLC 수정 응답"""
     plc_id: str = Field(..., description="PLC ID")
@@ -60,14 +82,39 @@ class PlcRestoreResponse(BaseModel):
 
 class PlcListResponse(BaseModel):
     """PLC 목록 응답"""
-    total: int = Field(..., description="전체 개수")
+    total: Optional[int] = Field(None, description="전체 개수 (count_mode=estimated이면 추정치, none이면 null)")
     items: List[PlcResponse] = Field(..., description="PLC 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 
 class PlcSearchResponse(BaseModel):
     """PLC 검색 응답"""
     total: int = Field(..., description="검색 결과 개수")
     items: List[PlcResponse] = Field(..., description="검색 결과")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+class PlcSearchHit(BaseModel):
+    """PLC 랭킹 검색 결과 항목"""
+    plc_id: str = Field(..., description="PLC ID")
+    plc_name: str = Field(..., description="PLC 명칭")
+    plant: str = Field(..., description="Plant")
+    process: str = Field(..., description="공정")
+    line: str = Field(..., description="Line")
+    equipment_group: str = Field(..., description="장비그룹")
+    unit: str = Field(..., description="호기")
+    pgm_id: Optional[str] = Field(None, description="매핑된 프로그램 ID")
+    is_active: bool = Field(..., description="활성 상태")
+    match_type: str = Field(..., description="일치 유형 (exact/prefix/substring)")
+    highlights: Dict[str, List[List[int]]] = Field(..., description="필드별 일치 위치 [시작, 끝) 목록")
+
+
+class PlcRankedSearchResponse(BaseModel):
+    """PLC 랭킹 검색 응답"""
+    keyword: str = Field(..., description="검색 키워드")
+    engine: str = Field(..., description="사용한 검색 엔진 (trigram/memory)")
+    took_ms: float = Field(..., description="검색 소요 시간(ms)")
+    items: List[PlcSearchHit] = Field(..., description="검색 결과 (완전 일치 → 접두 일치 → 부분 일치)")
 
 
 class PlcCountResponse(BaseModel):
@@ -75,6 +122,15 @@ class PlcCountResponse(BaseModel):
     active_count: int = Field(..., description="활성 PLC 개수")
     inactive_count: int = Field(..., description="비활성 PLC 개수")
     total_count: int = Field(..., description="전체 PLC 개수")
+    mapped_count: Optional[int] = Field(None, description="프로그램이 매핑된 활성 PLC 개수")
+    unmapped_count: Optional[int] = Field(None, description="프로그램이 매핑되지 않은 활성 PLC 개수")
+
+
+class PlcCounterRefreshResponse(BaseModel):
+    """PLC 카운터 재집계 응답"""
+    node_count: int = Field(..., description="집계된 계층 노드 수")
+    program_count: int = Field(..., description="집계된 프로그램 수")
+    message: str = Field(..., description="메시지")
 
 
 class PlcExistsResponse(BaseModel):
@@ -127,6 +183,26 @@ class UnmapProgramResponse(BaseModel):
     message: str = Field(..., description="메시지")
 
 
+class BatchMappingItem(BaseModel):
+    """일괄 매핑/해제 - PLC별 결과"""
+    plc_id: str = Field(..., description="PLC ID")
+    status: str = Field(..., description="mapped / unmapped / already_mapped / not_mapped / mapped_to_other / not_found")
+    prev_pgm_id: Optional[str] = Field(None, description="변경 전 프로그램 ID")
+
+
+class BatchMappingResponse(BaseModel):
+    """프로그램 일괄 매핑/해제 응답"""
+    pgm_id: Optional[str] = Field(None, description="매핑한 프로그램 ID (해제는 null)")
+    dry_run: bool = Field(..., description="검증만 수행 여부")
+    total: int = Field(..., description="대상 PLC 수")
+    changed: int = Field(..., description="변경된 PLC 수")
+    unchanged: int = Field(..., description="이미 같은 상태인 PLC 수")
+    skipped: int = Field(..., description="다른 프로그램에 매핑되어 건너뛴 PLC 수 (overwrite=false)")
+    not_found: int = Field(..., description="없거나 삭제된 PLC 수")
+    version: Optional[int] = Field(None, description="변경 후 트리 버전 (변경이 없거나 dry run이면 null)")
+    items: List[BatchMappingItem] = Field(..., description="PLC별 결과")
+
+
 class MappingHistoryItemResponse(BaseModel):
     """매핑 이력 항목"""
     model_config = ConfigDict(from_attributes=True)
@@ -150,11 +226,58 @@ class MappingHistoryResponse(BaseModel):
 class PlcsByProgramResponse(BaseModel):
     """프로그램별 PLC 목록 응답"""
     pgm_id: str = Field(..., description="프로그램 ID")
-    total: int = Field(..., description="전체 PLC 개수")
+    total: Optional[int] = Field(None, description="전체 PLC 개수 (count_mode=estimated이면 추정치, none이면 null)")
     items: List[PlcWithMappingResponse] = Field(..., description="PLC 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 
 class UnmappedPlcsResponse(BaseModel):
     """미매핑 PLC 목록 응답"""
-    total: int = Field(..., description="전체 미매핑 PLC 개수")
+    total: Optional[int] = Field(None, description="전체 미매핑 PLC 개수 (count_mode=estimated이면 추정치, none이면 null)")
     items: List[PlcWithMappingResponse] = Field(..., description="미매핑 PLC 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+# ========== PLC 계층 펼치기 Response ==========
+
+class PlcTreeChildNode(BaseModel):
+    """계층 펼치기 - 하위 노드와 집계 (활성 PLC 기준)"""
+    name: str = Field(..., description="노드 이름")
+    plc_count: int = Field(..., description="활성 PLC 수")
+    mapped_count: int = Field(..., description="프로그램 매핑된 PLC 수")
+    unmapped_count: int = Field(..., description="프로그램 미매핑 PLC 수")
+    child_count: int = Field(..., description="바로 아래 계층 노드 수 (호기는 0)")
+
+
+class PlcTreeChildrenResponse(BaseModel):
+    """PLC 계층 펼치기 응답"""
+    level: str = Field(..., description="items의 계층 (plant/process/line/equipment_group/unit, 호기 지정 시 plc)")
+    path: Dict[str, str] = Field(..., description="펼친 노드 경로")
+    version: int = Field(..., description="트리 버전 (X-PLC-Tree-Version)")
+    plc_count: int = Field(..., description="펼친 노드의 활성 PLC 수")
+    mapped_count: int = Field(..., description="펼친 노드의 매핑된 PLC 수")
+    unmapped_count: int = Field(..., description="펼친 노드의 미매핑 PLC 수")
+    items: List[PlcTreeChildNode] = Field(..., description="하위 노드 목록")
+    plcs: Optional[List[dict]] = Field(None, description="호기까지 지정한 경우 PLC 정보 (plcId, plcNm, regDt, regUsr, pgmId)")
+
+
+# ========== PLC 트리 증분 동기화 Response ==========
+
+class PlcTreeChangeNode(BaseModel):
+    """트리 증분 - 추가/수정된 PLC (계층 경로 + info 한 건)"""
+    plt: str = Field(..., description="Plant")
+    proc: str = Field(..., description="공정")
+    line: str = Field(..., description="Line")
+    eqpGrp: str = Field(..., description="장비그룹")
+    unit: str = Field(..., description="호기")
+    info: dict = Field(..., description="PLC 정보 (plcId, plcNm, regDt, regUsr, pgmId)")
+
+
+class PlcTreeChangesResponse(BaseModel):
+    """PLC 트리 증분 응답"""
+    since: int = Field(..., description="요청한 시작 버전")
+    version: int = Field(..., description="다음 조회에 사용할 버전")
+    has_more: bool = Field(..., description="남은 변경 존재 여부 (true이면 version으로 바로 다시 조회)")
+    full_reload: bool = Field(..., description="증분 적용 불가 - /plcs/tree 전체 재조회 필요")
+    upserts: List[PlcTreeChangeNode] = Field(..., description="추가/수정된 PLC (plcId 기준으로 기존 위치에서 제거 후 삽입)")
+    removes: List[str] = Field(..., description="트리에서 제거할 PLC ID")
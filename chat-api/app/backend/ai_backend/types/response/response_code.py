@@ -49,6 +49,7 @@ class ResponseCode(Enum):
     # CACHE_SERVICE = (-1500 ~ -1599)
     CACHE_CONNECTION_ERROR = (-1501, "캐시 연결 오류가 발생했습니다.")
     CACHE_OPERATION_ERROR = (-1502, "캐시 작업 오류가 발생했습니다.")
+    CACHE_QUERY_ERROR = (-1503, "캐시 조회 오류가 발생했습니다.")
     
     # VALIDATION_ERROR = (-1600 ~ -1699)
     VALIDATION_ERROR = (-1601, "입력 데이터 검증 오류가 발생했습니다.")
@@ -77,6 +78,10 @@ class ResponseCode(Enum):
     DOCUMENT_UPLOAD_NOT_FOUND = (-1814, "업로드 ID를 찾을 수 없습니다.")
     DOCUMENT_UPLOAD_PROCESSING = (-1815, "업로드가 아직 처리 중입니다.")
     DOCUMENT_UPLOAD_FAILED = (-1816, "업로드 처리에 실패했습니다.")
+    DOCUMENT_UPLOAD_OFFSET_MISMATCH = (-1817, "업로드 오프셋이 일치하지 않습니다.")
+    DOCUMENT_UPLOAD_LOCKED = (-1818, "다른 요청이 같은 업로드를 진행 중입니다.")
+    DOCUMENT_UPLOAD_INCOMPLETE = (-1819, "업로드가 아직 끝나지 않았습니다.")
+    DOCUMENT_UPLOAD_HASH_MISMATCH = (-1820, "업로드된 파일의 해시가 일치하지 않습니다.")
     
     # GROUP_SERVICE = (-1900 ~ -1999)
     GROUP_NOT_FOUND = (-1901, "그룹을 찾을 수 없습니다.")
@@ -107,6 +112,7 @@ class ResponseCode(Enum):
     # PLC_UPDATE_ERROR = (-2204, "PLC 수정 중 오류가 발생했습니다.")
     # PLC_DELETE_ERROR = (-2205, "PLC 삭제 중 오류가 발생했습니다.")
     # PLC_MAPPING_ERROR = (-2206, "PLC 매핑 중 오류가 발생했습니다.")
+    PLC_HIERARCHY_NODE_NOT_FOUND = (-2207, "PLC 계층 노드를 찾을 수 없습니다.")
 
     # MAPPING_SERVICE = (-2300 ~ -2399)
     MAPPING_NOT_FOUND = (-2301, "매핑 정보를 찾을 수 없습니다.")
@@ -0,0 +1,144 @@
+# _*_ coding: utf-8 _*_
+"""파일 다운로드 응답 (Range / ETag 조건부 요청)."""
+import os
+import urllib.parse
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+__all__ = [
+    "content_disposition",
+    "etag_matches",
+    "parse_byte_range",
+    "file_download_response",
+    "stream_download_response",
+]
+
+# 브라우저/뷰어가 캐시하되 매번 ETag로 재검증 (권한이 바뀔 수 있으므로 공유 캐시는 금지)
+DOWNLOAD_CACHE_CONTROL = "private, no-cache"
+
+
+def content_disposition(filename: str, disposition_type: str = "attachment") -> str:
+    """한글 파일명을 위한 RFC 5987 Content-Disposition 값"""
+    encoded_filename = urllib.parse.quote(filename.encode('utf-8'))
+    return f"{disposition_type}; filename*=UTF-8''{encoded_filename}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (약한 비교, '*'와 쉼표 목록 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 Range 헤더 → (start, end) 포함 구간
+
+    - 헤더가 없거나 형식이 잘못됐거나 여러 구간이면 None (전체 응답, RFC 9110에서 무시 허용)
+    - 만족할 수 없는 구간이면 ValueError (416)
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last) or not (first + last).isdigit():
+        return None
+
+    if not first:
+        # 접미 구간 (bytes=-N: 마지막 N바이트)
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError("unsatisfiable range")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def file_download_response(
+    request: Request,
+    path: Union[str, Path],
+    filename: str,
+    media_type: str,
+    content_hash: Optional[str] = None,
+) -> Response:
+    """
+    파일 기반 다운로드 응답 (파일 내용을 메모리에 올리지 않음)
+
+    - Starlette FileResponse가 Range/If-Range(206, 416)를 처리하고 요청 구간만 64KB 청크로 읽는다
+      (서버가 ASGI pathsend 확장을 지원하면 경로만 넘겨 서버가 직접 전송)
+    - ETag는 저장된 내용 해시 (파일 수정 시각과 무관), If-None-Match가 일치하면 본문 없이 304
+    """
+    headers = {
+        "Content-Disposition": content_disposition(filename),
+        "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+    }
+    if content_hash:
+        etag = f'"{content_hash}"'
+        headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL})
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=os.stat(path))
+
+
+def stream_download_response(
+    request: Request,
+    size: int,
+    iter_content: Callable[[], Iterator[bytes]],
+    filename: str,
+    media_type: str,
+    content_hash: Optional[str] = None,
+    iter_range: Optional[Callable[[int, int], Iterator[bytes]]] = None,
+) -> Response:
+    """
+    청크 스트림 기반 다운로드 응답 (파일로 존재하지 않는 내용 - 예: ZIP 내부 멤버)
+
+    - iter_content: 전체 내용을 청크 단위로 생성
+    - iter_range: (start, end) 구간만 생성할 수 있으면 전달 - Range/If-Range 요청에 206/416 응답,
+      없으면 Accept-Ranges: none으로 전체만 전송
+    - ETag/304 처리는 file_download_response와 동일
+    """
+    headers = {
+        "Content-Disposition": content_disposition(filename),
+        "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+        "Accept-Ranges": "bytes" if iter_range else "none",
+    }
+    etag = None
+    if content_hash:
+        etag = f'"{content_hash}"'
+        headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL})
+
+    if iter_range:
+        if_range = request.headers.get("if-range")
+        # If-Range가 현재 ETag와 다르면 Range를 무시하고 전체 전송
+        if not if_range or (etag and if_range.strip() == etag):
+            try:
+                byte_range = parse_byte_range(request.headers.get("range"), size)
+            except ValueError:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+            if byte_range:
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+                headers["Content-Length"] = str(end - start + 1)
+                return StreamingResponse(
+                    iter_range(start, end), status_code=206, media_type=media_type, headers=headers
+                )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(iter_content(), media_type=media_type, headers=headers)
@@ -0,0 +1,33 @@
+# _*_ coding: utf-8 _*_
+"""Keyset(cursor) 페이지네이션 커서 인코딩."""
+import base64
+import json
+from typing import List, Sequence
+
+__all__ = [
+    "encode_cursor",
+    "decode_cursor",
+]
+
+
+def encode_cursor(values: Sequence) -> str:
+    """마지막 행의 정렬 키 값을 URL-safe 불투명 커서 문자열로 변환"""
+    raw = json.dumps(list(values), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """커서 문자열을 정렬 키 값 목록으로 복원
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 정렬 키 개수가 size와 다른 경우
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"invalid cursor: {cursor}")
+    return values
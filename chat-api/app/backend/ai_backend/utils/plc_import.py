@@ -0,0 +1,266 @@
+# _*_ coding: utf-8 _*_
+"""PLC 일괄 등록 파일 파서 (계층 JSON / CSV·파이프 구분 텍스트 / Excel)."""
+import codecs
+import csv
+import json
+import os
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # 선택 의존성
+    ijson = None
+
+__all__ = [
+    "PLC_IMPORT_FORMATS",
+    "PlcImportRecord",
+    "detect_import_format",
+    "iter_batches",
+    "iter_plc_records",
+    "normalize_plc_record",
+]
+
+
+PLC_IMPORT_FORMATS = ("json", "csv", "xlsx")
+
+# PLC_MASTER 컬럼 길이 (plc_models.PLCMaster와 동일)
+_MAX_LENGTHS = {
+    "plc_id": 50,
+    "plant": 100,
+    "process": 100,
+    "line": 100,
+    "equipment_group": 100,
+    "unit": 100,
+    "plc_name": 200,
+    "create_user": 50,
+}
+_REQUIRED_FIELDS = ("plc_id", "plant", "process", "line", "equipment_group", "unit")
+
+_TRUE_VALUES = {"true", "t", "1", "y", "yes"}
+_FALSE_VALUES = {"false", "f", "0", "n", "no"}
+
+# (행 번호, 원본 레코드) - 행 번호는 CSV/Excel은 파일의 줄 번호, JSON은 PLC 순번(1부터)
+PlcImportRecord = Tuple[int, Dict[str, Any]]
+
+
+def detect_import_format(filename: Optional[str], head: bytes = b"") -> str:
+    """확장자 또는 파일 앞부분으로 형식 판별 (json/csv/xlsx)"""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".json":
+        return "json"
+    if ext in (".xlsx", ".xlsm"):
+        return "xlsx"
+    if ext in (".csv", ".txt", ".tsv"):
+        return "csv"
+
+    if head.startswith(b"PK"):
+        return "xlsx"
+    stripped = head.lstrip(codecs.BOM_UTF8).lstrip()
+    if stripped[:1] in (b"{", b"["):
+        return "json"
+    return "csv"
+
+
+def iter_plc_records(fp: IO[bytes], file_format: str, encoding: str = "utf-8-sig") -> Iterator[PlcImportRecord]:
+    """
+    파일에서 PLC 레코드를 하나씩 읽기 (바이너리 파일 객체)
+
+    Raises:
+        ValueError: 파일 구조가 잘못된 경우 (개별 행의 값 오류는 normalize_plc_record에서 처리)
+    """
+    if file_format == "json":
+        return _iter_json_records(fp)
+    if file_format == "csv":
+        return _iter_delimited_records(codecs.getreader(encoding)(fp))
+    if file_format == "xlsx":
+        return _iter_xlsx_records(fp)
+    raise ValueError(f"지원하지 않는 형식입니다: {file_format}")
+
+
+def iter_batches(records: Iterable[PlcImportRecord], size: int) -> Iterator[List[PlcImportRecord]]:
+    """레코드를 size개씩 묶어서 반환"""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def normalize_plc_record(raw: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    원본 레코드를 PLC_MASTER 행 값으로 정리
+
+    - 문자열 앞뒤 공백 제거, PLC 명칭이 없으면 PLC ID 사용
+    - IS_ACTIVE가 없으면 활성(True)
+
+    Returns:
+        (정리된 레코드, None) 또는 (None, 오류 메시지)
+    """
+    record = {}
+    for field, max_length in _MAX_LENGTHS.items():
+        value = raw.get(field)
+        if value is not None:
+            value = (value if isinstance(value, str) else str(value)).strip() or None
+            if value and len(value) > max_length:
+                return None, f"{field} 길이 초과 ({len(value)} > {max_length})"
+        record[field] = value
+
+    missing = [field for field in _REQUIRED_FIELDS if not record[field]]
+    if missing:
+        return None, f"필수 값 누락: {', '.join(missing)}"
+
+    if not record["plc_name"]:
+        record["plc_name"] = record["plc_id"]
+
+    is_active = raw.get("is_active")
+    if is_active is None or is_active == "":
+        record["is_active"] = True
+    elif isinstance(is_active, bool):
+        record["is_active"] = is_active
+    elif str(is_active).strip().lower() in _TRUE_VALUES:
+        record["is_active"] = True
+    elif str(is_active).strip().lower() in _FALSE_VALUES:
+        record["is_active"] = False
+    else:
+        return None, f"is_active 값 오류: {is_active}"
+
+    return record, None
+
+
+# ========== JSON ==========
+
+def _iter_json_records(fp: IO[bytes]) -> Iterator[PlcImportRecord]:
+    """
+    계층 JSON(plc01.json 형식) 또는 PLC 레코드 배열
+
+    - {"plants": [{"plant", "processes": [{"process", "lines": [{"line", "equipment_groups":
+      [{"equipment_group", "units": [{"unit", "plcs": [{"plc_id", "plc_name"?}]}]}]}]}]}]}
+    - [{"plc_id", "plant", "process", "line", "equipment_group", "unit", "plc_name"?}, ...]
+
+    ijson이 설치되어 있으면 Plant(또는 레코드) 단위로 스트리밍하고, 없으면 파일 전체를 읽는다.
+    """
+    head = fp.read(64)
+    fp.seek(0)
+    is_flat = head.lstrip(codecs.BOM_UTF8).lstrip()[:1] == b"["
+
+    if ijson is not None:
+        if head.startswith(codecs.BOM_UTF8):
+            fp.read(len(codecs.BOM_UTF8))
+        try:
+            items = ijson.items(fp, "item" if is_flat else "plants.item")
+            yield from _expand_json_items(items, is_flat)
+        except ijson.JSONError as e:
+            raise ValueError(f"JSON 형식 오류: {e}") from e
+        return
+
+    try:
+        document = json.loads(fp.read().decode("utf-8-sig"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"JSON 형식 오류: {e}") from e
+    if is_flat:
+        items = document
+    elif isinstance(document, dict) and isinstance(document.get("plants"), list):
+        items = document["plants"]
+    else:
+        raise ValueError("JSON 최상위는 PLC 배열 또는 {\"plants\": [...]} 이어야 합니다.")
+    yield from _expand_json_items(items, is_flat)
+
+
+def _expand_json_items(items: Iterable[Any], is_flat: bool) -> Iterator[PlcImportRecord]:
+    row = 0
+    if is_flat:
+        for item in items:
+            row += 1
+            yield row, item if isinstance(item, dict) else {}
+        return
+
+    for plant in items:
+        for process in _children(plant, "processes"):
+            for line in _children(process, "lines"):
+                for group in _children(line, "equipment_groups"):
+                    for unit in _children(group, "units"):
+                        for plc in _children(unit, "plcs"):
+                            row += 1
+                            yield row, {
+                                "plc_id": plc.get("plc_id"),
+                                "plc_name": plc.get("plc_name"),
+                                "is_active": plc.get("is_active"),
+                                "create_user": plc.get("create_user"),
+                                "plant": plant.get("plant"),
+                                "process": process.get("process"),
+                                "line": line.get("line"),
+                                "equipment_group": group.get("equipment_group"),
+                                "unit": unit.get("unit"),
+                            }
+
+
+def _children(node: Any, key: str) -> List[Any]:
+    if not isinstance(node, dict):
+        return []
+    children = node.get(key)
+    return [child for child in children if isinstance(child, dict)] if isinstance(children, list) else []
+
+
+# ========== CSV / 파이프 구분 텍스트 ==========
+
+def _iter_delimited_records(text_fp: IO[str]) -> Iterator[PlcImportRecord]:
+    """
+    헤더가 있는 구분자 텍스트 (쉼표, 탭, 파이프 자동 판별)
+
+    DB 도구에서 내보낸 _PLC_MASTER__*.txt처럼 앞뒤 파이프, 공백 패딩, 헤더 아래 '---' 구분선이 있어도 읽는다.
+    헤더는 대소문자를 구분하지 않으며 PLC_MASTER 컬럼명(PLC_ID, PLANT, ...)을 사용한다.
+    """
+    header_line = text_fp.readline()
+    if not header_line.strip():
+        raise ValueError("헤더 행이 없습니다.")
+    delimiter = max(("|", "\t", ","), key=header_line.count)
+    framed = delimiter == "|" and header_line.strip().startswith("|")
+
+    def split(line: str) -> List[str]:
+        cells = next(csv.reader([line], delimiter=delimiter))
+        if framed:
+            cells = cells[1:-1] if len(cells) >= 2 else cells
+        return [cell.strip() for cell in cells]
+
+    header = [name.lower() for name in split(header_line.rstrip("\r\n"))]
+    if "plc_id" not in header:
+        raise ValueError("헤더에 PLC_ID 컬럼이 없습니다.")
+
+    reader = csv.reader(text_fp, delimiter=delimiter)
+    for cells in reader:
+        row = reader.line_num + 1
+        if framed:
+            cells = cells[1:-1] if len(cells) >= 2 else cells
+        cells = [cell.strip() for cell in cells]
+        if not any(cells) or all(set(cell) <= {"-", "+", ":"} for cell in cells):
+            continue
+        yield row, dict(zip(header, cells))
+
+
+# ========== Excel ==========
+
+def _iter_xlsx_records(fp: IO[bytes]) -> Iterator[PlcImportRecord]:
+    """첫 번째 시트를 헤더 + 데이터 행으로 읽기 (read_only 모드로 행 단위 스트리밍)"""
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(fp, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Excel 파일을 열 수 없습니다: {e}") from e
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            raise ValueError("헤더 행이 없습니다.")
+        header = [str(name).strip().lower() if name is not None else "" for name in header]
+        if "plc_id" not in header:
+            raise ValueError("헤더에 PLC_ID 컬럼이 없습니다.")
+
+        for row, values in enumerate(rows, start=2):
+            if not any(value not in (None, "") for value in values):
+                continue
+            yield row, dict(zip(header, values))
+    finally:
+        workbook.close()
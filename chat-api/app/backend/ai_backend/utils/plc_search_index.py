@@ -0,0 +1,150 @@
+# _*_ coding: utf-8 _*_
+"""In-process PLC keyword search index (pg_trgm를 쓸 수 없을 때의 대체 경로)."""
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "MATCH_EXACT",
+    "MATCH_PREFIX",
+    "MATCH_SUBSTRING",
+    "PlcSearchIndex",
+    "highlight_spans",
+    "match_type",
+]
+
+
+# 랭킹 단계 (작을수록 먼저)
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_SUBSTRING = 2
+
+_MATCH_NAMES = {MATCH_EXACT: "exact", MATCH_PREFIX: "prefix", MATCH_SUBSTRING: "substring"}
+
+
+def match_type(rank: int) -> str:
+    return _MATCH_NAMES[rank]
+
+
+def highlight_spans(text: Optional[str], keyword: str) -> List[List[int]]:
+    """text 안의 keyword 위치 목록 ([시작, 끝) 문자 offset, 대소문자 무시, 겹치지 않게)"""
+    if not text or not keyword:
+        return []
+    lowered = text.lower()
+    needle = keyword.lower()
+    # 소문자 변환으로 길이가 바뀌는 문자가 있으면 offset이 어긋나므로 생략
+    if len(lowered) != len(text):
+        return []
+
+    spans = []
+    pos = lowered.find(needle)
+    while pos != -1:
+        spans.append([pos, pos + len(needle)])
+        pos = lowered.find(needle, pos + len(needle))
+    return spans
+
+
+class PlcSearchIndex:
+    """PLC_ID / PLC_NAME 키워드 검색 인덱스 (읽기 전용, 버전마다 새로 생성)
+
+    - 완전 일치/접두 일치: 소문자 정렬 목록에서 이분 탐색
+    - 부분 일치: 필드별로 이어 붙인 문자열 버퍼를 str.find로 훑고, 줄 시작 offset으로 행을 찾는다
+    - limit개가 모이면 바로 멈추므로 짧은 키워드도 전체를 훑지 않는다
+
+    행은 (plc_id, plc_name, plant, process, line, equipment_group, unit, pgm_id, is_active) 튜플이다.
+    """
+
+    SEPARATOR = "\n"
+
+    def __init__(self, rows: Iterable[Sequence]):
+        # PLC ID(소문자) 순으로 정렬해 두면 접두 일치 결과가 ID 순으로 나온다
+        self.rows: List[Sequence] = sorted(rows, key=lambda row: row[0].lower())
+        self._id_keys = [row[0].lower() for row in self.rows]
+        name_keys = [(row[1] or "").lower().replace(self.SEPARATOR, " ") for row in self.rows]
+
+        self._name_order = array("l", sorted(range(len(self.rows)), key=name_keys.__getitem__))
+        self._name_keys = [name_keys[i] for i in self._name_order]
+
+        self._id_buffer, self._id_starts = self._join(self._id_keys)
+        self._name_buffer, self._name_starts = self._join(name_keys)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def _join(cls, keys: List[str]) -> Tuple[str, array]:
+        """키를 구분자로 이어 붙인 버퍼와 각 키의 시작 offset"""
+        starts = array("q", accumulate((len(key) + 1 for key in keys), initial=0))
+        starts.pop()
+        return cls.SEPARATOR.join(keys), starts
+
+    def search(
+        self,
+        keyword: str,
+        limit: int = 20,
+        is_active: Optional[bool] = True
+    ) -> List[Tuple[Sequence, int]]:
+        """키워드 검색
+
+        Returns:
+            [(행, 랭킹 단계)] - 완전 일치 → 접두 일치 → 부분 일치, 같은 단계는 PLC ID 순
+        """
+        needle = keyword.lower().replace(self.SEPARATOR, " ")
+        if not needle or limit <= 0:
+            return []
+
+        found = {}
+
+        def add(doc: int, rank: int) -> bool:
+            """결과 추가, limit에 도달하면 True"""
+            if doc not in found and (is_active is None or self.rows[doc][8] == is_active):
+                found[doc] = rank
+            return len(found) >= limit
+
+        done = self._collect_equal(needle, add) or self._collect_prefix(needle, add)
+        if not done:
+            done = self._collect_substring(self._id_buffer, self._id_starts, needle, add)
+        if not done:
+            self._collect_substring(self._name_buffer, self._name_starts, needle, add)
+
+        ordered = sorted(found.items(), key=lambda item: (item[1], item[0]))
+        return [(self.rows[doc], rank) for doc, rank in ordered]
+
+    def _collect_equal(self, needle: str, add) -> bool:
+        lo = bisect_left(self._id_keys, needle)
+        for doc in range(lo, bisect_right(self._id_keys, needle, lo)):
+            if add(doc, MATCH_EXACT):
+                return True
+        lo = bisect_left(self._name_keys, needle)
+        for pos in range(lo, bisect_right(self._name_keys, needle, lo)):
+            if add(self._name_order[pos], MATCH_EXACT):
+                return True
+        return False
+
+    def _collect_prefix(self, needle: str, add) -> bool:
+        for doc in range(bisect_left(self._id_keys, needle), len(self._id_keys)):
+            if not self._id_keys[doc].startswith(needle):
+                break
+            if add(doc, MATCH_PREFIX):
+                return True
+        for pos in range(bisect_left(self._name_keys, needle), len(self._name_keys)):
+            if not self._name_keys[pos].startswith(needle):
+                break
+            if add(self._name_order[pos], MATCH_PREFIX):
+                return True
+        return False
+
+    @staticmethod
+    def _collect_substring(buffer: str, starts: array, needle: str, add) -> bool:
+        pos = buffer.find(needle)
+        while pos != -1:
+            doc = bisect_right(starts, pos) - 1
+            if add(doc, MATCH_SUBSTRING):
+                return True
+            # 같은 행의 나머지는 건너뛰고 다음 행부터 다시 탐색
+            next_doc = doc + 1
+            if next_doc >= len(starts):
+                break
+            pos = buffer.find(needle, starts[next_doc])
+        return False
@@ -0,0 +1,144 @@
+# _*_ coding: utf-8 _*_
+"""PLC 계층 트리 생성 유틸리티."""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "PLC_HIERARCHY_FIELDS",
+    "PLC_TREE_LEVELS",
+    "build_plc_infos",
+    "build_plc_tree",
+    "build_plc_tree_changes",
+    "build_plc_tree_counts",
+]
+
+
+# 계층 필드 (PLCMaster 컬럼 속성명, 상위 → 하위)
+PLC_HIERARCHY_FIELDS = ("plant", "process", "line", "equipment_group", "unit")
+
+
+# 계층 순서 (응답 키, 하위 목록 키)
+PLC_TREE_LEVELS = (
+    ("plt", "procList"),
+    ("proc", "lineList"),
+    ("line", "eqpGrpList"),
+    ("eqpGrp", "unitList"),
+    ("unit", "info"),
+)
+
+
+def build_plc_tree(rows: Iterable[Sequence]) -> dict:
+    """
+    정렬된 PLC 행을 한 번 순회하여 계층 트리 생성
+
+    행은 (plant, process, line, equipment_group, unit, plc_id, plc_name, reg_dt, reg_user, pgm_id)
+    튜플이며 plant → process → line → equipment_group → unit 순으로 정렬되어 있어야 한다.
+    상위 계층 값이 바뀌면 그 아래 계층의 현재 노드를 새로 만들기 때문에
+    중간 딕셔너리 없이 응답 구조를 바로 만든다.
+
+    Returns:
+        {"data": [...]} 형식의 계층 구조 (/plcs/tree 응답)
+    """
+    plants: List[dict] = []
+    # 계층별 현재 노드와 키 (plant, process, line, equipment_group, unit)
+    current_keys: List[Optional[str]] = [None] * len(PLC_TREE_LEVELS)
+    current_nodes: List[Optional[dict]] = [None] * len(PLC_TREE_LEVELS)
+
+    for plant, process, line, equipment_group, unit, plc_id, plc_name, reg_dt, reg_user, pgm_id in rows:
+        keys = (plant, process, line, equipment_group, unit)
+
+        # 값이 처음 달라지는 계층 찾기 (그 아래는 모두 새 노드)
+        depth = 0
+        while depth < len(keys) and keys[depth] == current_keys[depth]:
+            depth += 1
+
+        for level in range(depth, len(keys)):
+            name_key, children_key = PLC_TREE_LEVELS[level]
+            node = {name_key: keys[level], children_key: []}
+            if level == 0:
+                plants.append(node)
+            else:
+                current_nodes[level - 1][PLC_TREE_LEVELS[level - 1][1]].append(node)
+            current_nodes[level] = node
+            current_keys[level] = keys[level]
+
+        current_nodes[-1]["info"].append(_plc_info(plc_id, plc_name, reg_dt, reg_user, pgm_id))
+
+    return {"data": plants}
+
+
+def build_plc_tree_changes(rows: Iterable[Sequence], is_active: Optional[bool] = True) -> Tuple[List[dict], List[str]]:
+    """
+    변경된 PLC 행을 트리 증분(upserts/removes)으로 변환
+
+    행은 PlcCRUD.get_plc_changes() 형식
+    (change_id, plc_id, plant, process, line, equipment_group, unit, plc_name, reg_dt, reg_user, pgm_id, is_active)
+    이며, 현재 상태가 조회 조건(is_active)에 맞으면 upsert, 아니면 remove로 분류한다.
+
+    Returns:
+        (upserts, removes) - upsert는 계층 경로와 info 한 건, remove는 PLC ID
+    """
+    upserts: List[dict] = []
+    removes: List[str] = []
+
+    for (_, plc_id, plant, process, line, equipment_group, unit,
+         plc_name, reg_dt, reg_user, pgm_id, active) in rows:
+        if active is None or (is_active is not None and active != is_active):
+            removes.append(plc_id)
+            continue
+
+        upserts.append({
+            "plt": plant,
+            "proc": process,
+            "line": line,
+            "eqpGrp": equipment_group,
+            "unit": unit,
+            "info": _plc_info(plc_id, plc_name, reg_dt, reg_user, pgm_id)
+        })
+
+    return upserts, removes
+
+
+def build_plc_tree_counts(unit_rows: Iterable[Sequence]) -> dict:
+    """
+    호기별 집계 행으로 계층별 PLC 수 트리 생성 (지연 펼치기용)
+
+    행은 PlcCRUD.get_unit_counts() 형식
+    (plant, process, line, equipment_group, unit, plc_count, mapped_count)이며,
+    각 노드는 {"plc_count", "mapped_count", "children": {이름: 노드}} 형태다.
+    children은 행 순서(계층 순 정렬)를 유지한다.
+
+    Returns:
+        루트 노드 (전체 집계)
+    """
+    root = {"plc_count": 0, "mapped_count": 0, "children": {}}
+
+    for row in unit_rows:
+        plc_count, mapped_count = row[-2], row[-1]
+        node = root
+        node["plc_count"] += plc_count
+        node["mapped_count"] += mapped_count
+        for name in row[:len(PLC_HIERARCHY_FIELDS)]:
+            child = node["children"].get(name)
+            if child is None:
+                child = node["children"][name] = {"plc_count": 0, "mapped_count": 0, "children": {}}
+            child["plc_count"] += plc_count
+            child["mapped_count"] += mapped_count
+            node = child
+
+    return root
+
+
+def build_plc_infos(rows: Iterable[Sequence]) -> List[dict]:
+    """get_plc_tree_rows() 형식의 행을 트리 말단(info) 목록으로 변환"""
+    return [_plc_info(*row[len(PLC_HIERARCHY_FIELDS):]) for row in rows]
+
+
+def _plc_info(plc_id, plc_name, reg_dt, reg_user, pgm_id) -> dict:
+    """트리 말단(info) 항목"""
+    return {
+        "plcId": plc_id,
+        "plcNm": plc_name,
+        "regDt": reg_dt,
+        "regUsr": reg_user or "unknown",
+        "pgmId": pgm_id or None
+    }
@@ -0,0 +1,60 @@
+# _*_ coding: utf-8 _*_
+"""토큰 계산 유틸리티 함수들."""
+import logging
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+
+__all__ = [
+    "get_tokenizer",
+    "count_tokens",
+    "count_fitting_suffix",
+]
+
+
+@lru_cache(maxsize=32)
+def get_tokenizer(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    모델별 tiktoken 인코더 반환 (프로세스 단위 캐시)
+
+    encoding_for_model은 요청마다 호출하면 비용이 크므로 모델명 기준으로 1회만 로드한다.
+    지원하지 않는 모델이면 None을 반환하며, 실패 결과도 캐시되어 경고는 1회만 출력된다.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        logger.warning(f"Failed to initialize tokenizer for model {model}: {e}")
+        return None
+
+
+def count_tokens(text: str, tokenizer: Optional[tiktoken.Encoding]) -> int:
+    """텍스트의 토큰 수 계산 (인코더가 없으면 약 4글자 = 1토큰으로 추정)"""
+    if not text:
+        return 0
+    if tokenizer is None:
+        return len(text) // 4
+    try:
+        return len(tokenizer.encode(text))
+    except Exception as e:
+        logger.warning(f"Token counting failed: {e}")
+        return len(text) // 4
+
+
+def count_fitting_suffix(token_counts: List[int], budget: int) -> int:
+    """
+    토큰 예산 안에 들어가는 최신 메시지 개수 반환
+
+    뒤에서부터의 누적 합(suffix sum)을 만들고 이분 탐색으로 예산을 넘지 않는 최대 개수를 찾는다.
+
+    Args:
+        token_counts: 오래된 것부터 정렬된 메시지별 토큰 수
+        budget: 허용 토큰 수
+    """
+    suffix_sums = list(accumulate(reversed(token_counts)))
+    return bisect_right(suffix_sums, budget)
@@ -0,0 +1,137 @@
+# _*_ coding: utf-8 _*_
+"""ZIP 멤버 스트리밍 (central directory 캐시 + 청크 단위 읽기/Range)."""
+import os
+import struct
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Union
+
+__all__ = [
+    "ZIP_COPY_CHUNK_SIZE",
+    "ZipArchive",
+    "open_zip_archive",
+    "clear_zip_archive_cache",
+]
+
+# 멤버 복사/전송 청크 크기 (멤버 크기와 무관하게 요청당 메모리는 이 크기)
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+# central directory를 캐시할 아카이브 수 (LRU)
+ZIP_ARCHIVE_CACHE_SIZE = 32
+
+# 로컬 파일 헤더 (zipfile.structFileHeader와 동일): 고정 30바이트 + 파일명 + extra
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+
+
+class ZipArchive:
+    """
+    열린 ZIP 아카이브 (central directory 파싱 결과 + 멤버 데이터 오프셋 캐시)
+
+    - ZipFile은 여러 스레드가 멤버를 동시에 열어도 안전 (공유 파일 핸들을 잠금으로 seek/read)
+    - 캐시에서 밀려나 close되어도 이미 열린 멤버 스트림은 끝까지 읽을 수 있다 (ZipFile 참조 카운트)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        self.zip_file = zipfile.ZipFile(self.path, "r")
+        self._data_offsets = {}
+        self._lock = threading.Lock()
+
+    def get_member(self, name: str) -> zipfile.ZipInfo:
+        """멤버 정보 (없으면 KeyError)"""
+        return self.zip_file.getinfo(name)
+
+    def is_range_capable(self, info: zipfile.ZipInfo) -> bool:
+        """무압축(stored)·비암호화 멤버만 아카이브 안의 연속 구간이므로 Range 가능"""
+        return (
+            not info.is_dir()
+            and info.compress_type == zipfile.ZIP_STORED
+            and not info.flag_bits & 0x1
+        )
+
+    def data_offset(self, info: zipfile.ZipInfo) -> int:
+        """멤버 데이터 시작 위치 (로컬 헤더의 가변 길이 필드 다음, 멤버별 1회 계산)"""
+        with self._lock:
+            offset = self._data_offsets.get(info.filename)
+            if offset is None:
+                with open(self.path, "rb") as f:
+                    f.seek(info.header_offset)
+                    header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+                if header[0] != _LOCAL_HEADER_SIGNATURE:
+                    raise zipfile.BadZipFile(f"잘못된 로컬 헤더: {info.filename}")
+                offset = info.header_offset + _LOCAL_HEADER.size + header[10] + header[11]
+                self._data_offsets[info.filename] = offset
+            return offset
+
+    def iter_member(self, info: zipfile.ZipInfo, chunk_size: int = ZIP_COPY_CHUNK_SIZE) -> Iterator[bytes]:
+        """멤버 전체를 압축 해제하며 청크 단위로 읽기 (CRC는 zipfile이 끝에서 검증)"""
+        with self.zip_file.open(info) as source:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def iter_stored_range(
+        self, info: zipfile.ZipInfo, start: int, end: int, chunk_size: int = ZIP_COPY_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """무압축 멤버의 [start, end] 구간을 아카이브 파일에서 직접 읽기 (앞부분을 읽지 않음)"""
+        position = self.data_offset(info) + start
+        remaining = end - start + 1
+        with open(self.path, "rb") as f:
+            f.seek(position)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"멤버 데이터가 잘렸습니다: {info.filename}")
+                remaining -= len(chunk)
+                yield chunk
+
+    def close(self) -> None:
+        self.zip_file.close()
+
+
+_archive_cache = OrderedDict()
+_archive_cache_lock = threading.Lock()
+
+
+def open_zip_archive(path: Union[str, Path]) -> ZipArchive:
+    """
+    아카이브를 열어 캐시 (같은 파일이면 central directory를 다시 파싱하지 않음)
+
+    캐시 키에 inode/크기/수정 시각을 포함하므로 파일이 교체되면 새로 연다.
+
+    Raises:
+        FileNotFoundError, zipfile.BadZipFile
+    """
+    stat_result = os.stat(path)
+    key = (os.path.realpath(path), stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+    with _archive_cache_lock:
+        archive = _archive_cache.get(key)
+        if archive is not None:
+            _archive_cache.move_to_end(key)
+            return archive
+
+    archive = ZipArchive(path)
+    with _archive_cache_lock:
+        cached = _archive_cache.get(key)
+        if cached is not None:
+            # 다른 요청이 먼저 열었으면 그것을 사용
+            archive.close()
+            _archive_cache.move_to_end(key)
+            return cached
+        _archive_cache[key] = archive
+        while len(_archive_cache) > ZIP_ARCHIVE_CACHE_SIZE:
+            _, evicted = _archive_cache.popitem(last=False)
+            evicted.close()
+    return archive
+
+
+def clear_zip_archive_cache() -> None:
+    """캐시된 아카이브를 모두 닫기"""
+    with _archive_cache_lock:
+        while _archive_cache:
+            _, archive = _archive_cache.popitem()
+            archive.close()
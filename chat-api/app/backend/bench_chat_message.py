@@ -0,0 +1,94 @@
+"""REST 채팅 메시지 API(/chat/{chat_id}/message) 부하 테스트 스크립트
+
+사용법:
+    python bench_chat_message.py [동시 사용자 수] [사용자당 요청 수]
+
+ASGI 앱을 httpx.AsyncClient(ASGITransport)로 직접 호출한다. (네트워크/서버 프로세스 없음)
+LLM 제공자와 채팅 저장소는 bench_chat_stream의 스텁/메모리 CRUD를 사용하고,
+동시 사용자 수(기본 200)만큼 요청을 보내
+- 기존 방식: 동기 라우트가 스레드풀 워커에서 asyncio.run(send_message_simple(...)) 실행
+- 현재 방식: chat_router의 async 라우트가 앱 이벤트 루프에서 send_message_simple을 await
+의 초당 요청 수와 응답 시간(p50/p95, ms)을 출력한다.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from ai_backend.api.routers.chat_router import router
+from ai_backend.core.dependencies import get_llm_chat_service
+from ai_backend.types.request.chat_request import UserMessageRequest
+from bench_chat_stream import MemoryChatCRUD, StubProvider, make_service
+
+# 스텁 LLM 응답 시간 = 10 x 10ms
+LLM_CHUNK_COUNT = 10
+LLM_CHUNK_DELAY = 0.01
+# DB 왕복 시간 (AsyncSession처럼 await)
+DB_LATENCY = 0.002
+
+
+def create_app(legacy: bool) -> FastAPI:
+    """현재 chat_router 앱 또는 기존 방식(asyncio.run) 라우트 앱 생성"""
+    crud = MemoryChatCRUD(DB_LATENCY, blocking=False)
+    provider = StubProvider(LLM_CHUNK_COUNT, LLM_CHUNK_DELAY)
+
+    app = FastAPI()
+    if legacy:
+        @app.post("/chat/{chat_id}/message")
+        def send_message(chat_id: str, request: UserMessageRequest, llm_chat_service=Depends(get_llm_chat_service)):
+            # 기존 send_message_simple: 요청마다 새 이벤트 루프를 만들고 닫음
+            return asyncio.run(llm_chat_service.send_message_simple(chat_id, request.message, request.user_id))
+    else:
+        app.include_router(router)
+    app.dependency_overrides[get_llm_chat_service] = lambda: make_service(provider, crud)
+    return app
+
+
+async def user_session(client: httpx.AsyncClient, user: int, requests: int, latencies: list):
+    """한 사용자가 자기 채팅방에 순서대로 메시지 전송"""
+    for i in range(requests):
+        started = time.perf_counter()
+        response = await client.post(
+            f"/chat/bench-{user}/message", json={"message": f"질문 {i}", "user_id": f"user-{user}"}
+        )
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(legacy: bool, users: int, requests: int):
+    """부하 실행 - (전체 시간, 응답 시간 목록)"""
+    latencies = []
+    transport = httpx.ASGITransport(app=create_app(legacy))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(user_session(client, user, requests, latencies) for user in range(users)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logging.disable(logging.WARNING)
+
+    print(f"동시 사용자: {users}, 사용자당 요청: {requests}, "
+          f"LLM 응답 {LLM_CHUNK_COUNT * LLM_CHUNK_DELAY * 1000:.0f}ms, DB 호출 지연 {DB_LATENCY * 1000:.1f}ms")
+    print("=" * 72)
+    print(f"{'mode':>12} {'elapsed(s)':>11} {'req/s':>9} {'p50(ms)':>9} {'p95(ms)':>9}")
+    print("-" * 72)
+    for label, legacy in (("asyncio.run", True), ("async", False)):
+        elapsed, latencies = asyncio.run(run(legacy, users, requests))
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{label:>12} {elapsed:>11.2f} {len(latencies) / elapsed:>9.1f} "
+              f"{statistics.median(latencies) * 1000:>9.1f} {p95 * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
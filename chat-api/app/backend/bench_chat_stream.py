@@ -0,0 +1,192 @@
+"""채팅 스트리밍 동시 처리량 비교 스크립트
+
+사용법:
+    python bench_chat_stream.py [동시 스트림 수] [DB 호출 지연(ms)]
+
+LLM 제공자는 청크를 일정 간격으로 내보내는 스텁, 채팅 저장소는 메모리 CRUD로 대체하고
+동시 스트림 수(기본 200)만큼 generate_ai_response_stream을 끝까지 소비하여
+- 기존 방식: DB 호출이 이벤트 루프를 블로킹 (동기 Session 흉내 - time.sleep)
+- 현재 방식: AsyncChatCRUD처럼 DB 호출을 await (asyncio.sleep)
+의 전체 시간, 초당 스트림/청크 수, 이벤트 루프 최대 지연(ms)을 출력한다.
+(레디스는 사용하지 않음 - 취소 확인은 DB 폴링 경로)
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai_backend.api.services import llm_chat_service
+from ai_backend.api.services.llm_chat_service import LLMChatService
+
+# 스텁 LLM 응답: 청크 수 x 청크 간격 (실제 LLM의 토큰 스트림 흉내)
+CHUNK_COUNT = 40
+CHUNK_DELAY = 0.01
+
+
+class StubStream:
+    """일정 간격으로 청크를 내보내는 스트림 (네트워크 대기는 await)"""
+
+    def __init__(self, chunk_count: int, chunk_delay: float):
+        self.chunk_count = chunk_count
+        self.chunk_delay = chunk_delay
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for i in range(self.chunk_count):
+            await asyncio.sleep(self.chunk_delay)
+            yield f"토큰{i} "
+
+
+class StubProvider:
+    """LLM 제공자 스텁 (BaseLLMProvider와 같은 인터페이스)"""
+
+    model = "bench-stub"
+
+    def __init__(self, chunk_count: int = CHUNK_COUNT, chunk_delay: float = CHUNK_DELAY):
+        self.chunk_count = chunk_count
+        self.chunk_delay = chunk_delay
+
+    async def create_completion(self, messages, stream: bool = False):
+        if stream:
+            return StubStream(self.chunk_count, self.chunk_delay)
+        await asyncio.sleep(self.chunk_count * self.chunk_delay)
+        content = "".join(f"토큰{i} " for i in range(self.chunk_count))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def process_stream_chunk(self, chunk):
+        return chunk
+
+    async def aclose(self):
+        pass
+
+
+class MemoryChatCRUD:
+    """
+    AsyncChatCRUD 중 채팅 경로에서 쓰는 메서드만 가진 메모리 저장소
+
+    DB 왕복 시간은 db_latency로 흉내낸다.
+    - blocking=True: time.sleep (이벤트 루프에서 동기 Session을 호출하던 기존 방식)
+    - blocking=False: asyncio.sleep (AsyncSession)
+    """
+
+    def __init__(self, db_latency: float, blocking: bool):
+        self.db_latency = db_latency
+        self.blocking = blocking
+        self.messages = {}
+        self.chats = set()
+
+    async def _round_trip(self):
+        if self.blocking:
+            time.sleep(self.db_latency)
+        else:
+            await asyncio.sleep(self.db_latency)
+
+    def _add(self, message_id, chat_id, message, message_type, status, token_count=None):
+        self.messages[message_id] = SimpleNamespace(
+            message_id=message_id, chat_id=chat_id, message=message, message_type=message_type,
+            status=status, is_cancelled=False, token_count=token_count
+        )
+
+    async def get_chat_or_create(self, chat_id, user_id="user"):
+        await self._round_trip()
+        self.chats.add(chat_id)
+
+    async def get_recent_messages(self, chat_id, limit=50):
+        await self._round_trip()
+        return [m for m in self.messages.values() if m.chat_id == chat_id][-limit:]
+
+    async def save_user_message_simple(self, message_id, chat_id, user_id, message, token_count=None):
+        await self._round_trip()
+        self._add(message_id, chat_id, message, "user", "completed", token_count)
+
+    async def save_ai_message(self, message_id, chat_id, user_id, content, status, token_count=None):
+        await self._round_trip()
+        self._add(message_id, chat_id, content, "assistant", status, token_count)
+
+    async def save_ai_message_generating(self, message_id, chat_id, user_id):
+        await self._round_trip()
+        self._add(message_id, chat_id, "", "assistant", "generating")
+
+    async def is_message_cancelled(self, message_id):
+        await self._round_trip()
+        return self.messages[message_id].is_cancelled
+
+    async def update_ai_message_completed(self, message_id, content, external_api_nodes=None, token_count=None):
+        await self._round_trip()
+        message = self.messages[message_id]
+        message.message, message.status, message.token_count = content, "completed", token_count
+
+    async def update_message_to_error(self, message_id, error_message):
+        await self._round_trip()
+        self.messages[message_id].status = "error"
+
+
+def make_service(provider, crud) -> LLMChatService:
+    """스텁 제공자/메모리 CRUD를 쓰는 LLMChatService (레디스 미사용)"""
+    llm_chat_service.get_llm_provider_registry = lambda: SimpleNamespace(get_provider=lambda: provider)
+    service = LLMChatService(db=object(), redis_client=None)
+    service.async_chat_crud = crud
+    return service
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """이벤트 루프 최대 지연(초) - 다른 요청이 실행을 기다린 최대 시간"""
+    max_lag = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - started - interval)
+    return max_lag
+
+
+async def consume_stream(service: LLMChatService, chat_id: str) -> int:
+    """스트림을 끝까지 소비하고 받은 청크 수 반환"""
+    chunks = 0
+    async for event in service.generate_ai_response_stream(chat_id):
+        if event["type"] == "ai_response_chunk":
+            chunks += 1
+        elif event["type"] not in ("progress", "ai_response_complete"):
+            raise RuntimeError(f"예상하지 못한 이벤트: {event}")
+    return chunks
+
+
+async def run(concurrency: int, db_latency: float, blocking: bool):
+    """동시 스트림 실행 - (전체 시간, 청크 수, 이벤트 루프 최대 지연)"""
+    crud = MemoryChatCRUD(db_latency, blocking)
+    service = make_service(StubProvider(), crud)
+    for i in range(concurrency):
+        crud._add(f"user-{i}", f"chat-{i}", "PLC 프로그램 매핑 관련 질문입니다.", "user", "completed")
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started = time.perf_counter()
+    chunk_counts = await asyncio.gather(*(consume_stream(service, f"chat-{i}") for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, sum(chunk_counts), await lag_task
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    db_latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 2.0) / 1000
+    logging.disable(logging.WARNING)
+
+    ideal = CHUNK_COUNT * CHUNK_DELAY
+    print(f"동시 스트림: {concurrency}, DB 호출 지연: {db_latency * 1000:.1f}ms, "
+          f"스트림당 청크: {CHUNK_COUNT} x {CHUNK_DELAY * 1000:.0f}ms (단독 실행 시 약 {ideal:.2f}s)")
+    print("=" * 78)
+    print(f"{'mode':>10} {'elapsed(s)':>11} {'streams/s':>10} {'chunks/s':>10} {'max loop lag(ms)':>18}")
+    print("-" * 78)
+    for label, blocking in (("blocking", True), ("async", False)):
+        elapsed, chunks, lag = asyncio.run(run(concurrency, db_latency, blocking))
+        print(f"{label:>10} {elapsed:>11.2f} {concurrency / elapsed:>10.1f} {chunks / elapsed:>10.0f} {lag * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""캐시 코덱 인코딩/디코딩 성능 비교 스크립트
+
+사용법:
+    python bench_codecs.py [반복 횟수]
+
+대화 기록 형태의 페이로드를 메시지 수별로 만들어 코덱마다
+1회당 인코딩/디코딩 시간(µs)과 인코딩 결과 크기(bytes)를 출력한다.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai_backend.cache.codec import available_codecs, encode_sse, get_codec
+
+
+def make_history(message_count: int) -> list:
+    """대화 기록 캐시와 같은 형태의 페이로드 생성"""
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": "PLC 프로그램 매핑 관련 질문입니다. " * 8,
+            "timestamp": "2024-01-01T00:00:00",
+            "cancelled": False,
+            "token_count": 120
+        }
+        for i in range(message_count)
+    ]
+
+
+def bench(codec, payload, number: int):
+    """1회당 인코딩/디코딩 시간(µs)과 인코딩 크기 반환"""
+    encoded = codec.encode(payload)
+    encode_us = timeit.timeit(lambda: codec.encode(payload), number=number) / number * 1e6
+    decode_us = timeit.timeit(lambda: codec.decode(encoded), number=number) / number * 1e6
+    size = len(encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+    return encode_us, decode_us, size
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    codecs = [get_codec(name) for name in available_codecs()]
+
+    print(f"반복 횟수: {number}, 사용 가능한 코덱: {', '.join(c.name for c in codecs)}")
+    print("=" * 72)
+    print(f"{'messages':>8} {'codec':>8} {'encode(µs)':>12} {'decode(µs)':>12} {'size(bytes)':>12}")
+    print("-" * 72)
+
+    for message_count in (1, 10, 50, 200):
+        payload = make_history(message_count)
+        for codec in codecs:
+            encode_us, decode_us, size = bench(codec, payload, number)
+            print(f"{message_count:>8} {codec.name:>8} {encode_us:>12.2f} {decode_us:>12.2f} {size:>12}")
+        print("-" * 72)
+
+    # SSE 청크 프레이밍 (스트리밍 응답 1청크)
+    chunk = {
+        "type": "ai_response_chunk",
+        "message_id": "msg-1",
+        "content": "안녕하세요",
+        "user_id": "user",
+        "timestamp": "2024-01-01T00:00:00"
+    }
+    sse_us = timeit.timeit(lambda: encode_sse(chunk), number=number * 10) / (number * 10) * 1e6
+    print(f"SSE 청크 프레이밍: {sse_us:.2f} µs/chunk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""PLC 메모리 검색 인덱스 성능 측정 스크립트
+
+사용법:
+    python bench_plc_search.py [PLC 수] [반복 횟수]
+
+가상의 PLC 데이터(기본 1,000,000건)로 PlcSearchIndex를 만들고
+키워드 유형별(완전/접두/부분 일치, 짧은 키워드, 결과 없음) 검색 지연(p50/p99, ms)을 출력한다.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai_backend.utils.plc_search_index import PlcSearchIndex, highlight_spans
+
+
+def make_rows(count: int) -> list:
+    """get_plc_search_rows()와 같은 형태의 가상 데이터 생성"""
+    rng = random.Random(42)
+    kinds = ["조립", "도장", "용접", "프레스", "검사", "ASSY", "PAINT", "WELD"]
+    rows = []
+    for i in range(count):
+        plant = f"PLT{i % 10 + 1}"
+        unit = f"U{i % 40 + 1}"
+        rows.append((
+            f"M{i % 10}{kinds[i % 8][:1]}FB{i:07d}",
+            f"{kinds[rng.randrange(8)]}라인{i % 500} {unit} PLC",
+            plant,
+            f"{plant}-PRC{i % 5 + 1}",
+            f"{plant}-LN{i % 20 + 1}",
+            f"EQ{i % 100 + 1}",
+            unit,
+            f"PGM{i % 3000}" if i % 3 else None,
+            i % 17 != 0
+        ))
+    return rows
+
+
+def percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rows = make_rows(count)
+
+    started = time.perf_counter()
+    index = PlcSearchIndex(rows)
+    print(f"PLC 수: {count:,}, 인덱스 생성: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    keywords = {
+        "exact id": rows[count // 2][0],
+        "prefix id": rows[count // 3][0][:8],
+        "substring id": rows[count // 4][0][-5:],
+        "name word": "도장라인42",
+        "short (1자)": "m",
+        "rare substring": "ln19-x",
+        "no match": "zzzzzz",
+    }
+
+    print("=" * 64)
+    print(f"{'keyword':>16} {'hits':>6} {'p50(ms)':>10} {'p99(ms)':>10}")
+    print("-" * 64)
+    for label, keyword in keywords.items():
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = index.search(keyword, limit=20, is_active=True)
+            for row, _ in hits:
+                highlight_spans(row[0], keyword)
+                highlight_spans(row[1], keyword)
+            samples.append((time.perf_counter() - started) * 1000)
+        print(f"{label:>16} {len(hits):>6} {percentile(samples, 0.5):>10.3f} {percentile(samples, 0.99):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""PLC 계층 트리 생성 성능 비교 스크립트
+
+사용법:
+    python bench_plc_tree.py [PLC 수]
+
+가상의 PLC 데이터(기본 100,000건)로
+- 기존 방식: 전체 컬럼 객체 + datetime → 5단계 딕셔너리 → Response 변환
+- 현재 방식: 계층 순 정렬된 튜플(등록일 문자열) → build_plc_tree 한 번 순회
+의 트리 생성 시간(ms)을 출력하고 두 결과가 같은지 확인한다. (DB 조회 시간은 포함하지 않음)
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai_backend.utils.plc_tree import build_plc_tree
+
+
+def make_plcs(count: int) -> list:
+    """PLC_MASTER 행과 같은 형태의 가상 데이터 생성 (계층 순 정렬)"""
+    base_dt = datetime(2025, 10, 21, 13, 17, 0, 123456)
+    plcs = []
+    for i in range(count):
+        plant = f"PLT{i // 20000 + 1}"
+        process = f"{plant}-PRC{i // 4000 % 5 + 1}"
+        line = f"{process}-LN{i // 800 % 5 + 1}"
+        equipment_group = f"{line}-EQ{i // 100 % 8 + 1}"
+        unit = f"{equipment_group}-U{i // 10 % 10 + 1}"
+        plcs.append(SimpleNamespace(
+            plc_id=f"{unit}-PLC{i % 10 + 1:02d}",
+            plant=plant,
+            process=process,
+            line=line,
+            equipment_group=equipment_group,
+            unit=unit,
+            plc_name=f"PLC {i}",
+            pgm_id=f"PGM{i % 300}" if i % 3 else None,
+            pgm_mapping_dt=None,
+            pgm_mapping_user=None,
+            is_active=True,
+            create_dt=base_dt + timedelta(seconds=i),
+            create_user="admin" if i % 7 else None,
+            update_dt=None,
+            update_user=None
+        ))
+    return plcs
+
+
+def to_rows(plcs: list) -> list:
+    """get_plc_tree_rows()와 같은 형태의 튜플로 변환 (등록일은 DB에서 문자열로 변환됨)"""
+    return [
+        (
+            plc.plant, plc.process, plc.line, plc.equipment_group, plc.unit,
+            plc.plc_id, plc.plc_name, plc.create_dt.isoformat(),
+            plc.create_user or "unknown", plc.pgm_id
+        )
+        for plc in plcs
+    ]
+
+
+def legacy_build(plcs: list) -> dict:
+    """이전 PlcService._build_hierarchy + _convert_to_response 방식"""
+    hierarchy = {}
+    for plc in plcs:
+        units = (
+            hierarchy.setdefault(plc.plant, {})
+            .setdefault(plc.process, {})
+            .setdefault(plc.line, {})
+            .setdefault(plc.equipment_group, {})
+        )
+        units.setdefault(plc.unit, []).append({
+            "plcId": plc.plc_id,
+            "plcNm": plc.plc_name,
+            "regDt": plc.create_dt.isoformat() if plc.create_dt else None,
+            "regUsr": plc.create_user or "unknown",
+            "pgmId": plc.pgm_id or None
+        })
+
+    return {"data": [
+        {"plt": plant, "procList": [
+            {"proc": process, "lineList": [
+                {"line": line, "eqpGrpList": [
+                    {"eqpGrp": eqp_grp, "unitList": [
+                        {"unit": unit, "info": info}
+                        for unit, info in units.items()
+                    ]}
+                    for eqp_grp, units in eqp_grps.items()
+                ]}
+                for line, eqp_grps in lines.items()
+            ]}
+            for process, lines in processes.items()
+        ]}
+        for plant, processes in hierarchy.items()
+    ]}
+
+
+def measure(func, arg, repeat: int = 5) -> float:
+    """최소 실행 시간(ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    plcs = make_plcs(count)
+    rows = to_rows(plcs)
+
+    assert legacy_build(plcs) == build_plc_tree(rows), "트리 결과가 다릅니다"
+
+    legacy_ms = measure(legacy_build, plcs)
+    single_pass_ms = measure(build_plc_tree, rows)
+
+    print(f"PLC 수: {count:,}")
+    print("=" * 48)
+    print(f"{'legacy (dict + convert)':>28}: {legacy_ms:>10.1f} ms")
+    print(f"{'build_plc_tree (1-pass)':>28}: {single_pass_ms:>10.1f} ms")
+    print("-" * 48)
+    print(f"{'speedup':>28}: {legacy_ms / single_pass_ms:>10.2f} x")
+
+
+if __name__ == "__main__":
+    main()
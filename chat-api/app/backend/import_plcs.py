@@ -0,0 +1,76 @@
+"""PLC 일괄 등록 스크립트
+
+사용법:
+    python import_plcs.py <파일> [--format json|csv|xlsx] [--user 사용자] [--batch-size 2000]
+                          [--dry-run] [--encoding utf-8-sig] [--errors 오류파일.json]
+
+계층 JSON(plc01.json 형식), CSV/파이프 구분 텍스트(_PLC_MASTER__*.txt), Excel(.xlsx)을
+POST /v1/plcs/import와 같은 방식으로 DB에 upsert하고 결과 요약을 출력한다.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ai_backend.api.services.plc_service import PlcService
+from ai_backend.core.dependencies import get_database, get_redis_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PLC 일괄 등록 (PLC ID 기준 upsert)')
+    parser.add_argument('path', help='등록할 파일 경로')
+    parser.add_argument('--format', choices=['json', 'csv', 'xlsx'], default=None,
+                        help='파일 형식 (생략 시 확장자/내용으로 판별)')
+    parser.add_argument('--user', '-u', default=os.getenv('USER'),
+                        help='등록/수정 사용자')
+    parser.add_argument('--batch-size', '-b', type=int, default=2000,
+                        help='청크(트랜잭션) 크기')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='검증만 수행 (DB 변경 없음)')
+    parser.add_argument('--encoding', default='utf-8-sig',
+                        help='CSV 인코딩 (Excel에서 저장한 CSV는 cp949)')
+    parser.add_argument('--errors', default=None,
+                        help='행 오류 목록을 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    session = get_database()._session_factory()
+    try:
+        # 레디스가 있으면 트리 버전을 파드 간에 공유하므로 다른 서버의 캐시도 갱신된다
+        service = PlcService(db=session, redis_client=get_redis_client())
+        with open(args.path, 'rb') as fp:
+            result = service.import_plcs(
+                fp,
+                filename=args.path,
+                file_format=args.format,
+                user=args.user,
+                batch_size=args.batch_size,
+                dry_run=args.dry_run,
+                encoding=args.encoding
+            )
+    finally:
+        session.close()
+
+    print("=" * 50)
+    print(f"PLC 일괄 등록{' (dry run)' if result['dry_run'] else ''}: {args.path} ({result['format']})")
+    print("=" * 50)
+    for key in ('total', 'inserted', 'updated', 'unchanged', 'failed'):
+        print(f"  {key:>10}: {result[key]:,}")
+    print(f"  {'version':>10}: {result['version']}")
+    print(f"  {'elapsed':>10}: {result['elapsed_ms']:,.1f} ms")
+
+    for error in result['errors'][:20]:
+        print(f"  - {error['row']}행 {error['plc_id'] or ''}: {error['error']}")
+    if result['failed'] > 20:
+        print(f"  ... 외 {result['failed'] - 20:,}건")
+
+    if args.errors:
+        with open(args.errors, 'w', encoding='utf-8') as f:
+            json.dump(result['errors'], f, ensure_ascii=False, indent=2)
+
+    return 1 if result['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
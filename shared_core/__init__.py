@@ -7,26 +7,34 @@ Backend와 Prefect 프로젝트에서 공통으로 사용하는 문서 관련 
 __version__ = "1.0.0"
 __author__ = "Document Processing Team"
 
-from .crud import DocumentChunkCRUD, DocumentCRUD, ProcessingJobCRUD
+from .crud import DocumentBlobCRUD, DocumentChunkCRUD, DocumentCRUD, ProcessingJobCRUD
 from .database import (
     DatabaseManager,
     get_database_manager,
     get_db_session,
     initialize_database,
 )
-from .models import Document, DocumentChunk, ProcessingJob
-from .services import DocumentChunkService, DocumentService, ProcessingJobService
+from .models import Document, DocumentBlob, DocumentChunk, ProcessingJob
+from .services import (
+    DocumentChunkService,
+    DocumentService,
+    FileTooLargeError,
+    ProcessingJobService,
+)
 
 __all__ = [
     "Document",
+    "DocumentBlob",
     "DocumentChunk", 
     "ProcessingJob",
     "DocumentCRUD",
+    "DocumentBlobCRUD",
     "DocumentChunkCRUD",
     "ProcessingJobCRUD",
     "DocumentService",
     "DocumentChunkService",
     "ProcessingJobService",
+    "FileTooLargeError",
     "DatabaseManager",
     "get_db_session",
     "initialize_database",
@@ -6,12 +6,13 @@ Backend와 Prefect 프로젝트에서 공통으로 사용하는 데이터베이
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from .models import Document, DocumentChunk, ProcessingJob
+from .models import Document, DocumentBlob, DocumentChunk, ProcessingJob
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,7 @@ class DocumentCRUD:
         error_message: str = None,
         # 새로운 optional 필드들
         file_hash: str = None,
+        content_hash: str = None,
         total_pages: int = None,
         processed_pages: int = None,
         milvus_collection_name: str = None,
@@ -68,6 +70,7 @@ class DocumentCRUD:
                 is_public=is_public,
                 # 새로운 optional 필드들
                 file_hash=file_hash,
+                content_hash=content_hash,
                 total_pages=total_pages,
                 processed_pages=processed_pages,
                 milvus_collection_name=milvus_collection_name,
@@ -188,29 +191,51 @@ class DocumentCRUD:
             logger.error(f"문서 처리 정보 업데이트 실패: {str(e)}")
             raise
     
-    def find_document_by_hash(self, file_hash: str, status_filter: str = None) -> Optional[Document]:
-        """파일 해시를 기반으로 기존 문서 검색 (중복 체크용)"""
+    def find_document_by_hash(self, file_hash: str, status_filter: str = None, user_id: str = None) -> Optional[Document]:
+        """파일 해시를 기반으로 기존 문서 검색 (중복 체크용, user_id를 주면 그 사용자 소유 문서만)"""
         try:
             query = self.db.query(Document).filter(Document.file_hash == file_hash)
             if status_filter:
                 query = query.filter(Document.status == status_filter)
+            if user_id:
+                query = query.filter(Document.user_id == user_id)
             return query.first()
         except Exception as e:
             logger.error(f"해시 기반 문서 검색 실패: {str(e)}")
             raise
     
-    def find_completed_document_by_hash(self, file_hash: str) -> Optional[Document]:
-        """완료된 상태의 기존 문서 검색 (완전 중복 체크용)"""
+    def find_completed_document_by_hash(self, file_hash: str, readable_by: str = None) -> Optional[Document]:
+        """완료된 상태의 기존 문서 검색 (완전 중복 체크용, readable_by는 _filter_readable 참고)"""
         try:
-            return self.db.query(Document)\
+            query = self.db.query(Document)\
                 .filter(Document.file_hash == file_hash)\
                 .filter(Document.status == 'completed')\
-                .filter(Document.is_deleted == False)\
-                .first()
+                .filter(Document.is_deleted == False)
+            return self._filter_readable(query, readable_by).first()
         except Exception as e:
             logger.error(f"완료된 문서 검색 실패: {str(e)}")
             raise
     
+    def find_completed_document_by_content_hash(self, content_hash: str, readable_by: str = None) -> Optional[Document]:
+        """내용 해시(SHA-256)로 완료된 문서 검색 (업로드 전 중복 확인용, readable_by는 _filter_readable 참고)"""
+        try:
+            query = self.db.query(Document)\
+                .filter(Document.content_hash == content_hash)\
+                .filter(Document.status == 'completed')\
+                .filter(Document.is_deleted == False)
+            return self._filter_readable(query, readable_by).first()
+        except Exception as e:
+            logger.error(f"내용 해시 기반 문서 검색 실패: {str(e)}")
+            raise
+    
+    def _filter_readable(self, query, user_id: str = None):
+        """user_id가 읽을 수 있는 문서(본인 소유 또는 공개)로 제한 - 본인 문서를 먼저"""
+        if not user_id:
+            return query
+        return query\
+            .filter(or_(Document.user_id == user_id, Document.is_public == True))\
+            .order_by(desc(Document.user_id == user_id), Document.create_dt)
+    
     def check_document_permission(self, document_id: str, required_permission: str) -> bool:
         """문서의 특정 권한 체크"""
         try:
@@ -369,6 +394,73 @@ class DocumentCRUD:
             raise
 
 
+class DocumentBlobCRUD:
+    """DocumentBlob(내용 주소 기반 공유 파일) CRUD"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def lock_blob(self, content_hash: str, file_size: int, blob_path: str) -> DocumentBlob:
+        """
+        공유 파일 행을 (없으면 만들어) 잠금 - 커밋하지 않음
+        
+        호출자가 같은 트랜잭션에서 CONTENT_HASH를 가진 문서를 저장(커밋)할 때까지 잠금이 유지되므로
+        그 사이에 release_blob이 참조 0으로 보고 파일을 지우는 일이 없다.
+        """
+        try:
+            self.db.execute(
+                pg_insert(DocumentBlob)
+                .values(content_hash=content_hash, file_size=file_size, blob_path=blob_path)
+                .on_conflict_do_nothing(index_elements=[DocumentBlob.content_hash])
+            )
+            return self.db.query(DocumentBlob)\
+                .filter(DocumentBlob.content_hash == content_hash)\
+                .populate_existing()\
+                .with_for_update()\
+                .one()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"공유 파일 잠금 실패: {str(e)}")
+            raise
+    
+    def count_references(self, content_hash: str) -> int:
+        """공유 파일을 참조하는 삭제되지 않은 문서 수"""
+        return self.db.query(func.count(Document.document_id))\
+            .filter(Document.content_hash == content_hash)\
+            .filter(Document.is_deleted == False)\
+            .scalar()
+    
+    def release_blob(self, content_hash: str, remove_file: Callable[[str], None]) -> Optional[str]:
+        """
+        참조가 남지 않은 공유 파일 행과 파일 삭제 (문서 삭제 후 호출)
+        
+        remove_file(BLOB_PATH)는 행 잠금을 쥔 채 커밋 전에 호출된다.
+        커밋 후에 지우면 그 사이 lock_blob으로 행을 다시 만든 업로드가 곧 지워질 파일에 연결할 수 있다.
+        remove_file이 실패하면 롤백하여 행을 남긴다.
+        
+        Returns:
+            삭제된 행의 BLOB_PATH, 참조가 남아 있거나 행이 없으면 None
+        """
+        try:
+            blob = self.db.query(DocumentBlob)\
+                .filter(DocumentBlob.content_hash == content_hash)\
+                .with_for_update()\
+                .first()
+            if not blob or self.count_references(content_hash) > 0:
+                self.db.commit()
+                return None
+            blob_path = blob.blob_path
+            self.db.delete(blob)
+            self.db.flush()
+            remove_file(blob_path)
+            self.db.commit()
+            return blob_path
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"공유 파일 해제 실패: {str(e)}")
+            raise
+
+
 class DocumentChunkCRUD:
     """DocumentChunk 관련 CRUD 작업을 처리하는 클래스"""
     
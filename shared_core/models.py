@@ -9,10 +9,12 @@ from datetime import datetime
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
@@ -50,6 +52,7 @@ class Document(Base):
     file_extension = Column('FILE_EXTENSION', String(10), nullable=False)
     upload_path = Column('UPLOAD_PATH', String(500), nullable=False)
     file_hash = Column('FILE_HASH', String(64), nullable=True)  # 중복 방지
+    content_hash = Column('CONTENT_HASH', String(64), nullable=True)  # 공유 파일(DOCUMENT_BLOBS) SHA-256
     
     # 사용자 정보
     user_id = Column('USER_ID', String(50), nullable=False)
@@ -86,6 +89,11 @@ class Document(Base):
     # 삭제 플래그
     is_deleted = Column('IS_DELETED', Boolean, nullable=False, server_default=false())
 
+    __table_args__ = (
+        # 공유 파일 참조 수 = 같은 CONTENT_HASH의 삭제되지 않은 문서 수
+        Index('IX_DOCUMENTS_CONTENT_HASH', 'CONTENT_HASH'),
+    )
+
     def __repr__(self):
         return f"<Document(document_id='{self.document_id}', name='{self.document_name}', status='{self.status}')>"
     
@@ -111,6 +119,24 @@ class Document(Base):
             return any(perm in self.permissions for perm in required_permissions)
 
 
+class DocumentBlob(Base):
+    """
+    내용 주소 기반 공유 파일 (SHA-256 하나당 저장소 파일 하나)
+    - 같은 내용의 문서는 사용자와 무관하게 이 파일을 하드 링크로 공유 (UPLOAD_PATH는 사용자별 경로 유지)
+    - 참조 수는 별도 카운터 없이 DOCUMENTS.CONTENT_HASH가 같은 삭제되지 않은 문서 행 수로 센다
+    - 업로드(참조 추가)와 삭제(마지막 참조면 파일 정리)는 이 행의 잠금으로 직렬화
+    """
+    __tablename__ = "DOCUMENT_BLOBS"
+
+    content_hash = Column('CONTENT_HASH', String(64), primary_key=True)  # SHA-256 (hex)
+    file_size = Column('FILE_SIZE', BigInteger, nullable=False)
+    blob_path = Column('BLOB_PATH', String(500), nullable=False)
+    create_dt = Column('CREATE_DT', DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<DocumentBlob(content_hash='{self.content_hash}', size={self.file_size})>"
+
+
 class DocumentChunk(Base):
     """문서 청크 정보 테이블"""
     __tablename__ = "DOCUMENT_CHUNKS"
@@ -5,21 +5,37 @@ Backend와 Prefect 프로젝트에서 공통으로 사용하는 문서 관련 
 """
 
 import hashlib
+import io
 import logging
 import mimetypes
 import os
+import shutil
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import BinaryIO, Dict, List, Optional, Union
+from typing import BinaryIO, Callable, Dict, List, Optional, Union
 
 from sqlalchemy.orm import Session
 
-from .crud import DocumentChunkCRUD, DocumentCRUD, ProcessingJobCRUD
+from .crud import DocumentBlobCRUD, DocumentChunkCRUD, DocumentCRUD, ProcessingJobCRUD
 from .models import Document, DocumentChunk, ProcessingJob
 
 logger = logging.getLogger(__name__)
 
+# 업로드 스트리밍 청크 크기 (요청 하나가 점유하는 메모리는 파일 크기와 무관하게 이 크기)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# 내용 주소 기반 공유 파일 저장소 (업로드 경로 하위 - 사용자 경로와 같은 볼륨이어야 하드 링크 가능)
+BLOB_DIR_NAME = ".blobs"
+
+
+class FileTooLargeError(ValueError):
+    """업로드 파일이 최대 크기를 넘은 경우 (스트리밍 중 감지, 임시 파일은 삭제됨)"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"파일 크기가 최대 {max_size} 바이트를 초과합니다.")
+        self.max_size = max_size
+
 
 class DocumentService:
     """공통 문서 관리 서비스"""
@@ -30,7 +46,9 @@ class DocumentService:
             Path(upload_base_path) if upload_base_path else Path("uploads")
         )
         self.upload_base_path.mkdir(parents=True, exist_ok=True)
+        self.blob_base_path = self.upload_base_path / BLOB_DIR_NAME
         self.document_crud = DocumentCRUD(db)
+        self.blob_crud = DocumentBlobCRUD(db)
         self.chunk_crud = DocumentChunkCRUD(db)
         self.job_crud = ProcessingJobCRUD(db)
 
@@ -52,11 +70,99 @@ class DocumentService:
             hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
+    def _write_stream(self, stream: BinaryIO, max_size: Optional[int] = None) -> tuple:
+        """
+        스트림을 청크 단위로 읽어 해시 계산과 동시에 임시 파일에 쓰기
+
+        - 임시 파일은 공유 파일 저장소 아래에 만들어 os.replace로 원자적으로 옮길 수 있게 한다
+          (권한은 기존 open()과 같이 umask를 따름 - 다른 서비스가 같은 볼륨의 파일을 읽음)
+        - max_size를 넘으면 즉시 중단하고 임시 파일을 지운 뒤 FileTooLargeError
+
+        Returns:
+            (임시 파일 경로, 파일 크기, MD5 해시(FILE_HASH), SHA-256 해시(CONTENT_HASH))
+        """
+        temp_dir = self.blob_base_path / "tmp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = temp_dir / f"{uuid.uuid4().hex}.part"
+        hash_md5 = hashlib.md5()
+        hash_sha256 = hashlib.sha256()
+        file_size = 0
+        try:
+            with open(temp_path, "xb") as f:
+                while True:
+                    chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    file_size += len(chunk)
+                    if max_size is not None and file_size > max_size:
+                        raise FileTooLargeError(max_size)
+                    hash_md5.update(chunk)
+                    hash_sha256.update(chunk)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return temp_path, file_size, hash_md5.hexdigest(), hash_sha256.hexdigest()
+
+    def _hash_file(self, file_path: Path) -> tuple:
+        """파일을 청크 단위로 읽어 (크기, MD5, SHA-256) 계산"""
+        hash_md5 = hashlib.md5()
+        hash_sha256 = hashlib.sha256()
+        file_size = 0
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                hash_md5.update(chunk)
+                hash_sha256.update(chunk)
+        return file_size, hash_md5.hexdigest(), hash_sha256.hexdigest()
+
+    def _get_blob_path(self, content_hash: str) -> Path:
+        """공유 파일 경로 (.blobs/ab/cd/abcd...)"""
+        return self.blob_base_path / content_hash[:2] / content_hash[2:4] / content_hash
+
+    def _link_blob(self, blob_path: Path, upload_path: Path) -> None:
+        """
+        공유 파일을 사용자 경로에 하드 링크로 노출 (같은 inode - 추가 디스크 사용/쓰기 없음)
+
+        - 임시 이름으로 링크를 만든 뒤 os.replace로 교체하므로 기존 파일은 원자적으로 바뀐다
+        - 하드 링크를 만들 수 없는 파일시스템/볼륨이면 복사로 대체
+        """
+        upload_path.parent.mkdir(parents=True, exist_ok=True)
+        if upload_path.exists() and os.path.samefile(blob_path, upload_path):
+            return
+        link_path = upload_path.with_name(f".{upload_path.name}.{uuid.uuid4().hex}.link")
+        try:
+            try:
+                os.link(blob_path, link_path)
+            except OSError as e:
+                logger.warning(f"하드 링크 실패, 복사로 대체: {blob_path} -> {upload_path} ({e})")
+                shutil.copyfile(blob_path, link_path)
+            os.replace(link_path, upload_path)
+        finally:
+            link_path.unlink(missing_ok=True)
+
+    def _release_blob(self, content_hash: str) -> None:
+        """공유 파일 참조 해제 - 마지막 참조였으면 공유 파일 삭제 (GC)"""
+        blob_path = self.blob_crud.release_blob(
+            content_hash, lambda path: Path(path).unlink(missing_ok=True)
+        )
+        if blob_path:
+            logger.info(f"🗑️ 참조 없는 공유 파일 삭제: {content_hash}")
+
     def _generate_file_key(self, user_id: str, filename: str = None) -> str:
         """파일 키 생성 (저장 경로)"""
         # 폴더 구조: uploads/user_id/filename
         return f"{user_id}/{filename}"
 
+    def _generate_document_id(self, file_hash: str) -> str:
+        """문서 ID 생성 (같은 내용을 여러 사용자가 같은 초에 올려도 겹치지 않게 임의 접미사 포함)"""
+        return f"doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file_hash[:8]}_{uuid.uuid4().hex[:8]}"
+
     def _get_upload_path(self, file_key: str) -> Path:
         """실제 업로드 경로 생성"""
         return self.upload_base_path / file_key
@@ -71,112 +177,255 @@ class DocumentService:
         document_type: str = "common",
         **additional_metadata,
     ) -> Dict:
-        """파일 내용으로부터 문서 생성"""
-        try:
-            # 파일 정보 추출
-            file_extension = self._get_file_extension(filename)
-            file_type = self._get_mime_type(filename)
-            file_size = len(file_content)
-            file_hash = self._calculate_file_hash(file_content)
-
-            # 중복 파일 체크
-            existing_doc = self.document_crud.find_document_by_hash(file_hash)
-            if existing_doc and existing_doc.status == "completed":
-                logger.info(f"📋 완료된 기존 문서 발견: {existing_doc.document_id}")
-                return self._document_to_dict(existing_doc, is_duplicate=True)
-
-            # 고유한 문서 ID 생성
-            if existing_doc and existing_doc.status in ["processing", "failed"]:
-                document_id = existing_doc.document_id
-                logger.info(f"🔄 기존 문서 재처리: {document_id}")
-            else:
-                document_id = (
-                    f"doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file_hash[:8]}"
-                )
-
-            # 파일 저장
-            file_key = self._generate_file_key(user_id, filename)
-            upload_path = self._get_upload_path(file_key)
-
-            # 디렉토리 생성
-            upload_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # 파일 저장
-            with open(upload_path, "wb") as f:
-                f.write(file_content)
-
-            # DB에 메타데이터 저장
-            if existing_doc and existing_doc.status in ["failed", "processing"]:
-                # 기존 문서 업데이트
-                self.document_crud.update_document(
-                    document_id,
-                    document_name=filename,
-                    original_filename=filename,
-                    file_key=file_key,
-                    file_size=file_size,
-                    file_type=file_type,
-                    file_extension=file_extension,
-                    user_id=user_id,
-                    upload_path=str(upload_path),
-                    is_public=is_public,
-                    status="completed",
-                    permissions=permissions,
-                    document_type=document_type,
-                    **additional_metadata,
-                )
-                document = self.document_crud.get_document(document_id)
-            else:
-                # 새 문서 생성
-                document = self.document_crud.create_document(
-                    document_id=document_id,
-                    document_name=filename,
-                    original_filename=filename,
-                    file_key=file_key,
-                    file_size=file_size,
-                    file_type=file_type,
-                    file_extension=file_extension,
-                    user_id=user_id,
-                    upload_path=str(upload_path),
-                    is_public=is_public,
-                    file_hash=file_hash,
-                    status="completed",
-                    permissions=permissions,
-                    document_type=document_type,
-                    **additional_metadata,
-                )
+        """파일 내용으로부터 문서 생성 (메모리에 있는 내용 - 큰 파일은 create_document_from_stream 사용)"""
+        return self.create_document_from_stream(
+            stream=io.BytesIO(file_content),
+            filename=filename,
+            user_id=user_id,
+            is_public=is_public,
+            permissions=permissions,
+            document_type=document_type,
+            **additional_metadata,
+        )
 
-            return self._document_to_dict(document)
+    def create_document_from_stream(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        user_id: str,
+        is_public: bool = False,
+        permissions: List[str] = None,
+        document_type: str = "common",
+        max_size: Optional[int] = None,
+        **additional_metadata,
+    ) -> Dict:
+        """
+        파일 스트림으로부터 문서 생성 (UPLOAD_CHUNK_SIZE 단위로 읽어 메모리 사용량 일정)
+
+        - 읽으면서 해시를 계산하고 임시 파일에 쓴 뒤 공유 파일 저장소로 원자적 이름 변경
+          (쓰는 도중 실패해도 기존 파일이 깨지지 않고, 읽는 쪽은 완성된 파일만 본다)
+        - 같은 내용(SHA-256)의 공유 파일이 이미 있으면 임시 파일을 버리고 그 파일을 upload_path에 하드 링크
+        - 완료된 중복 문서면 임시 파일을 지우고 기존 문서를 반환
+
+        Raises:
+            FileTooLargeError: max_size를 넘은 경우
+        """
+        temp_path = None
+        try:
+            temp_path, file_size, file_hash, content_hash = self._write_stream(stream, max_size)
+            return self.create_document_from_temp_file(
+                temp_path=temp_path,
+                filename=filename,
+                user_id=user_id,
+                is_public=is_public,
+                permissions=permissions,
+                document_type=document_type,
+                file_size=file_size,
+                file_hash=file_hash,
+                content_hash=content_hash,
+                **additional_metadata,
+            )
 
         except Exception as e:
             logger.error(f"문서 생성 실패: {str(e)}")
             raise
+        finally:
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
 
-    def create_document_from_path(
+    def create_document_from_temp_file(
         self,
-        file_path: str,
+        temp_path: Path,
+        filename: str,
         user_id: str,
         is_public: bool = False,
         permissions: List[str] = None,
         document_type: str = "common",
+        file_size: Optional[int] = None,
+        file_hash: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        before_commit: Optional[Callable[[str], None]] = None,
         **additional_metadata,
     ) -> Dict:
-        """파일 경로로부터 문서 생성"""
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+        """
+        공유 파일 저장소 임시 디렉토리(.blobs/tmp)에 다 쓰인 파일로 문서 생성 (재개 가능 업로드 완료 등)
+
+        - 해시를 넘기지 않으면 파일을 청크 단위로 다시 읽어 계산
+        - 성공하면 임시 파일은 공유 파일로 옮겨지거나 삭제된다 (실패하면 남겨 두므로 호출자가 정리/재시도)
+        - before_commit(document_id)는 문서를 저장하기 직전에 호출되며, 그 안에서 바꾼 상태는
+          문서와 같은 트랜잭션으로 커밋된다 (이미 완료된 본인 문서를 반환하는 경우에는 호출되지 않음)
+        """
+        if file_size is None or file_hash is None or content_hash is None:
+            file_size, file_hash, content_hash = self._hash_file(temp_path)
+
+        # 파일 정보 추출
+        file_extension = self._get_file_extension(filename)
+        file_type = self._get_mime_type(filename)
+
+        file_key = self._generate_file_key(user_id, filename)
+        upload_path = self._get_upload_path(file_key)
+
+        # 중복 파일 체크 (본인 문서만 - 다른 사용자와 같은 내용이면 공유 파일만 함께 쓰고 문서는 따로 생성)
+        existing_doc = self.document_crud.find_document_by_hash(file_hash, user_id=user_id)
+        if existing_doc and existing_doc.status == "completed":
+            logger.info(f"📋 완료된 기존 문서 발견: {existing_doc.document_id}")
+            temp_path.unlink(missing_ok=True)
+            return self._document_to_dict(existing_doc, is_duplicate=True)
+
+        # 고유한 문서 ID 생성
+        if existing_doc and existing_doc.status in ["processing", "failed"]:
+            document_id = existing_doc.document_id
+            logger.info(f"🔄 기존 문서 재처리: {document_id}")
+        else:
+            document_id = self._generate_document_id(file_hash)
+
+        # 공유 파일 저장 후 사용자 경로에 링크
+        # - 행 잠금은 아래 문서 저장 커밋까지 유지 (동시 삭제의 GC가 이 파일을 지우지 못함)
+        blob = self.blob_crud.lock_blob(
+            content_hash, file_size, str(self._get_blob_path(content_hash))
+        )
+        blob_path = Path(blob.blob_path)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                # 링크로 설치하고 임시 파일은 문서 저장 후 삭제 (실패 시 재시도할 수 있게 남김)
+                os.link(temp_path, blob_path)
+            except OSError:
+                os.replace(temp_path, blob_path)
+        else:
+            logger.info(f"♻️ 같은 내용의 공유 파일 재사용: {content_hash}")
+        self._link_blob(blob_path, upload_path)
+
+        if before_commit is not None:
+            before_commit(document_id)
+
+        # DB에 메타데이터 저장
+        if existing_doc and existing_doc.status in ["failed", "processing"]:
+            previous_content_hash = existing_doc.content_hash
+            # 기존 문서 업데이트
+            self.document_crud.update_document(
+                document_id,
+                document_name=filename,
+                original_filename=filename,
+                file_key=file_key,
+                file_size=file_size,
+                file_type=file_type,
+                file_extension=file_extension,
+                user_id=user_id,
+                upload_path=str(upload_path),
+                content_hash=content_hash,
+                is_public=is_public,
+                status="completed",
+                permissions=permissions,
+                document_type=document_type,
+                **additional_metadata,
+            )
+            if previous_content_hash and previous_content_hash != content_hash:
+                self._release_blob(previous_content_hash)
+            document = self.document_crud.get_document(document_id)
+        else:
+            # 새 문서 생성
+            document = self.document_crud.create_document(
+                document_id=document_id,
+                document_name=filename,
+                original_filename=filename,
+                file_key=file_key,
+                file_size=file_size,
+                file_type=file_type,
+                file_extension=file_extension,
+                user_id=user_id,
+                upload_path=str(upload_path),
+                is_public=is_public,
+                file_hash=file_hash,
+                content_hash=content_hash,
+                status="completed",
+                permissions=permissions,
+                document_type=document_type,
+                **additional_metadata,
+            )
 
-        with open(file_path, "rb") as f:
-            file_content = f.read()
+        temp_path.unlink(missing_ok=True)
+        return self._document_to_dict(document)
 
-        return self.create_document_from_file(
-            file_content=file_content,
-            filename=file_path.name,
+    def create_document_from_blob(
+        self,
+        source_document_id: str,
+        filename: str,
+        user_id: str,
+        is_public: bool = False,
+        permissions: List[str] = None,
+        document_type: str = "common",
+        **additional_metadata,
+    ) -> Optional[Dict]:
+        """
+        기존 문서와 같은 내용의 문서를 파일 전송 없이 생성 (업로드 전 해시 확인에서 다른 사용자의 공개 문서와 일치)
+
+        - 원본 문서의 공유 파일(DOCUMENT_BLOBS)을 사용자 경로에 하드 링크하고 호출자 소유 문서를 새로 만든다
+        - 원본 문서나 공유 파일이 없으면 None (호출자가 일반 업로드로 진행)
+        """
+        source = self.document_crud.get_document(source_document_id)
+        if not source or source.is_deleted or not source.content_hash:
+            return None
+
+        file_key = self._generate_file_key(user_id, filename)
+        upload_path = self._get_upload_path(file_key)
+
+        # 행 잠금은 문서 저장 커밋까지 유지 (동시 삭제의 GC가 공유 파일을 지우지 못함)
+        blob = self.blob_crud.lock_blob(
+            source.content_hash, source.file_size, str(self._get_blob_path(source.content_hash))
+        )
+        blob_path = Path(blob.blob_path)
+        if not blob_path.exists():
+            self.db.rollback()
+            logger.warning(f"공유 파일 없음 - 일반 업로드로 진행: {source.content_hash}")
+            return None
+        self._link_blob(blob_path, upload_path)
+
+        document = self.document_crud.create_document(
+            document_id=self._generate_document_id(source.file_hash),
+            document_name=filename,
+            original_filename=filename,
+            file_key=file_key,
+            file_size=source.file_size,
+            file_type=self._get_mime_type(filename),
+            file_extension=self._get_file_extension(filename),
             user_id=user_id,
+            upload_path=str(upload_path),
             is_public=is_public,
+            file_hash=source.file_hash,
+            content_hash=source.content_hash,
+            status="completed",
             permissions=permissions,
             document_type=document_type,
             **additional_metadata,
         )
+        logger.info(f"♻️ 공유 파일로 문서 생성 (업로드 생략): {document.document_id} ← {source_document_id}")
+        return self._document_to_dict(document)
+
+    def create_document_from_path(
+        self,
+        file_path: str,
+        user_id: str,
+        is_public: bool = False,
+        permissions: List[str] = None,
+        document_type: str = "common",
+        **additional_metadata,
+    ) -> Dict:
+        """파일 경로로부터 문서 생성"""
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+
+        with open(file_path, "rb") as f:
+            return self.create_document_from_stream(
+                stream=f,
+                filename=file_path.name,
+                user_id=user_id,
+                is_public=is_public,
+                permissions=permissions,
+                document_type=document_type,
+                **additional_metadata,
+            )
 
     def get_document(self, document_id: str, user_id: str = None) -> Optional[Dict]:
         """문서 정보 조회"""
@@ -216,10 +465,15 @@ class DocumentService:
             logger.error(f"문서 검색 실패: {str(e)}")
             raise
 
-    def download_document(
+    def get_document_file(
         self, document_id: str, user_id: str = None
-    ) -> tuple[bytes, str, str]:
-        """문서 다운로드"""
+    ) -> tuple[Path, str, str, Optional[str]]:
+        """
+        다운로드할 문서 파일 정보 (파일 내용은 읽지 않음 - 호출자가 파일 기반 응답으로 전송)
+
+        Returns:
+            (파일 경로, 원본 파일명, MIME 타입, 내용 해시 - ETag용 CONTENT_HASH 또는 FILE_HASH)
+        """
         try:
             document = self.document_crud.get_document(document_id)
 
@@ -230,20 +484,30 @@ class DocumentService:
             if user_id and document.user_id != user_id and not document.is_public:
                 raise PermissionError("문서에 접근할 권한이 없습니다.")
 
-            # 파일 읽기
             upload_path = Path(document.upload_path)
-            if not upload_path.exists():
+            if not upload_path.is_file():
                 raise FileNotFoundError("파일이 존재하지 않습니다.")
 
-            with open(upload_path, "rb") as f:
-                file_content = f.read()
-
-            return file_content, document.original_filename, document.file_type
+            return (
+                upload_path,
+                document.original_filename,
+                document.file_type,
+                document.content_hash or document.file_hash,
+            )
 
         except Exception as e:
             logger.error(f"문서 다운로드 실패: {str(e)}")
             raise
 
+    def download_document(
+        self, document_id: str, user_id: str = None
+    ) -> tuple[bytes, str, str]:
+        """문서 다운로드 (파일 전체를 메모리로 읽음 - API 응답은 get_document_file 사용)"""
+        upload_path, filename, file_type, _ = self.get_document_file(document_id, user_id)
+        with open(upload_path, "rb") as f:
+            file_content = f.read()
+        return file_content, filename, file_type
+
     def delete_document(self, document_id: str, user_id: str = None) -> bool:
         """문서 삭제"""
         try:
@@ -263,10 +527,12 @@ class DocumentService:
             if success:
                 self.chunk_crud.delete_document_chunks(document_id)
 
-                # 실제 파일도 삭제 (선택사항)
+                # 실제 파일도 삭제 (선택사항) - 사용자 경로의 링크만 지우고 공유 파일은 참조가 없을 때 삭제
                 upload_path = Path(document.upload_path)
                 if upload_path.exists():
                     upload_path.unlink()
+                if document.content_hash:
+                    self._release_blob(document.content_hash)
 
             return success
 